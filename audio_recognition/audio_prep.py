@@ -0,0 +1,255 @@
+"""
+Audio Preparation Module
+
+Shared audio-prep stage for recognition services: downmix, resample and
+WAV-encode an AudioChunk once, then reuse the result everywhere.
+
+- Polyphase resampling (same filter design as scipy.signal.resample_poly,
+  implemented with NumPy so scipy stays optional). The polyphase filter bank
+  is designed once per rate pair (e.g. 48000->44100, 48000->16000) and cached.
+- WAV headers are packed directly in front of the int16 sample buffer
+  (no wave module / BytesIO round-trip).
+- Results are memoized per AudioChunk via AudioChunk.get_prepared()/to_wav().
+"""
+
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+from math import gcd
+from typing import Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Filter design constants (match scipy.signal.resample_poly defaults)
+FILTER_HALF_LEN_PER_RATE = 10   # Half filter length = 10 * max(up, down)
+KAISER_BETA = 5.0
+
+# Max output samples resampled per vectorized block (bounds temporary memory)
+RESAMPLE_BLOCK_SIZE = 65536
+
+@dataclass(frozen=True)
+class PolyphaseFilter:
+    """
+    Precomputed polyphase filter bank for one up/down rate pair.
+
+    Outputs repeat their filter phase every `up` samples, so one period of
+    output positions fully describes the filter.
+
+    Attributes:
+        up: Upsampling factor (reduced by gcd)
+        down: Downsampling factor (reduced by gcd)
+        bank: Filter taps for each output position in a period, shape (up, taps), float32
+        cols: Input window (column in the period row view) per output position, shape (up, taps)
+        width: Input samples spanned by one period row
+        pad: Zero padding needed before the input (filter delay, in input samples)
+    """
+    up: int
+    down: int
+    bank: np.ndarray
+    cols: np.ndarray
+    width: int
+    pad: int
+
+
+def _reduce_ratio(src_rate: int, dst_rate: int) -> Tuple[int, int]:
+    """Reduce src->dst rates to coprime (up, down) factors."""
+    g = gcd(int(src_rate), int(dst_rate))
+    return int(dst_rate) // g, int(src_rate) // g
+
+
+@lru_cache(maxsize=16)
+def get_polyphase_filter(src_rate: int, dst_rate: int) -> PolyphaseFilter:
+    """
+    Design (once) the polyphase filter bank for a rate pair.
+
+    Kaiser-windowed sinc low-pass at min(1/up, 1/down) Nyquist, scaled by up
+    to preserve gain after zero-stuffing - identical to resample_poly.
+
+    Args:
+        src_rate: Input sample rate in Hz
+        dst_rate: Output sample rate in Hz
+
+    Returns:
+        PolyphaseFilter for the reduced up/down pair
+    """
+    up, down = _reduce_ratio(src_rate, dst_rate)
+    max_rate = max(up, down)
+    half_len = FILTER_HALF_LEN_PER_RATE * max_rate
+    num_taps = 2 * half_len + 1
+
+    # Windowed sinc, cutoff normalized to the upsampled rate
+    cutoff = 1.0 / max_rate
+    n = np.arange(num_taps, dtype=np.float64) - half_len
+    h = cutoff * np.sinc(cutoff * n) * np.kaiser(num_taps, KAISER_BETA)
+    h *= up / h.sum()  # Unity DC gain, times up to make up for zero-stuffing
+
+    # Pad so every phase has the same number of taps
+    taps_per_phase = -(-num_taps // up)
+    h = np.concatenate([h, np.zeros(taps_per_phase * up - num_taps)])
+
+    # polyphase[p, j] = h[p + j*up]  -> tap j of phase p
+    polyphase = h.reshape(taps_per_phase, up).T.astype(np.float32)
+
+    # Output m lands on upsampled index t = m*down + half_len (centre the filter).
+    # Over one period (m in [0, up)), record which phase/input offset each output uses.
+    t = np.arange(up, dtype=np.int64) * down + half_len
+    phases = t % up
+    offsets = t // up
+    pad = taps_per_phase
+
+    # Taps run backwards in time: output uses inputs offset, offset-1, ... (shifted by pad)
+    cols = offsets[:, None] + pad - np.arange(taps_per_phase)[None, :]
+
+    logger.debug(
+        f"Designed polyphase filter {src_rate}->{dst_rate} Hz "
+        f"(up={up}, down={down}, {taps_per_phase} taps/phase)"
+    )
+    return PolyphaseFilter(
+        up=up, down=down, bank=polyphase[phases], cols=cols,
+        width=int(offsets.max()) + pad + 1, pad=pad,
+    )
+
+
+def resample(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """
+    Polyphase-resample a mono signal.
+
+    Only the needed output samples are computed (no zero-stuffed intermediate),
+    in blocks of about RESAMPLE_BLOCK_SIZE outputs.
+
+    Args:
+        samples: 1-D mono samples (any numeric dtype)
+        src_rate: Input sample rate in Hz
+        dst_rate: Output sample rate in Hz
+
+    Returns:
+        Resampled float32 array of length ceil(len * dst_rate / src_rate)
+    """
+    if src_rate == dst_rate:
+        return samples.astype(np.float32, copy=False)
+
+    pf = get_polyphase_filter(src_rate, dst_rate)
+    n_in = samples.shape[0]
+    n_out = -(-n_in * pf.up // pf.down)
+    periods = -(-n_out // pf.up)
+
+    # Zero-padded input, viewed (without copying) as one row per output period:
+    # rows[q, k] = x[q*down + k]
+    x = np.zeros(periods * pf.down + pf.width, dtype=np.float32)
+    x[pf.pad:pf.pad + n_in] = samples
+    rows = as_strided(
+        x, shape=(periods, pf.width), strides=(x.strides[0] * pf.down, x.strides[0]), writeable=False
+    )
+
+    out = np.empty((periods, pf.up), dtype=np.float32)
+    periods_per_block = max(1, RESAMPLE_BLOCK_SIZE // pf.up)
+    for q0 in range(0, periods, periods_per_block):
+        q1 = q0 + periods_per_block
+        # (periods, up, taps) gather -> weight -> sum over taps
+        out[q0:q1] = np.einsum('qut,ut->qu', rows[q0:q1][:, pf.cols], pf.bank)
+
+    return out.ravel()[:n_out]
+
+
+def downmix(data: np.ndarray) -> np.ndarray:
+    """
+    Downmix interleaved (frames, channels) int16 audio to mono float32.
+
+    Args:
+        data: 1-D mono or 2-D (frames, channels) array
+
+    Returns:
+        1-D float32 mono samples
+    """
+    if data.ndim == 1:
+        return data.astype(np.float32, copy=False)
+    if data.shape[1] == 1:
+        return data[:, 0].astype(np.float32, copy=False)
+    return data.mean(axis=1, dtype=np.float32)
+
+
+def to_int16(samples: np.ndarray) -> np.ndarray:
+    """Round and clip float samples to little-endian int16."""
+    if samples.dtype == np.dtype('<i2'):
+        return samples
+    return np.clip(np.rint(samples), -32768, 32767).astype('<i2')
+
+
+def prepare_samples(data: np.ndarray, sample_rate: int, channels: int,
+                    target_rate: int = None, mono: bool = False) -> Tuple[np.ndarray, int, int]:
+    """
+    Downmix and/or resample raw capture data in one pass.
+
+    Args:
+        data: Raw int16 samples, 1-D or (frames, channels)
+        sample_rate: Source sample rate
+        channels: Source channel count
+        target_rate: Output rate (None = keep source rate)
+        mono: Downmix to mono
+
+    Returns:
+        Tuple of (int16 samples, sample_rate, channels)
+    """
+    target_rate = target_rate or sample_rate
+    needs_resample = target_rate != sample_rate
+
+    if not needs_resample and not (mono and channels > 1):
+        return np.ascontiguousarray(data, dtype='<i2'), sample_rate, channels
+
+    if mono or data.ndim == 1:
+        out = resample(downmix(data), sample_rate, target_rate)
+        return to_int16(out), target_rate, 1
+
+    # Multi-channel output: resample each channel with the shared filter bank
+    resampled = np.stack(
+        [resample(data[:, ch], sample_rate, target_rate) for ch in range(data.shape[1])],
+        axis=1,
+    )
+    return to_int16(resampled), target_rate, data.shape[1]
+
+
+def build_wav_header(num_bytes: int, sample_rate: int, channels: int, sample_width: int = 2) -> bytes:
+    """
+    Pack a canonical 44-byte PCM WAV header.
+
+    Args:
+        num_bytes: Size of the PCM data chunk in bytes
+        sample_rate: Sample rate in Hz
+        channels: Number of channels
+        sample_width: Bytes per sample (2 = int16)
+
+    Returns:
+        Header bytes
+    """
+    block_align = channels * sample_width
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + num_bytes, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate, sample_rate * block_align, block_align, sample_width * 8,
+        b'data', num_bytes,
+    )
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int, channels: int) -> bytes:
+    """
+    Encode int16 samples as WAV bytes.
+
+    The header is joined directly with a view of the sample buffer, so the
+    samples are copied exactly once (into the returned bytes object).
+
+    Args:
+        samples: int16 samples, 1-D or (frames, channels)
+        sample_rate: Sample rate in Hz
+        channels: Number of channels
+
+    Returns:
+        WAV file bytes
+    """
+    pcm = np.ascontiguousarray(samples, dtype='<i2')
+    payload = memoryview(pcm).cast('B')
+    return b''.join((build_wav_header(payload.nbytes, sample_rate, channels), payload))
@@ -7,8 +7,8 @@ Supports loopback devices (MOTU M4, VB-Cable, Voicemeeter) for capturing system
 
 import asyncio
 import time
-from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, Tuple
 
 import numpy as np
 
@@ -114,6 +114,49 @@ class AudioChunk:
     channels: int
     duration: float
     capture_start_time: float
+    # Memoized audio-prep results (prepared samples and encoded WAV) - see audio_prep.py
+    _prepared: Dict[tuple, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    
+    def get_prepared(self, target_rate: Optional[int] = None, mono: bool = False) -> Tuple[np.ndarray, int, int]:
+        """
+        Get downmixed/resampled int16 samples (computed once per chunk).
+        
+        Args:
+            target_rate: Output sample rate (None = keep capture rate)
+            mono: Downmix to mono
+            
+        Returns:
+            Tuple of (samples, sample_rate, channels)
+        """
+        key = (target_rate, mono)
+        prepared = self._prepared.get(key)
+        if prepared is None:
+            from .audio_prep import prepare_samples
+            prepared = prepare_samples(self.data, self.sample_rate, self.channels, target_rate, mono)
+            self._prepared[key] = prepared
+        return prepared
+    
+    def to_wav(self, target_rate: Optional[int] = None, mono: bool = False) -> bytes:
+        """
+        Get WAV bytes for this chunk (encoded once per chunk and format).
+        
+        Args:
+            target_rate: Output sample rate (None = keep capture rate)
+            mono: Downmix to mono
+            
+        Returns:
+            WAV file bytes
+        """
+        key = ("wav", target_rate, mono)
+        wav_bytes = self._prepared.get(key)
+        if wav_bytes is None:
+            from .audio_prep import encode_wav
+            samples, rate, channels = self.get_prepared(target_rate, mono)
+            wav_bytes = encode_wav(samples, rate, channels)
+            self._prepared[key] = wav_bytes
+        return wav_bytes
     
     def get_max_amplitude(self) -> int:
         """Get the maximum amplitude in the audio (for silence detection)."""
@@ -0,0 +1,185 @@
+"""
+Song Change Detector Module
+
+Cheap signal-level check for "is this still the same song?" between recognitions.
+Used by the engine's stable tracking state to skip full recognition while the
+audio stays continuous, and to trigger it early when it does not.
+
+Signals (per captured chunk, all NumPy, a few ms per chunk):
+- Silence gap:   A run of near-silent frames between non-silent audio (track boundary)
+- Level shift:   Loudness jumps versus the running reference of the current song
+- Spectral jump: The coarse log-spectrum (timbre) departs from the reference, or
+                 differs sharply between the two halves of the chunk (onset of a new track)
+
+False positives only cost one full recognition cycle, so thresholds lean sensitive.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from logging_config import get_logger
+from .capture import AudioChunk
+
+logger = get_logger(__name__)
+
+FRAME_SECONDS = 0.05        # Loudness frame size (gap detection)
+FFT_SIZE = 2048             # Spectrum frame size (non-overlapping)
+NUM_BANDS = 24              # Log-spaced bands between BAND_MIN_HZ and BAND_MAX_HZ
+BAND_MIN_HZ = 100.0
+BAND_MAX_HZ = 8000.0
+SILENCE_DBFS = -50.0        # Frames below this are "silent"
+GAP_MIN_SECONDS = 0.4       # Shortest interior silence treated as a track gap
+REFERENCE_SMOOTHING = 0.3   # EMA weight of the newest chunk in the song reference
+
+
+@dataclass
+class ChunkProfile:
+    """Coarse loudness/spectrum summary of one chunk."""
+    level_db: float          # Median frame loudness (dBFS) of non-silent frames
+    bands: np.ndarray        # Mean-removed log band energies (whole chunk)
+    half_distance: float     # Spectral distance between first and second half
+    has_gap: bool            # Interior silence gap found
+
+
+def _spectral_distance(a: np.ndarray, b: np.ndarray) -> float:
+    """Correlation distance between two mean-removed log spectra (0 = same shape, up to 2)."""
+    denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+    if denom <= 0:
+        return 0.0
+    return 1.0 - float(np.dot(a, b)) / denom
+
+
+def _band_edges(sample_rate: int) -> np.ndarray:
+    """FFT bin indices delimiting the log-spaced bands."""
+    top = min(BAND_MAX_HZ, sample_rate / 2 * 0.95)
+    edges_hz = np.geomspace(BAND_MIN_HZ, top, NUM_BANDS + 1)
+    bins = np.round(edges_hz * FFT_SIZE / sample_rate).astype(np.int64)
+    return np.unique(np.clip(bins, 1, FFT_SIZE // 2))
+
+
+def _log_bands(power: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Collapse an averaged power spectrum into mean-removed log band energies."""
+    bands = np.add.reduceat(power[:edges[-1]], edges[:-1])
+    log_bands = np.log10(bands + 1e-9)
+    return log_bands - log_bands.mean()
+
+
+def analyze_chunk(audio: AudioChunk) -> Optional[ChunkProfile]:
+    """
+    Summarize a chunk for change detection.
+
+    Returns:
+        ChunkProfile, or None if the chunk is too short or entirely silent
+    """
+    samples, rate, _ = audio.get_prepared(mono=True)
+    x = samples.astype(np.float32) / 32768.0
+
+    frame = max(1, int(rate * FRAME_SECONDS))
+    n_frames = len(x) // frame
+    if n_frames < 4 or len(x) < 2 * FFT_SIZE:
+        return None
+
+    # Frame loudness (dBFS)
+    frames = x[:n_frames * frame].reshape(n_frames, frame)
+    rms = np.sqrt(np.mean(frames * frames, axis=1) + 1e-12)
+    level = 20.0 * np.log10(rms)
+    loud = level > SILENCE_DBFS
+    if not loud.any():
+        return None
+
+    # Interior gap: silent run with audio on both sides
+    has_gap = False
+    min_gap = max(1, int(GAP_MIN_SECONDS / FRAME_SECONDS))
+    loud_idx = np.flatnonzero(loud)
+    if len(loud_idx) > 1:
+        runs = np.diff(loud_idx) - 1  # Silent frames between consecutive loud frames
+        has_gap = bool((runs >= min_gap).any())
+
+    # Coarse spectrum over non-overlapping FFT frames
+    n_fft = len(x) // FFT_SIZE
+    spec_frames = x[:n_fft * FFT_SIZE].reshape(n_fft, FFT_SIZE) * np.hanning(FFT_SIZE).astype(np.float32)
+    power = np.abs(np.fft.rfft(spec_frames, axis=1)) ** 2
+    edges = _band_edges(rate)
+
+    half = n_fft // 2
+    first = _log_bands(power[:half].mean(axis=0), edges)
+    second = _log_bands(power[half:].mean(axis=0), edges)
+
+    return ChunkProfile(
+        level_db=float(np.median(level[loud])),
+        bands=_log_bands(power.mean(axis=0), edges),
+        half_distance=_spectral_distance(first, second),
+        has_gap=has_gap,
+    )
+
+
+class SongChangeDetector:
+    """
+    Tracks a running loudness/spectrum reference for the current song and
+    flags chunks that break continuity.
+
+    Usage:
+        detector = SongChangeDetector()
+        reason = detector.observe(chunk)   # None = looks like the same song
+        detector.reset()                   # On accepted song change
+    """
+
+    def __init__(self, level_change_db: float = 10.0, spectral_change: float = 0.4):
+        """
+        Args:
+            level_change_db: Loudness jump (dB) versus the reference that counts as a change
+            spectral_change: Spectral distance (0-2) versus the reference that counts as a change
+        """
+        self._level_change_db = level_change_db
+        self._spectral_change = spectral_change
+        self._ref_level: Optional[float] = None
+        self._ref_bands: Optional[np.ndarray] = None
+
+    def reset(self) -> None:
+        """Forget the reference (next chunk starts a new one)."""
+        self._ref_level = None
+        self._ref_bands = None
+
+    def observe(self, audio: AudioChunk) -> Optional[str]:
+        """
+        Compare a chunk against the reference and fold it in.
+
+        Args:
+            audio: Newly captured chunk
+
+        Returns:
+            Reason string if a song change is likely, else None
+        """
+        try:
+            profile = analyze_chunk(audio)
+        except Exception as e:
+            logger.debug(f"Change detector analysis failed: {e}")
+            return None
+        if profile is None:
+            return None
+
+        reason = None
+        if profile.has_gap:
+            reason = "silence gap"
+        elif profile.half_distance > self._spectral_change:
+            reason = f"onset within chunk (spectral distance {profile.half_distance:.2f})"
+        elif self._ref_level is not None:
+            level_delta = profile.level_db - self._ref_level
+            distance = _spectral_distance(profile.bands, self._ref_bands)
+            if abs(level_delta) > self._level_change_db:
+                reason = f"level shift {level_delta:+.1f} dB"
+            elif distance > self._spectral_change:
+                reason = f"spectral change {distance:.2f}"
+
+        if reason or self._ref_level is None:
+            # Start a fresh reference from this chunk
+            self._ref_level = profile.level_db
+            self._ref_bands = profile.bands
+        else:
+            w = REFERENCE_SMOOTHING
+            self._ref_level = (1 - w) * self._ref_level + w * profile.level_db
+            self._ref_bands = (1 - w) * self._ref_bands + w * profile.bands
+
+        return reason
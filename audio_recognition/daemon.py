@@ -24,6 +24,7 @@ from pathlib import Path
 from typing import Optional, Any, Dict
 
 from logging_config import get_logger
+from metrics import histogram
 
 logger = get_logger(__name__)
 
@@ -275,7 +276,7 @@ class DaemonManager:
         
         return None
     
-    async def send_command(self, command: dict) -> Optional[dict]:
+    async def send_command(self, command: dict, timeout: Optional[float] = None) -> Optional[dict]:
         """
         Send a command to the daemon and get response (async-safe).
         
@@ -284,6 +285,8 @@ class DaemonManager:
         
         Args:
             command: Command dict (e.g., {"cmd": "query", "path": "..."})
+            timeout: Response timeout in seconds (default: COMMAND_TIMEOUT).
+                     Long-running commands like fingerprint-batch need more.
             
         Returns:
             Response dict or None on error
@@ -301,20 +304,25 @@ class DaemonManager:
         
         # Lock ensures only one command/response transaction at a time
         async with self._io_lock:
+            start = time.perf_counter()
+            outcome = "error"
             try:
                 # Run blocking I/O in thread with timeout
                 result = await asyncio.wait_for(
                     asyncio.to_thread(self._send_command_sync, command),
-                    timeout=self.COMMAND_TIMEOUT
+                    timeout=timeout or self.COMMAND_TIMEOUT
                 )
                 
                 if result is None:
                     # Command failed, daemon may have crashed
                     await self._handle_crash()
+                else:
+                    outcome = "ok"
                 
                 return result
                 
             except asyncio.TimeoutError:
+                outcome = "timeout"
                 logger.error(f"Daemon command timed out: {command.get('cmd')}")
                 await self._handle_crash()
                 return None
@@ -322,6 +330,9 @@ class DaemonManager:
                 logger.error(f"Error sending command to daemon: {e}")
                 await self._handle_crash()
                 return None
+            finally:
+                histogram("fingerprint_daemon_seconds", "sfp-cli daemon command latency (lock held)",
+                          cmd=command.get("cmd", "unknown"), outcome=outcome).observe(time.perf_counter() - start)
     
     async def _ensure_daemon(self) -> bool:
         """Ensure daemon is running, starting or restarting if needed."""
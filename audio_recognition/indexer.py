@@ -0,0 +1,872 @@
+"""
+Local Fingerprint Library Indexer
+
+Incremental, parallel indexer for the local fingerprint database (sfp-cli).
+
+Pipeline:
+1. Scan:   Walk the library once and stat every audio file
+2. Diff:   Compare size/mtime against the on-disk manifest (indexed_files.json).
+           Unchanged files are skipped without being opened.
+3. Decode: Changed/new files are decoded in a process pool. One ffmpeg run per file
+           produces both the 8 kHz mono WAV handed to the daemon and the 90-second
+           PCM stream used for the content hash (same hash as the legacy script).
+4. Index:  Decoded files are streamed to the daemon in fingerprint-batch groups as
+           soon as they are ready, while the pool keeps decoding the next ones.
+5. Commit: After every batch the daemon DB and the manifest are saved atomically,
+           so an interrupted run resumes where it stopped.
+
+The manifest format is shared with scripts/test_sfp_indexing.py (size/mtime are
+added to each entry; legacy entries without them are adopted on the next run).
+
+Usage:
+    python -m audio_recognition.indexer <folder> [--db-path PATH] [--workers N] [--dry-run]
+"""
+
+import asyncio
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import subprocess
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Manifest / tracking files (shared with scripts/test_sfp_indexing.py)
+MANIFEST_FILENAME = "indexed_files.json"
+SKIP_LOG_FILENAME = "skip_log.json"
+EXCLUDE_FILENAME = "exclude.json"
+CHECKPOINT_FILENAME = "index_checkpoint.json"
+
+SUPPORTED_EXTENSIONS = ('.flac', '.mp3', '.wav', '.m4a', '.ogg')
+MAX_DURATION_MINUTES = 20  # Skip files longer than this
+
+# Decode format - matches sfp-cli's FingerprintConfig.SampleRate
+INDEX_SAMPLE_RATE = 8000
+CONTENT_HASH_SECONDS = 90  # Seconds of decoded audio hashed for deduplication
+DECODE_TIMEOUT = 300  # seconds per file
+
+# The daemon fingerprints up to 8 files of a batch concurrently
+BATCH_SIZE = 8
+BATCH_TIMEOUT = 600  # seconds per fingerprint-batch command
+
+# Existing SyncLyrics daemon (sfp-cli --tcp)
+DAEMON_TCP_HOST = "127.0.0.1"
+DAEMON_TCP_PORT = 9123
+
+
+def _utc_now() -> str:
+    """ISO timestamp in the manifest's format."""
+    return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def normalize_song_id(artist: str, title: str) -> str:
+    """
+    Generate a normalized song ID from artist and title.
+    Matches the _normalize_track_id function in system_utils/helpers.py
+    """
+    norm_artist = "".join(c for c in (artist or "").lower() if c.isalnum())
+    norm_title = "".join(c for c in (title or "").lower() if c.isalnum())
+    return f"{norm_artist}_{norm_title}"
+
+
+def is_excluded(song_id: str, artist: str, title: str, exclusions: Dict[str, Any]) -> bool:
+    """Check if a song is excluded by ID or pattern (exclude.json)."""
+    if song_id in exclusions.get('songIds', []):
+        return True
+
+    combined = f"{artist} - {title}".lower()
+    for pattern in exclusions.get('patterns', []):
+        pattern_lower = pattern.lower()
+        if (fnmatch.fnmatch(artist.lower(), pattern_lower)
+                or fnmatch.fnmatch(title.lower(), pattern_lower)
+                or fnmatch.fnmatch(combined, pattern_lower)):
+            return True
+    return False
+
+
+def _load_json(path: Path) -> Dict:
+    """Load a JSON dict, or return an empty one if missing/corrupt."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+            return data if isinstance(data, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Could not read {path.name}: {e}")
+        return {}
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _save_json_atomic(path: Path, data: Dict) -> None:
+    """Write JSON via temp file + rename so a crash never leaves a truncated file."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# ============================================================================
+# MANIFEST
+# ============================================================================
+
+class IndexManifest:
+    """
+    On-disk record of which files are in the fingerprint DB.
+
+    Entries are keyed by absolute file path:
+        {songId, contentHash, indexedAt, size, mtime[, skipped]}
+
+    Change detection is stat-based (size + mtime), so unchanged files are never
+    decoded. Content hashes are only compared once a file's stat has changed.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Load manifest and skip log from the database directory.
+
+        Args:
+            db_path: Fingerprint database directory
+        """
+        self._path = db_path / MANIFEST_FILENAME
+        self._skip_path = db_path / SKIP_LOG_FILENAME
+        self.entries: Dict[str, Dict[str, Any]] = _load_json(self._path)
+        self.skip_log: Dict[str, Dict[str, Any]] = _load_json(self._skip_path)
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def classify(self, file_key: str, size: int, mtime: float) -> Optional[str]:
+        """
+        Decide whether a file needs work.
+
+        Args:
+            file_key: Absolute file path
+            size: File size in bytes
+            mtime: Modification time (seconds)
+
+        Returns:
+            None if unchanged, "new" if never seen, "modified" if stat changed
+        """
+        entry = self.entries.get(file_key)
+        if entry is None:
+            skipped = self.skip_log.get(file_key)
+            # Previously skipped (missing tags, too long...) and untouched since
+            if skipped and skipped.get('size') == size and skipped.get('mtime') == mtime:
+                return None
+            return "new"
+
+        if 'size' not in entry or 'mtime' not in entry:
+            # Legacy entry from the serial script - trust it and adopt the current stat
+            entry['size'] = size
+            entry['mtime'] = mtime
+            self._dirty = True
+            return None
+
+        if entry['size'] == size and entry['mtime'] == mtime:
+            return None
+        return "modified"
+
+    def record(self, file_key: str, song_id: str, content_hash: Optional[str],
+               size: int, mtime: float, skipped: Optional[str] = None) -> None:
+        """Record a file as indexed (or as a known duplicate when skipped is set)."""
+        entry = {
+            'songId': song_id,
+            'contentHash': content_hash,
+            'indexedAt': _utc_now(),
+            'size': size,
+            'mtime': mtime,
+        }
+        if skipped:
+            entry['skipped'] = skipped
+        self.entries[file_key] = entry
+        self.skip_log.pop(file_key, None)
+        self._dirty = True
+
+    def touch(self, file_key: str, size: int, mtime: float) -> None:
+        """Update stat only (file rewritten, audio content unchanged - e.g. retagged)."""
+        entry = self.entries[file_key]
+        entry['size'] = size
+        entry['mtime'] = mtime
+        self._dirty = True
+
+    def skip(self, file_key: str, reason: str, size: int, mtime: float) -> None:
+        """Record a file that was not indexed, so it is not re-examined until it changes."""
+        self.entries.pop(file_key, None)
+        self.skip_log[file_key] = {
+            'reason': reason,
+            'skippedAt': _utc_now(),
+            'size': size,
+            'mtime': mtime,
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Persist manifest and skip log (no-op if nothing changed)."""
+        if not self._dirty:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        _save_json_atomic(self._path, self.entries)
+        _save_json_atomic(self._skip_path, self.skip_log)
+        self._dirty = False
+
+
+# ============================================================================
+# DECODE WORKER (runs in a separate process)
+# ============================================================================
+
+def read_track_metadata(path: Path, filename_fallback: bool = False) -> Dict[str, Any]:
+    """
+    Extract the tags sfp-cli stores with each song.
+
+    Args:
+        path: Audio file path
+        filename_fallback: Parse "Artist - Title" from the filename when tags are missing
+
+    Returns:
+        Metadata dict (title/artist are None if unavailable)
+    """
+    metadata = {
+        'title': None, 'artist': None, 'album': None, 'albumArtist': None,
+        'duration': None, 'trackNumber': None, 'discNumber': None,
+        'genre': None, 'year': None, 'isrc': None,
+        'originalFilepath': str(path),
+    }
+
+    from mutagen import File as MutagenFile  # Only needed by decode workers
+
+    try:
+        audio = MutagenFile(path)
+    except Exception as e:
+        logger.warning(f"Could not read metadata from {path}: {e}")
+        audio = None
+
+    if audio is not None:
+        if hasattr(audio.info, 'length'):
+            metadata['duration'] = round(audio.info.length, 2)
+
+        tags = getattr(audio, 'tags', None)
+        if tags:
+            def get_tag(names):
+                for name in names:
+                    if name in tags:
+                        val = tags[name]
+                        if isinstance(val, list) and val:
+                            return str(val[0])
+                        elif val:
+                            return str(val)
+                return None
+
+            def get_number(names):
+                value = get_tag(names)
+                try:
+                    return int(value.split('/')[0]) if value else None
+                except ValueError:
+                    return None
+
+            metadata['title'] = get_tag(['title', 'TITLE', 'TIT2'])
+            metadata['artist'] = get_tag(['artist', 'ARTIST', 'TPE1'])
+            metadata['album'] = get_tag(['album', 'ALBUM', 'TALB'])
+            metadata['albumArtist'] = get_tag(['albumartist', 'album_artist', 'ALBUMARTIST', 'TPE2'])
+            metadata['genre'] = get_tag(['genre', 'GENRE', 'TCON'])
+            metadata['year'] = get_tag(['date', 'DATE', 'year', 'YEAR', 'TDRC'])
+            metadata['isrc'] = get_tag(['isrc', 'ISRC', 'TSRC'])
+            metadata['trackNumber'] = get_number(['tracknumber', 'TRACKNUMBER', 'TRCK'])
+            metadata['discNumber'] = get_number(['discnumber', 'DISCNUMBER', 'TPOS'])
+
+    if filename_fallback and not (metadata['title'] and metadata['artist']):
+        # "01. Artist - Title" / "Artist - Title"
+        name = re.sub(r'^\d+[\.\-\s]+', '', path.stem)
+        if ' - ' in name:
+            artist, title = name.split(' - ', 1)
+            metadata['artist'] = metadata['artist'] or artist.strip()
+            metadata['title'] = metadata['title'] or title.strip()
+        else:
+            metadata['title'] = metadata['title'] or name
+
+    return metadata
+
+
+def _check_metadata(metadata: Dict[str, Any], required_tags: Tuple[str, ...]) -> Optional[str]:
+    """Return a skip reason if the file should not be indexed, else None."""
+    if not metadata['title'] or not metadata['artist']:
+        return "Missing required tags (artist or title)"
+
+    missing = [tag for tag in required_tags if not metadata.get(tag.lower())]
+    if missing:
+        return f"Missing required tags: {', '.join(missing)}"
+
+    duration = metadata['duration']
+    if duration and duration > MAX_DURATION_MINUTES * 60:
+        return f"Duration exceeds limit ({duration / 60:.1f} min > {MAX_DURATION_MINUTES} min)"
+    return None
+
+
+def decode_for_indexing(path_str: str, wav_path_str: Optional[str],
+                        filename_fallback: bool = False,
+                        required_tags: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """
+    Prepare one file for fingerprinting (process pool worker).
+
+    A single ffmpeg run decodes the file once and writes two outputs:
+    - the full track as 8 kHz mono WAV (what sfp-cli fingerprints)
+    - the first CONTENT_HASH_SECONDS as raw PCM on stdout (hashed for dedup,
+      byte-identical to the legacy compute_content_hash)
+
+    Args:
+        path_str: Source audio file
+        wav_path_str: Where to write the decoded WAV (None = metadata only, for dry runs)
+        filename_fallback: Parse filename when tags are missing
+        required_tags: Extra tags that must be present
+
+    Returns:
+        Dict with metadata, content_hash and wav_path, or skip_reason/error
+    """
+    path = Path(path_str)
+    metadata = read_track_metadata(path, filename_fallback)
+    result: Dict[str, Any] = {'metadata': metadata}
+
+    skip_reason = _check_metadata(metadata, required_tags)
+    if skip_reason:
+        result['skip_reason'] = skip_reason
+        return result
+    metadata['songId'] = normalize_song_id(metadata['artist'], metadata['title'])
+
+    if wav_path_str is None:
+        return result
+
+    pcm_args = ["-ac", "1", "-ar", str(INDEX_SAMPLE_RATE)]
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-i", path_str,
+        *pcm_args, "-f", "wav", "-y", wav_path_str,
+        "-t", str(CONTENT_HASH_SECONDS), *pcm_args, "-f", "s16le", "-",
+    ]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, timeout=DECODE_TIMEOUT)
+    except Exception as e:
+        result['error'] = f"Decode failed: {e}"
+        _remove_file(wav_path_str)  # ffmpeg may have left a partial file (timeout)
+        return result
+
+    if proc.returncode != 0:
+        stderr = proc.stderr.decode('utf-8', errors='replace').strip()
+        result['error'] = f"Decode failed: {stderr[-200:] or proc.returncode}"
+        _remove_file(wav_path_str)
+        return result
+
+    metadata['contentHash'] = hashlib.sha256(proc.stdout).hexdigest()[:16]
+    result['content_hash'] = metadata['contentHash']
+    result['wav_path'] = wav_path_str
+    return result
+
+
+# ============================================================================
+# DAEMON CONNECTION
+# ============================================================================
+
+class TcpDaemonClient:
+    """
+    Client for an already-running sfp-cli daemon (SyncLyrics starts it with --tcp).
+
+    Indexing through the app's daemon keeps its in-memory DB current, so no
+    reload is needed after the run.
+    """
+
+    def __init__(self, host: str = DAEMON_TCP_HOST, port: int = DAEMON_TCP_PORT):
+        self._host = host
+        self._port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def connect(self, timeout: float = 2.0) -> bool:
+        """Connect and wait for the {"status": "connected"} handshake."""
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self._host, self._port), timeout=timeout
+            )
+            handshake = await self._read_line(timeout=30)
+        except (OSError, asyncio.TimeoutError):
+            self.close()
+            return False
+
+        if not handshake or handshake.get('status') != 'connected':
+            self.close()
+            return False
+
+        logger.info(f"Indexer connected to running daemon ({handshake.get('songs', 0)} songs)")
+        return True
+
+    async def _read_line(self, timeout: float) -> Optional[dict]:
+        line = await asyncio.wait_for(self._reader.readline(), timeout=timeout)
+        if not line:
+            return None
+        # C# StreamWriter may prefix a UTF-8 BOM
+        return json.loads(line.decode('utf-8-sig').strip())
+
+    async def send_command(self, command: dict, timeout: Optional[float] = None) -> Optional[dict]:
+        """Send a command and wait for its response line."""
+        if self._writer is None:
+            return None
+        async with self._lock:
+            try:
+                self._writer.write((json.dumps(command) + "\n").encode('utf-8'))
+                await self._writer.drain()
+                return await self._read_line(timeout=timeout or BATCH_TIMEOUT)
+            except (OSError, asyncio.TimeoutError, json.JSONDecodeError) as e:
+                logger.error(f"Daemon TCP command failed ({command.get('cmd')}): {e}")
+                self.close()
+                return None
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+
+
+async def connect_daemon(db_path: Path) -> Tuple[Optional[Any], Optional[Callable[[], None]]]:
+    """
+    Get a daemon connection for indexing.
+
+    Prefers the running SyncLyrics daemon over TCP when db_path is the
+    configured database (the one that daemon serves); otherwise starts a
+    private sfp-cli daemon on db_path.
+
+    Returns:
+        (daemon, close) - daemon exposes async send_command(command, timeout=None)
+    """
+    from config import LOCAL_FINGERPRINT
+    if Path(db_path).resolve() == Path(LOCAL_FINGERPRINT["db_path"]).resolve():
+        tcp = TcpDaemonClient()
+        if await tcp.connect():
+            return tcp, tcp.close
+
+    from .local import LocalRecognizer
+    recognizer = LocalRecognizer(db_path=db_path)
+    daemon = recognizer._get_daemon()
+    if daemon is None or not await daemon.start():
+        logger.error("Could not start sfp-cli daemon for indexing")
+        return None, None
+    return daemon, recognizer.stop_daemon
+
+
+# ============================================================================
+# INDEXER
+# ============================================================================
+
+@dataclass
+class IndexJob:
+    """A file that needs (re)indexing."""
+    file_key: str
+    size: int
+    mtime: float
+    reason: str  # "new" or "modified"
+
+
+@dataclass
+class IndexProgress:
+    """Live counters for an indexing run."""
+    total: int = 0
+    unchanged: int = 0
+    queued: int = 0
+    decoded: int = 0
+    indexed: int = 0
+    skipped: int = 0
+    excluded: int = 0
+    failed: int = 0
+    started_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = time.time() - self.started_at
+        done = self.indexed + self.skipped + self.excluded + self.failed
+        return {
+            'total': self.total,
+            'unchanged': self.unchanged,
+            'queued': self.queued,
+            'decoded': self.decoded,
+            'indexed': self.indexed,
+            'skipped': self.skipped,
+            'excluded': self.excluded,
+            'failed': self.failed,
+            'elapsed': round(elapsed, 1),
+            'files_per_sec': round(done / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+
+def scan_library(folder: Path, extensions: Tuple[str, ...] = SUPPORTED_EXTENSIONS) -> Iterator[Tuple[str, int, float]]:
+    """
+    Walk a folder once, yielding (absolute path, size, mtime) for audio files.
+
+    Uses os.scandir so the stat comes with the directory listing on Windows
+    and the tree is walked once instead of once per extension.
+    """
+    extensions = tuple(ext.lower() for ext in extensions)
+    stack = [str(folder.absolute())]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.lower().endswith(extensions):
+                            st = entry.stat()
+                            yield entry.path, st.st_size, st.st_mtime
+                    except OSError as e:
+                        logger.debug(f"Skipping {entry.path}: {e}")
+        except OSError as e:
+            logger.warning(f"Cannot scan {current}: {e}")
+
+
+class LibraryIndexer:
+    """
+    Incremental, parallel builder for the local fingerprint database.
+
+    Features:
+    - Stat-based change detection against indexed_files.json
+    - Process-pool decoding (one ffmpeg run per file)
+    - Batches streamed to the daemon while decoding continues
+    - Manifest checkpoint after every batch (interrupted runs resume)
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, workers: Optional[int] = None,
+                 batch_size: int = BATCH_SIZE):
+        """
+        Initialize indexer.
+
+        Args:
+            db_path: Fingerprint database directory (default: from config)
+            workers: Decode processes (default: CPU count)
+            batch_size: Files per fingerprint-batch command
+        """
+        if db_path is None:
+            from config import LOCAL_FINGERPRINT
+            db_path = LOCAL_FINGERPRINT["db_path"]
+        self._db_path = Path(db_path)
+        self._workers = max(1, workers or os.cpu_count() or 4)
+        self._batch_size = max(1, batch_size)
+        self.progress = IndexProgress()
+
+    def plan(self, folder: Path, manifest: IndexManifest,
+             extensions: Tuple[str, ...] = SUPPORTED_EXTENSIONS) -> List[IndexJob]:
+        """
+        Scan a folder and return the files that need work.
+
+        Args:
+            folder: Library folder
+            manifest: Loaded manifest
+            extensions: Audio extensions to include
+
+        Returns:
+            Jobs for new or modified files
+        """
+        jobs = []
+        for file_key, size, mtime in scan_library(folder, extensions):
+            self.progress.total += 1
+            reason = manifest.classify(file_key, size, mtime)
+            if reason is None:
+                self.progress.unchanged += 1
+            else:
+                jobs.append(IndexJob(file_key, size, mtime, reason))
+        self.progress.queued = len(jobs)
+        return jobs
+
+    async def index_folder(self, folder: Path, daemon: Any = None, dry_run: bool = False,
+                           extensions: Tuple[str, ...] = SUPPORTED_EXTENSIONS,
+                           required_tags: Tuple[str, ...] = (),
+                           filename_fallback: bool = False,
+                           force_include: bool = False) -> Dict[str, Any]:
+        """
+        Bring the fingerprint DB up to date with a library folder.
+
+        Args:
+            folder: Library folder
+            daemon: Connected daemon with async send_command() (default: connect_daemon())
+            dry_run: Only report what would be indexed (reads tags, no decoding)
+            extensions: Audio extensions to include
+            required_tags: Extra tags that must be present (artist/title always required)
+            filename_fallback: Parse filename when tags are missing
+            force_include: Ignore exclude.json
+
+        Returns:
+            Summary dict (counts, indexed songs, errors)
+        """
+        folder = Path(folder)
+        self._db_path.mkdir(parents=True, exist_ok=True)
+        temp_dir = self._db_path / "temp"
+        temp_dir.mkdir(parents=True, exist_ok=True)
+
+        self.progress = IndexProgress()
+        manifest = IndexManifest(self._db_path)
+        exclusions = {} if force_include else _load_json(self._db_path / EXCLUDE_FILENAME)
+        results: Dict[str, Any] = {'songs': [], 'errors': [], 'skipped_files': [], 'excluded_files': []}
+
+        checkpoint_path = self._db_path / CHECKPOINT_FILENAME
+        checkpoint = _load_json(checkpoint_path)
+        if checkpoint and not dry_run:
+            logger.info(
+                f"Resuming interrupted index run from {checkpoint.get('startedAt')} "
+                f"({checkpoint.get('committed', 0)} files committed)"
+            )
+
+        jobs = self.plan(folder, manifest, extensions)
+        logger.info(
+            f"Indexer: {self.progress.total} files, {self.progress.unchanged} unchanged, "
+            f"{len(jobs)} to process ({self._workers} decode workers)"
+        )
+
+        if dry_run:
+            results['would_index'] = []
+        elif not jobs:
+            manifest.save()
+            results.update(self.progress.to_dict())
+            return results
+
+        own_daemon = None
+        if not dry_run:
+            if daemon is None:
+                daemon, own_daemon = await connect_daemon(self._db_path)
+                if daemon is None:
+                    return {'error': 'Daemon startup failed', **results, **self.progress.to_dict()}
+            _save_json_atomic(checkpoint_path, {
+                'folder': str(folder.absolute()),
+                'startedAt': checkpoint.get('startedAt') or _utc_now(),
+                'committed': checkpoint.get('committed', 0),
+            })
+
+        loop = asyncio.get_running_loop()
+        pool = ProcessPoolExecutor(max_workers=self._workers)
+        # Bound in-flight decodes so temp WAVs never pile up far ahead of the daemon
+        max_in_flight = max(self._workers * 2, self._batch_size * 2)
+        # Awaitable -> (job, pool future, temp WAV path)
+        in_flight: Dict[asyncio.Future, Tuple[IndexJob, Future, Optional[str]]] = {}
+        next_job = 0
+        ready: List[Tuple[IndexJob, Dict[str, Any]]] = []
+
+        try:
+            while next_job < len(jobs) or in_flight or ready:
+                while next_job < len(jobs) and len(in_flight) < max_in_flight:
+                    job = jobs[next_job]
+                    next_job += 1
+                    wav_path = None if dry_run else str(temp_dir / f"index_{next_job:06d}_{os.getpid()}.wav")
+                    pool_future = pool.submit(
+                        decode_for_indexing, job.file_key, wav_path,
+                        filename_fallback, tuple(required_tags),
+                    )
+                    in_flight[asyncio.wrap_future(pool_future, loop=loop)] = (job, pool_future, wav_path)
+
+                if in_flight:
+                    done, _ = await asyncio.wait(in_flight.keys(), return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        job = in_flight.pop(future)[0]
+                        try:
+                            prepared = future.result()
+                        except Exception as e:
+                            prepared = {'error': f"Decode worker failed: {e}"}
+                        self.progress.decoded += 1
+                        if self._accept(job, prepared, manifest, exclusions, results, dry_run):
+                            ready.append((job, prepared))
+
+                # Flush full batches, or whatever is left once decoding is finished
+                drained = next_job >= len(jobs) and not in_flight
+                while ready and (len(ready) >= self._batch_size or drained):
+                    batch, ready = ready[:self._batch_size], ready[self._batch_size:]
+                    if dry_run:
+                        results['would_index'].extend(
+                            {**{k: p['metadata'].get(k) for k in ('songId', 'artist', 'title', 'duration')},
+                             'filepath': j.file_key}
+                            for j, p in batch
+                        )
+                        continue
+                    await self._index_batch(daemon, batch, manifest, results)
+                    await daemon.send_command({"cmd": "save"})
+                    manifest.save()
+                    _save_json_atomic(checkpoint_path, {
+                        **_load_json(checkpoint_path),
+                        'committed': self.progress.indexed + self.progress.skipped + self.progress.failed,
+                    })
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            # Decodes that are still running write their WAV after we stop waiting:
+            # delete it when they finish (runs on the pool's thread, no event loop needed)
+            for _, pool_future, wav_path in in_flight.values():
+                if wav_path:
+                    pool_future.add_done_callback(lambda _, path=wav_path: _remove_file(path))
+            for _, prepared in ready:
+                self._remove_temp(prepared)
+            if not dry_run:
+                manifest.save()
+            if own_daemon is not None:
+                own_daemon()
+
+        if not dry_run:
+            try:
+                checkpoint_path.unlink()
+            except FileNotFoundError:
+                pass
+
+        results.update(self.progress.to_dict())
+        logger.info(f"Indexer finished: {self.progress.to_dict()}")
+        return results
+
+    def _accept(self, job: IndexJob, prepared: Dict[str, Any], manifest: IndexManifest,
+                exclusions: Dict[str, Any], results: Dict[str, Any], dry_run: bool) -> bool:
+        """
+        Handle a decoded file. Returns True if it should go to the daemon.
+        """
+        metadata = prepared.get('metadata') or {}
+
+        if prepared.get('skip_reason'):
+            self.progress.skipped += 1
+            results['skipped_files'].append({'filepath': job.file_key, 'reason': prepared['skip_reason']})
+            if not dry_run:
+                manifest.skip(job.file_key, prepared['skip_reason'], job.size, job.mtime)
+            return False
+
+        if prepared.get('error'):
+            self.progress.failed += 1
+            results['errors'].append({'file': job.file_key, 'error': prepared['error']})
+            return False
+
+        song_id = metadata['songId']
+        if exclusions and is_excluded(song_id, metadata['artist'], metadata['title'], exclusions):
+            self.progress.excluded += 1
+            results['excluded_files'].append({
+                'songId': song_id, 'artist': metadata['artist'], 'title': metadata['title'],
+                'filepath': job.file_key, 'reason': 'Excluded by ID or pattern',
+            })
+            self._remove_temp(prepared)
+            return False
+
+        if job.reason == "modified":
+            previous = manifest.entries.get(job.file_key, {})
+            if previous.get('contentHash') and previous.get('contentHash') == prepared.get('content_hash') \
+                    and previous.get('songId') == song_id:
+                # Rewritten but same audio and tags (e.g. touched or re-saved) - no re-fingerprint
+                self.progress.unchanged += 1
+                if not dry_run:
+                    manifest.touch(job.file_key, job.size, job.mtime)
+                self._remove_temp(prepared)
+                return False
+
+        metadata['originalFilepath'] = job.file_key
+        return True
+
+    async def _index_batch(self, daemon: Any, batch: List[Tuple[IndexJob, Dict[str, Any]]],
+                           manifest: IndexManifest, results: Dict[str, Any]) -> None:
+        """Fingerprint one batch of decoded files and record the outcome."""
+        try:
+            # Modified files replace their previous DB entry
+            for job, _ in batch:
+                if job.reason == "modified":
+                    old_id = manifest.entries.get(job.file_key, {}).get('songId')
+                    if old_id:
+                        await daemon.send_command({"cmd": "delete", "songId": old_id})
+
+            batch_start = time.time()
+            response = await daemon.send_command({
+                "cmd": "fingerprint-batch",
+                "files": [{"path": p['wav_path'], "metadata": p['metadata']} for _, p in batch],
+            }, timeout=BATCH_TIMEOUT)
+            batch_time = time.time() - batch_start
+        finally:
+            for _, prepared in batch:
+                self._remove_temp(prepared)
+
+        if not response or not response.get('success'):
+            error = (response or {}).get('error', 'No response from daemon')
+            logger.error(f"Indexer batch failed: {error}")
+            for job, _ in batch:
+                self.progress.failed += 1
+                results['errors'].append({'file': job.file_key, 'error': error})
+            return
+
+        batch_results = response.get('results') or []
+        if len(batch_results) != len(batch):
+            logger.warning(f"Indexer batch: daemon returned {len(batch_results)} results for {len(batch)} files")
+        for job, _ in batch[len(batch_results):]:
+            self.progress.failed += 1
+            results['errors'].append({'file': job.file_key, 'error': 'No result from daemon'})
+
+        for (job, prepared), result in zip(batch, batch_results):
+            metadata = prepared['metadata']
+            song_id = metadata['songId']
+            if result.get('success'):
+                self.progress.indexed += 1
+                manifest.record(job.file_key, song_id, prepared['content_hash'], job.size, job.mtime)
+                results['songs'].append({
+                    'song_id': song_id,
+                    'title': metadata['title'],
+                    'artist': metadata['artist'],
+                    'source': job.file_key,
+                    'fingerprints': result.get('fingerprints', 0),
+                })
+            elif result.get('skipped'):
+                reason = result.get('reason', 'Unknown')
+                self.progress.skipped += 1
+                results['skipped_files'].append({'filepath': job.file_key, 'reason': reason})
+                if 'already' in reason.lower() or 'duplicate' in reason.lower():
+                    manifest.record(job.file_key, song_id, prepared['content_hash'],
+                                    job.size, job.mtime, skipped=reason)
+            else:
+                self.progress.failed += 1
+                results['errors'].append({'file': job.file_key, 'error': result.get('error', 'Unknown error')})
+
+        logger.info(
+            f"Indexer batch: {len(batch)} files in {batch_time:.1f}s "
+            f"({self.progress.indexed} indexed, {self.progress.decoded}/{self.progress.queued} decoded)"
+        )
+
+    @staticmethod
+    def _remove_temp(prepared: Dict[str, Any]) -> None:
+        """Delete a decoded temp WAV."""
+        wav_path = prepared.get('wav_path')
+        if wav_path:
+            _remove_file(wav_path)
+
+
+def main() -> None:
+    """Command-line entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Incrementally index a music library into the local fingerprint DB")
+    parser.add_argument("folder", type=Path, help="Library folder to index")
+    parser.add_argument("--db-path", type=Path, default=None, help="Fingerprint database directory")
+    parser.add_argument("--workers", type=int, default=None, help="Decode worker processes (default: CPU count)")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be indexed")
+    parser.add_argument("--require-tags", default="", help="Comma-separated extra required tags")
+    parser.add_argument("--filename-fallback", action="store_true", help="Parse filename when tags are missing")
+    parser.add_argument("--force", action="store_true", help="Ignore exclusion list")
+    args = parser.parse_args()
+
+    indexer = LibraryIndexer(db_path=args.db_path, workers=args.workers)
+    results = asyncio.run(indexer.index_folder(
+        args.folder,
+        dry_run=args.dry_run,
+        required_tags=tuple(t.strip() for t in args.require_tags.split(",") if t.strip()),
+        filename_fallback=args.filename_fallback,
+        force_include=args.force,
+    ))
+    print(json.dumps({k: v for k, v in results.items() if k not in ('songs', 'would_index')}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
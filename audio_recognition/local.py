@@ -12,11 +12,12 @@ import json
 import subprocess
 import sys
 import tempfile
-import wave
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 from logging_config import get_logger
+from metrics import timed
 from .shazam import RecognitionResult
 from .capture import AudioChunk
 from .daemon import DaemonManager
@@ -328,13 +329,91 @@ class LocalRecognizer:
         except Exception as e:
             return {"error": str(e)}
     
+    async def _query(self, audio: AudioChunk, wav_bytes: Optional[bytes] = None) -> Tuple[Dict[str, Any], float]:
+        """
+        Run an sfp-cli query for an audio chunk.
+        
+        Args:
+            audio: AudioChunk to query
+            wav_bytes: Optional pre-encoded WAV bytes (written as-is to skip re-encoding)
+            
+        Returns:
+            Tuple of (raw sfp-cli result dict, query time in seconds)
+        """
+        # Write AudioChunk to WAV file for sfp-cli
+        # Reuse the WAV already encoded for this cycle (memoized on the chunk otherwise)
+        # Standard WAV is fine - FFmpegAudioService will handle conversion to 5512Hz mono
+        wav_bytes = wav_bytes or audio.to_wav()
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as wav_file:
+            wav_path = Path(wav_file.name)
+            wav_file.write(wav_bytes)
+        
+        # NOTE: FFmpegAudioService now handles format conversion internally
+        # Old FFmpeg conversion code commented out for reference:
+        # with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as sfp_file:
+        #     sfp_path = Path(sfp_file.name)
+        # creationflags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+        # ffmpeg_result = subprocess.run(
+        #     ["ffmpeg", "-i", str(raw_path)] + self.FFMPEG_ARGS + [str(sfp_path), "-y"],
+        #     capture_output=True,
+        #     timeout=10,
+        #     creationflags=creationflags
+        # )
+        # raw_path.unlink()
+        # if ffmpeg_result.returncode != 0:
+        #     logger.warning("FFmpeg conversion failed for local recognition")
+        #     sfp_path.unlink()
+        #     return None
+        
+        # Query sfp-cli (async to not block event loop)
+        # FFmpegAudioService handles the downsampling to 5512Hz mono internally
+        duration = int(audio.duration)
+        query_start = time.time()
+        try:
+            with timed("local_fp_query_seconds"):
+                result = await self._run_cli_command_async("query", str(wav_path), str(duration), "0")
+        finally:
+            # Clean up temp file
+            wav_path.unlink()
+        return result, time.time() - query_start
+    
+    def _build_result(self, best: Dict[str, Any], audio: AudioChunk, recognition_time: float) -> RecognitionResult:
+        """Build a RecognitionResult from one sfp-cli match."""
+        # CRITICAL: Adjust capture_start_time for buffered audio
+        # queryMatchStartsAt tells us where in OUR QUERY the match was found
+        # This allows correct latency compensation when using rolling buffer
+        query_match_offset = best.get("queryMatchStartsAt", 0)
+        adjusted_capture_start = audio.capture_start_time + query_match_offset
+        
+        return RecognitionResult(
+            title=best.get("title", "Unknown"),
+            artist=best.get("artist", "Unknown"),
+            offset=float(best.get("trackMatchStartsAt", 0)),
+            capture_start_time=adjusted_capture_start,  # Adjusted for buffer
+            recognition_time=recognition_time,
+            confidence=best.get("confidence", 0),
+            time_skew=0.0,
+            frequency_skew=0.0,
+            track_id=best.get("songId"),
+            album=best.get("album"),
+            album_art_url=None,  # Will be enriched later
+            isrc=best.get("isrc"),  # Now provided by sfp-cli
+            shazam_url=None,
+            spotify_url=None,
+            background_image_url=None,
+            genre=best.get("genre"),  # Now provided by sfp-cli
+            shazam_lyrics_text=None,
+            recognition_provider="local_fingerprint",
+            duration=best.get("duration")
+        )
+    
     async def recognize(self, audio: AudioChunk, wav_bytes: Optional[bytes] = None) -> Optional[RecognitionResult]:
         """
         Recognize audio against local fingerprint database.
         
         Args:
             audio: AudioChunk with capture timing info
-            wav_bytes: Optional WAV bytes (not used - we convert AudioChunk directly)
+            wav_bytes: Optional pre-encoded WAV bytes (written as-is to skip re-encoding)
             
         Returns:
             RecognitionResult or None if no match
@@ -347,43 +426,9 @@ class LocalRecognizer:
         try:
             # Write AudioChunk to WAV file for sfp-cli
             # FFmpegAudioService handles downsampling internally, so we just need standard WAV
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as wav_file:
-                wav_path = Path(wav_file.name)
-                
-                # Write standard WAV (FFmpegAudioService will handle conversion to 5512Hz mono)
-                with wave.open(str(wav_path), 'wb') as wf:
-                    wf.setnchannels(audio.channels)
-                    wf.setsampwidth(2)  # int16
-                    wf.setframerate(audio.sample_rate)
-                    wf.writeframes(audio.data.tobytes())
-            
-            # NOTE: FFmpegAudioService now handles format conversion internally
-            # Old FFmpeg conversion code commented out for reference:
-            # with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as sfp_file:
-            #     sfp_path = Path(sfp_file.name)
-            # creationflags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
-            # ffmpeg_result = subprocess.run(
-            #     ["ffmpeg", "-i", str(raw_path)] + self.FFMPEG_ARGS + [str(sfp_path), "-y"],
-            #     capture_output=True,
-            #     timeout=10,
-            #     creationflags=creationflags
-            # )
-            # raw_path.unlink()
-            # if ffmpeg_result.returncode != 0:
-            #     logger.warning("FFmpeg conversion failed for local recognition")
-            #     sfp_path.unlink()
-            #     return None
-            
-            # Query sfp-cli (async to not block event loop)
-            # FFmpegAudioService handles the downsampling to 5512Hz mono internally
-            duration = int(audio.duration)
-            query_start = time.time()
-            result = await self._run_cli_command_async("query", str(wav_path), str(duration), "0")
-            query_time = time.time() - query_start
-            
-            # Clean up temp file
-            wav_path.unlink()
-
+            # Reuse the WAV already encoded for this cycle (memoized on the chunk otherwise)
+            # Standard WAV is fine - FFmpegAudioService will handle conversion to 5512Hz mono
+            result, query_time = await self._query(audio, wav_bytes)
             
             recognition_time = time.time()
             
@@ -393,7 +438,7 @@ class LocalRecognizer:
                 if self._no_match_count == 1 or self._no_match_count % 4 == 0:
                     logger.info(f"Local FP: No match (attempt #{self._no_match_count}) | Audio: {audio.duration:.1f}s | Query: {query_time:.2f}s")
                 else:
-                    logger.debug(f"Local FP: No match (attempt #{self._no_match_count}) | Audio: {audio.duration:.1f}s | Query: {query_time:.2f}s")
+                    logger.debug("Local FP: No match (attempt #%d) | Audio: %.1fs | Query: %.2fs", self._no_match_count, audio.duration, query_time)
                 return None
             
             # Extract best match from multi-match response format
@@ -433,14 +478,14 @@ class LocalRecognizer:
                     sorted_by_confidence = sorted(matches, key=lambda m: m.get("confidence", 0), reverse=True)
                     best = sorted_by_confidence[0]
                     selection_reason = "highest confidence (multi-match disabled)"
-                    logger.debug(f"Multi-match disabled: using highest confidence ({len(matches)} candidates)")
+                    logger.debug("Multi-match disabled: using highest confidence (%d candidates)", len(matches))
             else:
                 # Single match or backward compatibility
                 best = result.get("bestMatch", result)
                 selection_reason = "single match"
             
             # Debug log with query stats
-            logger.debug(f"Local query stats: Audio: {audio.duration:.1f}s | Query: {query_time:.2f}s | Matches: {len(matches)}")
+            logger.debug("Local query stats: Audio: %.1fs | Query: %.2fs | Matches: %d", audio.duration, query_time, len(matches))
             
             # Check confidence thresholds
             confidence = best.get("confidence", 0)
@@ -474,35 +519,9 @@ class LocalRecognizer:
                 # for low confidence matches via Reaper validation or multi-match
             
             # Build RecognitionResult from best match
-            track_offset = best.get("trackMatchStartsAt", 0)
-            
-            # CRITICAL: Adjust capture_start_time for buffered audio
-            # queryMatchStartsAt tells us where in OUR QUERY the match was found
-            # This allows correct latency compensation when using rolling buffer
+            recognition = self._build_result(best, audio, recognition_time)
+            track_offset = recognition.offset
             query_match_offset = best.get("queryMatchStartsAt", 0)
-            adjusted_capture_start = audio.capture_start_time + query_match_offset
-            
-            recognition = RecognitionResult(
-                title=best.get("title", "Unknown"),
-                artist=best.get("artist", "Unknown"),
-                offset=float(track_offset),
-                capture_start_time=adjusted_capture_start,  # Adjusted for buffer
-                recognition_time=recognition_time,
-                confidence=confidence,
-                time_skew=0.0,
-                frequency_skew=0.0,
-                track_id=best.get("songId"),
-                album=best.get("album"),
-                album_art_url=None,  # Will be enriched later
-                isrc=best.get("isrc"),  # Now provided by sfp-cli
-                shazam_url=None,
-                spotify_url=None,
-                background_image_url=None,
-                genre=best.get("genre"),  # Now provided by sfp-cli
-                shazam_lyrics_text=None,
-                recognition_provider="local_fingerprint",
-                duration=best.get("duration")
-            )
             
             latency = recognition.get_latency()
             current_pos = recognition.get_current_position()
@@ -529,6 +548,70 @@ class LocalRecognizer:
             logger.error(f"Local recognition failed: {e}")
             return None
     
+    async def verify(self, audio: AudioChunk, song_id: str, expected_position: Optional[float],
+                     tolerance: float, wav_bytes: Optional[bytes] = None) -> Tuple[str, Optional[RecognitionResult]]:
+        """
+        Cheap "still the same song?" check used by the engine's stable tracking state.
+        
+        Only looks for the expected song (and position) among the daemon's matches -
+        no multi-match selection, no remote services.
+        
+        Args:
+            audio: Latest capture
+            song_id: Expected local songId
+            expected_position: Expected current position (None = don't check position)
+            tolerance: Allowed position drift in seconds
+            wav_bytes: Optional pre-encoded WAV bytes
+            
+        Returns:
+            ("confirmed", result) - expected song found near the expected position
+            ("mismatch", None)    - another song matched confidently, or the position jumped (seek)
+            ("no_match", None)    - nothing usable matched
+        """
+        if not self.is_available():
+            return "no_match", None
+        
+        try:
+            result, query_time = await self._query(audio, wav_bytes)
+        except Exception as e:
+            logger.debug(f"Local verify failed: {e}")
+            return "no_match", None
+        
+        if not result.get("matched"):
+            return "no_match", None
+        
+        from config import LOCAL_FINGERPRINT
+        reject_threshold = LOCAL_FINGERPRINT.get("reject_threshold")
+        recognition_time = time.time()
+        candidates = result.get("matches") or [result.get("bestMatch", result)]
+        
+        position_jump = False
+        for match in candidates:
+            if match.get("songId") != song_id or match.get("confidence", 0) < reject_threshold:
+                continue
+            recognition = self._build_result(match, audio, recognition_time)
+            current_pos = recognition.get_current_position()
+            if expected_position is not None and abs(current_pos - expected_position) > tolerance:
+                position_jump = True
+                continue
+            
+            if hasattr(self, '_position_tracker') and self._position_tracker:
+                self._position_tracker.update(current_pos, song_id)
+            logger.debug(
+                f"Local verify: confirmed {recognition.artist} - {recognition.title} | "
+                f"Current: {current_pos:.1f}s | Query: {query_time:.2f}s"
+            )
+            return "confirmed", recognition
+        
+        best = max(candidates, key=lambda m: m.get("confidence", 0))
+        if position_jump or best.get("confidence", 0) >= self._min_confidence:
+            logger.debug(
+                f"Local verify: mismatch (expected {song_id}, best {best.get('songId')}, "
+                f"position jump: {position_jump})"
+            )
+            return "mismatch", None
+        return "no_match", None
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
         return self._run_cli_command_sync("stats")
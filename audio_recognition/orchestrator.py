@@ -0,0 +1,176 @@
+"""
+Recognition Orchestrator Module
+
+Runs the recognition services (Local FP, ShazamIO, ACRCloud) as hedged stages
+instead of a strict cascade. Each stage starts when either every earlier stage
+has finished without a result, or its hedge delay (seconds since the cycle
+started) has elapsed - whichever comes first.
+
+The first stage to return a validated RecognitionResult wins. Remaining stages
+are cancelled (or left to drain, for stages that must not be interrupted).
+
+Modes (see RECOGNITION_HEDGING in config.py):
+- "sequential": Old cascade behavior - a stage only starts after the previous one missed
+- "hedged":     Remote stages also start after their hedge delay, even if earlier ones are still running
+- "parallel":   All stages start immediately
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
+
+from logging_config import get_logger
+from .shazam import RecognitionResult
+
+logger = get_logger(__name__)
+
+VALID_MODES = ("sequential", "hedged", "parallel")
+
+
+@dataclass
+class RecognitionStage:
+    """
+    A single recognition service taking part in a hedged cycle.
+
+    Attributes:
+        name: Service name for logging ("local_fingerprint", "shazam", "acrcloud")
+        run: Zero-arg coroutine factory returning a validated result or None
+        delay: Hedge delay in seconds from cycle start (None = only after earlier stages miss)
+        can_start: Optional gate checked right before launching (e.g. ACRCloud quota/cooldown)
+        cancellable: If False, the stage is left to finish in the background when it loses
+                     (Local FP must not be cancelled mid-transaction with the sfp-cli daemon)
+    """
+    name: str
+    run: Callable[[], Awaitable[Optional[RecognitionResult]]]
+    delay: Optional[float] = None
+    can_start: Optional[Callable[[], bool]] = None
+    cancellable: bool = True
+
+
+def get_hedging_config() -> dict:
+    """Lazy load hedging config to avoid circular imports."""
+    from config import RECOGNITION_HEDGING
+    return RECOGNITION_HEDGING
+
+
+def resolve_stage_delay(mode: str, configured_delay: float) -> Optional[float]:
+    """
+    Map the orchestration mode to the effective hedge delay for a remote stage.
+
+    Args:
+        mode: "sequential", "hedged" or "parallel"
+        configured_delay: Hedge delay from config (seconds)
+
+    Returns:
+        Delay in seconds, or None if the stage should only start after earlier stages miss
+    """
+    if mode == "parallel":
+        return 0.0
+    if mode == "hedged":
+        return max(0.0, configured_delay)
+    return None
+
+
+class RecognitionOrchestrator:
+    """
+    Runs recognition stages with hedged start times.
+
+    Features:
+    - First validated result wins, losers are cancelled
+    - Per-stage start gates (ACRCloud quota is checked before launching, not after)
+    - Non-cancellable stages drain in the background instead of being interrupted
+    """
+
+    def __init__(self):
+        """Initialize orchestrator."""
+        # Keep references to drained stages so they are not garbage collected mid-flight
+        self._draining: set = set()
+
+    async def run(self, stages: List[RecognitionStage]) -> Optional[RecognitionResult]:
+        """
+        Run stages until one returns a result or all have finished.
+
+        Args:
+            stages: Stages in priority order
+
+        Returns:
+            Winning RecognitionResult, or None if every stage missed
+        """
+        loop = asyncio.get_running_loop()
+        cycle_start = loop.time()
+        pending: dict = {}  # task -> stage
+        next_index = 0
+
+        try:
+            while next_index < len(stages) or pending:
+                # Launch the next stage if earlier stages are done or its hedge delay elapsed
+                if next_index < len(stages):
+                    stage = stages[next_index]
+                    elapsed = loop.time() - cycle_start
+                    due = stage.delay is not None and elapsed >= stage.delay
+
+                    if not pending or due:
+                        next_index += 1
+                        if stage.can_start is not None and not stage.can_start():
+                            logger.debug(f"Orchestrator: {stage.name} skipped (start gate closed)")
+                            continue
+                        if pending:
+                            logger.debug(f"Orchestrator: hedging {stage.name} after {elapsed:.2f}s")
+                        task = asyncio.create_task(stage.run())
+                        pending[task] = stage
+                        continue
+
+                    # Wait until the next stage becomes due (or something finishes first)
+                    timeout = None if stage.delay is None else max(0.0, stage.delay - elapsed)
+                else:
+                    timeout = None
+
+                done, _ = await asyncio.wait(
+                    pending.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    stage = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except asyncio.CancelledError:
+                        continue
+                    except Exception as e:
+                        logger.warning(f"Orchestrator: {stage.name} failed: {e}")
+                        continue
+
+                    if result:
+                        total = loop.time() - cycle_start
+                        losers = [s.name for s in pending.values()]
+                        if losers:
+                            logger.debug(
+                                f"Orchestrator: {stage.name} won after {total:.2f}s, "
+                                f"cancelling {', '.join(losers)}"
+                            )
+                        return result
+
+            return None
+        finally:
+            # Cancel (or drain) every stage still in flight - also runs if we are cancelled
+            self._abandon(pending)
+
+    def _abandon(self, pending: dict) -> None:
+        """Cancel losing stages, or let non-cancellable ones finish in the background."""
+        for task, stage in pending.items():
+            if stage.cancellable:
+                task.cancel()
+            else:
+                self._draining.add(task)
+                task.add_done_callback(self._on_drained)
+
+    def _on_drained(self, task: asyncio.Task) -> None:
+        """Release a drained stage and swallow its outcome."""
+        self._draining.discard(task)
+        if not task.cancelled():
+            # Retrieve exception so asyncio does not log "exception was never retrieved"
+            task.exception()
+
+    @property
+    def draining_count(self) -> int:
+        """Number of abandoned non-cancellable stages still running."""
+        return len(self._draining)
@@ -2,19 +2,16 @@
 Shazam Recognition Module
 
 Handles song recognition via ShazamIO with latency-compensated results.
-Uses stdlib wave module for audio conversion (no FFmpeg/pydub dependency).
+Uses the NumPy audio-prep stage for WAV conversion (no FFmpeg/pydub dependency).
 """
 
-import io
+import asyncio
 import json
 import struct
 import time
-import wave
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Dict, Any
-
-import numpy as np
+from typing import Optional, Dict, Any, Tuple
 
 try:
     from shazamio import Shazam
@@ -35,6 +32,10 @@ FREQSKEW_REJECT_THRESHOLD = 0.019   # Reject if abs(frequencyskew) > 1%
 # Set to True only if you experience recognition issues with 48kHz audio
 ENABLE_RESAMPLING = False
 
+# Downmix to mono before encoding - Shazam, ACRCloud and SFP all fingerprint mono audio,
+# so stereo only doubles the upload/temp file size
+ENABLE_DOWNMIX = True
+
 
 @dataclass
 class RecognitionResult:
@@ -161,10 +162,11 @@ class ShazamRecognizer:
     Handles song recognition via ShazamIO with ACRCloud fallback.
     
     Features:
-    - Converts audio using stdlib wave (no FFmpeg dependency)
+    - Converts audio via shared audio-prep stage (no FFmpeg dependency)
     - Automatic latency compensation in results
     - Silence detection to avoid unnecessary API calls
     - ACRCloud fallback when Shazamio fails (if configured)
+    - Hedged service orchestration (Local FP -> Shazam -> ACRCloud, first result wins)
     """
     
     MIN_AUDIO_LEVEL = 100  # Minimum amplitude for valid audio
@@ -172,7 +174,10 @@ class ShazamRecognizer:
     def __init__(self):
         """Initialize Shazam client and optional ACRCloud fallback."""
         self._no_match_count = 0  # For throttled logging
-        self._wav_bytes_cache: bytes = b''  # Cache WAV for ACRCloud fallback
+        
+        # Hedged orchestration of Local FP / Shazam / ACRCloud (see orchestrator.py)
+        from .orchestrator import RecognitionOrchestrator
+        self._orchestrator = RecognitionOrchestrator()
         
         if Shazam is None:
             logger.error("shazamio not installed. Song recognition unavailable.")
@@ -284,6 +289,10 @@ class ShazamRecognizer:
         """
         Recognize a song from an audio chunk.
         
+        Services run as hedged stages (see orchestrator.py): Local FP starts
+        immediately, ShazamIO and ACRCloud start when earlier services miss or
+        after their hedge delay. The first validated result wins.
+        
         Args:
             audio: AudioChunk from capture (may be combined buffer or single capture)
             buffer_config: Optional buffer configuration dict with:
@@ -328,34 +337,123 @@ class ShazamRecognizer:
         # Save debug audio EARLY - before any recognition, so we always capture it
         # Always save single capture, optionally also save buffered version
         try:
-            single_wav_bytes = self._convert_to_wav(audio)
-            self._save_debug_audio(single_wav_bytes, is_buffered=False)  # last_recognition_audio.wav
+            self._save_debug_audio(self._convert_to_wav(audio), is_buffered=False)  # last_recognition_audio.wav
             
             if buffered_audio:
-                buffered_wav_bytes = self._convert_to_wav(buffered_audio)
-                self._save_debug_audio(buffered_wav_bytes, is_buffered=True)  # last_recognition_audio_buffer.wav
+                self._save_debug_audio(self._convert_to_wav(buffered_audio), is_buffered=True)  # last_recognition_audio_buffer.wav
         except Exception as e:
             logger.debug(f"Failed to save debug audio: {e}")
         
-        # 1. Try LOCAL FINGERPRINT FIRST (instant, offline, zero cost)
+        # Build hedged stages in priority order
+        from .orchestrator import RecognitionStage, get_hedging_config, resolve_stage_delay, VALID_MODES
+        
+        hedging = get_hedging_config()
+        mode = hedging.get("mode", "hedged")
+        if mode not in VALID_MODES:
+            mode = "sequential"
+        
+        stages = []
+        
+        # 1. LOCAL FINGERPRINT FIRST (instant, offline, zero cost)
         if self._local and self._local.is_available():
-            try:
-                local_result = await self._local.recognize(local_audio)
-                if local_result:
-                    logger.info(f"Local FP recognized match: {local_result.artist} - {local_result.title}")
-                    self._no_match_count = 0
-                    return local_result
-                logger.debug("Local: No match, falling back to ShazamIO")
-            except Exception as e:
-                logger.warning(f"Local recognition error: {e}")
-        
-        # 2. Try ShazamIO (cloud)
+            stages.append(RecognitionStage(
+                name="local_fingerprint",
+                run=lambda: self._recognize_local(local_audio, self._convert_to_wav(local_audio)),
+                delay=0.0,
+                # Cancelling mid-query would desync the daemon's request/response pairing
+                cancellable=False,
+            ))
+        
+        # 2. ShazamIO (cloud)
+        stages.append(RecognitionStage(
+            name="shazam",
+            run=lambda: self._recognize_shazam(shazam_audio, self._convert_to_wav(shazam_audio), audio),
+            delay=resolve_stage_delay(mode, hedging.get("shazam_delay", 1.0)),
+        ))
+        
+        # 3. ACRCloud (quota-limited fallback) - gate checks daily limit/cooldown before launching
+        if self._acrcloud and self._acrcloud.is_available():
+            stages.append(RecognitionStage(
+                name="acrcloud",
+                run=lambda: self._acrcloud.recognize(acrcloud_audio, self._convert_to_wav(acrcloud_audio)),
+                delay=resolve_stage_delay(mode, hedging.get("acrcloud_delay", 4.0)),
+                can_start=lambda: self._acrcloud._can_make_request()[0],
+            ))
+        
+        result = await self._orchestrator.run(stages)
+        if result:
+            self._no_match_count = 0
+        return result
+    
+    async def _recognize_local(self, audio: AudioChunk, wav_bytes: bytes) -> Optional[RecognitionResult]:
+        """
+        Recognition stage: Local fingerprint database.
+        
+        Returns:
+            RecognitionResult or None if no match
+        """
         try:
-            # Convert to WAV bytes
-            wav_bytes = self._convert_to_wav(shazam_audio)
+            local_result = await self._local.recognize(audio, wav_bytes)
+            if local_result:
+                logger.info(f"Local FP recognized match: {local_result.artist} - {local_result.title}")
+                return local_result
+            logger.debug("Local: No match")
+        except Exception as e:
+            logger.warning(f"Local recognition error: {e}")
+        return None
+    
+    async def verify_current_song(self, audio: AudioChunk, expected: RecognitionResult,
+                                  expected_position: Optional[float], tolerance: float) -> Tuple[str, Optional[RecognitionResult]]:
+        """
+        Cheap same-song check for the engine's stable tracking state (Local FP only).
+        
+        Args:
+            audio: Latest capture
+            expected: Currently tracked song
+            expected_position: Expected current position in seconds
+            tolerance: Allowed position drift in seconds
             
-            # Note: Debug audio is saved earlier (before Local FP) so it always captures
+        Returns:
+            ("confirmed", result), ("mismatch", None), ("no_match", None), or
+            ("unavailable", None) when Local FP can't answer for this song
+        """
+        if not self._local or not self._local.is_available():
+            return "unavailable", None
+        
+        is_local = expected.recognition_provider == "local_fingerprint" and expected.track_id
+        if is_local:
+            song_id = expected.track_id
+        else:
+            from system_utils.helpers import _normalize_track_id
+            song_id = _normalize_track_id(expected.artist, expected.title)
+        
+        try:
+            status, result = await self._local.verify(audio, song_id, expected_position, tolerance)
+        except Exception as e:
+            logger.debug(f"Local verify error: {e}")
+            return "unavailable", None
+        
+        # Song identified by a remote service may simply not be in the local library
+        if status == "no_match" and not is_local:
+            return "unavailable", None
+        return status, result
+    
+    async def _recognize_shazam(self, shazam_audio: AudioChunk, wav_bytes: bytes, audio: AudioChunk) -> Optional[RecognitionResult]:
+        """
+        Recognition stage: ShazamIO.
+        
+        Matches with excessive time/frequency skew are rejected (returns None),
+        which lets the orchestrator move on to ACRCloud.
+        
+        Args:
+            shazam_audio: Audio sent to Shazam (single capture or buffer)
+            wav_bytes: Pre-encoded WAV for shazam_audio
+            audio: Single capture (its start time anchors the latency compensation)
             
+        Returns:
+            RecognitionResult or None if no match/rejected
+        """
+        try:
             logger.debug(f"Sending to ShazamIO ({len(wav_bytes) / 1024:.1f} KB)...")
             
             # Call ShazamIO
@@ -370,26 +468,12 @@ class ShazamRecognizer:
                     logger.info(f"Shazamio: No matches found (attempt #{self._no_match_count})")
                 else:
                     logger.debug(f"Shazamio: No matches found (attempt #{self._no_match_count})")
-                
-                # Try ACRCloud fallback if available
-                if self._acrcloud and self._acrcloud.is_available():
-                    logger.debug("Trying ACRCloud fallback...")
-                    acrcloud_wav = self._convert_to_wav(acrcloud_audio)
-                    acrcloud_result = await self._acrcloud.recognize(acrcloud_audio, acrcloud_wav)
-                    if acrcloud_result:
-                        self._no_match_count = 0  # Reset on ACRCloud success
-                        return acrcloud_result
-                    logger.debug("ACRCloud fallback: No match")
-                
                 return None
             
             # Extract track info
             track = result.get('track', {})
             match = result['matches'][0]
             
-            # Reset no-match counter on successful match
-            self._no_match_count = 0
-            
             # Extract core fields - keep artist name as-is from Shazam
             title = track.get('title', 'Unknown')
             artist = track.get('subtitle', 'Unknown')
@@ -443,19 +527,12 @@ class ShazamRecognizer:
             freq_skew_val = match.get('frequencyskew', 0.0)
             
             # Quality check: Reject matches with high skew values (likely false positives)
-            # If rejected, ACRCloud fallback will be attempted
+            # If rejected, the orchestrator moves on to ACRCloud
             if abs(time_skew_val) > TIMESKEW_REJECT_THRESHOLD:
                 logger.warning(
                     f"Shazamio: REJECTED - timeskew {time_skew_val:.6f} exceeds threshold "
                     f"({TIMESKEW_REJECT_THRESHOLD}) for '{artist} - {title}'"
                 )
-                # Try ACRCloud fallback
-                if self._acrcloud and self._acrcloud.is_available():
-                    logger.info("Trying ACRCloud fallback after skew rejection...")
-                    acrcloud_wav = self._convert_to_wav(acrcloud_audio)
-                    acrcloud_result = await self._acrcloud.recognize(acrcloud_audio, acrcloud_wav)
-                    if acrcloud_result:
-                        return acrcloud_result
                 return None
             
             if abs(freq_skew_val) > FREQSKEW_REJECT_THRESHOLD:
@@ -463,15 +540,11 @@ class ShazamRecognizer:
                     f"Shazamio: REJECTED - frequencyskew {freq_skew_val:.6f} exceeds threshold "
                     f"({FREQSKEW_REJECT_THRESHOLD}) for '{artist} - {title}'"
                 )
-                # Try ACRCloud fallback
-                if self._acrcloud and self._acrcloud.is_available():
-                    logger.info("Trying ACRCloud fallback after skew rejection...")
-                    acrcloud_wav = self._convert_to_wav(acrcloud_audio)
-                    acrcloud_result = await self._acrcloud.recognize(acrcloud_audio, acrcloud_wav)
-                    if acrcloud_result:
-                        return acrcloud_result
                 return None
             
+            # Reset no-match counter on successful match
+            self._no_match_count = 0
+            
             # Build result with latency compensation and all metadata
             recognition = RecognitionResult(
                 title=title,
@@ -496,15 +569,13 @@ class ShazamRecognizer:
             
             latency = recognition.get_latency()
             current_pos = recognition.get_current_position()
-            time_skew = match.get('timeskew', 0.0)
-            freq_skew = match.get('frequencyskew', 0.0)
             
             logger.info(
                 f"Shazam Recognized: {artist} - {title} | "
                 f"Offset: {offset:.1f}s | "
                 f"Latency: {latency:.1f}s | "
                 f"Current: {current_pos:.1f}s | "
-                f"Skew: t={time_skew:.6f}, f={freq_skew:.4f}"
+                f"Skew: t={time_skew_val:.6f}, f={freq_skew_val:.4f}"
             )
             
             # Save last match to cache for debugging
@@ -512,16 +583,21 @@ class ShazamRecognizer:
             
             return recognition
             
+        except asyncio.CancelledError:
+            logger.debug("Shazamio request cancelled (another service won)")
+            raise
         except Exception as e:
             logger.error(f"Recognition failed: {e}")
             return None
     
     def _convert_to_wav(self, audio: AudioChunk) -> bytes:
         """
-        Convert AudioChunk to WAV bytes using stdlib wave module.
+        Convert AudioChunk to WAV bytes via the shared audio-prep stage.
         
-        This avoids the FFmpeg/pydub dependency entirely.
-        Resamples to 44100 Hz if needed (ShazamIO works better with 44.1kHz).
+        Downmixes to mono (all services downmix internally anyway) and optionally
+        resamples to 44100 Hz with a cached polyphase filter. The result is
+        memoized on the chunk, so Local FP, Shazam, ACRCloud and debug output
+        share a single encode.
         
         Args:
             audio: AudioChunk to convert
@@ -531,66 +607,11 @@ class ShazamRecognizer:
         """
         TARGET_SAMPLE_RATE = 44100
         
-        audio_data = audio.data
-        sample_rate = audio.sample_rate
-        channels = audio.channels
-        
         # Resample to 44100 Hz if needed (WASAPI devices often return 48000 Hz)
         # NOTE: ShazamIO internally downsamples to 16kHz, so this step is optional
         # Set ENABLE_RESAMPLING = True at module level if you experience issues
-        if ENABLE_RESAMPLING and sample_rate != TARGET_SAMPLE_RATE:
-            try:
-                # Try scipy for high-quality resampling
-                from scipy import signal
-                
-                # Calculate new length
-                num_samples = len(audio_data) if audio_data.ndim == 1 else audio_data.shape[0]
-                new_num_samples = int(num_samples * TARGET_SAMPLE_RATE / sample_rate)
-                
-                # Resample (scipy returns float64)
-                if audio_data.ndim == 1:
-                    resampled = signal.resample(audio_data, new_num_samples)
-                    # Clip to int16 range to prevent overflow, then convert
-                    audio_data = np.clip(resampled, -32768, 32767).astype(np.int16)
-                else:
-                    # Stereo: resample each channel separately
-                    resampled = np.zeros((new_num_samples, channels), dtype=np.float64)
-                    for ch in range(channels):
-                        resampled[:, ch] = signal.resample(audio_data[:, ch], new_num_samples)
-                    # Clip to int16 range to prevent overflow, then convert
-                    audio_data = np.clip(resampled, -32768, 32767).astype(np.int16)
-                
-                logger.debug(f"Resampled {sample_rate}Hz → {TARGET_SAMPLE_RATE}Hz ({num_samples} → {new_num_samples} samples)")
-                sample_rate = TARGET_SAMPLE_RATE
-                
-            except ImportError:
-                # Fallback: simple linear interpolation (lower quality but no deps)
-                logger.warning("scipy not available, using simple resampling")
-                num_samples = len(audio_data) if audio_data.ndim == 1 else audio_data.shape[0]
-                new_num_samples = int(num_samples * TARGET_SAMPLE_RATE / sample_rate)
-                
-                old_indices = np.linspace(0, num_samples - 1, num_samples)
-                new_indices = np.linspace(0, num_samples - 1, new_num_samples)
-                
-                if audio_data.ndim == 1:
-                    audio_data = np.interp(new_indices, old_indices, audio_data).astype(np.int16)
-                else:
-                    resampled = np.zeros((new_num_samples, channels), dtype=np.int16)
-                    for ch in range(channels):
-                        resampled[:, ch] = np.interp(new_indices, old_indices, audio_data[:, ch]).astype(np.int16)
-                    audio_data = resampled
-                
-                sample_rate = TARGET_SAMPLE_RATE
-        
-        buffer = io.BytesIO()
-        
-        with wave.open(buffer, 'wb') as wf:
-            wf.setnchannels(channels)
-            wf.setsampwidth(2)  # int16 = 2 bytes per sample
-            wf.setframerate(sample_rate)
-            wf.writeframes(audio_data.tobytes())
-        
-        return buffer.getvalue()
+        target_rate = TARGET_SAMPLE_RATE if ENABLE_RESAMPLING else None
+        return audio.to_wav(target_rate=target_rate, mono=ENABLE_DOWNMIX)
     
     def _extract_spotify_url(self, track: dict) -> Optional[str]:
         """
@@ -0,0 +1,205 @@
+"""
+Staged startup for SyncLyrics.
+
+Importing server.py pulls in Quart, every lyrics provider, numpy/Pillow and
+the state manager (~0.7s on a desktop, several seconds on a Raspberry Pi or
+the first run of a PyInstaller build). Instead of making Hypercorn wait for
+that, it binds with a BootApp in front of the real app:
+
+- /health answers immediately with per-stage readiness
+- static assets (/resources/...) are served straight from disk
+- everything else gets 503 + Retry-After; the main page shows a
+  "starting" page that reloads itself
+
+The real app is imported in a worker thread (BootApp.load). Once it is in,
+Quart's startup hooks run and all traffic is forwarded to it. Providers,
+sources and caches then initialize in background tasks that report into the
+same stage table (stage()), shown under "startup" on /health.
+
+This module must stay cheap to import (stdlib + config/logging/metrics only).
+Measure with scripts/benchmark_import_time.py.
+"""
+
+import asyncio
+import json
+import mimetypes
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from logging_config import get_logger
+from metrics import gauge
+
+logger = get_logger(__name__)
+
+RETRY_AFTER_SECONDS = 2
+
+_boot_start = time.monotonic()
+_boot_seconds: Optional[float] = None
+_stages: Dict[str, Dict[str, Any]] = {}
+
+_STARTING_PAGE = (
+    "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+    f"<meta http-equiv=\"refresh\" content=\"{RETRY_AFTER_SECONDS}\">"
+    "<title>SyncLyrics</title></head>"
+    "<body style=\"background:#111;color:#ccc;font-family:sans-serif;text-align:center;padding-top:20vh\">"
+    "<p>SyncLyrics is starting&hellip;</p></body></html>"
+).encode()
+
+
+def register_stages(*names: str) -> None:
+    """Declare stages up front so /health lists them as pending before they run."""
+    for name in names:
+        _stages.setdefault(name, {"status": "pending"})
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Track a startup stage (usable in sync and async code).
+
+    Records status ("running" -> "ready"/"failed") and duration for /health
+    and the startup_stage_seconds gauge. Exceptions are recorded and re-raised.
+    """
+    global _boot_seconds
+    entry = _stages.setdefault(name, {})
+    entry.clear()
+    entry["status"] = "running"
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        entry["status"] = "failed"
+        entry["error"] = str(e) or type(e).__name__
+        raise
+    else:
+        entry["status"] = "ready"
+    finally:
+        elapsed = time.perf_counter() - start
+        entry["seconds"] = round(elapsed, 3)
+        gauge("startup_stage_seconds", "Duration of each startup stage", stage=name).set(elapsed)
+        logger.info(f"Startup stage '{name}' {entry['status']} in {elapsed:.2f}s")
+        if _boot_seconds is None and _all_done():
+            _boot_seconds = time.monotonic() - _boot_start
+            logger.info(f"Startup complete in {_boot_seconds:.2f}s")
+
+
+def _all_done() -> bool:
+    return all(entry.get("status") in ("ready", "failed") for entry in _stages.values())
+
+
+def get_readiness() -> Dict[str, Any]:
+    """
+    Startup progress for /health.
+
+    Returns:
+        {"ready": bool (every stage finished), "boot_seconds": float or None,
+         "stages": {name: {"status", "seconds", "error"?}}}
+    """
+    return {
+        "ready": bool(_stages) and _all_done(),
+        "boot_seconds": round(_boot_seconds, 3) if _boot_seconds is not None else None,
+        "stages": {name: dict(entry) for name, entry in _stages.items()},
+    }
+
+
+class BootApp:
+    """
+    ASGI app Hypercorn serves from the first moment; forwards to the real app once loaded.
+
+    Lifespan events are handled here (one BootApp can sit behind several
+    Hypercorn servers in dual-stack mode), so the real app's startup and
+    shutdown hooks run exactly once.
+    """
+
+    def __init__(self, static_folder: Path, static_url_path: Optional[str] = None):
+        self.static_folder = Path(static_folder).resolve()
+        self.static_url_path = (static_url_path or "/" + self.static_folder.name).rstrip("/")
+        self.app = None
+        self._shut_down = False
+
+    async def load(self, loader: Callable[[], Any]) -> Any:
+        """
+        Import the real app in a worker thread, run its startup hooks, then start forwarding.
+
+        Args:
+            loader: Blocking callable returning the Quart app (does the heavy imports)
+
+        Returns:
+            The loaded app
+        """
+        with stage("app"):
+            app = await asyncio.to_thread(loader)
+            await app.startup()
+        self.app = app
+        return app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif self.app is not None:
+            await self.app(scope, receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, send)
+        elif scope["type"] == "websocket":
+            # Closing before accept rejects the handshake; clients reconnect with backoff
+            await send({"type": "websocket.close", "code": 1013})
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self.app is not None and not self._shut_down:
+                    self._shut_down = True
+                    try:
+                        await self.app.shutdown()
+                    except Exception as e:
+                        logger.error(f"App shutdown hooks failed: {e}")
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, send) -> None:
+        path = scope["path"]
+        if path == "/health":
+            body = {
+                "status": "starting",
+                "uptime_seconds": int(time.monotonic() - _boot_start),
+                "startup": get_readiness(),
+            }
+            await self._respond(send, 200, json.dumps(body).encode(), "application/json")
+        elif path.startswith(self.static_url_path + "/") and scope["method"] in ("GET", "HEAD"):
+            await self._static(scope, send, path[len(self.static_url_path) + 1:])
+        elif path == "/":
+            await self._respond(send, 503, _STARTING_PAGE, "text/html; charset=utf-8", retry=True)
+        else:
+            body = json.dumps({"error": "Server is starting", "startup": get_readiness()}).encode()
+            await self._respond(send, 503, body, "application/json", retry=True)
+
+    async def _static(self, scope, send, relative: str) -> None:
+        file_path = (self.static_folder / relative).resolve()
+        if not file_path.is_relative_to(self.static_folder) or not file_path.is_file():
+            await self._respond(send, 404, b"Not Found", "text/plain")
+            return
+        data = await asyncio.to_thread(file_path.read_bytes)
+        content_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+        if scope["method"] == "HEAD":
+            await self._respond(send, 200, b"", content_type, length=len(data))
+        else:
+            await self._respond(send, 200, data, content_type)
+
+    @staticmethod
+    async def _respond(send, status: int, body: bytes, content_type: str,
+                       retry: bool = False, length: Optional[int] = None,
+                       cache_control: str = "no-store", extra_headers: Optional[list] = None) -> None:
+        headers = [
+            (b"content-type", content_type.encode()),
+            (b"content-length", str(len(body) if length is None else length).encode()),
+            (b"cache-control", cache_control.encode()),
+        ] + (extra_headers or [])
+        if retry:
+            headers.append((b"retry-after", str(RETRY_AFTER_SECONDS).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
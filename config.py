@@ -158,6 +158,13 @@ DEBUG = {
     "log_to_console": _safe_bool(conf("debug.log_to_console"), not getattr(sys, 'frozen', False)),
     "log_detailed": _safe_bool(conf("debug.log_detailed"), False),
     "performance_logging": _safe_bool(conf("debug.performance_logging"), False),
+    # Logging pipeline: records waiting for the writer thread (DEBUG/INFO dropped when full)
+    "log_queue_size": _safe_int(conf("debug.log_queue_size"), 10000),
+    # DEBUG records/second per call site in hot polling modules (0 = unlimited)
+    "log_rate_limit": _safe_float(conf("debug.log_rate_limit"), 5.0),
+    # Bearer token for /api/debug/profile (endpoint disabled while empty)
+    # ENV only: settings.json values are readable through GET /api/settings
+    "profile_token": os.getenv("SYNCLYRICS_DEBUG_TOKEN", ""),
     "log_rotation": {
         "max_bytes": _safe_int(conf("debug.log_rotation.max_bytes"), 10485760),
         "backup_count": _safe_int(conf("debug.log_rotation.backup_count"), 10)
@@ -207,6 +214,19 @@ SERVER = {
         "cert_file": conf("server.https.cert_file", "certs/server.crt"),
         "key_file": conf("server.https.key_file", "certs/server.key"),
     },
+    # gzip/brotli for JSON and text responses (see response_utils.compress_response)
+    "compression": {
+        "enabled": _safe_bool(conf("server.compression.enabled"), True),
+        "min_size": _safe_int(conf("server.compression.min_size"), 1024),  # Bytes; smaller bodies are sent as-is
+        "level": _safe_int(conf("server.compression.level"), 5),  # gzip level 1-9
+    },
+    # Multi-process mode for many displays (see edge.py); 0 workers = single process
+    "edge": {
+        "workers": _safe_int(conf("server.edge.workers"), 0),
+        "port": _safe_int(conf("server.edge.port"), 9014),
+        "publish_interval": _safe_float(conf("server.edge.publish_interval"), 0.1),  # Seconds between snapshots
+        "snapshot_size_kb": _safe_int(conf("server.edge.snapshot_size_kb"), 4096),  # Per slot (two slots)
+    },
 }
 
 UI = {
@@ -235,23 +255,28 @@ UI = {
     }
 }
 
-LYRICS = {
-    "display": {
-        "buffer_size": _safe_int(conf("lyrics.display.buffer_size"), 6),
-        "update_interval": _safe_float(conf("lyrics.display.update_interval"), 0.1),
-        "idle_interval": _safe_float(conf("lyrics.display.idle_interval"), 2.0),
-        "latency_compensation": _safe_float(conf("lyrics.display.latency_compensation"), -0.1),
-        "spotify_latency_compensation": _safe_float(conf("lyrics.display.spotify_latency_compensation"), -0.5),
-        "audio_recognition_latency_compensation": _safe_float(conf("lyrics.display.audio_recognition_latency_compensation"), 0.1),
-        "spicetify_latency_compensation": _safe_float(conf("lyrics.display.spicetify_latency_compensation"), 0.0),
-        "music_assistant_latency_compensation": _safe_float(conf("lyrics.display.music_assistant_latency_compensation"), 0.0),
-        "word_sync_latency_compensation": _safe_float(conf("lyrics.display.word_sync_latency_compensation"), -0.1),
-        "musixmatch_word_sync_offset": _safe_float(conf("lyrics.display.musixmatch_word_sync_offset"), -0.1),
-        "netease_word_sync_offset": _safe_float(conf("lyrics.display.netease_word_sync_offset"), -0.1),
-        "idle_wait_time": _safe_float(conf("lyrics.display.idle_wait_time"), 10.0),
-        "smart_race_timeout": _safe_float(conf("lyrics.display.smart_race_timeout"), 4.0),
-    },
-}
+def _lyrics_config() -> dict:
+    """LYRICS values (hot-reloadable: rebuilt by _refresh_hot_settings)."""
+    return {
+        "display": {
+            "buffer_size": _safe_int(conf("lyrics.display.buffer_size"), 6),
+            "update_interval": _safe_float(conf("lyrics.display.update_interval"), 0.1),
+            "idle_interval": _safe_float(conf("lyrics.display.idle_interval"), 2.0),
+            "latency_compensation": _safe_float(conf("lyrics.display.latency_compensation"), -0.1),
+            "spotify_latency_compensation": _safe_float(conf("lyrics.display.spotify_latency_compensation"), -0.5),
+            "audio_recognition_latency_compensation": _safe_float(conf("lyrics.display.audio_recognition_latency_compensation"), 0.1),
+            "spicetify_latency_compensation": _safe_float(conf("lyrics.display.spicetify_latency_compensation"), 0.0),
+            "music_assistant_latency_compensation": _safe_float(conf("lyrics.display.music_assistant_latency_compensation"), 0.0),
+            "word_sync_latency_compensation": _safe_float(conf("lyrics.display.word_sync_latency_compensation"), -0.1),
+            "musixmatch_word_sync_offset": _safe_float(conf("lyrics.display.musixmatch_word_sync_offset"), -0.1),
+            "netease_word_sync_offset": _safe_float(conf("lyrics.display.netease_word_sync_offset"), -0.1),
+            "idle_wait_time": _safe_float(conf("lyrics.display.idle_wait_time"), 10.0),
+            "smart_race_timeout": _safe_float(conf("lyrics.display.smart_race_timeout"), 4.0),
+        },
+    }
+
+
+LYRICS = _lyrics_config()
 
 SPOTIFY = {
     # FIX: Use empty string instead of None for null safety with spotipy
@@ -397,19 +422,24 @@ SYSTEM = {
     }
 }
 
-FEATURES = {
-    "minimal_ui": _safe_bool(conf("features.minimal_ui"), False),
-    "save_lyrics_locally": _safe_bool(conf("features.save_lyrics_locally"), True),
-    "show_lyrics_source": _safe_bool(conf("features.show_lyrics_source"), True),
-    "parallel_provider_fetch": _safe_bool(conf("features.parallel_provider_fetch"), True),
-    "provider_stats": _safe_bool(conf("features.provider_stats"), False),
-    "auto_theme": _safe_bool(conf("features.auto_theme"), True),
-    "album_art_colors": _safe_bool(conf("features.album_art_colors"), True),
-    "album_art_db": _safe_bool(conf("features.album_art_db"), True),
-    "word_sync_auto_switch": _safe_bool(conf("features.word_sync_auto_switch"), False),  # Respect provider priority
-    "word_sync_default_enabled": _safe_bool(conf("features.word_sync_default_enabled"), True),  # Word-sync ON by default
-    "spicetify_database": _safe_bool(conf("features.spicetify_database"), True),  # Cache audio analysis from Spicetify
-}
+def _features_config() -> dict:
+    """FEATURES values (hot-reloadable: rebuilt by _refresh_hot_settings)."""
+    return {
+        "minimal_ui": _safe_bool(conf("features.minimal_ui"), False),
+        "save_lyrics_locally": _safe_bool(conf("features.save_lyrics_locally"), True),
+        "show_lyrics_source": _safe_bool(conf("features.show_lyrics_source"), True),
+        "parallel_provider_fetch": _safe_bool(conf("features.parallel_provider_fetch"), True),
+        "provider_stats": _safe_bool(conf("features.provider_stats"), False),
+        "auto_theme": _safe_bool(conf("features.auto_theme"), True),
+        "album_art_colors": _safe_bool(conf("features.album_art_colors"), True),
+        "album_art_db": _safe_bool(conf("features.album_art_db"), True),
+        "word_sync_auto_switch": _safe_bool(conf("features.word_sync_auto_switch"), False),  # Respect provider priority
+        "word_sync_default_enabled": _safe_bool(conf("features.word_sync_default_enabled"), True),  # Word-sync ON by default
+        "spicetify_database": _safe_bool(conf("features.spicetify_database"), True),  # Cache audio analysis from Spicetify
+    }
+
+
+FEATURES = _features_config()
 
 ALBUM_ART = {
     "timeout": _safe_int(conf("album_art.timeout"), 5),
@@ -428,7 +458,60 @@ ARTIST_IMAGE = {
     # Enable Wikipedia/Wikimedia integration (provides 1500-5000px high-res images)
     "enable_wikipedia": _safe_bool(conf("artist_image.enable_wikipedia"), False),
     # Enable FanArt.tv album covers (fetches album artwork, can be disabled if too many duplicates)
-    "enable_fanart_albumcover": _safe_bool(conf("artist_image.enable_fanart_albumcover"), True)
+    "enable_fanart_albumcover": _safe_bool(conf("artist_image.enable_fanart_albumcover"), True),
+    # Cache each source's lookup per artist across restarts (incl. "nothing found")
+    "lookup_cache": _safe_bool(conf("artist_image.lookup_cache"), True)
+}
+
+# On-demand resized/transcoded image variants (?w=&fmt=&q= on album art / artist image URLs)
+IMAGE_VARIANTS = {
+    "enabled": _safe_bool(os.getenv("IMAGE_VARIANTS_ENABLED") or conf("image_variants.enabled"), True),
+    # Disk budget for generated variants (oldest-used evicted first)
+    "disk_budget_mb": _safe_int(os.getenv("IMAGE_VARIANTS_DISK_BUDGET_MB") or conf("image_variants.disk_budget_mb"), 512),
+    # Largest width a variant may be requested at (originals are never upscaled)
+    "max_width": _safe_int(conf("image_variants.max_width"), 2048),
+    "default_format": str(conf("image_variants.default_format", "webp")).lower(),
+    "default_quality": _safe_int(conf("image_variants.default_quality"), 80),
+    # Encoder threads (Pillow releases the GIL while decoding/resizing/encoding)
+    "workers": _safe_int(conf("image_variants.workers"), 2),
+}
+
+# Image Downloads (album art + artist images)
+IMAGE_DOWNLOADS = {
+    # Concurrent downloads across all hosts
+    "workers": _safe_int(os.getenv("IMAGE_DOWNLOADS_WORKERS") or conf("image_downloads.workers"), 4),
+    # Concurrent downloads per host (politeness)
+    "per_host": _safe_int(conf("image_downloads.per_host"), 2),
+    # Minimum seconds between request starts to the same host
+    "host_interval": _safe_float(conf("image_downloads.host_interval"), 0.2),
+}
+
+# Perceptual duplicate removal in the album art DB (same image from several providers)
+IMAGE_DEDUP = {
+    "enabled": _safe_bool(conf("image_dedup.enabled"), True),
+    # Max differing dHash bits (of 64) for two images to count as the same
+    "max_distance": _safe_int(conf("image_dedup.max_distance"), 6),
+    # Max mean per-channel difference (0-255) of the 4x4 color thumbnails
+    "max_color_diff": _safe_float(conf("image_dedup.max_color_diff"), 12.0),
+}
+
+# Bulk library backfill job (lyrics + album art + artist images for a whole library)
+LIBRARY_BACKFILL = {
+    # Seconds between library items (bounds provider/API request rate)
+    "interval": _safe_float(conf("library_backfill.interval"), 3.0),
+    # Pause the job as soon as playback starts (resume via the start endpoint)
+    "pause_on_playback": _safe_bool(conf("library_backfill.pause_on_playback"), True),
+}
+
+# Event-loop lag monitor (see system_utils/loop_monitor.py, GET /api/debug/loop-lag)
+LOOP_MONITOR = {
+    "enabled": _safe_bool(conf("loop_monitor.enabled"), True),
+    # Seconds between lag samples
+    "interval": _safe_float(conf("loop_monitor.interval"), 0.25),
+    # Lag (seconds) recorded as an event; stalls this long get the blocking stack captured
+    "threshold": _safe_float(conf("loop_monitor.threshold"), 0.1),
+    # asyncio debug mode slow-callback reports (adds overhead, for investigations)
+    "slow_callbacks": _safe_bool(conf("loop_monitor.slow_callbacks"), False),
 }
 
 # Audio Recognition (Reaper Integration)
@@ -484,6 +567,35 @@ AUDIO_BUFFER = {
     "acrcloud_enabled": _safe_bool(os.getenv("ACRCLOUD_BUFFER_ENABLED") or conf("audio_buffer.acrcloud_enabled"), False),
 }
 
+# Recognition Hedging (Local FP / Shazam / ACRCloud orchestration)
+# Local FP always starts first. Remote services start when earlier services miss,
+# or after their hedge delay (seconds since cycle start) - whichever comes first.
+RECOGNITION_HEDGING = {
+    # "sequential" = strict cascade (old behavior), "hedged" = start after delay, "parallel" = start all at once
+    "mode": str(os.getenv("RECOGNITION_HEDGE_MODE") or conf("recognition_hedging.mode", "hedged")).lower(),
+    # Start Shazam after this many seconds even if Local FP is still running
+    "shazam_delay": _safe_float(os.getenv("RECOGNITION_HEDGE_SHAZAM_DELAY") or conf("recognition_hedging.shazam_delay"), 1.0),
+    # Start ACRCloud after this many seconds even if Shazam is still running (quota/cooldown still apply)
+    "acrcloud_delay": _safe_float(os.getenv("RECOGNITION_HEDGE_ACRCLOUD_DELAY") or conf("recognition_hedging.acrcloud_delay"), 4.0),
+}
+
+# Adaptive Recognition Interval
+# Fast cadence while unidentified, long cadence with cheap Local FP verification once stable
+ADAPTIVE_RECOGNITION = {
+    "enabled": _safe_bool(os.getenv("ADAPTIVE_RECOGNITION_ENABLED") or conf("adaptive_recognition.enabled"), True),
+    # Seconds between cycles once the song is stable
+    "stable_interval": _safe_float(os.getenv("ADAPTIVE_RECOGNITION_STABLE_INTERVAL") or conf("adaptive_recognition.stable_interval"), 15.0),
+    # Consecutive same-song recognitions (after verification) before switching to the stable cadence
+    "stable_after": _safe_int(os.getenv("ADAPTIVE_RECOGNITION_STABLE_AFTER") or conf("adaptive_recognition.stable_after"), 2),
+    # Stable cycles allowed on continuity check alone when Local FP can't verify the song
+    "max_unverified_cycles": _safe_int(os.getenv("ADAPTIVE_RECOGNITION_MAX_UNVERIFIED") or conf("adaptive_recognition.max_unverified_cycles"), 2),
+    # Allowed drift (seconds) between verified and expected position
+    "position_tolerance": _safe_float(os.getenv("ADAPTIVE_RECOGNITION_POSITION_TOLERANCE") or conf("adaptive_recognition.position_tolerance"), 3.0),
+    # Song change detector thresholds (see audio_recognition/change_detector.py)
+    "level_change_db": _safe_float(os.getenv("ADAPTIVE_RECOGNITION_LEVEL_CHANGE_DB") or conf("adaptive_recognition.level_change_db"), 10.0),
+    "spectral_change": _safe_float(os.getenv("ADAPTIVE_RECOGNITION_SPECTRAL_CHANGE") or conf("adaptive_recognition.spectral_change"), 0.4),
+}
+
 # Multi-Match Position Verification
 # When SFP returns multiple matches, use position tracking to select the correct one
 MULTI_MATCH = {
@@ -496,6 +608,47 @@ MULTI_MATCH = {
     "fallback_to_confidence": _safe_bool(os.getenv("MULTI_MATCH_FALLBACK") or conf("multi_match.fallback_to_confidence"), True),
 }
 
+# ==========================================
+# Hot-reloadable settings
+# ==========================================
+# LYRICS and FEATURES are updated in place whenever a setting changes
+# (settings.set, /api/settings/reload), so `from config import LYRICS` stays live.
+# Lookups the lyrics hot path does per poll are precomputed here once per change.
+
+# Per-source lyric latency (s). Sources not listed use LYRICS["display"]["latency_compensation"].
+SOURCE_LATENCY: dict = {}
+
+# Word-sync timing offset (s) per word-sync provider
+WORD_SYNC_OFFSETS: dict = {}
+
+
+def _refresh_hot_settings(snapshot=None) -> None:
+    """Rebuild LYRICS/FEATURES and derived tables (settings.subscribe callback)."""
+    fresh = _lyrics_config()
+    for section, values in fresh.items():
+        if isinstance(values, dict) and isinstance(LYRICS.get(section), dict):
+            LYRICS[section].update(values)
+        else:
+            LYRICS[section] = values
+    FEATURES.update(_features_config())
+
+    display = LYRICS["display"]
+    SOURCE_LATENCY.update({
+        "spotify": display["spotify_latency_compensation"],  # API polling lag
+        "spicetify": display["spicetify_latency_compensation"],  # Real-time WebSocket position
+        "audio_recognition": display["audio_recognition_latency_compensation"],
+        "music_assistant": display["music_assistant_latency_compensation"],
+    })
+    WORD_SYNC_OFFSETS.update({
+        "musixmatch": display["musixmatch_word_sync_offset"],
+        "netease": display["netease_word_sync_offset"],
+    })
+
+
+_refresh_hot_settings()
+if hasattr(settings, "subscribe"):
+    settings.subscribe(_refresh_hot_settings)
+
 # Helper functions
 def get_provider_config(name: str) -> dict:
     return PROVIDERS.get(name, {"enabled": False, "priority": 0})
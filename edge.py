@@ -0,0 +1,580 @@
+"""
+Multi-process deployment: one producer process, N stateless edge workers.
+
+The normal process (sync_lyrics.py + server.py) stays the producer: it owns
+the media sources, audio recognition and lyrics resolution, and keeps serving
+the main port. With server.edge.workers > 0 it additionally:
+
+- renders the display's hot endpoints (/current-track, /lyrics) once per
+  server.edge.publish_interval and publishes the response bodies into a
+  shared memory segment (SnapshotWriter)
+- starts N Hypercorn worker processes on server.edge.port that share one
+  listening socket and serve EdgeApp
+
+Edge workers never import server.py (no routes, no providers). They answer
+the hot endpoints from the latest snapshot, serve static files, album art
+and image variants from disk, and reverse-proxy everything else (pages,
+controls, settings) to the producer over HTTP. Websockets (/ws/spicetify,
+browser mic) must use the main port. The producer's polling work is fixed
+per interval no matter how many kiosks poll the edge port.
+
+Snapshot segment layout (double-buffered, so a reader never sees a slot
+that is being written):
+
+    header: magic "SLE1" | uint32 slot size | uint64 sequence | uint32 active slot
+    slot:   float64 captured_at (time.time) | uint32 payload length | payload
+    payload: uint32 count, then per entry: uint16 path length, path, uint32 body length, body
+
+Measure with scripts/benchmark_kiosk_load.py.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import signal
+import stat
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing import get_context, shared_memory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from boot import BootApp
+from config import ALBUM_ART_DB_DIR, CACHE_DIR, RESOURCES_DIR, SERVER
+from logging_config import get_logger
+from metrics import gauge
+
+logger = get_logger(__name__)
+
+SNAPSHOT_PATHS = ("/current-track", "/lyrics")
+MAGIC = b"SLE1"
+_HEADER = struct.Struct("<4sIQI")  # magic, slot size, sequence, active slot
+_SLOT_HEADER = struct.Struct("<dI")  # captured_at, payload length
+
+# Mirrors system_utils.image_variants (importing system_utils would pull in every source)
+VARIANTS_DIR = CACHE_DIR / "image_variants"
+VARIANT_URL_PREFIX = "/api/image-variants/"
+ALBUM_ART_URL_PREFIX = "/api/album-art/image/"
+IMAGE_MIMETYPES = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png",
+                   ".webp": "image/webp", ".avif": "image/avif", ".gif": "image/gif"}
+
+HOP_BY_HOP = {b"connection", b"keep-alive", b"proxy-connection", b"te", b"trailer",
+              b"transfer-encoding", b"upgrade"}
+PROXY_CHUNK_SIZE = 64 * 1024
+PROXY_TIMEOUT = 30.0  # Seconds for the producer to answer, and max idle time between body chunks
+
+
+def _pack(bodies: Dict[str, bytes]) -> bytes:
+    parts = [struct.pack("<I", len(bodies))]
+    for path, body in bodies.items():
+        encoded = path.encode()
+        parts += [struct.pack("<H", len(encoded)), encoded, struct.pack("<I", len(body)), body]
+    return b"".join(parts)
+
+
+def _unpack(payload: bytes) -> Dict[str, bytes]:
+    (count,) = struct.unpack_from("<I", payload, 0)
+    offset, bodies = 4, {}
+    for _ in range(count):
+        (path_length,) = struct.unpack_from("<H", payload, offset)
+        path = payload[offset + 2:offset + 2 + path_length].decode()
+        offset += 2 + path_length
+        (body_length,) = struct.unpack_from("<I", payload, offset)
+        bodies[path] = payload[offset + 4:offset + 4 + body_length]
+        offset += 4 + body_length
+    return bodies
+
+
+class SnapshotWriter:
+    """Producer side: owns the shared memory segment and publishes into the inactive slot."""
+
+    def __init__(self, slot_size: int):
+        self.slot_size = slot_size
+        self.shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + 2 * slot_size)
+        self.name = self.shm.name
+        self._seq = 0
+        self._active = 0
+        self._oversize_logged = set()
+        self._lock = threading.Lock()  # close() runs in a worker thread during shutdown
+        self.closed = False
+        _HEADER.pack_into(self.shm.buf, 0, MAGIC, slot_size, 0, 0)
+
+    def publish(self, bodies: Dict[str, bytes], captured_at: float) -> None:
+        """
+        Write a snapshot and make it current.
+
+        Bodies that do not fit the slot are left out (edges proxy those paths).
+        Does nothing once the writer is closed.
+        """
+        limit = self.slot_size - _SLOT_HEADER.size - 4
+        for path in list(bodies):
+            needed = len(bodies[path]) + len(path) + 6
+            if needed > limit:
+                if path not in self._oversize_logged:
+                    self._oversize_logged.add(path)
+                    logger.warning(f"Edge snapshot: {path} ({needed} bytes) exceeds the slot, edges will proxy it")
+                del bodies[path]
+            else:
+                limit -= needed
+        payload = _pack(bodies)
+        with self._lock:
+            if self.closed:
+                return
+            slot = 1 - self._active
+            offset = _HEADER.size + slot * self.slot_size
+            _SLOT_HEADER.pack_into(self.shm.buf, offset, captured_at, len(payload))
+            self.shm.buf[offset + _SLOT_HEADER.size:offset + _SLOT_HEADER.size + len(payload)] = payload
+            # Flip: readers check the sequence before and after copying a slot
+            self._seq += 1
+            self._active = slot
+            _HEADER.pack_into(self.shm.buf, 0, MAGIC, self.slot_size, self._seq, slot)
+
+    def close(self) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.shm.close()
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+@dataclass
+class Snapshot:
+    seq: int
+    captured_at: float
+    bodies: Dict[str, bytes]
+    cache: Dict[Any, Any] = field(default_factory=dict)  # Parsed/compressed bodies for this sequence
+
+
+class SnapshotReader:
+    """Edge side: attaches to the producer's segment, re-reads it only when the sequence changes."""
+
+    def __init__(self, name: str):
+        # Spawned workers share the producer's resource tracker, so attaching
+        # re-registers the same name and the producer's unlink() clears it
+        self.shm = shared_memory.SharedMemory(name=name)
+        self._current: Optional[Snapshot] = None
+
+    def read(self) -> Optional[Snapshot]:
+        buf = self.shm.buf
+        for _ in range(5):
+            magic, slot_size, seq, slot = _HEADER.unpack_from(buf, 0)
+            if magic != MAGIC or seq == 0:
+                return None
+            if self._current is not None and self._current.seq == seq:
+                return self._current
+            offset = _HEADER.size + slot * slot_size
+            captured_at, length = _SLOT_HEADER.unpack_from(buf, offset)
+            payload = bytes(buf[offset + _SLOT_HEADER.size:offset + _SLOT_HEADER.size + length])
+            if _HEADER.unpack_from(buf, 0)[2] == seq:
+                self._current = Snapshot(seq, captured_at, _unpack(payload))
+                return self._current
+        return self._current  # Producer flipped twice while copying; use the previous one
+
+
+async def publish_snapshots(app, writer: SnapshotWriter, interval: float) -> None:
+    """
+    Producer task: render the hot endpoints through the app and publish them.
+
+    Runs the real routes (same bytes a browser would get), so the edge never
+    needs to know how a response is built.
+    """
+    client = app.test_client()
+    publish_gauge = gauge("edge_snapshot_publish_seconds", "Time to render and publish the edge snapshot")
+    size_gauge = gauge("edge_snapshot_bytes", "Size of the last published edge snapshot")
+    while not writer.closed:
+        start = time.perf_counter()
+        try:
+            bodies = {}
+            captured_at = time.time()
+            for path in SNAPSHOT_PATHS:
+                response = await client.get(path)
+                if response.status_code == 200:
+                    bodies[path] = await response.get_data()
+            writer.publish(bodies, captured_at)
+            size_gauge.set(sum(len(body) for body in bodies.values()))
+        except Exception as e:
+            logger.error(f"Edge snapshot publish failed: {e}")
+        elapsed = time.perf_counter() - start
+        publish_gauge.set(elapsed)
+        await asyncio.sleep(max(0.0, interval - elapsed))
+
+
+class EdgeApp(BootApp):
+    """
+    Stateless ASGI app run by each edge worker.
+
+    Hot endpoints come from the snapshot, files from disk, the rest is proxied
+    to the producer. A snapshot older than max_age (producer stalled or gone)
+    is not served; those requests are proxied instead.
+    """
+
+    STATIC_CACHE_CONTROL = "public, max-age=360, must-revalidate"
+    ALBUM_ART_CACHE_CONTROL = "public, max-age=86400, must-revalidate"
+    IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+    def __init__(self, snapshot_name: str, upstream: Tuple[str, int], max_age: float, upstream_ssl: bool = False):
+        super().__init__(RESOURCES_DIR)
+        self.snapshot = SnapshotReader(snapshot_name)
+        self.upstream = upstream
+        self.upstream_ssl = None
+        if upstream_ssl:
+            import ssl
+            # The producer's certificate is usually self-signed; this hop never leaves the machine
+            self.upstream_ssl = ssl.create_default_context()
+            self.upstream_ssl.check_hostname = False
+            self.upstream_ssl.verify_mode = ssl.CERT_NONE
+        self.max_age = max_age
+        self.compression = SERVER["compression"]
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._edge_http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            # Websockets (Spicetify bridge, browser mic) are only served on the main port
+            await send({"type": "websocket.close", "code": 1008})
+
+    async def _edge_http(self, scope, receive, send) -> None:
+        path, method = scope["path"], scope["method"]
+        if method in ("GET", "HEAD"):
+            if path in SNAPSHOT_PATHS and await self._snapshot_response(scope, send, path):
+                return
+            if path == "/health":
+                await self._health(send)
+                return
+            if path.startswith(self.static_url_path + "/"):
+                await self._file(scope, send, self.static_folder, path[len(self.static_url_path) + 1:],
+                                 self.STATIC_CACHE_CONTROL)
+                return
+            if path.startswith(VARIANT_URL_PREFIX):
+                await self._file(scope, send, VARIANTS_DIR, path[len(VARIANT_URL_PREFIX):],
+                                 self.IMMUTABLE_CACHE_CONTROL)
+                return
+            if path.startswith(ALBUM_ART_URL_PREFIX) and not scope["query_string"]:
+                # Resize requests (?w=&fmt=) need the producer's variant cache
+                await self._file(scope, send, ALBUM_ART_DB_DIR, path[len(ALBUM_ART_URL_PREFIX):],
+                                 self.ALBUM_ART_CACHE_CONTROL)
+                return
+        await self._proxy(scope, receive, send)
+
+    def _fresh_snapshot(self) -> Optional[Snapshot]:
+        snapshot = self.snapshot.read()
+        if snapshot is None or time.time() - snapshot.captured_at > self.max_age:
+            return None
+        return snapshot
+
+    async def _health(self, send) -> None:
+        snapshot = self.snapshot.read()
+        body = {
+            "status": "ok",
+            "role": "edge",
+            "pid": os.getpid(),
+            "snapshot": {
+                "sequence": snapshot.seq if snapshot else 0,
+                "age_ms": round((time.time() - snapshot.captured_at) * 1000) if snapshot else None,
+                "paths": sorted(snapshot.bodies) if snapshot else [],
+            },
+        }
+        await self._respond(send, 200, json.dumps(body).encode(), "application/json")
+
+    async def _snapshot_response(self, scope, send, path: str) -> bool:
+        snapshot = self._fresh_snapshot()
+        if snapshot is None or path not in snapshot.bodies:
+            return False
+        query = parse_qs(scope["query_string"].decode("latin-1"))
+        fields = query.get("fields", [None])[0]
+        if fields or path == "/current-track":
+            data = snapshot.cache.get(path)
+            if data is None:
+                data = snapshot.cache[path] = json.loads(snapshot.bodies[path])
+            if path == "/current-track" and data.get("is_playing") and isinstance(data.get("position"), (int, float)):
+                # Advance the position by the snapshot's age, like the producer's own estimate would
+                position = data["position"] + (time.time() - snapshot.captured_at)
+                duration = (data.get("duration_ms") or 0) / 1000
+                data = dict(data, position=min(position, duration) if duration > 0 else position)
+            if fields:
+                from response_utils import select_fields  # Quart import; only for ?fields= clients
+                data = select_fields(data, fields)
+            body, cache_key = json.dumps(data).encode(), None
+        else:
+            body, cache_key = snapshot.bodies[path], path
+        await self._send_json(scope, send, body, snapshot, cache_key)
+        return True
+
+    async def _send_json(self, scope, send, body: bytes, snapshot: Snapshot, cache_key: Optional[str]) -> None:
+        headers = [(b"vary", b"Accept-Encoding"), (b"pragma", b"no-cache")]
+        if self.compression["enabled"] and len(body) >= self.compression["min_size"] and _accepts_gzip(scope):
+            # Unchanged bodies are compressed once per snapshot, not once per client
+            compressed = snapshot.cache.get(("gzip", cache_key)) if cache_key else None
+            if compressed is None:
+                compressed = gzip.compress(body, compresslevel=self.compression["level"], mtime=0)
+                if cache_key:
+                    snapshot.cache[("gzip", cache_key)] = compressed
+            body = compressed
+            headers.append((b"content-encoding", b"gzip"))
+        await self._respond(send, 200, b"" if scope["method"] == "HEAD" else body, "application/json",
+                            length=len(body), cache_control="no-cache, no-store, must-revalidate",
+                            extra_headers=headers)
+
+    async def _file(self, scope, send, root: Path, relative: str, cache_control: str) -> None:
+        """Serve a file below root (relative comes from the already percent-decoded scope path)."""
+        found = await asyncio.to_thread(_stat_file, root, relative)
+        if found is None:
+            await self._respond(send, 404, b"Not Found", "text/plain")
+            return
+        file_path, st = found
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        headers = [(b"etag", etag.encode())]
+        content_type = IMAGE_MIMETYPES.get(file_path.suffix.lower()) or _guess_type(file_path)
+        if etag in _header(scope, b"if-none-match"):
+            await self._respond(send, 304, b"", content_type, length=0, cache_control=cache_control, extra_headers=headers)
+            return
+        data = b"" if scope["method"] == "HEAD" else await asyncio.to_thread(file_path.read_bytes)
+        await self._respond(send, 200, data, content_type, length=st.st_size,
+                            cache_control=cache_control, extra_headers=headers)
+
+    async def _proxy(self, scope, receive, send) -> None:
+        """Forward a request to the producer (HTTP/1.0, so the response is close-delimited, never chunked)."""
+        body = bytearray()
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        target = scope.get("raw_path") or scope["path"].encode()
+        if scope["query_string"]:
+            target += b"?" + scope["query_string"]
+        client = scope.get("client") or ("", 0)
+        host = _header(scope, b"host")
+        lines = [scope["method"].encode() + b" " + target + b" HTTP/1.0",
+                 f"Content-Length: {len(body)}".encode(),
+                 f"X-Forwarded-For: {client[0]}".encode(),
+                 f"X-Forwarded-Proto: {scope.get('scheme', 'http')}".encode()]
+        # The client's Host header is forwarded as is (below), so the producer sees the real origin
+        if host:
+            lines.append(f"X-Forwarded-Host: {host}".encode())
+        else:
+            lines.append(f"Host: {self.upstream[0]}:{self.upstream[1]}".encode())
+        lines += [name + b": " + value for name, value in scope["headers"]
+                  if name.lower() not in HOP_BY_HOP and name.lower() != b"content-length"]
+
+        started = False
+        writer = None
+        try:
+            async with asyncio.timeout(PROXY_TIMEOUT):
+                reader, writer = await asyncio.open_connection(*self.upstream, ssl=self.upstream_ssl)
+                writer.write(b"\r\n".join(lines) + b"\r\n\r\n" + bytes(body))
+                await writer.drain()
+                status, headers = await _read_response_head(reader)
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            started = True
+            while True:
+                chunk = await asyncio.wait_for(reader.read(PROXY_CHUNK_SIZE), PROXY_TIMEOUT)
+                if not chunk:
+                    break
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        except (IndexError, ValueError, OSError, TimeoutError) as e:
+            # Producer down, restarting or stalled
+            if started:
+                logger.debug(f"Edge proxy: {scope['path']} aborted mid-response: {e!r}")
+                return  # Status already sent; ending without the final body closes the connection
+            error = f"Producer unavailable: {e}" if str(e) else f"Producer unavailable ({type(e).__name__})"
+            await self._respond(send, 502, json.dumps({"error": error}).encode(), "application/json", retry=True)
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+async def _read_response_head(reader: asyncio.StreamReader) -> Tuple[int, list]:
+    """
+    Read the producer's status line and headers.
+
+    Raises:
+        ValueError: Empty or malformed status line (producer restarting, connection reset)
+    """
+    parts = (await reader.readline()).split()
+    if len(parts) < 2 or not parts[1].isdigit():
+        raise ValueError("empty or malformed response")
+    status = int(parts[1])
+    headers = []
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.rstrip(b"\r\n").partition(b":")
+        if name.strip().lower() not in HOP_BY_HOP:
+            headers.append((name.strip().lower(), value.strip()))
+    return status, headers
+
+
+def _stat_file(root: Path, relative: str) -> Optional[Tuple[Path, os.stat_result]]:
+    """Resolve relative below root (blocking); None if missing or outside root."""
+    root = Path(root).resolve()
+    file_path = (root / relative).resolve()
+    if not file_path.is_relative_to(root):
+        return None
+    try:
+        st = file_path.stat()
+    except OSError:
+        return None
+    return (file_path, st) if stat.S_ISREG(st.st_mode) else None
+
+
+def _header(scope, name: bytes) -> str:
+    return ",".join(value.decode("latin-1") for key, value in scope["headers"] if key.lower() == name)
+
+
+def _accepts_gzip(scope) -> bool:
+    return "gzip" in _header(scope, b"accept-encoding").lower()
+
+
+def _guess_type(file_path: Path) -> str:
+    import mimetypes
+    return mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+
+
+def _hypercorn_worker_api():
+    """
+    Hypercorn's multi-worker internals (what `hypercorn --workers N` runs per process).
+
+    worker_serve(app, config, sockets=, shutdown_trigger=), wrap_app(app,
+    wsgi_max_body_size, mode) and check_multiprocess_shutdown_event are the same
+    from 0.14.3 (the requirements.txt minimum) through 0.18; checked up front so
+    a future release that changes them disables edge workers with a clear error.
+
+    Returns:
+        (worker_serve, wrap_app, check_multiprocess_shutdown_event)
+
+    Raises:
+        RuntimeError: If this Hypercorn version does not provide them
+    """
+    import inspect
+    try:
+        from hypercorn.asyncio.run import worker_serve
+        from hypercorn.utils import check_multiprocess_shutdown_event, wrap_app
+    except ImportError as e:
+        raise RuntimeError(f"Edge workers need Hypercorn's worker API: {e}") from e
+    serve_params = inspect.signature(worker_serve).parameters
+    if not {"sockets", "shutdown_trigger"} <= set(serve_params) or len(inspect.signature(wrap_app).parameters) != 3:
+        raise RuntimeError("Edge workers do not support this Hypercorn version (worker API changed)")
+    return worker_serve, wrap_app, check_multiprocess_shutdown_event
+
+
+def _edge_worker(config, sockets, shutdown_event, snapshot_name: str, upstream: Tuple[str, int],
+                 upstream_ssl: bool, max_age: float, log_level: str) -> None:
+    """Worker process entry point (spawned): serve EdgeApp on the shared socket until shutdown."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The producer handles Ctrl+C and stops us via shutdown_event
+    # Console only: several processes must not rotate the producer's log files
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(f"(edge {os.getpid()}) %(levelname)s - %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(log_level)
+    from functools import partial
+    worker_serve, wrap_app, check_multiprocess_shutdown_event = _hypercorn_worker_api()
+
+    app = EdgeApp(snapshot_name, upstream, max_age, upstream_ssl)
+    shutdown_trigger = partial(check_multiprocess_shutdown_event, shutdown_event, asyncio.sleep)
+    asyncio.run(worker_serve(wrap_app(app, config.wsgi_max_body_size, "asgi"), config,
+                             sockets=sockets, shutdown_trigger=shutdown_trigger))
+
+
+class EdgePool:
+    """Producer side: snapshot segment, publisher task and edge worker processes."""
+
+    def __init__(self, workers: int, host: str, port: int, upstream_port: int,
+                 publish_interval: float, slot_size: int, upstream_ssl: bool = False):
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.upstream = ("127.0.0.1", upstream_port)
+        self.upstream_ssl = upstream_ssl
+        self.publish_interval = publish_interval
+        self.writer = SnapshotWriter(slot_size)
+        self._processes: List[Any] = []
+        self._sockets = None
+        self._shutdown_event = None
+
+    def start(self, log_level: str = "INFO") -> None:
+        from hypercorn.config import Config
+
+        config = Config()
+        config.bind = [f"{self.host}:{self.port}"]
+        config.workers = self.workers
+        config.graceful_timeout = 2
+        config.shutdown_timeout = 2
+        config.accesslog = None
+        self._sockets = config.create_sockets()
+
+        ctx = get_context("spawn")
+        self._shutdown_event = ctx.Event()
+        # Snapshots older than this are treated as a stalled producer (requests get proxied)
+        max_age = max(2.0, 10 * self.publish_interval)
+        for _ in range(self.workers):
+            process = ctx.Process(
+                target=_edge_worker, name="SyncLyricsEdge", daemon=True,
+                kwargs={"config": config, "sockets": self._sockets, "shutdown_event": self._shutdown_event,
+                        "snapshot_name": self.writer.name, "upstream": self.upstream,
+                        "upstream_ssl": self.upstream_ssl,
+                        "max_age": max_age, "log_level": log_level},
+            )
+            process.start()
+            self._processes.append(process)
+        logger.info(f"Started {self.workers} edge worker(s) on {self.host}:{self.port} "
+                    f"(snapshot every {self.publish_interval * 1000:.0f}ms)")
+
+    async def publish_loop(self, app) -> None:
+        await publish_snapshots(app, self.writer, self.publish_interval)
+
+    def stop(self, timeout: float = 3.0) -> None:
+        """Signal workers to shut down, terminate stragglers, release the socket and segment."""
+        if self._shutdown_event is not None:
+            self._shutdown_event.set()
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+                process.join(1.0)
+        self._processes.clear()
+        if self._sockets is not None:
+            for sock in self._sockets.secure_sockets + self._sockets.insecure_sockets:
+                sock.close()
+            self._sockets = None
+        self.writer.close()
+
+
+def create_edge_pool() -> Optional[EdgePool]:
+    """
+    Build the pool from SERVER["edge"] (None when edge workers are disabled).
+
+    Raises:
+        RuntimeError: If the installed Hypercorn cannot run edge workers
+    """
+    settings = SERVER["edge"]
+    if settings["workers"] <= 0:
+        return None
+    _hypercorn_worker_api()
+    https = SERVER["https"]
+    # HTTPS-only mode serves TLS on the main port; dual-stack keeps plain HTTP there
+    https_only = https["enabled"] and (not https["port"] or https["port"] == SERVER["port"])
+    return EdgePool(
+        workers=settings["workers"],
+        host=SERVER["host"],
+        port=settings["port"],
+        upstream_port=SERVER["port"],
+        publish_interval=settings["publish_interval"],
+        slot_size=settings["snapshot_size_kb"] * 1024,
+        upstream_ssl=https_only,
+    )
@@ -1,13 +1,24 @@
 """
 Centralized logging configuration for SyncLyrics
 Handles all logging setup and provides convenience functions
+
+Records are not written on the calling thread: the root logger only has a
+QueueHandler that drops the record into a bounded queue, and a QueueListener
+thread formats it and runs the console/file handlers (including rollover).
+When the queue is full, DEBUG/INFO records are dropped instead of blocking the
+event loop. DEBUG records from hot polling modules are rate limited per call
+site, and should_log() replaces the ad-hoc throttle timestamps for messages
+that should only appear once per interval.
 """
 
 import logging
 import logging.handlers
 import os
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 # from config import ROOT_DIR  <-- Removed to avoid circular dependency
 import sys
@@ -71,12 +82,189 @@ def log_namer(default_name: str) -> str:
 # Track if logging has been initialized
 _logging_initialized = False
 
+# Queue between the logging call sites and the writer thread
+DEFAULT_QUEUE_SIZE = 10000
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["_NonBlockingQueueHandler"] = None
+
+# DEBUG records per second allowed per call site (logger name prefix -> rate).
+# These modules log on every 10 Hz poll; everything else is not limited.
+RATE_LIMITED_LOGGERS = (
+    "system_utils.metadata",
+    "system_utils.spicetify",
+    "system_utils.windows",
+    "system_utils.spotify",
+    "system_utils.artist_image",
+    "lyrics",
+    "audio_recognition",
+)
+RATE_LIMIT_BURST = 3.0  # Seconds worth of records a call site may emit at once
+
+_stats_lock = threading.Lock()
+_stats = {"queued": 0, "dropped": 0, "rate_limited": 0}
+
+
+def _count(stat: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[stat] += amount
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the caller on DEBUG/INFO records.
+
+    Only merges msg % args (so the writer thread doesn't need the arguments)
+    and leaves full formatting, including tracebacks, to the listener's handlers.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno < logging.WARNING:
+                _count("dropped")
+                return
+            # Warnings and errors are worth a short wait for the writer to catch up
+            try:
+                self.queue.put(record, timeout=0.5)
+            except queue.Full:
+                _count("dropped")
+                return
+        _count("queued")
+
+
+class _RateLimitFilter(logging.Filter):
+    """
+    Token bucket per call site (logger, file, line) for DEBUG records of hot modules.
+
+    The first record let through after suppression says how many were dropped.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        # Longest prefix first so submodule overrides win
+        self._rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self._buckets: Dict[tuple, list] = {}  # call site -> [tokens, last refill, suppressed]
+        self._lock = threading.Lock()
+
+    def _rate_for(self, name: str) -> float:
+        for prefix, rate in self._rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return rate
+        return 0.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        rate = self._rate_for(record.name)
+        if rate <= 0:
+            return True
+
+        site = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        capacity = max(1.0, rate * RATE_LIMIT_BURST)
+        with self._lock:
+            bucket = self._buckets.get(site)
+            if bucket is None:
+                bucket = self._buckets[site] = [capacity, now, 0]
+            else:
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                _count("rate_limited")
+                return False
+            bucket[0] -= 1.0
+            suppressed, bucket[2] = bucket[2], 0
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} [{suppressed} similar suppressed]"
+            record.args = None
+        return True
+
+
+_throttle_lock = threading.Lock()
+_throttle: Dict[str, float] = {}
+_THROTTLE_MAX_KEYS = 500
+
+
+def should_log(key: str, interval: float) -> bool:
+    """
+    Throttle for messages that should appear at most once per interval.
+
+    Args:
+        key: Message identity (e.g. "no_fallback_<artist>")
+        interval: Minimum seconds between two messages with the same key
+
+    Returns:
+        True if the caller should log now (the timestamp is recorded)
+    """
+    now = time.monotonic()
+    with _throttle_lock:
+        last = _throttle.get(key)
+        if last is not None and now - last < interval:
+            return False
+        _throttle[key] = now
+        if len(_throttle) > _THROTTLE_MAX_KEYS:
+            # Forget keys that haven't logged for 5 minutes (prevents unbounded growth)
+            cutoff = now - 300
+            for k in [k for k, t in _throttle.items() if t < cutoff]:
+                del _throttle[k]
+        return True
+
+
+def get_logging_stats() -> Dict[str, int]:
+    """
+    Counters of the logging pipeline.
+
+    Returns:
+        {"queued", "dropped", "rate_limited", "pending", "capacity"}
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    log_queue = _queue_handler.queue if _queue_handler else None
+    stats["pending"] = log_queue.qsize() if log_queue else 0
+    stats["capacity"] = log_queue.maxsize if log_queue else 0
+    return stats
+
+
+def shutdown_logging() -> None:
+    """
+    Flush queued records and close all handlers (idempotent).
+
+    Must run before os._exit() or spawning a replacement process, since
+    atexit handlers are skipped there and the files stay locked otherwise.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        try:
+            _listener.stop()  # Drains the queue before returning
+        except Exception:
+            pass
+        for handler in _listener.handlers:
+            try:
+                handler.close()
+            except Exception:
+                pass
+        _listener = None
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+
 def setup_logging(
     console_level: str = "INFO",
     file_level: str = "DEBUG",
     console: bool = True,
     log_file: Optional[str] = None,
-    log_providers: bool = True
+    log_providers: bool = True,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    debug_rate_limit: float = 5.0,
+    rate_limits: Optional[Dict[str, float]] = None
 ) -> None:
     """
     Set up logging configuration with separate console and file handlers
@@ -87,8 +275,11 @@ def setup_logging(
         console: Whether to enable console logging (default: True)
         log_file: Optional custom log file name
         log_providers: Whether to enable provider logging (default: True)
+        queue_size: Max records waiting for the writer thread (default: 10000)
+        debug_rate_limit: DEBUG records/second per call site in RATE_LIMITED_LOGGERS (0 = unlimited)
+        rate_limits: Per logger-prefix overrides of debug_rate_limit
     """
-    global _logging_initialized
+    global _logging_initialized, _listener, _queue_handler
     if _logging_initialized:
         return
         
@@ -109,12 +300,15 @@ def setup_logging(
     # Clear any existing handlers
     root_logger.handlers = []
     
+    # Handlers below are run by the writer thread, not attached to the root logger
+    handlers = []
+    
     # Console handler (simpler format)
     if console:
         console_handler = logging.StreamHandler(sys.stdout)  # Use stdout instead of stderr
         console_handler.setLevel(getattr(logging, console_level.upper()))
         console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
     # --- INFO File Handler (Session-based, High Backups) ---
     # maxBytes=0 means it won't rotate by size automatically.
@@ -133,7 +327,7 @@ def setup_logging(
         
     info_file_handler.setLevel(logging.INFO)
     info_file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
-    root_logger.addHandler(info_file_handler)
+    handlers.append(info_file_handler)
 
     # DEBUG File handler (Detailed debugging)
     # Rotate logs: 1MB max size, keep 5 backups
@@ -151,7 +345,16 @@ def setup_logging(
         
     debug_file_handler.setLevel(logging.DEBUG)
     debug_file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
-    root_logger.addHandler(debug_file_handler)
+    handlers.append(debug_file_handler)
+    
+    # Non-blocking pipeline: callers only enqueue, the listener thread writes
+    limits = {prefix: debug_rate_limit for prefix in RATE_LIMITED_LOGGERS}
+    limits.update(rate_limits or {})
+    _queue_handler = _NonBlockingQueueHandler(queue.Queue(maxsize=max(100, queue_size)))
+    _queue_handler.addFilter(_RateLimitFilter(limits))
+    root_logger.addHandler(_queue_handler)
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
     
     # Configure specific loggers
     if log_providers:
@@ -3,6 +3,7 @@ import logging
 import json
 import os
 import tempfile
+import time
 from typing import Optional, List, Tuple, Dict, Set, Any
 
 from system_utils import get_current_song_meta_data, create_tracked_task
@@ -11,8 +12,9 @@ from providers.netease import NetEaseProvider
 from providers.spotify_lyrics import SpotifyLyrics
 from providers.qq import QQMusicProvider
 from providers.musixmatch import MusixmatchProvider
-from config import LYRICS, DEBUG, FEATURES, DATABASE_DIR
-from logging_config import get_logger
+from config import LYRICS, DEBUG, FEATURES, DATABASE_DIR, SOURCE_LATENCY
+from logging_config import get_logger, should_log
+from metrics import histogram, timed, timed_async
 
 logger = get_logger(__name__)
 
@@ -332,6 +334,29 @@ async def save_song_word_sync_offset(artist: str, title: str, offset: float) ->
             return False
 
 
+async def _call_provider(provider: Any, artist: str, title: str, album: Optional[str], duration: Optional[int]) -> Any:
+    """Calls provider.get_lyrics (sync providers run in a thread) and records its latency.
+    
+    Recorded as lyrics_provider_seconds{provider, outcome}, outcome being
+    found / empty / error / cancelled (laggards cancelled after a better result).
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        if asyncio.iscoroutinefunction(provider.get_lyrics):
+            result = await provider.get_lyrics(artist, title, album, duration)
+        else:
+            result = await asyncio.to_thread(provider.get_lyrics, artist, title, album, duration)
+        outcome = "found" if result else "empty"
+        return result
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    finally:
+        histogram("lyrics_provider_seconds", "Lyrics provider call latency",
+                  provider=getattr(provider, "name", "Unknown"), outcome=outcome).observe(time.perf_counter() - start)
+
+
 def _normalize_provider_result(result: Optional[Any]) -> Tuple[Optional[List[Tuple[float, str]]], Dict[str, Any], Optional[List[Dict[str, Any]]]]:
     """
     Normalize provider output into a lyrics list, metadata dict, and word-synced data.
@@ -664,7 +689,8 @@ async def _save_to_db(artist: str, title: str, lyrics: list, source: str,
     async with _db_lock:
         try:
             # Run blocking file I/O in thread pool
-            provider_count = await asyncio.to_thread(_do_file_io)
+            with timed("lyrics_save_seconds"):
+                provider_count = await asyncio.to_thread(_do_file_io)
             
             # Log what we saved
             word_sync_status = f", word-sync from {source}" if word_synced else ""
@@ -763,12 +789,7 @@ def _backfill_missing_providers(
             provider_map: Dict[asyncio.Task, object] = {}
 
             for provider in missing_providers:
-                if asyncio.iscoroutinefunction(provider.get_lyrics):
-                    coro = provider.get_lyrics(artist, title, album, duration)
-                else:
-                    coro = asyncio.to_thread(provider.get_lyrics, artist, title, album, duration)
-
-                task = asyncio.create_task(coro)
+                task = asyncio.create_task(_call_provider(provider, artist, title, album, duration))
                 tasks.add(task)
                 provider_map[task] = provider
 
@@ -1021,10 +1042,7 @@ async def set_provider_preference(artist: str, title: str, provider_name: str) -
             duration_ms = current_song_data.get("duration_ms")
             duration = duration_ms // 1000 if duration_ms else None
         
-        if asyncio.iscoroutinefunction(provider_obj.get_lyrics):
-            raw_result = await provider_obj.get_lyrics(artist, title, album, duration)
-        else:
-            raw_result = await asyncio.to_thread(provider_obj.get_lyrics, artist, title, album, duration)
+        raw_result = await _call_provider(provider_obj, artist, title, album, duration)
 
         lyrics, metadata, word_synced = _normalize_provider_result(raw_result)
         lyrics = _apply_instrumental_marker(lyrics, metadata)
@@ -1448,6 +1466,7 @@ async def _fetch_and_set_lyrics(target_artist: str, target_title: str,
     except Exception as e:
         logger.error(f"Error in background fetch for {target_artist}: {e}")
 
+@timed_async("lyrics_update_seconds")
 async def _update_song():
     """
     Updates current song data and fetches lyrics if changed.
@@ -1473,14 +1492,11 @@ async def _update_song():
         if new_song_data is None or (not new_song_data["artist"].strip() or not new_song_data["title"].strip()):
             # Throttled log: only log once every 60 seconds to prevent spam
             if new_song_data is not None:
-                import time
                 from system_utils import state
-                current_time = time.time()
-                if current_time - state._lyrics_skip_last_log_time >= state._LYRICS_SKIP_LOG_INTERVAL:
-                    state._lyrics_skip_last_log_time = current_time
+                if should_log("lyrics_skip_incomplete", state._LYRICS_SKIP_LOG_INTERVAL):
                     artist = new_song_data.get("artist", "") or "(empty)"
                     title = new_song_data.get("title", "") or "(empty)"
-                    logger.debug(f"Skipping lyrics: incomplete metadata - artist: '{artist}', title: '{title}'")
+                    logger.debug("Skipping lyrics: incomplete metadata - artist: '%s', title: '%s'", artist, title)
             
             current_song_lyrics = None
             current_song_data = new_song_data
@@ -1531,7 +1547,7 @@ async def _update_song():
             if manual_flag is False:
                 # User explicitly marked as NOT instrumental - skip cached instrumental check
                 # This fixes the bug where Musixmatch false positives poisoned the cache
-                logger.debug(f"Song {target_artist} - {target_title} is manually marked as NOT instrumental, proceeding with lyrics")
+                logger.debug("Song %s - %s is manually marked as NOT instrumental, proceeding with lyrics", target_artist, target_title)
                 # Fall through to lyrics loading (don't check _is_cached_instrumental)
             elif _is_cached_instrumental(target_artist, target_title):
                 # Auto-detection: only check cached instrumental if no manual flag
@@ -1593,7 +1609,7 @@ async def _update_song():
                                 backfill_duration = backfill_duration_ms // 1000 if backfill_duration_ms else None
                                 _backfill_missing_providers(target_artist, target_title, missing, album=backfill_album, duration=backfill_duration)
                     else:
-                        logger.debug(f"Skipping backfill for {target_artist} - {target_title} (have {len(saved_providers)} providers, word-sync: {has_word_sync})")
+                        logger.debug("Skipping backfill for %s - %s (have %d providers, word-sync: %s)", target_artist, target_title, len(saved_providers), has_word_sync)
             else:
                 # 2. Try Internet (Smart Race) - BACKGROUND
                 # CRITICAL PERFORMANCE FIX: Don't await internet fetch inside lock
@@ -1611,7 +1627,8 @@ async def _update_song():
             # Song hasn't changed, just update the metadata (position, etc.)
             current_song_data = new_song_data
 
-async def _get_lyrics(artist: str, title: str, album: str = None, duration: int = None):
+async def _get_lyrics(artist: str, title: str, album: str = None, duration: int = None,
+                      set_current_provider: bool = True):
     """
     Tries providers to find lyrics.
     
@@ -1620,6 +1637,8 @@ async def _get_lyrics(artist: str, title: str, album: str = None, duration: int
         title: Song title
         album: Album name for better matching (optional)
         duration: Track duration in seconds for scoring (optional)
+        set_current_provider: Record the winner in current_song_provider (False for
+            background fetches of songs that are not playing, e.g. library backfill)
     
     Modes:
     1. Sequential: Tries one by one. Safe, but slow.
@@ -1639,10 +1658,7 @@ async def _get_lyrics(artist: str, title: str, album: str = None, duration: int
         best_provider_name = None
         for provider in sorted_providers:
             try:
-                if asyncio.iscoroutinefunction(provider.get_lyrics):
-                    raw_result = await provider.get_lyrics(artist, title, album, duration)
-                else:
-                    raw_result = await asyncio.to_thread(provider.get_lyrics, artist, title, album, duration)
+                raw_result = await _call_provider(provider, artist, title, album, duration)
 
                 lyrics, metadata, word_synced = _normalize_provider_result(raw_result)
                 lyrics = _apply_instrumental_marker(lyrics, metadata)
@@ -1655,7 +1671,7 @@ async def _get_lyrics(artist: str, title: str, album: str = None, duration: int
                         best_provider_name = provider.name
             except Exception as e:
                 logger.error(f"Error with {provider.name}: {e}")
-        if best_provider_name:
+        if best_provider_name and set_current_provider:
             current_song_provider = best_provider_name
         return best_lyrics
 
@@ -1664,13 +1680,8 @@ async def _get_lyrics(artist: str, title: str, album: str = None, duration: int
     provider_map = {} # Map tasks to provider objects
 
     for provider in sorted_providers:
-        # Wrap sync functions in thread, keep async functions as is
-        if asyncio.iscoroutinefunction(provider.get_lyrics):
-            coro = provider.get_lyrics(artist, title, album, duration)
-        else:
-            coro = asyncio.to_thread(provider.get_lyrics, artist, title, album, duration)
-        
-        task = asyncio.create_task(coro)
+        # Sync providers run in a thread (see _call_provider)
+        task = asyncio.create_task(_call_provider(provider, artist, title, album, duration))
         tasks.append(task)
         provider_map[task] = provider
 
@@ -1714,7 +1725,8 @@ async def _get_lyrics(artist: str, title: str, album: str = None, duration: int
 
                 # Case A: High Quality provider (priority 1-2) finished – return immediately for UX
                 if provider.priority <= 2:
-                    current_song_provider = provider.name
+                    if set_current_provider:
+                        current_song_provider = provider.name
                     if pending:
                         _save_all_results_background(artist, title, pending, provider_map, timeout=LYRICS.get("background_timeout_high_quality", 8.0))
                     return best_result
@@ -1723,7 +1735,7 @@ async def _get_lyrics(artist: str, title: str, album: str = None, duration: int
             high_priority_pending = any(provider_map[t].priority <= 2 for t in pending)
             
             if not high_priority_pending:
-                if best_provider_name:
+                if best_provider_name and set_current_provider:
                     current_song_provider = best_provider_name
                 logger.info("No high quality providers pending. Returning best current lyrics.")
                 _save_all_results_background(artist, title, pending, provider_map, timeout=LYRICS.get("background_timeout_low_quality", 5.0))
@@ -1770,7 +1782,8 @@ async def _get_lyrics(artist: str, title: str, album: str = None, duration: int
                             logger.info(f"Grace window upgraded best result to {provider.name} (priority {provider.priority})")
 
                         if provider.priority <= 2:
-                            current_song_provider = provider.name
+                            if set_current_provider:
+                                current_song_provider = provider.name
                             if pending:
                                 _save_all_results_background(
                                     artist,
@@ -1784,13 +1797,13 @@ async def _get_lyrics(artist: str, title: str, album: str = None, duration: int
                 # Continue loop to keep waiting for the remaining providers after processing grace tasks
                 continue
             else:
-                if best_provider_name:
+                if best_provider_name and set_current_provider:
                     current_song_provider = best_provider_name
                 logger.info("Grace period expired with no upgrade, returning backup lyrics.")
                 _save_all_results_background(artist, title, pending, provider_map, timeout=LYRICS.get("background_timeout_low_quality", 5.0))
                 return best_result
 
-    if best_provider_name:
+    if best_provider_name and set_current_provider:
         current_song_provider = best_provider_name
     return best_result
 
@@ -1809,37 +1822,15 @@ def _find_current_lyric_index(delta: Optional[float] = None) -> int:
     if current_song_lyrics is None or current_song_data is None:
         return -1
     
-    # Read latency compensation dynamically from settings (allows hot-reload)
-    # FIX: Previously used static LATENCY_COMPENSATION which didn't update on settings change
-    general_latency = LYRICS.get("display", {}).get("latency_compensation", 0.0)
-    
+    # Latency compensation (config keeps these current on settings changes)
     # Use delta if provided (manual override), otherwise use setting
-    base_delta = delta if delta is not None else general_latency
-    
-    # Adaptive latency compensation: Use separate compensation for Spotify-only mode
-    # This helps lyrics sync correctly when using Spotify API as primary source (e.g., HAOS)
-    source = current_song_data.get("source", "")
-    
-    if source == "spotify":
-        # Spotify-only mode: Use configurable spotify_latency_compensation
-        # Default -0.5s means lyrics appear 500ms later to compensate for API polling latency
-        # Users on HAOS or with fast connections may want to adjust this
-        adaptive_delta = LYRICS.get("display", {}).get("spotify_latency_compensation", -0.5)
-    elif source == "spicetify":
-        # Spicetify mode: Use configurable spicetify_latency_compensation
-        # Default 0.0s since Spicetify provides real-time position via WebSocket (like Windows SMTC)
-        adaptive_delta = LYRICS.get("display", {}).get("spicetify_latency_compensation", 0.0)
-    elif source == "audio_recognition":
-        # Audio recognition: Use configurable audio_recognition_latency_compensation
-        # Positive = lyrics earlier, Negative = lyrics later
-        adaptive_delta = LYRICS.get("display", {}).get("audio_recognition_latency_compensation", 0.0)
-    elif source == "music_assistant":
-        # Music Assistant: Use configurable music_assistant_latency_compensation
-        # Positive = lyrics earlier, Negative = lyrics later
-        adaptive_delta = LYRICS.get("display", {}).get("music_assistant_latency_compensation", 0.0)
-    else:
-        # Normal mode (Windows Media, hybrid): Use base delta
-        adaptive_delta = base_delta
+    base_delta = delta if delta is not None else LYRICS["display"]["latency_compensation"]
+    
+    # Adaptive latency compensation: sources with their own timing characteristics
+    # (Spotify API polling lag, Spicetify/Music Assistant/audio recognition) have
+    # separate settings; Windows Media and hybrid modes use the base delta.
+    # Positive = lyrics earlier, Negative = lyrics later
+    adaptive_delta = SOURCE_LATENCY.get(current_song_data.get("source", ""), base_delta)
     
     position = current_song_data.get("position", 0)
     
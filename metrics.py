@@ -0,0 +1,353 @@
+"""
+In-process metrics for SyncLyrics hot paths.
+
+Counters, gauges and latency histograms kept in memory and exposed at
+/metrics (Prometheus text format, or JSON with ?format=json). Histograms use
+HDR-style log-linear buckets (~4% relative error from 10us to hours) so
+p50/p99 cost nothing to record; quantiles are reported over a sliding window
+of the last 1-2 minutes, count/sum over the whole session.
+
+Usage:
+    from metrics import timed, counter
+
+    with timed("lyrics_save_seconds"):
+        ...
+
+    @timed_async("metadata_fetch_seconds")
+    async def get_current_song_meta_data(): ...
+
+    counter("websocket_messages_total", direction="out").inc()
+
+Metrics are identified by name + labels; calling histogram()/counter()/gauge()
+again with the same arguments returns the same object. Keep label values
+low-cardinality (provider names, outcomes), never artists or titles.
+"""
+
+import functools
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# HDR-style buckets: bucket i covers (MIN_VALUE * GROWTH^(i-1), MIN_VALUE * GROWTH^i]
+MIN_VALUE = 1e-5               # 10 microseconds
+GROWTH = 2 ** (1 / 8)          # 8 buckets per doubling
+_LOG_GROWTH = math.log(GROWTH)
+WINDOW_SECONDS = 60            # Quantile window (current + previous window)
+QUANTILES = (0.5, 0.9, 0.99)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_metrics: Dict[Tuple[str, LabelKey], "_Metric"] = {}
+_help: Dict[str, Tuple[str, str]] = {}  # name -> (type, help)
+_callbacks: List[Tuple[str, str, Callable[[], Dict[LabelKey, float]]]] = []
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, labels: LabelKey):
+        self.name = name
+        self.labels = labels
+        self._lock = threading.Lock()
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    kind = "counter"
+
+    def __init__(self, name: str, labels: LabelKey):
+        super().__init__(name, labels)
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (queue depth, connected clients)."""
+    kind = "gauge"
+
+    def __init__(self, name: str, labels: LabelKey):
+        super().__init__(name, labels)
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+
+class Histogram(_Metric):
+    """Latency distribution in seconds (exported as a Prometheus summary)."""
+    kind = "summary"
+
+    def __init__(self, name: str, labels: LabelKey):
+        super().__init__(name, labels)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._current: Dict[int, int] = {}
+        self._previous: Dict[int, int] = {}
+        self._window_start = time.monotonic()
+
+    @staticmethod
+    def _bucket(value: float) -> int:
+        if value <= MIN_VALUE:
+            return 0
+        return math.ceil(math.log(value / MIN_VALUE) / _LOG_GROWTH)
+
+    def _rotate(self, now: float) -> None:
+        elapsed = now - self._window_start
+        if elapsed >= WINDOW_SECONDS:
+            # A full idle window in between means the previous window is stale too
+            self._previous = self._current if elapsed < 2 * WINDOW_SECONDS else {}
+            self._current = {}
+            self._window_start = now
+
+    def observe(self, seconds: float) -> None:
+        bucket = self._bucket(seconds)
+        with self._lock:
+            self._rotate(time.monotonic())
+            self._current[bucket] = self._current.get(bucket, 0) + 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantiles(self, qs=QUANTILES) -> Dict[float, Optional[float]]:
+        """
+        Quantiles over the recent window.
+
+        Returns:
+            {q: seconds (bucket midpoint, within ~4%), or None if nothing was recorded recently}
+        """
+        with self._lock:
+            self._rotate(time.monotonic())
+            merged = dict(self._previous)
+            for bucket, n in self._current.items():
+                merged[bucket] = merged.get(bucket, 0) + n
+            largest = self.max
+        total = sum(merged.values())
+        if not total:
+            return {q: None for q in qs}
+
+        result = {}
+        buckets = sorted(merged.items())
+        for q in qs:
+            rank = max(1, math.ceil(q * total))
+            seen = 0
+            for bucket, n in buckets:
+                seen += n
+                if seen >= rank:
+                    result[q] = min(MIN_VALUE * GROWTH ** (bucket - 0.5), largest) if bucket else MIN_VALUE
+                    break
+        return result
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+
+class _Timer:
+    """Context manager observing the elapsed time of its block (also on exceptions)."""
+
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+def _get(cls, name: str, help_text: str, labels: Dict[str, Any]):
+    key = (name, _label_key(labels))
+    metric = _metrics.get(key)
+    if metric is None:
+        with _lock:
+            metric = _metrics.get(key)
+            if metric is None:
+                metric = _metrics[key] = cls(name, key[1])
+                if help_text or name not in _help:
+                    _help[name] = (cls.kind, help_text)
+    return metric
+
+
+def counter(name: str, help_text: str = "", **labels) -> Counter:
+    """Get or create a counter."""
+    return _get(Counter, name, help_text, labels)
+
+
+def gauge(name: str, help_text: str = "", **labels) -> Gauge:
+    """Get or create a gauge."""
+    return _get(Gauge, name, help_text, labels)
+
+
+def histogram(name: str, help_text: str = "", **labels) -> Histogram:
+    """Get or create a latency histogram (seconds)."""
+    return _get(Histogram, name, help_text, labels)
+
+
+def timed(name: str, **labels) -> _Timer:
+    """Context manager recording the block's duration in histogram `name`."""
+    return histogram(name, **labels).time()
+
+
+def timed_async(name: str, **labels):
+    """Decorator recording the duration of each call of a coroutine function."""
+    def decorator(func):
+        hist = histogram(name, **labels)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with hist.time():
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def register_callback(name: str, help_text: str, func: Callable[[], Any], kind: str = "gauge") -> None:
+    """
+    Register a value computed at scrape time (e.g. a queue size owned by another module).
+
+    Args:
+        name: Metric name
+        help_text: Prometheus HELP text
+        func: Returns a number, or {labels dict as LabelKey: number}
+        kind: "gauge" or "counter"
+    """
+    with _lock:
+        _callbacks[:] = [cb for cb in _callbacks if cb[0] != name]
+        _callbacks.append((name, help_text, func))
+        _help[name] = (kind, help_text)
+
+
+def _collect_callbacks() -> Dict[str, Dict[LabelKey, float]]:
+    values = {}
+    for name, _, func in list(_callbacks):
+        try:
+            value = func()
+        except Exception:
+            continue  # A broken collector must not break the endpoint
+        values[name] = value if isinstance(value, dict) else {(): value}
+    return values
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: Optional[float]) -> str:
+    if value is None:
+        return "NaN"
+    return repr(float(value))
+
+
+def render_prometheus() -> str:
+    """All metrics in Prometheus text exposition format (0.0.4)."""
+    by_name: Dict[str, List[_Metric]] = {}
+    with _lock:
+        for (name, _), metric in sorted(_metrics.items()):
+            by_name.setdefault(name, []).append(metric)
+    callback_values = _collect_callbacks()
+
+    lines = []
+    for name in sorted(set(by_name) | set(callback_values)):
+        kind, help_text = _help.get(name, ("gauge", ""))
+        if help_text:
+            lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for metric in by_name.get(name, []):
+            if isinstance(metric, Histogram):
+                for q, value in metric.quantiles().items():
+                    lines.append(f"{name}{_format_labels(metric.labels, ('quantile', str(q)))} {_format_value(value)}")
+                lines.append(f"{name}_sum{_format_labels(metric.labels)} {_format_value(metric.sum)}")
+                lines.append(f"{name}_count{_format_labels(metric.labels)} {metric.count}")
+            else:
+                lines.append(f"{name}{_format_labels(metric.labels)} {_format_value(metric.value)}")
+        for labels, value in callback_values.get(name, {}).items():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _json_name(name: str, labels: LabelKey) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}"
+
+
+def get_metrics_snapshot() -> Dict[str, Any]:
+    """
+    All metrics as JSON-friendly dicts.
+
+    Returns:
+        {"counters": {...}, "gauges": {...}, "histograms": {name: {count, sum, max, p50, p90, p99}}};
+        labelled metrics are keyed as 'name{label=value}', latencies are in milliseconds
+    """
+    snapshot = {"counters": {}, "gauges": {}, "histograms": {}}
+    with _lock:
+        metrics = sorted(_metrics.items())
+    for (name, labels), metric in metrics:
+        key = _json_name(name, labels)
+        if isinstance(metric, Histogram):
+            entry = {
+                "count": metric.count,
+                "sum_ms": round(metric.sum * 1000, 3),
+                "max_ms": round(metric.max * 1000, 3),
+            }
+            for q, value in metric.quantiles().items():
+                entry[f"p{int(q * 100)}_ms"] = round(value * 1000, 3) if value is not None else None
+            snapshot["histograms"][key] = entry
+        elif isinstance(metric, Counter):
+            snapshot["counters"][key] = metric.value
+        else:
+            snapshot["gauges"][key] = metric.value
+    for name, values in _collect_callbacks().items():
+        section = "counters" if _help.get(name, ("gauge",))[0] == "counter" else "gauges"
+        for labels, value in values.items():
+            snapshot[section][_json_name(name, labels)] = value
+    return snapshot
+
+
+def get_latency_summary() -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Compact p50/p99 per histogram for the /health dashboard.
+
+    Returns:
+        {'name{labels}': {"p50_ms", "p99_ms", "count"}}
+    """
+    histograms = get_metrics_snapshot()["histograms"]
+    return {
+        key: {"p50_ms": h["p50_ms"], "p99_ms": h["p99_ms"], "count": h["count"]}
+        for key, h in histograms.items()
+    }
+
+
+def _logging_stats() -> Dict[LabelKey, float]:
+    from logging_config import get_logging_stats
+    return {(("stat", k),): v for k, v in get_logging_stats().items()}
+
+
+register_callback("logging_pipeline_records", "Logging queue counters (queued, dropped, rate_limited, pending, capacity)", _logging_stats)
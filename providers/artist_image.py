@@ -9,16 +9,21 @@ Fetches high-quality artist images, logos, and backgrounds from:
 6. Last.fm (Fallback)
 """
 import asyncio
+import functools
+import json
 import logging
 import os
 import re
+import threading
 import time
 import unicodedata
 from difflib import SequenceMatcher
 import requests
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import quote
 
+from config import CACHE_DIR
+
 # Safe import of ARTIST_IMAGE config - prevents crash if config.py is outdated
 try:
     from config import ARTIST_IMAGE
@@ -177,6 +182,117 @@ def safe_likes(item: Dict[str, Any]) -> int:
         # Handle non-numeric strings, wrong types, etc.
         return 0
 
+# ============================================================================
+# Persistent lookup cache
+# ============================================================================
+# Per-artist results of each source lookup (image URL lists, AudioDB MBID, the
+# resolved Wikipedia page title), kept across restarts so repeat artists skip the
+# multi-hop Wikipedia resolution and the other API calls. "Nothing found" is
+# cached too, with a shorter TTL; failed requests (fetchers return None) are not.
+
+LOOKUP_CACHE_PATH = CACHE_DIR / "artist_image_lookups.json"
+LOOKUP_CACHE_MAX_ARTISTS = 5000  # Least recently updated artists dropped beyond this
+
+_DAY = 86400
+# lookup -> (TTL when something was found, TTL when nothing was found), seconds
+LOOKUP_TTLS: Dict[str, Tuple[int, int]] = {
+    "deezer": (30 * _DAY, 3 * _DAY),
+    "theaudiodb": (30 * _DAY, 7 * _DAY),       # Also carries the MBID used for FanArt.tv
+    "fanart": (14 * _DAY, 3 * _DAY),           # Keyed by MBID; new uploads are common
+    "wikipedia": (30 * _DAY, 7 * _DAY),
+    "wikipedia_page": (90 * _DAY, 7 * _DAY),   # Page titles rarely change
+}
+
+_lookup_cache: Optional[Dict[str, Dict[str, list]]] = None  # artist key (or MBID) -> {lookup: [timestamp, value]}
+_lookup_lock = threading.Lock()
+_lookup_dirty = False
+
+
+def _lookup_key(artist: str) -> str:
+    """Case/width-insensitive artist key."""
+    return unicodedata.normalize('NFKC', artist).casefold().strip()
+
+
+def _is_empty_lookup(value: Any) -> bool:
+    """True for a cached "nothing found" result."""
+    if isinstance(value, dict):
+        return not value.get('images') and not value.get('mbid')
+    return not value
+
+
+def _load_lookups() -> Dict[str, Dict[str, list]]:
+    """Load the lookup cache file (once)."""
+    global _lookup_cache
+    if _lookup_cache is None:
+        with _lookup_lock:
+            if _lookup_cache is None:
+                cache = {}
+                try:
+                    with open(LOOKUP_CACHE_PATH, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    if isinstance(data, dict):
+                        cache = data
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    logger.warning(f"Artist image lookup cache unreadable, starting empty: {e}")
+                _lookup_cache = cache
+    return _lookup_cache
+
+
+def _get_lookup(artist: str, lookup: str) -> Tuple[bool, Any]:
+    """
+    Return a cached lookup result if it is still fresh.
+
+    Returns:
+        (hit, value)
+    """
+    entry = _load_lookups().get(_lookup_key(artist), {}).get(lookup)
+    if not entry:
+        return False, None
+    timestamp, value = entry
+    found_ttl, empty_ttl = LOOKUP_TTLS[lookup]
+    ttl = empty_ttl if _is_empty_lookup(value) else found_ttl
+    if time.time() - timestamp > ttl:
+        return False, None
+    return True, value
+
+
+def _set_lookup(artist: str, lookup: str, value: Any) -> None:
+    """Cache a lookup result (saved by _save_lookups)."""
+    global _lookup_dirty
+    cache = _load_lookups()
+    with _lookup_lock:
+        cache.setdefault(_lookup_key(artist), {})[lookup] = [time.time(), value]
+        _lookup_dirty = True
+
+
+def _save_lookups() -> None:
+    """Write the lookup cache if it changed (temp file + rename)."""
+    global _lookup_dirty
+    if not _lookup_dirty:
+        return
+    with _lookup_lock:
+        if len(_lookup_cache) > LOOKUP_CACHE_MAX_ARTISTS:
+            newest = sorted(
+                _lookup_cache.items(),
+                key=lambda item: max(entry[0] for entry in item[1].values()),
+                reverse=True,
+            )
+            _lookup_cache.clear()
+            _lookup_cache.update(newest[:LOOKUP_CACHE_MAX_ARTISTS])
+        snapshot = json.dumps(_lookup_cache, ensure_ascii=False, separators=(',', ':'))
+        _lookup_dirty = False
+    try:
+        LOOKUP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = LOOKUP_CACHE_PATH.with_suffix(".json.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(snapshot)
+        os.replace(tmp, LOOKUP_CACHE_PATH)
+    except Exception as e:
+        logger.debug(f"Failed to save artist image lookup cache: {e}")
+
+
 class ArtistImageProvider:
     """
     Provider for fetching high-quality artist images from multiple sources.
@@ -213,10 +329,12 @@ class ArtistImageProvider:
         try:
             self.enable_wikipedia = ARTIST_IMAGE.get("enable_wikipedia", True)
             self.enable_fanart_albumcover = ARTIST_IMAGE.get("enable_fanart_albumcover", True)
+            self.lookup_cache = ARTIST_IMAGE.get("lookup_cache", True)
         except (NameError, AttributeError):
             # Fallback if config not available
             self.enable_wikipedia = True
             self.enable_fanart_albumcover = True
+            self.lookup_cache = True
         
         # Log initialization status
         api_key_status = "set" if self.fanart_api_key else "missing"
@@ -244,12 +362,38 @@ class ArtistImageProvider:
         
         logger.info(f"ArtistImageProvider initialized - {', '.join(features)}")
 
-    async def get_artist_images(self, artist_name: str) -> List[Dict[str, Any]]:
+    def _cached_lookup(self, artist: str, lookup: str, fetch, *args, refresh: bool = False) -> Any:
+        """
+        Run a source lookup through the persistent lookup cache (blocking).
+
+        Args:
+            artist: Artist name (cache key)
+            lookup: Lookup name (key of LOOKUP_TTLS)
+            fetch: Fetcher returning the result, or None if the request failed
+            *args: Fetcher arguments
+            refresh: Ignore cached results (the new result is still cached)
+
+        Returns:
+            Cached or fetched result (None if the fetch failed)
+        """
+        if not self.lookup_cache:
+            return fetch(*args)
+        if not refresh:
+            hit, value = _get_lookup(artist, lookup)
+            if hit:
+                return value
+        value = fetch(*args)
+        if value is not None:
+            _set_lookup(artist, lookup, value)
+        return value
+
+    async def get_artist_images(self, artist_name: str, refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Fetch artist images from all enabled sources in parallel.
         
         Args:
             artist_name: Name of the artist to search for
+            refresh: Bypass the persistent lookup cache (manual refetch)
             
         Returns:
             List of dicts with format: {'url': str, 'source': str, 'width': int, 'height': int, 'type': str}
@@ -260,17 +404,20 @@ class ArtistImageProvider:
         loop = asyncio.get_running_loop()
         tasks = []
         
+        def cached(lookup, fetch, *args):
+            return functools.partial(self._cached_lookup, artist_name, lookup, fetch, *args, refresh=refresh)
+        
         # 1. Wikipedia/Wikimedia (Ultra high-res, 1500-5000px, free, no auth required)
         if self.enable_wikipedia:
-            tasks.append(loop.run_in_executor(None, self._fetch_wikipedia, artist_name))
+            tasks.append(loop.run_in_executor(None, cached("wikipedia", self._fetch_wikipedia, artist_name, refresh)))
         
         # 2. Deezer (Fast, high quality, free, no auth required)
         if self.enable_deezer:
-            tasks.append(loop.run_in_executor(None, self._fetch_deezer, artist_name))
+            tasks.append(loop.run_in_executor(None, cached("deezer", self._fetch_deezer, artist_name)))
             
         # 3. TheAudioDB (Rich metadata + MBID for FanArt.tv)
         if self.enable_audiodb:
-            tasks.append(loop.run_in_executor(None, self._fetch_theaudiodb, artist_name))
+            tasks.append(loop.run_in_executor(None, cached("theaudiodb", self._fetch_theaudiodb, artist_name)))
             
         # Run all in parallel with timeout - use asyncio.wait for partial results
         # If some providers timeout, we still keep results from providers that succeeded
@@ -322,10 +469,15 @@ class ArtistImageProvider:
         # Only fetch if we have both MBID and API key
         if self.enable_fanart and self.fanart_api_key and mbid:
             try:
-                fanart_images = await loop.run_in_executor(None, self._fetch_fanart, mbid)
-                all_images.extend(fanart_images)
+                # Cached under the MBID (not the artist name) so a corrected MBID is looked up fresh
+                fanart_images = await loop.run_in_executor(None, functools.partial(
+                    self._cached_lookup, mbid, "fanart", self._fetch_fanart, mbid, refresh=refresh
+                ))
+                all_images.extend(fanart_images or [])
             except Exception as e:
                 logger.error(f"FanArt.tv fetch failed: {e}")
+        
+        await loop.run_in_executor(None, _save_lookups)
 
         # Deduplicate by URL to avoid storing the same image multiple times
         # Defensive: Handle cases where image dict might be malformed or missing 'url' key
@@ -345,7 +497,7 @@ class ArtistImageProvider:
                 
         return unique_images
 
-    def _fetch_deezer(self, artist: str) -> List[Dict[str, Any]]:
+    def _fetch_deezer(self, artist: str) -> Optional[List[Dict[str, Any]]]:
         """
         Fetch artist images from Deezer API.
         Deezer provides high-quality 1000x1000px images for free, no authentication required.
@@ -354,14 +506,14 @@ class ArtistImageProvider:
             artist: Artist name to search for
             
         Returns:
-            List of image dicts with Deezer images
+            List of image dicts with Deezer images, or None if the request failed
         """
         try:
             # Step 1: Search for artist to get ID
             search_url = f"https://api.deezer.com/search/artist?q={quote(artist)}"
             resp = self.session.get(search_url, timeout=self.timeout)
             if resp.status_code != 200: 
-                return []
+                return None
             
             data = resp.json()
             if not data.get('data') or len(data.get('data', [])) == 0:
@@ -425,9 +577,9 @@ class ArtistImageProvider:
             return images
         except Exception as e:
             logger.debug(f"Deezer fetch failed for {artist}: {e}")
-            return []
+            return None
 
-    def _fetch_theaudiodb(self, artist: str) -> Dict[str, Any]:
+    def _fetch_theaudiodb(self, artist: str) -> Optional[Dict[str, Any]]:
         """
         Fetch artist images from TheAudioDB API.
         TheAudioDB provides multiple image types (thumbnails, logos, backgrounds) and includes
@@ -437,7 +589,7 @@ class ArtistImageProvider:
             artist: Artist name to search for
             
         Returns:
-            Dict with format: {'images': List[Dict], 'mbid': Optional[str]}
+            Dict with format: {'images': List[Dict], 'mbid': Optional[str]}, or None if the request failed
         """
         result = {'images': [], 'mbid': None}
         try:
@@ -445,7 +597,7 @@ class ArtistImageProvider:
             url = f"https://www.theaudiodb.com/api/v1/json/{self.audiodb_api_key}/search.php?s={quote(artist)}"
             resp = self.session.get(url, timeout=self.timeout)
             if resp.status_code != 200:
-                return result
+                return None
                 
             data = resp.json()
             if not data or not data.get('artists') or len(data.get('artists', [])) == 0:
@@ -498,9 +650,9 @@ class ArtistImageProvider:
             
         except Exception as e:
             logger.debug(f"TheAudioDB fetch failed for {artist}: {e}")
-            return result
+            return None
 
-    def _fetch_fanart(self, mbid: str) -> List[Dict[str, Any]]:
+    def _fetch_fanart(self, mbid: str) -> Optional[List[Dict[str, Any]]]:
         """
         Fetch artist images from FanArt.tv API.
         FanArt.tv provides the highest quality curated images but requires:
@@ -511,7 +663,7 @@ class ArtistImageProvider:
             mbid: MusicBrainz ID of the artist
             
         Returns:
-            List of image dicts with FanArt.tv images
+            List of image dicts with FanArt.tv images, or None if the request failed
         """
         if not self.fanart_api_key or not mbid:
             return []
@@ -522,7 +674,8 @@ class ArtistImageProvider:
             resp = self.session.get(url, timeout=self.timeout)
             if resp.status_code != 200:
                 logger.debug(f"FanArt.tv returned status {resp.status_code} for MBID {mbid}")
-                return []
+                # 404 = FanArt.tv has nothing for this artist; anything else may be transient
+                return [] if resp.status_code == 404 else None
                 
             data = resp.json()
             images = []
@@ -636,9 +789,9 @@ class ArtistImageProvider:
             return images
         except Exception as e:
             logger.debug(f"FanArt.tv fetch failed for MBID {mbid}: {e}")
-            return []
+            return None
     
-    def _fetch_wikipedia(self, artist: str) -> List[Dict[str, Any]]:
+    def _fetch_wikipedia(self, artist: str, refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
         """
         Fetch high-resolution artist images from Wikipedia/Wikimedia Commons.
         Provides 1500-12000px ultra-high-res images for artists (7-10 images on average).
@@ -676,184 +829,16 @@ class ArtistImageProvider:
         
         Args:
             artist: Artist name to search for
+            refresh: Re-resolve the page title instead of using the cached one
             
         Returns:
-            List of image dicts with Wikipedia/Wikimedia images (up to 10, filtered by quality)
+            List of image dicts with Wikipedia/Wikimedia images (up to 10, filtered by quality),
+            or None if the lookup failed
         """
         try:
-            page_title = None
-            strategy_used = None
-            
-            # Strategy 1: Direct lookup (fastest, most accurate)
-            # Wikipedia automatically normalizes page titles and handles redirects
-            if _should_log_wikipedia(artist, 'strategy'):
-                logger.debug(f"Wikipedia: Strategy 1 (direct lookup) - Checking '{artist}'")
-            
-            lookup_url = "https://en.wikipedia.org/w/api.php"
-            lookup_params = {
-                'action': 'query',
-                'format': 'json',
-                'titles': artist,
-                'prop': 'info',
-                'inprop': 'url'
-            }
-            
-            resp = self.session.get(lookup_url, params=lookup_params, timeout=self.timeout)
-            if resp.status_code == 200:
-                data = resp.json()
-                pages = data.get('query', {}).get('pages', {})
-                
-                # Check if page exists (not -1) and title matches using smart validation
-                for page_id, page_data in pages.items():
-                    if page_id != '-1':  # Page exists
-                        title = page_data.get('title', '')
-                        # Use smart validation that handles disambiguation, special chars, etc.
-                        if _validate_wikipedia_title(artist, title):
-                            page_title = title
-                            strategy_used = "Direct lookup"
-                            if _should_log_wikipedia(artist, 'strategy'):
-                                logger.debug(f"Wikipedia: Direct lookup found page '{page_title}' (ID: {page_id})")
-                            break
-            
-            # Strategy 2: Search with artist name only (if direct lookup failed)
-            if not page_title:
-                if _should_log_wikipedia(artist, 'strategy'):
-                    logger.debug(f"Wikipedia: Strategy 2 (search) - Trying '{artist}'")
-                
-                search_url = "https://en.wikipedia.org/w/api.php"
-                search_params = {
-                    'action': 'query',
-                    'format': 'json',
-                    'list': 'search',
-                    'srsearch': artist,  # Just artist name, no modifier
-                    'srlimit': 5,  # Get top 5 results to find best match
-                    'srnamespace': 0
-                }
-                
-                resp = self.session.get(search_url, params=search_params, timeout=self.timeout)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    search_results = data.get('query', {}).get('search', [])
-                    
-                    if _should_log_wikipedia(artist, 'strategy'):
-                        result_titles = [r.get('title', '') for r in search_results[:3]]
-                        logger.debug(f"Wikipedia: Search returned {len(search_results)} results: {result_titles}")
-                    
-                    # Prioritize disambiguation pages (e.g., "Nirvana (band)" over "Nirvana")
-                    # First pass: Look for pages with disambiguation suffixes
-                    for result in search_results:
-                        title = result.get('title', '')
-                        # Check if this is a disambiguation page (band, musician, etc.)
-                        if any(suffix in title.lower() for suffix in ['(band)', '(musician)', '(musical group)', '(singer)', '(rapper)']):
-                            if _validate_wikipedia_title(artist, title):
-                                page_title = title
-                                strategy_used = "Search (disambiguation prioritized)"
-                                if _should_log_wikipedia(artist, 'strategy'):
-                                    logger.debug(f"Wikipedia: Selected disambiguation page '{page_title}'")
-                                break
-                    
-                    # Second pass: If no disambiguation page found, check all results
-                    if not page_title:
-                        for result in search_results:
-                            title = result.get('title', '')
-                            if _validate_wikipedia_title(artist, title):
-                                page_title = title
-                                strategy_used = "Search (artist name)"
-                                if _should_log_wikipedia(artist, 'strategy'):
-                                    logger.debug(f"Wikipedia: Selected page '{page_title}'")
-                                break
-            
-            # Strategy 3: Search with "band" modifier (for bands/groups)
-            if not page_title:
-                if _should_log_wikipedia(artist, 'strategy'):
-                    logger.debug(f"Wikipedia: Strategy 3 (search) - Trying '{artist} band'")
-                
-                search_url = "https://en.wikipedia.org/w/api.php"
-                search_params = {
-                    'action': 'query',
-                    'format': 'json',
-                    'list': 'search',
-                    'srsearch': f"{artist} band",  # Add "band" to refine search for bands/groups
-                    'srlimit': 5,
-                    'srnamespace': 0
-                }
-                
-                resp = self.session.get(search_url, params=search_params, timeout=self.timeout)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    search_results = data.get('query', {}).get('search', [])
-                    
-                    if _should_log_wikipedia(artist, 'strategy'):
-                        result_titles = [r.get('title', '') for r in search_results[:3]]
-                        logger.debug(f"Wikipedia: Search returned {len(search_results)} results: {result_titles}")
-                    
-                    # Prioritize disambiguation pages first
-                    for result in search_results:
-                        title = result.get('title', '')
-                        if any(suffix in title.lower() for suffix in ['(band)', '(musical group)']):
-                            if _validate_wikipedia_title(artist, title):
-                                page_title = title
-                                strategy_used = "Search (band modifier, disambiguation)"
-                                if _should_log_wikipedia(artist, 'strategy'):
-                                    logger.debug(f"Wikipedia: Selected page '{page_title}'")
-                                break
-                    
-                    # Fallback to all results if no disambiguation found
-                    if not page_title:
-                        for result in search_results:
-                            title = result.get('title', '')
-                            if _validate_wikipedia_title(artist, title):
-                                page_title = title
-                                strategy_used = "Search (band modifier)"
-                                if _should_log_wikipedia(artist, 'strategy'):
-                                    logger.debug(f"Wikipedia: Selected page '{page_title}'")
-                                break
-            
-            # Strategy 4: Search with "musician" modifier (last resort, for solo artists)
-            if not page_title:
-                if _should_log_wikipedia(artist, 'strategy'):
-                    logger.debug(f"Wikipedia: Strategy 4 (search) - Trying '{artist} musician'")
-                
-                search_url = "https://en.wikipedia.org/w/api.php"
-                search_params = {
-                    'action': 'query',
-                    'format': 'json',
-                    'list': 'search',
-                    'srsearch': f"{artist} musician",  # Add "musician" to refine search for solo artists
-                    'srlimit': 5,
-                    'srnamespace': 0
-                }
-                
-                resp = self.session.get(search_url, params=search_params, timeout=self.timeout)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    search_results = data.get('query', {}).get('search', [])
-                    
-                    if _should_log_wikipedia(artist, 'strategy'):
-                        result_titles = [r.get('title', '') for r in search_results[:3]]
-                        logger.debug(f"Wikipedia: Search returned {len(search_results)} results: {result_titles}")
-                    
-                    # Prioritize disambiguation pages first
-                    for result in search_results:
-                        title = result.get('title', '')
-                        if any(suffix in title.lower() for suffix in ['(musician)', '(singer)', '(rapper)', '(vocalist)']):
-                            if _validate_wikipedia_title(artist, title):
-                                page_title = title
-                                strategy_used = "Search (musician modifier, disambiguation)"
-                                if _should_log_wikipedia(artist, 'strategy'):
-                                    logger.debug(f"Wikipedia: Selected page '{page_title}'")
-                                break
-                    
-                    # Fallback to all results if no disambiguation found
-                    if not page_title:
-                        for result in search_results:
-                            title = result.get('title', '')
-                            if _validate_wikipedia_title(artist, title):
-                                page_title = title
-                                strategy_used = "Search (musician modifier)"
-                                if _should_log_wikipedia(artist, 'strategy'):
-                                    logger.debug(f"Wikipedia: Selected page '{page_title}'")
-                                break
+            # Page discovery takes up to 4 requests; the result is cached across restarts
+            page_lookup = self._cached_lookup(artist, "wikipedia_page", self._find_wikipedia_page, artist, refresh=refresh)
+            page_title = page_lookup or None
             
             # If we still don't have a page title, try Commons search anyway (might find images even without Wikipedia page)
             # But if we have a page title, we'll use it for better results
@@ -869,6 +854,7 @@ class ArtistImageProvider:
             
             # Strategy A: Wikimedia Commons search (primary - best coverage)
             commons_images = self._fetch_wikimedia_commons(artist, seen_urls)
+            failed = commons_images is None
             if commons_images:
                 images.extend(commons_images)
                 image_source = "Wikimedia Commons search"
@@ -884,6 +870,7 @@ class ArtistImageProvider:
             # Strategy B: All images from Wikipedia article (fallback if Commons didn't find enough)
             if page_title:
                 article_images = self._fetch_all_article_images(page_title, seen_urls)
+                failed = failed or article_images is None
                 if article_images:
                     images.extend(article_images)
                     if not image_source:
@@ -899,6 +886,7 @@ class ArtistImageProvider:
             # Strategy C: pageimages infobox (last resort - usually only 0-1 images)
             if page_title:
                 infobox_images = self._fetch_pageimages_infobox(page_title, seen_urls)
+                failed = failed or infobox_images is None
                 if infobox_images:
                     images.extend(infobox_images)
                     if not image_source:
@@ -920,14 +908,216 @@ class ArtistImageProvider:
                 else:
                     logger.debug(f"Wikipedia: Could not find page or images for '{artist}'")
             
+            # Nothing found because page discovery or an image request failed: don't cache as "no images"
+            if not images and (page_lookup is None or failed):
+                return None
             return images
             
         except Exception as e:
             if _should_log_wikipedia(artist, 'error'):
                 logger.debug(f"Wikipedia fetch failed for {artist}: {e}")
-            return []
+            return None
     
-    def _fetch_wikimedia_commons(self, artist: str, seen_urls: set) -> List[Dict[str, Any]]:
+    def _find_wikipedia_page(self, artist: str) -> Optional[str]:
+        """
+        Find the artist's Wikipedia page title (up to 4 API requests).
+
+        1. Direct lookup (fastest, most accurate - Wikipedia normalizes/redirects automatically)
+        2. Search with artist name only (if direct lookup fails)
+        3. Search with "band" modifier (for bands/groups)
+        4. Search with "musician" modifier (last resort, for solo artists)
+
+        Args:
+            artist: Artist name to search for
+
+        Returns:
+            Page title, "" if the artist has no page, or None if a request failed
+            (so a transient error is not cached as "no page")
+        """
+        complete = True
+        page_title = None
+        strategy_used = None
+        
+        # Strategy 1: Direct lookup (fastest, most accurate)
+        # Wikipedia automatically normalizes page titles and handles redirects
+        if _should_log_wikipedia(artist, 'strategy'):
+            logger.debug(f"Wikipedia: Strategy 1 (direct lookup) - Checking '{artist}'")
+        
+        lookup_url = "https://en.wikipedia.org/w/api.php"
+        lookup_params = {
+            'action': 'query',
+            'format': 'json',
+            'titles': artist,
+            'prop': 'info',
+            'inprop': 'url'
+        }
+        
+        resp = self.session.get(lookup_url, params=lookup_params, timeout=self.timeout)
+        complete = complete and resp.status_code == 200
+        if resp.status_code == 200:
+            data = resp.json()
+            pages = data.get('query', {}).get('pages', {})
+            
+            # Check if page exists (not -1) and title matches using smart validation
+            for page_id, page_data in pages.items():
+                if page_id != '-1':  # Page exists
+                    title = page_data.get('title', '')
+                    # Use smart validation that handles disambiguation, special chars, etc.
+                    if _validate_wikipedia_title(artist, title):
+                        page_title = title
+                        strategy_used = "Direct lookup"
+                        if _should_log_wikipedia(artist, 'strategy'):
+                            logger.debug(f"Wikipedia: Direct lookup found page '{page_title}' (ID: {page_id})")
+                        break
+        
+        # Strategy 2: Search with artist name only (if direct lookup failed)
+        if not page_title:
+            if _should_log_wikipedia(artist, 'strategy'):
+                logger.debug(f"Wikipedia: Strategy 2 (search) - Trying '{artist}'")
+            
+            search_url = "https://en.wikipedia.org/w/api.php"
+            search_params = {
+                'action': 'query',
+                'format': 'json',
+                'list': 'search',
+                'srsearch': artist,  # Just artist name, no modifier
+                'srlimit': 5,  # Get top 5 results to find best match
+                'srnamespace': 0
+            }
+            
+            resp = self.session.get(search_url, params=search_params, timeout=self.timeout)
+            complete = complete and resp.status_code == 200
+            if resp.status_code == 200:
+                data = resp.json()
+                search_results = data.get('query', {}).get('search', [])
+                
+                if _should_log_wikipedia(artist, 'strategy'):
+                    result_titles = [r.get('title', '') for r in search_results[:3]]
+                    logger.debug(f"Wikipedia: Search returned {len(search_results)} results: {result_titles}")
+                
+                # Prioritize disambiguation pages (e.g., "Nirvana (band)" over "Nirvana")
+                # First pass: Look for pages with disambiguation suffixes
+                for result in search_results:
+                    title = result.get('title', '')
+                    # Check if this is a disambiguation page (band, musician, etc.)
+                    if any(suffix in title.lower() for suffix in ['(band)', '(musician)', '(musical group)', '(singer)', '(rapper)']):
+                        if _validate_wikipedia_title(artist, title):
+                            page_title = title
+                            strategy_used = "Search (disambiguation prioritized)"
+                            if _should_log_wikipedia(artist, 'strategy'):
+                                logger.debug(f"Wikipedia: Selected disambiguation page '{page_title}'")
+                            break
+                
+                # Second pass: If no disambiguation page found, check all results
+                if not page_title:
+                    for result in search_results:
+                        title = result.get('title', '')
+                        if _validate_wikipedia_title(artist, title):
+                            page_title = title
+                            strategy_used = "Search (artist name)"
+                            if _should_log_wikipedia(artist, 'strategy'):
+                                logger.debug(f"Wikipedia: Selected page '{page_title}'")
+                            break
+        
+        # Strategy 3: Search with "band" modifier (for bands/groups)
+        if not page_title:
+            if _should_log_wikipedia(artist, 'strategy'):
+                logger.debug(f"Wikipedia: Strategy 3 (search) - Trying '{artist} band'")
+            
+            search_url = "https://en.wikipedia.org/w/api.php"
+            search_params = {
+                'action': 'query',
+                'format': 'json',
+                'list': 'search',
+                'srsearch': f"{artist} band",  # Add "band" to refine search for bands/groups
+                'srlimit': 5,
+                'srnamespace': 0
+            }
+            
+            resp = self.session.get(search_url, params=search_params, timeout=self.timeout)
+            complete = complete and resp.status_code == 200
+            if resp.status_code == 200:
+                data = resp.json()
+                search_results = data.get('query', {}).get('search', [])
+                
+                if _should_log_wikipedia(artist, 'strategy'):
+                    result_titles = [r.get('title', '') for r in search_results[:3]]
+                    logger.debug(f"Wikipedia: Search returned {len(search_results)} results: {result_titles}")
+                
+                # Prioritize disambiguation pages first
+                for result in search_results:
+                    title = result.get('title', '')
+                    if any(suffix in title.lower() for suffix in ['(band)', '(musical group)']):
+                        if _validate_wikipedia_title(artist, title):
+                            page_title = title
+                            strategy_used = "Search (band modifier, disambiguation)"
+                            if _should_log_wikipedia(artist, 'strategy'):
+                                logger.debug(f"Wikipedia: Selected page '{page_title}'")
+                            break
+                
+                # Fallback to all results if no disambiguation found
+                if not page_title:
+                    for result in search_results:
+                        title = result.get('title', '')
+                        if _validate_wikipedia_title(artist, title):
+                            page_title = title
+                            strategy_used = "Search (band modifier)"
+                            if _should_log_wikipedia(artist, 'strategy'):
+                                logger.debug(f"Wikipedia: Selected page '{page_title}'")
+                            break
+        
+        # Strategy 4: Search with "musician" modifier (last resort, for solo artists)
+        if not page_title:
+            if _should_log_wikipedia(artist, 'strategy'):
+                logger.debug(f"Wikipedia: Strategy 4 (search) - Trying '{artist} musician'")
+            
+            search_url = "https://en.wikipedia.org/w/api.php"
+            search_params = {
+                'action': 'query',
+                'format': 'json',
+                'list': 'search',
+                'srsearch': f"{artist} musician",  # Add "musician" to refine search for solo artists
+                'srlimit': 5,
+                'srnamespace': 0
+            }
+            
+            resp = self.session.get(search_url, params=search_params, timeout=self.timeout)
+            complete = complete and resp.status_code == 200
+            if resp.status_code == 200:
+                data = resp.json()
+                search_results = data.get('query', {}).get('search', [])
+                
+                if _should_log_wikipedia(artist, 'strategy'):
+                    result_titles = [r.get('title', '') for r in search_results[:3]]
+                    logger.debug(f"Wikipedia: Search returned {len(search_results)} results: {result_titles}")
+                
+                # Prioritize disambiguation pages first
+                for result in search_results:
+                    title = result.get('title', '')
+                    if any(suffix in title.lower() for suffix in ['(musician)', '(singer)', '(rapper)', '(vocalist)']):
+                        if _validate_wikipedia_title(artist, title):
+                            page_title = title
+                            strategy_used = "Search (musician modifier, disambiguation)"
+                            if _should_log_wikipedia(artist, 'strategy'):
+                                logger.debug(f"Wikipedia: Selected page '{page_title}'")
+                            break
+                
+                # Fallback to all results if no disambiguation found
+                if not page_title:
+                    for result in search_results:
+                        title = result.get('title', '')
+                        if _validate_wikipedia_title(artist, title):
+                            page_title = title
+                            strategy_used = "Search (musician modifier)"
+                            if _should_log_wikipedia(artist, 'strategy'):
+                                logger.debug(f"Wikipedia: Selected page '{page_title}'")
+                            break
+        
+        if page_title:
+            return page_title
+        return "" if complete else None
+
+    def _fetch_wikimedia_commons(self, artist: str, seen_urls: set) -> Optional[List[Dict[str, Any]]]:
         """
         Search Wikimedia Commons directly for artist images.
         This is the PRIMARY strategy as it finds the most images (7-10 on average).
@@ -937,9 +1127,11 @@ class ArtistImageProvider:
             seen_urls: Set of URLs already seen (for deduplication)
             
         Returns:
-            List of high-quality image dicts from Wikimedia Commons
+            List of high-quality image dicts from Wikimedia Commons,
+            or None if a request failed and nothing was found
         """
         images = []
+        failed = False
         try:
             # Search Wikimedia Commons for artist images
             commons_url = "https://commons.wikimedia.org/w/api.php"
@@ -963,6 +1155,7 @@ class ArtistImageProvider:
                 
                 resp = self.session.get(commons_url, params=search_params, timeout=self.timeout)
                 if resp.status_code != 200:
+                    failed = True
                     continue
                 
                 data = resp.json()
@@ -988,6 +1181,7 @@ class ArtistImageProvider:
                 
                 info_resp = self.session.get(commons_url, params=info_params, timeout=self.timeout)
                 if info_resp.status_code != 200:
+                    failed = True
                     continue
                 
                 info_data = info_resp.json()
@@ -1042,14 +1236,14 @@ class ArtistImageProvider:
                 if len(images) >= 10:
                     break
             
-            return images
+            return None if failed and not images else images
             
         except Exception as e:
             if _should_log_wikipedia(artist, 'error'):
                 logger.debug(f"Wikimedia Commons search failed for {artist}: {e}")
-            return []
+            return images or None
     
-    def _fetch_all_article_images(self, page_title: str, seen_urls: set) -> List[Dict[str, Any]]:
+    def _fetch_all_article_images(self, page_title: str, seen_urls: set) -> Optional[List[Dict[str, Any]]]:
         """
         Get ALL images from Wikipedia article (not just infobox).
         This is Strategy B - finds 2-7 images on average.
@@ -1059,7 +1253,7 @@ class ArtistImageProvider:
             seen_urls: Set of URLs already seen (for deduplication)
             
         Returns:
-            List of high-quality image dicts from Wikipedia article
+            List of high-quality image dicts from Wikipedia article, or None if the request failed
         """
         images = []
         try:
@@ -1077,7 +1271,7 @@ class ArtistImageProvider:
             
             resp = self.session.get(url, params=params, timeout=self.timeout)
             if resp.status_code != 200:
-                return []
+                return None
             
             data = resp.json()
             pages = data.get('query', {}).get('pages', {})
@@ -1136,9 +1330,9 @@ class ArtistImageProvider:
         except Exception as e:
             if _should_log_wikipedia(page_title, 'error'):
                 logger.debug(f"Wikipedia article images fetch failed for '{page_title}': {e}")
-            return []
+            return None
     
-    def _fetch_pageimages_infobox(self, page_title: str, seen_urls: set) -> List[Dict[str, Any]]:
+    def _fetch_pageimages_infobox(self, page_title: str, seen_urls: set) -> Optional[List[Dict[str, Any]]]:
         """
         Get main infobox image from Wikipedia (fallback strategy).
         This is Strategy C - usually only finds 0-1 images.
@@ -1148,7 +1342,7 @@ class ArtistImageProvider:
             seen_urls: Set of URLs already seen (for deduplication)
             
         Returns:
-            List of image dicts (usually 0-1 images)
+            List of image dicts (usually 0-1 images), or None if the request failed
         """
         images = []
         try:
@@ -1164,7 +1358,7 @@ class ArtistImageProvider:
             
             resp = self.session.get(url, params=params, timeout=self.timeout)
             if resp.status_code != 200:
-                return []
+                return None
             
             data = resp.json()
             pages = data.get('query', {}).get('pages', {})
@@ -1199,5 +1393,5 @@ class ArtistImageProvider:
         except Exception as e:
             if _should_log_wikipedia(page_title, 'error'):
                 logger.debug(f"Wikipedia infobox fetch failed for '{page_title}': {e}")
-            return []
+            return None
 
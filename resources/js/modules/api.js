@@ -620,6 +620,94 @@ export async function fetchQueue() {
     return apiFetch('/api/playback/queue');
 }
 
+// ========== AUDIO ANALYSIS ==========
+
+let audioAnalysisRequest = null;  // In-flight request shared by waveform + spectrum
+
+/**
+ * Decode the compact audio analysis artifact (format: system_utils/analysis_compact.py)
+ * 
+ * @param {ArrayBuffer} buffer - Response body
+ * @returns {Object} {analysis_track_id, duration, tempo, waveform, segments, beats, sections, arrays}
+ */
+function decodeCompactAnalysis(buffer) {
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== 'SLA1') {
+        throw new Error(`Unknown audio analysis format: ${magic}`);
+    }
+    const headerLength = new DataView(buffer).getUint32(4, true);
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+
+    // Arrays are 4-byte aligned, so typed arrays view the buffer without copying
+    const arrays = {};
+    let offset = 8 + headerLength;
+    for (const [name, dtype, length] of header.arrays) {
+        offset += (4 - offset % 4) % 4;
+        if (dtype === 'float32') {
+            arrays[name] = new Float32Array(buffer, offset, length);
+            offset += length * 4;
+        } else {
+            arrays[name] = new Uint8Array(buffer, offset, length);
+            offset += length;
+        }
+    }
+
+    const { segment_start, segment_duration, waveform, pitches } = arrays;
+    const segments = [];
+    const waveformPoints = [];
+    for (let i = 0; i < segment_start.length; i++) {
+        segments.push({
+            start: segment_start[i],
+            duration: segment_duration[i],
+            pitches: Array.from(pitches.subarray(i * 12, i * 12 + 12), v => v / 255)
+        });
+        waveformPoints.push({ start: segment_start[i], amp: waveform[i] / 255 });
+    }
+    const beats = Array.from(arrays.beat_start, (start, i) => ({
+        start,
+        confidence: arrays.beat_confidence[i] / 255
+    }));
+    const sections = Array.from(arrays.section_start, (start, i) => ({
+        start,
+        duration: arrays.section_duration[i],
+        loudness: arrays.section_loudness[i]
+    }));
+
+    return {
+        analysis_track_id: header.analysis_track_id,
+        duration: header.duration,
+        tempo: header.tempo,
+        waveform: waveformPoints,
+        segments,
+        beats,
+        sections,
+        arrays  // Raw quantized arrays (timbre etc.) for other visualizers
+    };
+}
+
+/**
+ * Fetch the current track's audio analysis (waveform, pitches, beats, sections)
+ * 
+ * Uses the compact binary endpoint; concurrent callers share one request and
+ * repeat fetches revalidate via ETag.
+ * 
+ * @returns {Promise<Object|null>} Decoded analysis, or null if unavailable
+ */
+export function fetchAudioAnalysis() {
+    if (!audioAnalysisRequest) {
+        audioAnalysisRequest = (async () => {
+            const response = await fetch('/api/playback/audio-analysis/compact');
+            if (!response.ok) {
+                return null;
+            }
+            return decodeCompactAnalysis(await response.arrayBuffer());
+        })().finally(() => {
+            audioAnalysisRequest = null;
+        });
+    }
+    return audioAnalysisRequest;
+}
+
 // ========== LIKE ==========
 
 /**
@@ -655,11 +743,19 @@ export async function toggleLikeStatus(trackId, action, source = '') {
  * Fetch random images for global slideshow
  * 
  * @param {number} limit - Number of images to fetch
+ * @param {Object} [options] - Optional sampling filters
+ * @param {string} [options.artist] - Only images from this artist
+ * @param {number} [options.minResolution] - Only images at least this many pixels on the larger side
+ * @param {string} [options.weight] - 'resolution' or 'recent' to bias the random pick
  * @returns {Promise<Array<string>>} Array of image URLs
  */
-export async function fetchRandomSlideshowImages(limit = 50) {
+export async function fetchRandomSlideshowImages(limit = 50, options = {}) {
     try {
-        const response = await fetch(`/api/slideshow/random-images?limit=${limit}`);
+        const params = new URLSearchParams({ limit });
+        if (options.artist) params.set('artist', options.artist);
+        if (options.minResolution) params.set('min_resolution', options.minResolution);
+        if (options.weight) params.set('weight', options.weight);
+        const response = await fetch(`/api/slideshow/random-images?${params}`);
         if (!response.ok) throw new Error('Failed to fetch random images');
 
         const data = await response.json();
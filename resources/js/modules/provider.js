@@ -22,7 +22,7 @@ import {
     setWordSyncStyle
 } from './state.js';
 import { showToast, setLyricsInDom } from './dom.js';
-import { normalizeTrackId } from './utils.js';
+import { normalizeTrackId, imageVariantUrl } from './utils.js';
 import {
     fetchProviders,
     fetchAlbumArtOptions,
@@ -47,6 +47,9 @@ import {
 import { updateLatencyDisplay } from './latency.js';
 import { songWordSyncOffset } from './state.js';
 
+// Art grid cards are ~140-250px wide; request a matching variant instead of the full-size original
+const ART_CARD_WIDTH = 256;
+
 // ========== PROVIDER DISPLAY ==========
 
 /**
@@ -292,8 +295,11 @@ export async function loadAlbumArtTab() {
             }
             card.dataset.provider = option.provider;
 
+            // Inline preview from the options response (no extra request); resized variant otherwise
+            const previewSrc = option.thumbnail || imageVariantUrl(option.image_url, ART_CARD_WIDTH);
+
             card.innerHTML = `
-                <img src="${option.image_url}" alt="${option.provider}" class="art-card-image" loading="lazy" onerror="this.parentElement.classList.add('loading')">
+                <img src="${previewSrc}" alt="${option.provider}" class="art-card-image" loading="lazy" onerror="this.parentElement.classList.add('loading')">
                 <div class="art-card-overlay">
                     <div class="art-card-provider">${option.provider}</div>
                     <div class="art-card-resolution">${option.resolution}</div>
@@ -339,7 +345,7 @@ export function loadArtistImagesTab() {
         card.className = 'art-card';
 
         card.innerHTML = `
-            <img src="${url}" class="art-card-image" loading="lazy">
+            <img src="${imageVariantUrl(url, ART_CARD_WIDTH)}" class="art-card-image" loading="lazy">
             <div class="art-card-overlay">
                 <div class="art-card-provider">Image ${index + 1}</div>
             </div>
@@ -38,6 +38,7 @@ import { showToast } from './dom.js';
 import { isManualArtistImageActive, resetArtZoom, syncZoomImgIfInArtMode } from './artZoom.js';
 import { updateBackground } from './background.js';
 import { fetchArtistImages, saveArtistSlideshowPreferences } from './api.js';
+import { imageVariantUrl } from './utils.js';
 
 // ========== CONSTANTS ==========
 const RESUME_DELAY_RATIO = 0.5;  // Resume after half of interval when manual browsing stops
@@ -1555,7 +1556,7 @@ function renderImageGrid() {
         }
         
         const imgEl = document.createElement('img');
-        imgEl.src = img.url;
+        imgEl.src = imageVariantUrl(img.url, 160);  // Grid thumbnail, not the full-size original
         imgEl.loading = 'lazy';
         imgEl.decoding = 'async';  // Non-blocking decode on background thread
         imgEl.alt = img.source;
@@ -11,10 +11,11 @@
  * - Self-calibrating per-track loudness range
  * - Toggle between linear and true dB conversion
  * 
- * Level 2 - Imports: state
+ * Level 2 - Imports: state, api
  */
 
 import { displayConfig } from './state.js';
+import { fetchAudioAnalysis } from './api.js';
 
 // ========== CONFIGURATION (All tunables at top) ==========
 const CONFIG = {
@@ -72,12 +73,10 @@ let trackMaxLoudness = 0;          // Loudest section in this track
  */
 async function fetchSpectrumData() {
     try {
-        const response = await fetch('/api/playback/audio-analysis');
-        if (!response.ok) {
+        const data = await fetchAudioAnalysis();
+        if (!data) {
             console.debug('[Spectrum] Audio analysis not available');
-            return null;
         }
-        const data = await response.json();
         return data;
     } catch (error) {
         console.error('[Spectrum] Failed to fetch audio analysis:', error);
@@ -380,24 +379,21 @@ export async function updateSpectrum(trackInfo) {
         beatJustHit = false;
         
         const data = await fetchSpectrumData();
-        const analysis = data?.audio_analysis;
-        if (data && analysis && analysis.segments) {
-            // Store the audio_analysis for use by other functions
+        if (data && data.segments.length > 0) {
+            // Store the decoded analysis for use by other functions
             spectrumData = {
-                segments: analysis.segments,
-                beats: analysis.beats || [],
-                sections: analysis.sections || [],
-                duration: analysis.duration,
-                tempo: analysis.tempo,
-                // Store full analysis for future visualizer features
-                audio_analysis: analysis
+                segments: data.segments,
+                beats: data.beats,
+                sections: data.sections,
+                duration: data.duration,
+                tempo: data.tempo
             };
-            spectrumDuration = analysis.duration || trackInfo.duration_ms / 1000;
+            spectrumDuration = data.duration || trackInfo.duration_ms / 1000;
             
             // Self-calibrate energy range for this track
             calibrateEnergyRange();
             
-            console.debug(`[Spectrum] Loaded ${analysis.segments.length} segments, ${analysis.beats?.length || 0} beats, ${analysis.sections?.length || 0} sections, tempo: ${analysis.tempo}bpm`);
+            console.debug(`[Spectrum] Loaded ${data.segments.length} segments, ${data.beats.length} beats, ${data.sections.length} sections, tempo: ${data.tempo}bpm`);
         } else {
             spectrumData = null;
             spectrumDuration = 0;
@@ -524,19 +520,17 @@ export async function showSpectrum() {
     if (!spectrumData) {
         console.debug('[Spectrum] No data, fetching...');
         const data = await fetchSpectrumData();
-        const analysis = data?.audio_analysis;
-        if (data && analysis && analysis.segments) {
+        if (data && data.segments.length > 0) {
             spectrumData = {
-                segments: analysis.segments,
-                beats: analysis.beats || [],
-                sections: analysis.sections || [],
-                duration: analysis.duration,
-                tempo: analysis.tempo,
-                audio_analysis: analysis
+                segments: data.segments,
+                beats: data.beats,
+                sections: data.sections,
+                duration: data.duration,
+                tempo: data.tempo
             };
-            spectrumDuration = analysis.duration || 0;
+            spectrumDuration = data.duration || 0;
             calibrateEnergyRange();
-            console.debug(`[Spectrum] Loaded ${analysis.segments.length} segments on toggle`);
+            console.debug(`[Spectrum] Loaded ${data.segments.length} segments on toggle`);
         }
     }
     
@@ -88,6 +88,24 @@ export function sleep(ms) {
     return new Promise(resolve => setTimeout(resolve, ms));
 }
 
+// ========== IMAGE URLS ==========
+
+/**
+ * Request a resized variant of a locally served image.
+ * Only local album art / artist image URLs support variants; others are returned unchanged.
+ * 
+ * @param {string} url - Image URL
+ * @param {number} cssWidth - Displayed width in CSS pixels
+ * @returns {string} URL with ?w= (device pixels) appended when supported
+ */
+export function imageVariantUrl(url, cssWidth) {
+    if (!url || !(url.startsWith('/api/album-art/image/') || url.startsWith('/cover-art'))) {
+        return url;
+    }
+    const width = Math.round(cssWidth * (window.devicePixelRatio || 1));
+    return `${url}${url.includes('?') ? '&' : '?'}w=${width}`;
+}
+
 // ========== COMPARISON HELPERS ==========
 
 /**
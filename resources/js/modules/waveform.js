@@ -9,7 +9,7 @@
 
 import { displayConfig } from './state.js';
 import { formatTime } from './utils.js';
-import { seekToPosition } from './api.js';
+import { seekToPosition, fetchAudioAnalysis } from './api.js';
 
 // ========== WAVEFORM STATE ==========
 let waveformData = null;       // Cached waveform data from API
@@ -31,17 +31,15 @@ let seekTooltip = null;
 /**
  * Fetch waveform data from the backend API
  * 
- * @returns {Promise<Object|null>} Waveform data or null if unavailable
+ * @returns {Promise<Object|null>} Decoded audio analysis or null if unavailable
  */
 async function fetchWaveformData() {
     try {
-        const response = await fetch('/api/playback/audio-analysis');
-        if (!response.ok) {
+        const data = await fetchAudioAnalysis();
+        if (!data) {
             // Analysis not available (likely not using Spicetify)
             console.debug('[Waveform] Audio analysis not available');
-            return null;
         }
-        const data = await response.json();
         return data;
     } catch (error) {
         console.error('[Waveform] Failed to fetch audio analysis:', error);
@@ -49,41 +47,6 @@ async function fetchWaveformData() {
     }
 }
 
-/**
- * Process raw segments into waveform data (amplitude per segment)
- * Converts loudness dB to normalized 0-1 amplitude values
- * 
- * @param {Array} segments - Raw segments from audio analysis
- * @returns {Array} Waveform array with {start, duration, amp} objects
- */
-function processSegmentsToWaveform(segments) {
-    if (!segments || segments.length === 0) return [];
-    
-    // Calculate amplitude from loudness (dB to linear)
-    let maxAmp = 0;
-    const waveform = segments.map(seg => {
-        const loudStart = Math.max(seg.loudness_start || -60, -60);  // Floor at -60dB
-        const loudMax = Math.max(seg.loudness_max || -60, -60);
-        const avgDb = (loudStart + loudMax) / 2;
-        const amp = Math.pow(10, avgDb / 20);  // dB to linear amplitude
-        maxAmp = Math.max(maxAmp, amp);
-        return {
-            start: seg.start,
-            duration: seg.duration || 0,
-            amp: amp  // Will normalize after
-        };
-    });
-    
-    // Normalize amplitudes to 0-1 range
-    if (maxAmp > 0) {
-        for (const w of waveform) {
-            w.amp = w.amp / maxAmp;
-        }
-    }
-    
-    return waveform;
-}
-
 /**
  * Initialize the waveform canvas
  * Sets up canvas sizing and event listeners
@@ -174,8 +137,7 @@ export async function updateWaveform(trackInfo) {
         console.debug(`[Waveform] ${trackChanged ? 'Track' : 'Source'} changed, fetching new waveform data`);
         
         const data = await fetchWaveformData();
-        const analysis = data?.audio_analysis;
-        if (data && analysis && analysis.segments) {
+        if (data && data.waveform.length > 0) {
             // CRITICAL: Validate analysis belongs to current track
             // This prevents stale Spotify waveform from showing over MusicBee songs
             // The analysis_track_id is a normalized "artist_title" string
@@ -184,17 +146,14 @@ export async function updateWaveform(trackInfo) {
                 waveformData = null;
                 waveformDuration = 0;
             } else {
-                // Process segments into waveform locally
-                const waveform = processSegmentsToWaveform(analysis.segments);
+                // Waveform amplitudes are precomputed server-side (normalized 0-1)
                 waveformData = {
-                    waveform: waveform,
-                    duration: analysis.duration || trackInfo.duration_ms / 1000,
-                    analysis_track_id: data.analysis_track_id,
-                    // Store full analysis for potential future use
-                    audio_analysis: analysis
+                    waveform: data.waveform,
+                    duration: data.duration || trackInfo.duration_ms / 1000,
+                    analysis_track_id: data.analysis_track_id
                 };
                 waveformDuration = waveformData.duration;
-                console.debug(`[Waveform] Processed ${waveform.length} segments, duration: ${waveformData.duration.toFixed(1)}s`);
+                console.debug(`[Waveform] Loaded ${data.waveform.length} segments, duration: ${waveformData.duration.toFixed(1)}s`);
             }
         } else {
             waveformData = null;
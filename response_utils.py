@@ -0,0 +1,195 @@
+"""
+Response encoding for the JSON APIs.
+
+- FastJSONProvider: Quart JSON provider backed by orjson when it is installed
+  (falls back to the stdlib encoder for anything orjson rejects)
+- compress_response(): negotiated brotli/gzip for JSON/text bodies above
+  SERVER["compression"]["min_size"] (brotli only if the package is installed)
+- json_fields: opt-in ?fields= projection so small clients (embedded
+  dashboards, ?minimal=true pages) only receive what they render
+
+Usage:
+    app.json = FastJSONProvider(app)
+
+    @app.after_request
+    async def compress(response):
+        return await compress_response(response, request.accept_encodings)
+
+    @app.route("/current-track")
+    @json_fields
+    async def current_track(): ...
+"""
+
+import asyncio
+import gzip
+from functools import wraps
+from typing import Any, Dict, Optional, Set
+
+from quart import request
+from quart.json.provider import DefaultJSONProvider
+from quart.wrappers.response import DataBody
+
+from config import SERVER
+from metrics import counter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "image/svg+xml", "text/")
+THREAD_THRESHOLD = 64 * 1024  # Compress bigger bodies off the event loop
+BROTLI_QUALITY = 4            # ~gzip -6 size at a fraction of the CPU time
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider that serializes with orjson (UTF-8, insertion key order)."""
+
+    sort_keys = False
+    _OPTIONS = (
+        (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME)
+        if orjson else 0
+    )
+
+    def _orjson_dumps(self, obj: Any) -> Optional[bytes]:
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._OPTIONS)
+        except TypeError:
+            return None  # e.g. ints beyond 64 bit: let the stdlib encoder handle it
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is not None and not kwargs:
+            data = self._orjson_dumps(obj)
+            if data is not None:
+                return data.decode()
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if orjson is None or self._app.debug or self.compact is False:
+            return super().response(*args, **kwargs)  # Indented output for debugging
+        data = self._orjson_dumps(self._prepare_response_obj(args, kwargs))
+        if data is None:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(data + b"\n", mimetype=self.mimetype)
+
+
+def _compress(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+async def compress_response(response, accept_encodings):
+    """
+    Compress a buffered text/JSON response if the client accepts it (after_request hook).
+
+    Args:
+        response: Quart response
+        accept_encodings: request.accept_encodings
+
+    Returns:
+        The same response, compressed in place when worthwhile
+    """
+    settings = SERVER["compression"]
+    if not settings["enabled"] or not isinstance(response.response, DataBody):
+        return response
+    if response.status_code in (204, 206, 304) or "Content-Encoding" in response.headers:
+        return response
+    mimetype = response.mimetype or ""
+    if not mimetype.startswith(COMPRESSIBLE_TYPES):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    data = await response.get_data()
+    if len(data) < settings["min_size"]:
+        return response
+    encoding = accept_encodings.best_match(["br", "gzip"] if brotli else ["gzip"])
+    if encoding is None:
+        return response
+
+    if len(data) >= THREAD_THRESHOLD:
+        compressed = await asyncio.to_thread(_compress, data, encoding, settings["level"])
+    else:
+        compressed = _compress(data, encoding, settings["level"])
+    if len(compressed) >= len(data):
+        return response
+
+    counter("http_compression_bytes_total", "Response bytes before (in) and after (out) compression",
+            encoding=encoding, stage="in").inc(len(data))
+    counter("http_compression_bytes_total", encoding=encoding, stage="out").inc(len(compressed))
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def requested_fields(fields: Optional[str] = None) -> Optional[Set[str]]:
+    """
+    Top-level keys named in ?fields= (lets an endpoint skip building the rest).
+
+    Returns:
+        Set of top-level keys, or None if no projection was requested
+    """
+    if fields is None:
+        fields = request.args.get("fields")
+    if not fields:
+        return None
+    return {path.strip().split(".")[0] for path in fields.split(",") if path.strip()}
+
+
+def select_fields(data: Dict[str, Any], fields: str) -> Dict[str, Any]:
+    """
+    Project a dict down to comma-separated (dotted) paths, e.g. "title,artist,colors".
+
+    Unknown paths are ignored and an "error" key is always kept, so clients
+    still see failures.
+
+    Args:
+        data: Response dict (not modified)
+        fields: Comma-separated paths, nested keys with dots ("track.title")
+
+    Returns:
+        New dict with only the requested paths
+    """
+    result: Dict[str, Any] = {}
+    paths = [path.strip() for path in fields.split(",") if path.strip()]
+    if "error" in data:
+        paths.append("error")
+    for path in paths:
+        source, target = data, result
+        parts = path.split(".")
+        for depth, part in enumerate(parts):
+            if not isinstance(source, dict) or part not in source:
+                break
+            if depth == len(parts) - 1:
+                target[part] = source[part]
+                break
+            source = source[part]
+            existing = target.get(part)
+            if existing is source:
+                break  # Parent already selected whole
+            if not isinstance(existing, dict):
+                existing = target[part] = {}
+            target = existing
+    return result
+
+
+def json_fields(func):
+    """Route decorator applying ?fields= to dict results (error tuples and Responses pass through)."""
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        result = await func(*args, **kwargs)
+        fields = request.args.get("fields")
+        if fields and isinstance(result, dict):
+            return select_fields(result, fields)
+        return result
+    return wrapper
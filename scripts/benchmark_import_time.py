@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Import-Time Budget Report
+
+Runs `python -X importtime` in a fresh interpreter for each target and
+charges every imported module's own time to the SyncLyrics module that pulled
+it in (numpy under system_utils.image counts towards system_utils.image).
+
+Targets:
+    sync_lyrics  What runs before Hypercorn binds (keep this small)
+    server       What the boot app imports in the background (see boot.py)
+
+Usage:
+    python scripts/benchmark_import_time.py
+    python scripts/benchmark_import_time.py --target server --repeat 5 --top 25
+    python scripts/benchmark_import_time.py --target sync_lyrics --budget 300   # exit 1 if over budget
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_TARGETS = ["sync_lyrics", "server"]
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def project_packages() -> set:
+    """Top-level module and package names that belong to this repo."""
+    names = {p.stem for p in ROOT.glob("*.py")}
+    names |= {p.parent.name for p in ROOT.glob("*/__init__.py")}
+    return names
+
+
+def run_importtime(target: str) -> list:
+    """
+    Import `target` in a fresh interpreter with -X importtime.
+
+    Returns:
+        [(self_us, cumulative_us, depth, module)] in the order Python reports them
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            rows.append((int(match.group(1)), int(match.group(2)), (len(match.group(3)) - 1) // 2, match.group(4)))
+    return rows
+
+
+def owner_name(module: str) -> str:
+    """Group project modules by file (package.module), drop deeper submodules."""
+    return ".".join(module.split(".")[:2])
+
+
+def attribute(rows: list, project: set) -> tuple:
+    """
+    Charge each module's self time to the project module that imported it.
+
+    -X importtime prints children before their parent (post-order) and the
+    target last, so walking it reversed sees every parent before its children.
+    Third-party imports are labelled "owner > package" (server > quart).
+
+    Returns:
+        (by_owner {label: us}, by_package {top-level package: us}, total_us)
+    """
+    by_owner = defaultdict(int)
+    by_package = defaultdict(int)
+    ancestors = []  # (depth, label, is_project) chain of the current import path
+    total = 0
+    for index, (self_us, cumulative_us, depth, module) in enumerate(reversed(rows)):
+        if depth == 0:
+            if index:
+                break  # Anything earlier is interpreter startup (site, encodings)
+            total = cumulative_us
+        while ancestors and ancestors[-1][0] >= depth:
+            ancestors.pop()
+        top = module.split(".")[0]
+        if top in project:
+            label, is_project = owner_name(module), True
+        elif ancestors and ancestors[-1][2]:
+            label, is_project = f"{ancestors[-1][1]} > {top}", False
+        elif ancestors:
+            label, is_project = ancestors[-1][1], False
+        else:
+            label, is_project = top, False
+        ancestors.append((depth, label, is_project))
+        by_owner[label] += self_us
+        by_package[top] += self_us
+    return by_owner, by_package, total
+
+
+def print_table(title: str, values: dict, total: int, top: int) -> None:
+    print(f"  {title}")
+    for name, us in sorted(values.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"    {us / 1000:8.1f} ms  {100 * us / total if total else 0:5.1f}%  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget per subsystem")
+    parser.add_argument("--target", action="append", help=f"Module to import (default: {', '.join(DEFAULT_TARGETS)})")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per target; the fastest is reported (default: 3)")
+    parser.add_argument("--top", type=int, default=15, help="Rows per table (default: 15)")
+    parser.add_argument("--budget", type=float, help="Fail (exit 1) if a target takes longer than this many ms")
+    args = parser.parse_args()
+
+    project = project_packages()
+    over_budget = False
+    for target in args.target or DEFAULT_TARGETS:
+        runs = [attribute(run_importtime(target), project) for _ in range(max(1, args.repeat))]
+        by_owner, by_package, total = min(runs, key=lambda run: run[2])
+        print(f"\n== import {target}: {total / 1000:.1f} ms (best of {len(runs)}) ==")
+        print_table("By subsystem (self time of everything it pulled in)", by_owner, total, args.top)
+        print_table("By top-level package", by_package, total, args.top)
+        if args.budget is not None and total / 1000 > args.budget:
+            print(f"  OVER BUDGET: {total / 1000:.1f} ms > {args.budget:.0f} ms")
+            over_budget = True
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
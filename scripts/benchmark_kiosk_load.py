@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Kiosk Load Generator
+
+Simulates N always-on displays: each client polls /current-track and /lyrics
+in parallel, then waits --interval (like resources/js/main.js), over
+keep-alive connections with gzip accepted. Reports latency per endpoint and
+how close each client got to the intended poll rate.
+
+Compare the single-process server with edge workers (server.edge.workers > 0):
+    python scripts/benchmark_kiosk_load.py --url http://127.0.0.1:9012 --url http://127.0.0.1:9014
+
+Usage:
+    python scripts/benchmark_kiosk_load.py
+    python scripts/benchmark_kiosk_load.py --clients 100 --duration 60 --pid 12345   # + producer CPU (psutil)
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+PATHS = ["/current-track", "/lyrics"]
+
+
+class Connection:
+    """Minimal HTTP/1.1 keep-alive client (Content-Length and chunked bodies)."""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def get(self, path: str) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Accept-Encoding: gzip\r\nConnection: keep-alive\r\n\r\n".encode()
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def run_client(host: str, port: int, interval: float, deadline: float, results: dict) -> None:
+    connections = {path: Connection(host, port) for path in PATHS}  # Browsers poll both in parallel
+
+    async def timed_get(path):
+        start = time.perf_counter()
+        try:
+            status = await connections[path].get(path)
+            if status != 200:
+                results["errors"][f"HTTP {status}"] += 1
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError) as e:
+            connections[path].close()
+            results["errors"][type(e).__name__] += 1
+            return
+        results["latency"][path].append(time.perf_counter() - start)
+
+    polls = 0
+    while time.monotonic() < deadline:
+        await asyncio.gather(*(timed_get(path) for path in PATHS))
+        polls += 1
+        await asyncio.sleep(interval)
+    results["polls"].append(polls)
+    for connection in connections.values():
+        connection.close()
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+
+async def benchmark(url: str, clients: int, duration: float, interval: float, pid) -> None:
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    results = {"latency": defaultdict(list), "errors": defaultdict(int), "polls": []}
+    process = psutil.Process(pid) if psutil and pid else None
+    if process:
+        process.cpu_percent(None)
+
+    deadline = time.monotonic() + duration
+    start = time.monotonic()
+    # Stagger start-up like displays that were switched on at different times
+    tasks = []
+    for _ in range(clients):
+        tasks.append(asyncio.create_task(run_client(host, port, interval, deadline, results)))
+        await asyncio.sleep(interval / clients)
+    await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - start
+
+    total = sum(len(v) for v in results["latency"].values())
+    print(f"\n== {url}: {clients} clients, {elapsed:.1f}s ==")
+    print(f"  {total / elapsed:8.1f} req/s   errors: {dict(results['errors']) or 0}")
+    ideal = duration / interval
+    polls = results["polls"]
+    if polls:
+        print(f"  poll rate per client: mean {statistics.mean(polls) / duration:.1f}/s "
+              f"(ideal < {1 / interval:.1f}/s), slowest {min(polls) / duration:.1f}/s "
+              f"= {100 * min(polls) / ideal:.0f}% of ideal")
+    for path in PATHS:
+        values = results["latency"][path]
+        if values:
+            print(f"  {path:16} p50 {percentile(values, 50) * 1000:7.1f} ms  p95 {percentile(values, 95) * 1000:7.1f} ms  "
+                  f"p99 {percentile(values, 99) * 1000:7.1f} ms  max {max(values) * 1000:7.1f} ms")
+    if process:
+        print(f"  producer CPU: {process.cpu_percent(None):.0f}% (pid {pid})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many kiosk displays polling SyncLyrics")
+    parser.add_argument("--url", action="append", help="Base URL (repeat to compare; default: http://127.0.0.1:9012)")
+    parser.add_argument("--clients", type=int, default=50, help="Simulated displays (default: 50)")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per URL (default: 20)")
+    parser.add_argument("--interval", type=float, default=0.1, help="Pause between polls, like lyrics.display.update_interval (default: 0.1)")
+    parser.add_argument("--pid", type=int, help="Producer process id to report CPU usage for (needs psutil)")
+    args = parser.parse_args()
+    if args.pid and psutil is None:
+        print("psutil is not installed; CPU usage will not be reported", file=sys.stderr)
+
+    for url in args.url or ["http://127.0.0.1:9012"]:
+        asyncio.run(benchmark(url, args.clients, args.duration, args.interval, args.pid))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Recognition Engine Benchmark
+
+Replays a folder of WAV clips through RecognitionEngine end to end (audio buffer,
+hedged Local FP/Shazam/ACRCloud stages, multi-match verification) and reports
+accuracy and cost per clip. ShazamIO and ACRCloud are replaced by local stubs
+with configurable latency, so runs are offline and repeatable.
+
+Clip folder layout:
+    clips/
+        benchmark.json      Optional ground truth (see below)
+        Artist - Title.wav  Filename fallback: offset 0, stubs always match
+
+benchmark.json:
+    {"clips": [
+        {"file": "a.wav", "artist": "Artist", "title": "Title", "offset": 42.0,
+         "shazam": "match" | "miss" | {"artist": "...", "title": "..."},   # optional decoy
+         "acrcloud": "match" | "miss", "score": 90}                          # optional
+    ]}
+
+Reported per clip:
+- time to first (correct) accepted match, in simulated seconds and cycles
+- position error of accepted results versus ground truth
+- accepted/rejected counts from _validate_for_acceptance, wrong-song acceptances
+- CPU time and peak Python memory (tracemalloc) per cycle
+
+Usage:
+    python scripts/benchmark_recognition.py clips/ --output run.json
+    python scripts/benchmark_recognition.py clips/ --shazam-latency 1.5 --decoy-rate 0.2
+    python scripts/benchmark_recognition.py clips/ --output new.json --compare run.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import wave
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from logging_config import get_logger
+from system_utils.helpers import _normalize_track_id
+
+logger = get_logger(__name__)
+
+BENCHMARK_FILENAME = "benchmark.json"
+DEFAULT_MAX_CYCLES = 20
+
+
+# ============================================================================
+# CLIPS
+# ============================================================================
+
+def load_wav(path: Path) -> Tuple[np.ndarray, int, int]:
+    """Load a PCM16 WAV as (frames, channels) int16 samples."""
+    with wave.open(str(path), 'rb') as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"{path.name}: only 16-bit PCM WAV is supported")
+        channels = wf.getnchannels()
+        rate = wf.getframerate()
+        data = np.frombuffer(wf.readframes(wf.getnframes()), dtype='<i2')
+    return data.reshape(-1, channels), rate, channels
+
+
+def load_clips(folder: Path) -> List[Dict[str, Any]]:
+    """Read ground truth from benchmark.json, or derive it from "Artist - Title.wav" names."""
+    manifest_path = folder / BENCHMARK_FILENAME
+    if manifest_path.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            clips = json.load(f).get('clips', [])
+        for clip in clips:
+            clip['path'] = folder / clip['file']
+        return clips
+
+    clips = []
+    for path in sorted(folder.glob("*.wav")):
+        artist, _, title = path.stem.partition(" - ")
+        if not title:
+            logger.warning(f"Skipping {path.name}: no ground truth (expected 'Artist - Title.wav')")
+            continue
+        clips.append({'file': path.name, 'path': path, 'artist': artist.strip(), 'title': title.strip(), 'offset': 0.0})
+    return clips
+
+
+# ============================================================================
+# FAKES
+# ============================================================================
+
+class ReplayCapture:
+    """
+    Stand-in for AudioCaptureManager that slices a clip at the simulated position.
+
+    Records which clip position every capture started at, so results can be
+    checked against ground truth via their capture_start_time.
+    """
+
+    def __init__(self, data: np.ndarray, sample_rate: int, channels: int, clip_offset: float):
+        self._data = data
+        self._rate = sample_rate
+        self._channels = channels
+        self._clip_offset = clip_offset
+        self.position = 0.0  # Simulated seconds since clip start
+        self.truth: Dict[float, float] = {}  # capture_start_time -> song position
+
+    @property
+    def device_id(self) -> Optional[int]:
+        return None
+
+    @property
+    def duration(self) -> float:
+        return len(self._data) / self._rate
+
+    def abort(self) -> None:
+        pass
+
+    def song_position(self) -> float:
+        """Ground-truth song position of the current capture start."""
+        return self._clip_offset + self.position
+
+    async def capture(self, duration: float):
+        from audio_recognition.capture import AudioChunk
+
+        start = int(self.position * self._rate)
+        end = min(len(self._data), start + int(duration * self._rate))
+        if start >= end:
+            return None
+
+        data = self._data[start:end]
+        capture_start_time = time.time() - duration
+        self.truth[capture_start_time] = self.song_position()
+        return AudioChunk(
+            data=data if self._channels > 1 else data[:, 0],
+            sample_rate=self._rate,
+            channels=self._channels,
+            duration=(end - start) / self._rate,
+            capture_start_time=capture_start_time,
+        )
+
+
+class StubShazam:
+    """ShazamIO replacement returning the ground truth (or a miss/decoy) after a fixed latency."""
+
+    def __init__(self, bench: 'RecognitionBenchmark'):
+        self._bench = bench
+
+    async def recognize(self, wav_bytes: bytes) -> Dict[str, Any]:
+        bench = self._bench
+        await asyncio.sleep(bench.shazam_latency)
+        song = bench.stub_answer('shazam')
+        if song is None:
+            return {'matches': []}
+        return {
+            'matches': [{'offset': bench.stub_offset(), 'timeskew': 0.0, 'frequencyskew': 0.0}],
+            'track': {
+                'title': song['title'],
+                'subtitle': song['artist'],
+                'key': _normalize_track_id(song['artist'], song['title']),
+            },
+        }
+
+
+class StubACRCloud:
+    """ACRCloudRecognizer replacement (no quota, fixed latency)."""
+
+    def __init__(self, bench: 'RecognitionBenchmark'):
+        self._bench = bench
+
+    def is_available(self) -> bool:
+        return True
+
+    def _can_make_request(self) -> Tuple[bool, str]:
+        return True, ""
+
+    async def recognize(self, audio, wav_bytes: bytes):
+        from audio_recognition.shazam import RecognitionResult
+
+        bench = self._bench
+        await asyncio.sleep(bench.acrcloud_latency)
+        song = bench.stub_answer('acrcloud')
+        if song is None:
+            return None
+        return RecognitionResult(
+            title=song['title'],
+            artist=song['artist'],
+            offset=bench.stub_offset(),
+            capture_start_time=audio.capture_start_time,
+            recognition_time=time.time(),
+            confidence=bench.clip.get('score', bench.acrcloud_score) / 100.0,
+            track_id=_normalize_track_id(song['artist'], song['title']),
+            recognition_provider="acrcloud",
+        )
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _round(value: Optional[float], digits: int = 3) -> Optional[float]:
+    return None if value is None else round(value, digits)
+
+
+class RecognitionBenchmark:
+    """
+    Drives RecognitionEngine cycle by cycle over replayed clips.
+
+    Cycles run back to back (no real sleeps); a simulated clock advances by the
+    capture duration, the cycle's processing time and the engine's next interval,
+    so time-to-first-match reflects what a live session would see.
+    """
+
+    def __init__(self, args: argparse.Namespace):
+        self.shazam_latency = args.shazam_latency
+        self.acrcloud_latency = args.acrcloud_latency
+        self.acrcloud_score = args.acrcloud_score
+        self.offset_jitter = args.offset_jitter
+        self.miss_rate = args.miss_rate
+        self.decoy_rate = args.decoy_rate
+        self.max_cycles = args.max_cycles
+        self.with_local = args.with_local
+        self.track_memory = not args.no_memory
+        self._rng = random.Random(args.seed)
+
+        self.clip: Dict[str, Any] = {}
+        self.capture: Optional[ReplayCapture] = None
+
+    def stub_answer(self, provider: str) -> Optional[Dict[str, str]]:
+        """Song a stub service reports for the current capture (None = no match)."""
+        behaviour = self.clip.get(provider, "match")
+        if behaviour == "miss" or self._rng.random() < self.miss_rate:
+            return None
+        if isinstance(behaviour, dict):
+            return behaviour
+        if self._rng.random() < self.decoy_rate:
+            return {'artist': "Decoy Artist", 'title': f"Decoy {self._rng.randint(1, 3)}"}
+        return {'artist': self.clip['artist'], 'title': self.clip['title']}
+
+    def stub_offset(self) -> float:
+        """Ground-truth offset of the current capture plus configured jitter."""
+        jitter = self._rng.gauss(0.0, self.offset_jitter) if self.offset_jitter else 0.0
+        return self.capture.song_position() + jitter
+
+    def _build_engine(self):
+        from audio_recognition.engine import RecognitionEngine
+
+        engine = RecognitionEngine()
+        engine.capture = self.capture
+        engine.recognizer._shazam = StubShazam(self)
+        engine.recognizer._acrcloud = StubACRCloud(self)
+        if not self.with_local and engine.recognizer._local is not None:
+            engine.recognizer._local.stop_daemon()
+            engine.recognizer._local = None
+        return engine
+
+    async def run_clip(self, clip: Dict[str, Any]) -> Dict[str, Any]:
+        """Replay one clip and collect per-cycle measurements."""
+        data, rate, channels = load_wav(clip['path'])
+        self.clip = clip
+        self.capture = ReplayCapture(data, rate, channels, float(clip.get('offset', 0.0)))
+        engine = self._build_engine()
+        expected_id = _normalize_track_id(clip['artist'], clip['title'])
+
+        validations = {'accepted': 0, 'rejected': 0}
+        validate = engine._validate_for_acceptance
+
+        async def counted_validate(result):
+            accepted = await validate(result)
+            validations['accepted' if accepted else 'rejected'] += 1
+            return accepted
+
+        engine._validate_for_acceptance = counted_validate
+
+        cycles: List[Dict[str, Any]] = []
+        first_match_time = None
+        first_match_cycle = None
+        wrong_accepts = 0
+        position_errors: List[float] = []
+        previous_result = None
+
+        while len(cycles) < self.max_cycles and self.capture.position < self.capture.duration:
+            if self.track_memory:
+                tracemalloc.reset_peak()
+                mem_before = tracemalloc.get_traced_memory()[0]
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+
+            await engine._run_cycle()
+
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            peak_kb = (tracemalloc.get_traced_memory()[1] - mem_before) / 1024 if self.track_memory else None
+
+            result = engine.last_result
+            cycle = {
+                'position': round(self.capture.position, 2),
+                'wall_ms': round(wall * 1000, 1),
+                'cpu_ms': round(cpu * 1000, 1),
+                'peak_kb': _round(peak_kb, 1),
+                'state': engine.state.value,
+            }
+
+            # Judge a result only on the cycle it was accepted/refreshed
+            if result is not None and result is not previous_result:
+                result_id = _normalize_track_id(result.artist, result.title)
+                cycle['provider'] = result.recognition_provider
+                cycle['correct'] = result_id == expected_id
+                if cycle['correct']:
+                    truth = self.capture.truth.get(result.capture_start_time)
+                    if truth is not None:
+                        cycle['position_error'] = round(result.offset - truth, 3)
+                        position_errors.append(abs(cycle['position_error']))
+                    if first_match_time is None:
+                        first_match_time = self.capture.position + engine.capture_duration + wall
+                        first_match_cycle = len(cycles) + 1
+                elif previous_result is None or _normalize_track_id(previous_result.artist, previous_result.title) != result_id:
+                    wrong_accepts += 1
+            previous_result = result
+            cycles.append(cycle)
+
+            # Simulated clock: capture + processing + scheduled wait
+            self.capture.position += engine.capture_duration + wall + engine._next_interval()
+
+        await engine.recognizer.close()
+
+        cpu_values = [c['cpu_ms'] for c in cycles]
+        peak_values = [c['peak_kb'] for c in cycles if c['peak_kb'] is not None]
+        return {
+            'file': clip['file'],
+            'expected': f"{clip['artist']} - {clip['title']}",
+            'matched': first_match_time is not None,
+            'time_to_first_match': _round(first_match_time, 2),
+            'cycles_to_first_match': first_match_cycle,
+            'accepted': validations['accepted'],
+            'rejected': validations['rejected'],
+            'wrong_accepts': wrong_accepts,
+            'mean_abs_position_error': _round(statistics.fmean(position_errors)) if position_errors else None,
+            'max_abs_position_error': _round(max(position_errors)) if position_errors else None,
+            'mean_cpu_ms': _round(statistics.fmean(cpu_values), 1) if cpu_values else None,
+            'max_peak_kb': _round(max(peak_values), 1) if peak_values else None,
+            'cycles': cycles,
+        }
+
+    async def run(self, clips: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run every clip and build the report."""
+        if self.track_memory:
+            tracemalloc.start()
+        try:
+            results = []
+            for clip in clips:
+                logger.info(f"Benchmark: {clip['file']}")
+                results.append(await self.run_clip(clip))
+        finally:
+            if self.track_memory:
+                tracemalloc.stop()
+
+        ttfm = [r['time_to_first_match'] for r in results if r['matched']]
+        errors = [r['mean_abs_position_error'] for r in results if r['mean_abs_position_error'] is not None]
+        all_cycles = [c for r in results for c in r['cycles']]
+        peaks = [c['peak_kb'] for c in all_cycles if c['peak_kb'] is not None]
+
+        return {
+            'version': _git_version(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'config': {
+                'shazam_latency': self.shazam_latency,
+                'acrcloud_latency': self.acrcloud_latency,
+                'acrcloud_score': self.acrcloud_score,
+                'offset_jitter': self.offset_jitter,
+                'miss_rate': self.miss_rate,
+                'decoy_rate': self.decoy_rate,
+                'max_cycles': self.max_cycles,
+                'with_local': self.with_local,
+            },
+            'summary': {
+                'clips': len(results),
+                'matched': len(ttfm),
+                'accuracy': _round(len(ttfm) / len(results)) if results else None,
+                'median_time_to_first_match': _round(statistics.median(ttfm), 2) if ttfm else None,
+                'p95_time_to_first_match': _round(_percentile(ttfm, 95), 2),
+                'mean_abs_position_error': _round(statistics.fmean(errors)) if errors else None,
+                'accepted': sum(r['accepted'] for r in results),
+                'rejected': sum(r['rejected'] for r in results),
+                'wrong_accepts': sum(r['wrong_accepts'] for r in results),
+                'cycles': len(all_cycles),
+                'mean_cpu_ms_per_cycle': _round(statistics.fmean(c['cpu_ms'] for c in all_cycles), 1) if all_cycles else None,
+                'p95_cpu_ms_per_cycle': _round(_percentile([c['cpu_ms'] for c in all_cycles], 95), 1),
+                'max_peak_kb_per_cycle': _round(max(peaks), 1) if peaks else None,
+            },
+            'clips': results,
+        }
+
+
+def _git_version() -> Optional[str]:
+    """Current commit (for comparing runs between versions)."""
+    try:
+        out = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True, text=True, timeout=5, cwd=Path(__file__).parent.parent,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+# Direction of summary metrics for comparisons (others are informational)
+HIGHER_IS_BETTER = {'matched', 'accuracy'}
+LOWER_IS_BETTER = {
+    'median_time_to_first_match', 'p95_time_to_first_match', 'mean_abs_position_error',
+    'wrong_accepts', 'mean_cpu_ms_per_cycle', 'p95_cpu_ms_per_cycle', 'max_peak_kb_per_cycle',
+}
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print per-clip rows and the summary."""
+    print(f"\n{'Clip':<40} {'Match':>6} {'TTFM':>7} {'Cyc':>4} {'Acc':>4} {'Rej':>4} {'PosErr':>7} {'CPUms':>7} {'PeakKB':>8}")
+    print("-" * 96)
+    for r in report['clips']:
+        def fmt(value, spec):
+            return format(value, spec) if value is not None else "-"
+        print(
+            f"{r['file'][:40]:<40} {('yes' if r['matched'] else 'NO'):>6} "
+            f"{fmt(r['time_to_first_match'], '.2f'):>7} {fmt(r['cycles_to_first_match'], 'd'):>4} "
+            f"{r['accepted']:>4} {r['rejected']:>4} {fmt(r['mean_abs_position_error'], '.3f'):>7} "
+            f"{fmt(r['mean_cpu_ms'], '.1f'):>7} {fmt(r['max_peak_kb'], '.0f'):>8}"
+        )
+
+    print("\nSummary")
+    for key, value in report['summary'].items():
+        print(f"  {key:<30} {value}")
+
+
+def print_comparison(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print summary deltas against a previous run."""
+    print(f"\nComparison vs {baseline.get('version') or 'baseline'} ({baseline.get('timestamp', '?')})")
+    for key, new in report['summary'].items():
+        old = baseline.get('summary', {}).get(key)
+        if not isinstance(new, (int, float)) or not isinstance(old, (int, float)):
+            continue
+        delta = new - old
+        if delta == 0 or key not in HIGHER_IS_BETTER | LOWER_IS_BETTER:
+            marker = ""
+        elif (delta < 0) == (key in LOWER_IS_BETTER):
+            marker = "  better"
+        else:
+            marker = "  WORSE"
+        print(f"  {key:<30} {old:>10} -> {new:<10} ({delta:+.3f}){marker}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline accuracy/latency benchmark for RecognitionEngine")
+    parser.add_argument("folder", type=Path, help="Folder of WAV clips (with optional benchmark.json)")
+    parser.add_argument("--output", type=Path, help="Write JSON report to this file")
+    parser.add_argument("--compare", type=Path, help="Previous JSON report to compare against")
+    parser.add_argument("--shazam-latency", type=float, default=1.2, help="Stub Shazam latency in seconds (default: 1.2)")
+    parser.add_argument("--acrcloud-latency", type=float, default=1.5, help="Stub ACRCloud latency in seconds (default: 1.5)")
+    parser.add_argument("--acrcloud-score", type=int, default=90, help="Stub ACRCloud score 0-100 (default: 90)")
+    parser.add_argument("--offset-jitter", type=float, default=0.0, help="Std-dev of stub offset error in seconds")
+    parser.add_argument("--miss-rate", type=float, default=0.0, help="Probability a stub returns no match")
+    parser.add_argument("--decoy-rate", type=float, default=0.0, help="Probability a stub returns a wrong song")
+    parser.add_argument("--max-cycles", type=int, default=DEFAULT_MAX_CYCLES, help="Cycles per clip (default: 20)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for stub behaviour")
+    parser.add_argument("--with-local", action="store_true", help="Keep the real local fingerprint recognizer (needs LOCAL_FP_ENABLED)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (faster, no peak memory)")
+    args = parser.parse_args()
+
+    clips = load_clips(args.folder)
+    if not clips:
+        print(f"No clips found in {args.folder}")
+        sys.exit(1)
+
+    report = asyncio.run(RecognitionBenchmark(args).run(clips))
+    print_report(report)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print_comparison(report, json.load(f))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Album Art DB Compaction
+
+One-shot perceptual dedup of folders saved before duplicate removal existed:
+the same cover/photo downloaded from several providers at different
+resolutions is reduced to its highest-resolution copy (see
+system_utils/image_dedup.py). New downloads are deduplicated at save time.
+
+Run it while SyncLyrics is stopped.
+
+Usage:
+    python scripts/compact_album_art_db.py --dry-run
+    python scripts/compact_album_art_db.py
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import ALBUM_ART_DB_DIR
+from system_utils.image_dedup import compact_album_art_db
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove duplicate images from the album art database")
+    parser.add_argument("--dry-run", action="store_true", help="Only report duplicates, don't delete anything")
+    args = parser.parse_args()
+
+    print(f"Album art DB: {ALBUM_ART_DB_DIR}")
+    stats = compact_album_art_db(dry_run=args.dry_run)
+    action = "Found" if args.dry_run else "Removed"
+    print(f"Scanned {stats['folders']} folders")
+    print(f"{action} {stats['duplicates']} duplicate images in {stats['affected']} folders")
+
+
+if __name__ == "__main__":
+    main()
@@ -926,13 +926,28 @@ def undo_session(db_path: Path, session_id: str, daemon) -> Dict:
     }
 
 
+class _IndexingDaemonAdapter:
+    """Async send_command() facade over IndexingDaemon for LibraryIndexer."""
+    
+    def __init__(self, daemon: 'IndexingDaemon'):
+        self._daemon = daemon
+    
+    async def send_command(self, command: Dict[str, Any], timeout: float = None) -> Dict[str, Any]:
+        import asyncio
+        return await asyncio.to_thread(self._daemon._send_command, command)
+
+
 def index_folder(folder_path: Path, db_path: Path, extensions: List[str] = None, 
                  required_tags: List[str] = None, dry_run: bool = False,
                  daemon: 'IndexingDaemon' = None, filename_fallback: bool = False,
-                 force_include: bool = False) -> Dict[str, Any]:
+                 force_include: bool = False, workers: int = None) -> Dict[str, Any]:
     """
     Index all audio files in a folder.
     
+    Delegates to audio_recognition.indexer.LibraryIndexer: unchanged files
+    (same size/mtime as in indexed_files.json) are skipped without decoding,
+    new/changed files are decoded in parallel and fingerprinted in batches of 8.
+    
     Args:
         folder_path: Path to folder containing audio files
         db_path: Path to database directory
@@ -943,178 +958,60 @@ def index_folder(folder_path: Path, db_path: Path, extensions: List[str] = None,
         daemon: Optional existing IndexingDaemon to reuse (avoids creating duplicate)
         filename_fallback: If True, use filename parsing when tags are missing
         force_include: If True, ignore exclusion list (index all matching files)
+        workers: Decode worker processes (default: CPU count)
     
     Returns:
         Summary dict with results
     """
+    import asyncio
+    from audio_recognition.indexer import LibraryIndexer
+    
     if extensions is None:
         extensions = SUPPORTED_EXTENSIONS
     
-    # Ensure directories exist
-    db_path.mkdir(parents=True, exist_ok=True)
-    temp_dir = db_path / "temp"
-    temp_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Load tracking files
-    indexed_files_path = db_path / "indexed_files.json"
-    skip_log_path = db_path / "skip_log.json"
-    
-    indexed_files = load_json_file(indexed_files_path)
-    skip_log = load_json_file(skip_log_path)  # Dict keyed by filepath
-    
-    # Track excluded files for dry-run display
-    excluded_files = []  # List of {songId, artist, title, filepath, reason}
-    
-    # Find all audio files
-    audio_files = []
-    for ext in extensions:
-        audio_files.extend(folder_path.rglob(f"*{ext}"))
-    
-    print(f"\n=== Indexing {len(audio_files)} files from {folder_path} ===\n")
+    print(f"\n=== Indexing {folder_path} ===\n")
     print(f"Database: {db_path}")
-    print(f"Already indexed: {len(indexed_files)} files")
-    print(f"Using batch mode (8 files parallel) for maximum speed...\n")
-    
-    # Load exclusion list for checking
-    exclusions = load_exclusion_list(db_path)
-    excluded_ids = set(exclusions.get('songIds', []))
-    excluded_patterns = exclusions.get('patterns', [])
-    if excluded_ids or excluded_patterns:
-        print(f"📋 Exclusion list: {len(excluded_ids)} IDs, {len(excluded_patterns)} patterns")
-    
-    results = {
-        'total': len(audio_files),
-        'indexed': 0,
-        'skipped': 0,
-        'excluded': 0,
-        'failed': 0,
-        'songs': [],
-        'errors': []
-    }
     
     # Start daemon for fast fingerprinting (or reuse existing if running)
-    own_daemon = daemon is None or not daemon.is_running
-    if own_daemon:
-        daemon = IndexingDaemon(db_path)
-        if not daemon.start():
-            print("❌ Failed to start indexing daemon")
-            return {'error': 'Daemon startup failed', **results}
-    else:
-        print("✅ Using active CLI daemon")
+    own_daemon = False
+    if not dry_run:
+        own_daemon = daemon is None or not daemon.is_running
+        if own_daemon:
+            daemon = IndexingDaemon(db_path)
+            if not daemon.start():
+                print("❌ Failed to start indexing daemon")
+                return {'error': 'Daemon startup failed', 'indexed': 0, 'songs': [], 'errors': []}
+        else:
+            print("✅ Using active CLI daemon")
     
-    BATCH_SIZE = 8
-    total_files = len(audio_files)
+    indexer = LibraryIndexer(db_path=db_path, workers=workers)
+    try:
+        results = asyncio.run(indexer.index_folder(
+            folder_path,
+            daemon=None if dry_run else _IndexingDaemonAdapter(daemon),
+            dry_run=dry_run,
+            extensions=tuple(extensions),
+            required_tags=tuple(required_tags or ()),
+            filename_fallback=filename_fallback,
+            force_include=force_include,
+        ))
+    finally:
+        # Shutdown daemon (auto-saves database) - only if we own it
+        if own_daemon:
+            daemon.stop()
+        elif daemon is not None and not dry_run:
+            daemon.save()  # Just save, don't stop the CLI's daemon
     
-    # First pass: prepare all files (filter, extract metadata, compute hashes)
-    print(f"Phase 1: Preparing files (metadata + content hash)...")
-    prepared_files = []
-    skipped_in_pass = 0
+    # Show skipped / excluded files with reasons - limit to 50
+    skipped_files = results.get('skipped_files', [])
+    if skipped_files:
+        print(f"\n--- Skipped Files ({len(skipped_files)}) ---")
+        for entry in skipped_files[:50]:
+            print(f"  ❌ {Path(entry['filepath']).name}: {entry.get('reason', 'Unknown')}")
+        if len(skipped_files) > 50:
+            print(f"  ... and {len(skipped_files) - 50} more")
     
-    for i, audio_file in enumerate(audio_files, 1):
-        file_key = str(audio_file.absolute())
-        
-        # Progress output every 10 files or for small batches
-        if i % 10 == 1 or total_files < 20:
-            print(f"  [{i}/{total_files}] Scanning {audio_file.name[:50]}...")
-        
-        # Skip if already indexed by filepath
-        if file_key in indexed_files:
-            results['skipped'] += 1
-            skipped_in_pass += 1
-            continue
-        
-        # NOTE: skip_log check disabled - re-indexing now only requires removing from indexed_files.json
-        # If you want to use skip_log, uncomment the following block:
-        # if file_key in skip_log:
-        #     results['skipped'] += 1
-        #     skipped_in_pass += 1
-        #     continue
-        
-        # Extract metadata (with optional filename fallback)
-        metadata = extract_full_metadata(audio_file, filename_fallback=filename_fallback)
-        
-        # Skip if missing required tags
-        if not metadata['title'] or not metadata['artist']:
-            skip_log[file_key] = {
-                'reason': 'Missing required tags (artist or title)',
-                'skippedAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
-            }
-            results['skipped'] += 1
-            continue
-        
-        # Skip if missing additional required tags
-        if required_tags:
-            missing_tags = []
-            for tag in required_tags:
-                tag_lower = tag.lower()
-                tag_key = tag_lower
-                if tag_lower == 'year':
-                    tag_key = 'year'
-                value = metadata.get(tag_key)
-                if not value:
-                    missing_tags.append(tag)
-            
-            if missing_tags:
-                reason = f"Missing required tags: {', '.join(missing_tags)}"
-                skip_log[file_key] = {
-                    'reason': reason,
-                    'skippedAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
-                }
-                results['skipped'] += 1
-                continue
-        
-        # Skip if too long
-        if metadata['duration'] and metadata['duration'] > MAX_DURATION_MINUTES * 60:
-            duration_min = metadata['duration'] / 60
-            skip_log[file_key] = {
-                'reason': f'Duration exceeds limit ({duration_min:.1f} min > {MAX_DURATION_MINUTES} min)',
-                'skippedAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
-            }
-            results['skipped'] += 1
-            continue
-        
-        # Generate song ID and content hash
-        song_id = normalize_song_id(metadata['artist'], metadata['title'])
-        metadata['songId'] = song_id
-        
-        # Check exclusion list (both explicit IDs and patterns) - skip if force_include
-        if not force_include and is_excluded(song_id, metadata['artist'], metadata['title'], exclusions):
-            excluded_files.append({
-                'songId': song_id,
-                'artist': metadata['artist'],
-                'title': metadata['title'],
-                'filepath': file_key,
-                'reason': 'Excluded by ID or pattern'
-            })
-            results['excluded'] += 1
-            continue
-        
-        content_hash = compute_content_hash(audio_file)
-        metadata['contentHash'] = content_hash
-        metadata['originalFilepath'] = file_key
-        
-        prepared_files.append({
-            'path': audio_file,
-            'metadata': metadata,
-            'file_key': file_key,
-            'content_hash': content_hash
-        })
-    
-    excluded_msg = f", excluded {results['excluded']}" if results['excluded'] > 0 else ""
-    print(f"\nPhase 1 complete: {len(prepared_files)} files to index (skipped {results['skipped']}{excluded_msg})")
-    
-    # Show skipped files with reasons (always, not just dry-run) - limit to 50
-    if results['skipped'] > 0:
-        print(f"\n--- Skipped Files ({results['skipped']}) ---")
-        skip_items = list(skip_log.items())
-        for filepath, entry in skip_items[:50]:
-            reason = entry.get('reason', 'Unknown')
-            filename = Path(filepath).name
-            print(f"  ❌ {filename}: {reason}")
-        if len(skip_items) > 50:
-            print(f"  ... and {len(skip_items) - 50} more")
-    
-    # Show excluded files with details (always, not just dry-run) - limit to 50
+    excluded_files = results.get('excluded_files', [])
     if excluded_files:
         print(f"\n--- Excluded Files ({len(excluded_files)}) ---")
         for exc in excluded_files[:50]:
@@ -1122,176 +1019,41 @@ def index_folder(folder_path: Path, db_path: Path, extensions: List[str] = None,
         if len(excluded_files) > 50:
             print(f"  ... and {len(excluded_files) - 50} more")
     
-    # --- DRY-RUN: Exit after Phase 1 with detailed summary ---
     if dry_run:
         print(f"\n{'=' * 70}")
-        print("DRY-RUN MODE - No changes will be made")
+        print("DRY-RUN MODE - No changes were made")
         print(f"{'=' * 70}\n")
-        
-        if prepared_files:
-            print(f"Would index {len(prepared_files)} files:\n")
-            for f in prepared_files:
-                m = f['metadata']
-                dur = m.get('duration', 0)
+        would_index = results.get('would_index', [])
+        if would_index:
+            print(f"Would index {len(would_index)} files:\n")
+            for f in would_index:
+                dur = f.get('duration') or 0
                 dur_str = f" ({dur:.0f}s)" if dur else ""
-                print(f"  • {m['artist']} - {m['title']}{dur_str}")
-                print(f"    ID: {m['songId']}")
-                print(f"    File: {f['file_key']}")
+                print(f"  • {f['artist']} - {f['title']}{dur_str}")
+                print(f"    ID: {f['songId']}")
+                print(f"    File: {f['filepath']}")
         else:
             print("No new files to index.")
-        
-        print(f"\n{'=' * 40}")
-        print("Summary")
-        print(f"{'=' * 40}")
-        print(f"  Total files found: {results['total']}")
-        print(f"  Would index: {len(prepared_files)}")
-        print(f"  Skipped: {results['skipped']}")
-        if results['excluded'] > 0:
-            print(f"  Excluded: {results['excluded']}")
-        
-        # Show skipped files with reasons (from skip_log entries created this run) - limit to 50
-        if results['skipped'] > 0:
-            print(f"\n{'=' * 40}")
-            print(f"Skipped Files ({results['skipped']})")
-            print(f"{'=' * 40}")
-            # Show entries that were added/modified in this run
-            skip_items = list(skip_log.items())
-            for filepath, entry in skip_items[:50]:
-                reason = entry.get('reason', 'Unknown')
-                filename = Path(filepath).name
-                print(f"  ❌ {filename}")
-                print(f"     Reason: {reason}")
-            if len(skip_items) > 50:
-                print(f"  ... and {len(skip_items) - 50} more")
-        
-        # Show excluded files with details - limit to 50
-        if excluded_files:
-            print(f"\n{'=' * 40}")
-            print(f"Excluded Files ({len(excluded_files)})")
-            print(f"{'=' * 40}")
-            for exc in excluded_files[:50]:
-                print(f"  🚫 {exc['artist']} - {exc['title']}")
-                print(f"     ID: {exc['songId']}")
-            if len(excluded_files) > 50:
-                print(f"  ... and {len(excluded_files) - 50} more")
-        
-        # Add preview data to results for export
         results['dry_run'] = True
-        results['would_index'] = [
-            {
-                'songId': f['metadata']['songId'],
-                'artist': f['metadata']['artist'],
-                'title': f['metadata']['title'],
-                'duration': f['metadata'].get('duration', 0),
-                'filepath': f['file_key']
-            }
-            for f in prepared_files
-        ]
-        # Include skipped and excluded in export
-        results['skipped_files'] = [
-            {'filepath': fp, **entry} for fp, entry in skip_log.items()
-        ]
-        results['excluded_files'] = excluded_files
-        return results
-    
-    print(f"\nPhase 2: Batch fingerprinting ({BATCH_SIZE} parallel)...")
-    
-    # Second pass: process in batches of 8
-    total_batches = (len(prepared_files) + BATCH_SIZE - 1) // BATCH_SIZE
-    
-    for batch_num, batch_start in enumerate(range(0, len(prepared_files), BATCH_SIZE), 1):
-        batch = prepared_files[batch_start:batch_start + BATCH_SIZE]
-        
-        print(f"\n[Batch {batch_num}/{total_batches}] Processing {len(batch)} files...")
-        
-        # Send batch to daemon for parallel processing
-        batch_start_time = time.time()
-        batch_result = daemon.fingerprint_batch(batch)
-        batch_time = time.time() - batch_start_time
-        
-        if not batch_result.get('success'):
-            error = batch_result.get('error', 'Unknown batch error')
-            print(f"  ❌ Batch failed: {error}")
-            for f in batch:
-                results['failed'] += 1
-                results['errors'].append({'file': f['file_key'], 'error': error})
-            continue
-        
-        # Process individual results
-        batch_results = batch_result.get('results', [])
-        
-        for file_info, result in zip(batch, batch_results):
-            file_key = file_info['file_key']
-            metadata = file_info['metadata']
-            song_id = metadata['songId']
-            content_hash = file_info['content_hash']
-            
-            if result.get('success'):
-                print(f"  ✅ {metadata['artist']} - {metadata['title']} ({result.get('fingerprints', 0)} FPs)")
-                results['indexed'] += 1
-                results['songs'].append({
-                    'song_id': song_id,
-                    'title': metadata['title'],
-                    'artist': metadata['artist'],
-                    'source': file_key,
-                    'fingerprints': result.get('fingerprints', 0)
-                })
-                
-                indexed_files[file_key] = {
-                    'songId': song_id,
-                    'contentHash': content_hash,
-                    'indexedAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
-                }
-                
-            elif result.get('skipped'):
-                reason = result.get('reason', 'Unknown')
-                print(f"  ⏭️  {metadata['artist']} - {metadata['title']}: {reason}")
-                results['skipped'] += 1
-                
-                if 'already' in reason.lower() or 'duplicate' in reason.lower():
-                    indexed_files[file_key] = {
-                        'songId': song_id,
-                        'contentHash': content_hash,
-                        'indexedAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
-                        'skipped': reason
-                    }
-            else:
-                error = result.get('error', 'Unknown error')
-                print(f"  ❌ {metadata['artist']} - {metadata['title']}: {error}")
-                results['failed'] += 1
-                results['errors'].append({'file': file_key, 'error': error})
-        
-        # Print batch summary
-        print(f"  Batch completed in {batch_time:.1f}s ({batch_time/len(batch):.2f}s/file avg)")
-        
-        # Save after each batch
-        daemon.save()
-        save_json_file(indexed_files_path, indexed_files)
-        save_json_file(skip_log_path, skip_log)
-    
-    # Shutdown daemon (auto-saves database) - only if we own it
-    if own_daemon:
-        daemon.stop()
-    else:
-        daemon.save()  # Just save, don't stop the CLI's daemon
-    
-    # Final save
-    save_json_file(indexed_files_path, indexed_files)
-    save_json_file(skip_log_path, skip_log)
     
     # Summary
-    print(f"\n=== Indexing Complete ===")
-    print(f"Total files: {results['total']}")
-    print(f"Indexed: {results['indexed']}")
-    print(f"Skipped: {results['skipped']}")
-    print(f"Failed: {results['failed']}")
-    
-    if results['songs']:
+    print(f"\n=== Indexing {'Preview' if dry_run else 'Complete'} ===")
+    print(f"Total files: {results.get('total', 0)}")
+    print(f"Unchanged: {results.get('unchanged', 0)}")
+    if not dry_run:
+        print(f"Indexed: {results.get('indexed', 0)}")
+    print(f"Skipped: {results.get('skipped', 0)}")
+    if results.get('excluded'):
+        print(f"Excluded: {results['excluded']}")
+    print(f"Failed: {results.get('failed', 0)}")
+    print(f"Elapsed: {results.get('elapsed', 0)}s ({results.get('files_per_sec', 0)} files/s)")
+    
+    if results.get('songs'):
         total_fps = sum(s.get('fingerprints', 0) for s in results['songs'])
         print(f"Total fingerprints: {total_fps:,}")
     
     # Save session log for undo
-    if results['indexed'] > 0:
+    if results.get('indexed', 0) > 0:
         added_songs = [
             {'songId': s['song_id'], 'filepath': s['source']}
             for s in results['songs']
@@ -1310,6 +1072,7 @@ def index_folder(folder_path: Path, db_path: Path, extensions: List[str] = None,
     
     return results
 
+
 def reindex_songs(song_ids: List[str], db_path: Path, daemon: 'IndexingDaemon' = None,
                   force_include: bool = False) -> Dict[str, Any]:
     """
@@ -3976,6 +3739,8 @@ def main():
                         help="Force re-index all files in folder (overwrites existing)")
     
     # Preview mode
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Decode worker processes for --index (default: CPU count)")
     parser.add_argument("--dry-run", action="store_true",
                         help="Preview what would be indexed/reindexed without making changes")
     parser.add_argument("--export", type=str, metavar="FILE",
@@ -4006,7 +3771,8 @@ def main():
             required_tags = [t.strip() for t in args.require_tags.split(',') if t.strip()]
             print(f"Requiring additional tags: {', '.join(required_tags)}")
         
-        result = index_folder(folder, db_path, required_tags=required_tags, dry_run=args.dry_run)
+        result = index_folder(folder, db_path, required_tags=required_tags, dry_run=args.dry_run,
+                              workers=args.workers)
         
         # Handle export if dry-run
         if args.export and result.get('dry_run'):
@@ -2,7 +2,6 @@ from os import path
 from typing import Any, Optional, List, Dict
 import asyncio
 import time
-import random  # ADD THIS IMPORT
 from functools import wraps
 
 from quart import Quart, render_template, redirect, flash, request, jsonify, url_for, send_from_directory, websocket
@@ -10,9 +9,12 @@ from lyrics import get_timed_lyrics_previous_and_next, get_current_provider, _is
 import lyrics as lyrics_module
 from system_utils import get_current_song_meta_data, get_album_db_folder, load_album_art_from_db, save_album_db_metadata, get_cached_art_path, cleanup_old_art, clear_artist_image_cache
 from state_manager import *
-from config import LYRICS, RESOURCES_DIR, ALBUM_ART_DB_DIR, SERVER, conf
+from config import LYRICS, FEATURES, SOURCE_LATENCY, WORD_SYNC_OFFSETS, RESOURCES_DIR, SERVER, conf
 from settings import settings
 from logging_config import get_logger
+from metrics import timed, gauge, render_prometheus, get_metrics_snapshot, get_latency_summary
+from boot import get_readiness
+from response_utils import FastJSONProvider, compress_response, json_fields, requested_fields
 
 # Import shared Spotify singleton for controls - ensures all stats are consolidated
 from providers.spotify_api import get_shared_spotify_client
@@ -27,13 +29,8 @@ logger = get_logger(__name__)
 # Cache version based on app start time for cache busting
 APP_START_TIME = int(time.time())
 
-# Add this global near other globals at the top of server.py
-# Global cache for slideshow images
-_slideshow_cache = {
-    'images': [],
-    'last_update': 0
-}
-_SLIDESHOW_CACHE_TTL = 3600  # 1 hour
+# Image types the slideshow shows (GIFs in the album art DB are skipped)
+_SLIDESHOW_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
 
 # Global throttle for cover art logs (prevents spam when frontend makes multiple requests)
 # Key: file path (str), Value: last log timestamp
@@ -55,6 +52,7 @@ STATIC_DIRECTORY = str(RESOURCES_DIR)
 app = Quart(__name__, template_folder=TEMPLATE_DIRECTORY, static_folder=STATIC_DIRECTORY)
 app.config['SERVER_NAME'] = None
 app.secret_key = SERVER.get("secret_key")
+app.json = FastJSONProvider(app)  # orjson when installed
 
 # --- Helper Functions ---
 
@@ -134,6 +132,11 @@ async def add_cache_headers(response):
     
     return response
 
+@app.after_request
+async def compress(response):
+    """Negotiated brotli/gzip for JSON and text responses above server.compression.min_size."""
+    return await compress_response(response, request.accept_encodings)
+
 # --- Font Files Route ---
 # Explicit route for serving font files (Quart's static folder doesn't always pick up new directories)
 
@@ -165,9 +168,25 @@ async def health():
     return {
         "status": "ok",
         "uptime_seconds": int(time.time() - APP_START_TIME),
-        "spotify": spotify_status
+        "spotify": spotify_status,
+        "startup": get_readiness(),  # Background init stages (providers, sources, caches)
+        "latency": get_latency_summary()  # p50/p99 per hot path, see /metrics
     }, 200
 
+
+@app.route("/metrics")
+async def metrics_endpoint():
+    """
+    Hot-path metrics (latency percentiles, counters, gauges).
+    Prometheus text format by default; JSON with ?format=json or Accept: application/json.
+    """
+    wants_json = request.args.get("format") == "json" or (
+        request.accept_mimetypes.best == "application/json"
+    )
+    if wants_json:
+        return jsonify(get_metrics_snapshot())
+    return render_prometheus(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
 @app.route("/")
 async def index() -> str:
     """Main page - pass Spotify auth URL if not authenticated"""
@@ -220,6 +239,7 @@ async def index() -> str:
 
 
 @app.route("/lyrics")
+@json_fields
 async def lyrics() -> dict:
     """
     API endpoint that returns lyrics data as JSON.
@@ -384,6 +404,7 @@ async def lyrics() -> dict:
     }
 
 @app.route("/current-track")
+@json_fields
 async def current_track() -> dict:
     """
     Returns detailed track info (Art, Progress, Duration).
@@ -421,41 +442,20 @@ async def current_track() -> dict:
             
             # Add latency compensation for word-sync (based on source)
             # Same logic as _find_current_lyric_index in lyrics.py
-            source = metadata.get("source", "")
-            if source == "spotify":
-                # Spotify-only mode (e.g., HAOS without Windows)
-                latency_comp = LYRICS.get("display", {}).get("spotify_latency_compensation", -0.5)
-            elif source == "spicetify":
-                # Spicetify mode (Spotify Desktop via WebSocket)
-                latency_comp = LYRICS.get("display", {}).get("spicetify_latency_compensation", 0.0)
-            elif source == "audio_recognition":
-                # Audio recognition mode
-                latency_comp = LYRICS.get("display", {}).get("audio_recognition_latency_compensation", 0.0)
-            elif source == "music_assistant":
-                # Music Assistant mode (network streaming via MA server)
-                latency_comp = LYRICS.get("display", {}).get("music_assistant_latency_compensation", 0.0)
-            else:
-                # Normal mode (Windows Media, hybrid)
-                latency_comp = LYRICS.get("display", {}).get("latency_compensation", 0.0)
+            display_config = LYRICS["display"]
+            latency_comp = SOURCE_LATENCY.get(metadata.get("source", ""), display_config["latency_compensation"])
             metadata["latency_compensation"] = latency_comp
             
             # Add separate word-sync latency compensation for fine-tuning karaoke timing
-            word_sync_latency_comp = LYRICS.get("display", {}).get("word_sync_latency_compensation", 0.0)
-            metadata["word_sync_latency_compensation"] = word_sync_latency_comp
+            metadata["word_sync_latency_compensation"] = display_config["word_sync_latency_compensation"]
             
             # Add provider-specific word-sync offset (Musixmatch/NetEase may have different timing)
-            # Use settings.get() instead of LYRICS dict for hot-reload support
             word_sync_provider = lyrics_module.current_word_sync_provider
-            provider_offset = 0.0
-            if word_sync_provider:
-                offset_key = f"lyrics.display.{word_sync_provider}_word_sync_offset"
-                provider_offset = settings.get(offset_key, 0.0)
-            metadata["provider_word_sync_offset"] = provider_offset
+            metadata["provider_word_sync_offset"] = WORD_SYNC_OFFSETS.get(word_sync_provider, 0.0)
             metadata["word_sync_provider"] = word_sync_provider
             
             # Add word-sync default enabled setting (frontend can still toggle)
-            word_sync_default = settings.get("features.word_sync_default_enabled", True)
-            metadata["word_sync_default_enabled"] = word_sync_default
+            metadata["word_sync_default_enabled"] = FEATURES["word_sync_default_enabled"]
             
             # Add per-song word-sync offset (user adjustment)
             song_offset = lyrics_module.get_song_word_sync_offset(artist, title)
@@ -519,6 +519,7 @@ async def reload_settings():
 # --- Audio Analysis API (for waveform and spectrum visualizer) ---
 
 @app.route('/api/playback/audio-analysis')
+@json_fields
 async def get_audio_analysis():
     """
     Get audio analysis for current track (waveform + spectrum data).
@@ -594,12 +595,15 @@ async def get_audio_analysis():
     sections = analysis.get('sections', [])
     duration = analysis.get('duration', 0)
     
+    # ?fields= lets clients skip the derived copies (the bundled frontend only reads audio_analysis)
+    wanted = requested_fields()
+    
     # Process waveform: average loudness per segment (RMS-like)
     # Formula: (loudness_start + loudness_max) / 2, then convert dB to linear
     waveform = []
     max_amp = 0
     
-    for seg in segments:
+    for seg in (segments if wanted is None or 'waveform' in wanted else []):
         loud_start = max(seg.get('loudness_start', -60), -60)  # Floor at -60dB
         loud_max = max(seg.get('loudness_max', -60), -60)
         avg_db = (loud_start + loud_max) / 2
@@ -617,7 +621,7 @@ async def get_audio_analysis():
     
     # Process segments for spectrum: include start, duration, pitches, and timbre
     spectrum_segments = []
-    for seg in segments:
+    for seg in (segments if wanted is None or 'segments' in wanted else []):
         spectrum_segments.append({
             'start': round(seg.get('start', 0), 3),
             'duration': round(seg.get('duration', 0), 3),
@@ -627,7 +631,7 @@ async def get_audio_analysis():
         })
     
     # Return BOTH raw audio_analysis AND processed fields for backward compatibility
-    return jsonify({
+    return {
         # NEW: Full raw audio analysis (tempo, key, bars, tatums, etc.)
         'audio_analysis': analysis,
         'analysis_track_id': analysis_track_id,
@@ -638,7 +642,56 @@ async def get_audio_analysis():
         'sections': sections,
         'duration': duration,
         'segment_count': len(segments)
-    })
+    }
+
+
+@app.route('/api/playback/audio-analysis/compact')
+async def get_audio_analysis_compact():
+    """
+    Compact binary audio analysis for the waveform and spectrum visualizers.
+    
+    Precomputed waveform, quantized pitch/timbre matrices, beats and sections
+    (format: system_utils/analysis_compact.py), a few KB instead of the full
+    analysis JSON. Same source priority as /api/playback/audio-analysis.
+    Repeat fetches revalidate with the ETag and get a 304.
+    """
+    import zlib
+    from urllib.parse import quote
+    from system_utils.spicetify import _spicetify_state, is_connected as is_spicetify_fresh
+    from system_utils.spicetify_db import load_compact_analysis, build_compact_analysis
+    from system_utils.analysis_compact import decode_header
+    
+    metadata = await get_current_song_meta_data()
+    active_source = metadata.get('source') if metadata else None
+    
+    blob = None
+    if active_source == 'spicetify' and is_spicetify_fresh():
+        live_analysis = _spicetify_state.get('audio_analysis')
+        track_info = _spicetify_state.get('track') or {}
+        artist, title = track_info.get('artist', ''), track_info.get('name', '')
+        if live_analysis and live_analysis.get('segments') and artist and title:
+            # Usually already written by save_to_db; build from memory if that is still in flight
+            blob = await asyncio.to_thread(load_compact_analysis, artist, title)
+            if blob is None:
+                blob = await asyncio.to_thread(build_compact_analysis, artist, title, live_analysis)
+    
+    if blob is None and metadata and metadata.get('artist') and metadata.get('title'):
+        blob = await asyncio.to_thread(load_compact_analysis, metadata['artist'], metadata['title'])
+    
+    if blob is None:
+        return jsonify({"error": "No audio analysis available"}), 404
+    
+    analysis_track_id = decode_header(blob)["analysis_track_id"]
+    # The header embeds analysis_track_id, so the content hash changes with the track too
+    etag = f"{zlib.crc32(blob):08x}-{len(blob):x}"
+    headers = {
+        'ETag': f'"{etag}"',
+        'Cache-Control': 'no-cache',  # Store, but revalidate (cheap 304 via ETag)
+        'X-Analysis-Track-Id': quote(analysis_track_id),  # Non-ASCII titles are alphanumeric too
+    }
+    if request.if_none_match.contains_weak(etag):
+        return '', 304, headers
+    return blob, 200, {**headers, 'Content-Type': 'application/octet-stream'}
 
 
 # --- PWA Routes ---
@@ -713,8 +766,9 @@ async def api_update_settings():
     try:
         data = await request.get_json()
         needs_restart = False
-        for key, value in data.items():
-            needs_restart |= settings.set(key, value)
+        with settings.batch():
+            for key, value in data.items():
+                needs_restart |= settings.set(key, value)
         settings.save_to_config()
         return jsonify({"success": True, "requires_restart": needs_restart})
     except Exception as e:
@@ -1008,6 +1062,135 @@ async def backfill_art_endpoint():
     }), 200
 
 
+@app.route("/api/backfill/library", methods=['GET'])
+async def library_backfill_status():
+    """Progress of the bulk library backfill job"""
+    from system_utils.library_backfill import get_library_backfill
+    return jsonify(get_library_backfill().status())
+
+
+@app.route("/api/backfill/library/start", methods=['POST'])
+async def library_backfill_start():
+    """Start or resume the bulk library backfill job (lyrics, album art, artist images)"""
+    from system_utils.library_backfill import get_library_backfill
+
+    data = await request.get_json(silent=True) or {}
+    try:
+        status = get_library_backfill().start(
+            source=data.get("source", "lyrics_db"),
+            folder=data.get("folder"),
+            tasks=data.get("tasks"),
+            force=bool(data.get("force", False)),
+            restart=bool(data.get("restart", False)),
+        )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({"status": "error", "message": str(e)}), 409
+
+    return jsonify({"status": "success", "job": status}), 200
+
+
+@app.route("/api/backfill/library/pause", methods=['POST'])
+async def library_backfill_pause():
+    """Pause the bulk library backfill job after the current item (progress is kept)"""
+    from system_utils.library_backfill import get_library_backfill
+    return jsonify({"status": "success", "job": get_library_backfill().pause()}), 200
+
+
+@app.route("/api/downloads", methods=['GET'])
+async def get_downloads_status():
+    """Progress of album art / artist image downloads (active, queued, recent, per-host)"""
+    from system_utils.image_downloads import get_download_status
+    return jsonify(get_download_status())
+
+
+def _require_debug_token(func):
+    """
+    Guard for diagnostic endpoints that expose code internals.
+    Requires 'Authorization: Bearer <SYNCLYRICS_DEBUG_TOKEN>' (or ?token=);
+    the endpoints are disabled while no token is configured.
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        import hmac
+        from config import DEBUG
+        expected = DEBUG.get("profile_token", "")
+        if not expected:
+            return jsonify({"error": "Profiling is disabled (set SYNCLYRICS_DEBUG_TOKEN to enable)"}), 403
+        auth = request.headers.get("Authorization", "")
+        supplied = auth[7:] if auth.startswith("Bearer ") else request.args.get("token", "")
+        if not hmac.compare_digest(supplied.encode(), expected.encode()):
+            return jsonify({"error": "Invalid or missing debug token"}), 401
+        return await func(*args, **kwargs)
+    return wrapper
+
+
+@app.route("/api/debug/profile", methods=['GET'])
+@_require_debug_token
+async def debug_profile():
+    """
+    Profile the running server for ?seconds=N (default 10, max 60).
+    
+    ?mode=cpu (default): stack samples of the event loop and SyncLyrics_Worker threads
+        (?hz=100, ?threads=all, ?top=30); ?format=collapsed returns only the
+        flamegraph-ready collapsed stacks as text
+    ?mode=memory: tracemalloc allocation growth over the window
+    ?mode=memory_start / memory_diff / memory_stop: baseline snapshot, growth
+        since the baseline (any time later), stop tracing
+    """
+    import math
+    import threading
+    from system_utils import profiler
+    from system_utils.profiler import profile_cpu, ProfilerBusy
+    
+    seconds = request.args.get("seconds", 10.0, type=float)
+    top = request.args.get("top", 30, type=int)
+    mode = request.args.get("mode", "cpu")
+    if not math.isfinite(seconds):
+        return jsonify({"error": "seconds must be a finite number"}), 400
+    try:
+        if mode == "memory":
+            return jsonify(await asyncio.to_thread(profiler.profile_memory, seconds, top))
+        if mode == "memory_start":
+            return jsonify(await asyncio.to_thread(profiler.memory_baseline))
+        if mode == "memory_diff":
+            return jsonify(await asyncio.to_thread(profiler.memory_diff, top))
+        if mode == "memory_stop":
+            return jsonify(await asyncio.to_thread(profiler.memory_stop))
+        if mode != "cpu":
+            return jsonify({"error": f"Unknown mode '{mode}' (cpu, memory, memory_start, memory_diff, memory_stop)"}), 400
+        result = await asyncio.to_thread(
+            profile_cpu, seconds, threading.get_ident(),  # This handler runs on the loop thread
+            request.args.get("hz", 100, type=int),
+            request.args.get("threads") == "all",
+            top,
+        )
+    except ProfilerBusy as e:
+        return jsonify({"error": str(e)}), 409
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 400
+    if request.args.get("format") == "collapsed":
+        return result["collapsed"], 200, {"Content-Type": "text/plain; charset=utf-8"}
+    return jsonify(result)
+
+
+@app.route("/api/debug/loop-lag", methods=['GET'])
+async def get_loop_lag():
+    """Event loop lag statistics and recent lag/stall events (newest first, ?limit=N)"""
+    from system_utils.loop_monitor import get_loop_monitor
+    monitor = get_loop_monitor()
+    limit = request.args.get("limit", type=int)
+    return jsonify({**monitor.get_status(), "events": monitor.get_events(limit)})
+
+
+@app.route("/api/logging/stats", methods=['GET'])
+async def get_logging_pipeline_stats():
+    """Logging pipeline counters (queued, dropped when full, rate limited, pending)"""
+    from logging_config import get_logging_stats
+    return jsonify(get_logging_stats())
+
+
 # --- Album Art Database API ---
 
 @app.route("/api/album-art/options", methods=['GET'])
@@ -1039,6 +1222,7 @@ async def get_album_art_options():
     # CRITICAL FIX: Pass album and title explicitly to match function signature
     db_result = load_album_art_from_db(artist, album, title)
     options = []
+    option_paths = []  # Local file of each option (parallel to options)
     preferred_provider = None
     
     if db_result:
@@ -1054,6 +1238,8 @@ async def get_album_art_options():
         
         # Add album art options
         for provider_name, provider_data in providers.items():
+            if provider_data.get("duplicate_of"):
+                continue  # Same image as another provider's (removed as a duplicate)
             encoded_folder = quote(folder_name, safe='')
             encoded_filename = quote(provider_data.get('filename', f'{provider_name}.jpg'), safe='')
             image_url = f"/api/album-art/image/{encoded_folder}/{encoded_filename}"
@@ -1068,6 +1254,7 @@ async def get_album_art_options():
                 "is_preferred": provider_name == preferred_provider,
                 "type": "album_art"  # Distinguish from artist images
             })
+            option_paths.append(folder_path / provider_data.get('filename', f'{provider_name}.jpg'))
     
     # Also load artist images from artist-only folder
     artist_folder = get_album_db_folder(artist, None)  # Artist-only folder
@@ -1153,6 +1340,7 @@ async def get_album_art_options():
                         "is_preferred": is_preferred,
                         "type": "artist_image"  # Distinguish from album art
                     })
+                    option_paths.append(image_path)
                 
                 # CRITICAL FIX: Update preferred_provider to reflect artist image preference if set
                 # Use the album folder preference (filename-based) to find the source name for display
@@ -1169,6 +1357,15 @@ async def get_album_art_options():
     if not options:
         return jsonify({"error": "No album art or artist image options found"}), 404
     
+    # Inline small previews so the picker renders without fetching every original
+    from system_utils.image_variants import get_inline_thumbnail
+    thumbnails = await asyncio.gather(
+        *(get_inline_thumbnail(option_path) for option_path in option_paths), return_exceptions=True
+    )
+    for option, thumbnail in zip(options, thumbnails):
+        if isinstance(thumbnail, str):
+            option["thumbnail"] = thumbnail
+    
     return jsonify({
         "artist": artist,
         "album": album or (db_result["metadata"].get("album", "") if db_result else ""),
@@ -1730,13 +1927,92 @@ async def set_background_style():
         else:
             return jsonify({"error": "Failed to save preference"}), 500
 
+# Image file extension -> mimetype (unknown extensions are served as JPEG)
+IMAGE_MIMETYPES = {
+    '.png': 'image/png',
+    '.bmp': 'image/bmp',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.avif': 'image/avif',
+}
+IMAGE_STREAM_CHUNK_SIZE = 256 * 1024  # Bytes per read when streaming image files
+
+async def _send_image_file(image_path: Path, cache_control: str, mimetype: Optional[str] = None,
+                           etag: Optional[str] = None):
+    """
+    Shared image response: streamed file body, content-hash ETag, conditional GET and Range.
+    
+    If-None-Match / If-Modified-Since short-circuit to 304 without opening the file.
+    The ETag comes from the persistent content hash index (system_utils.image_hashes),
+    so unchanged files are never re-read to validate a request.
+    
+    Args:
+        image_path: Image file to serve (must exist)
+        cache_control: Cache-Control header value
+        mimetype: Override mimetype (default: from file extension)
+        etag: Precomputed ETag (e.g. content-addressed filenames), skips the hash index
+        
+    Returns:
+        200, 206 or 304 response
+    """
+    from datetime import datetime, timezone
+    from quart import Response
+    from quart.wrappers.response import FileBody
+    from system_utils.image_hashes import get_content_hash
+    
+    st = image_path.stat()
+    content_hash = etag or await get_content_hash(image_path, st)
+    
+    response = Response(
+        FileBody(image_path, buffer_size=IMAGE_STREAM_CHUNK_SIZE),
+        mimetype=mimetype or IMAGE_MIMETYPES.get(image_path.suffix.lower(), 'image/jpeg')
+    )
+    response.content_length = st.st_size
+    response.headers['Cache-Control'] = cache_control
+    response.headers['Accept-Ranges'] = 'bytes'
+    response.set_etag(content_hash)
+    response.last_modified = datetime.fromtimestamp(st.st_mtime, tz=timezone.utc)
+    return await response.make_conditional(request, accept_ranges=True, complete_length=st.st_size)
+
+async def _image_variant_redirect(image_path: Path):
+    """
+    Redirect to a resized/transcoded variant if the request asks for one (?w=&fmt=&q=).
+    
+    Variant URLs are content-addressed and served as immutable; the redirect itself
+    is not cached so a replaced original is picked up immediately.
+    
+    Returns:
+        Redirect response, or None to serve the original
+    """
+    from system_utils.image_variants import parse_variant_args, get_variant, variant_url
+    
+    spec = parse_variant_args(request.args)
+    if spec is None:
+        return None
+    variant = await get_variant(image_path, spec)
+    if variant is None:
+        return None
+    response = redirect(variant_url(variant))
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route("/api/image-variants/<name>", methods=['GET'])
+async def serve_image_variant(name: str):
+    """Serve a generated image variant (content-addressed, immutable)."""
+    from system_utils.image_variants import resolve_variant, variant_mimetype, IMMUTABLE_CACHE_CONTROL
+    
+    variant_path = resolve_variant(name)
+    if variant_path is None:
+        return "", 404
+    
+    # Name is already a content hash of original + parameters
+    return await _send_image_file(variant_path, IMMUTABLE_CACHE_CONTROL, variant_mimetype(name), etag=variant_path.stem)
+
 @app.route("/api/album-art/image/<folder_name>/<filename>", methods=['GET'])
 async def serve_album_art_image(folder_name: str, filename: str):
-    """Serve album art images from database"""
+    """Serve album art images from database (?w=&fmt=&q= redirects to a resized variant)"""
     from config import ALBUM_ART_DB_DIR
-    from quart import Response
     from urllib.parse import unquote
-    import os
     
     try:
         # Decode URL-encoded folder name and filename
@@ -1757,42 +2033,13 @@ async def serve_album_art_image(folder_name: str, filename: str):
         if not image_path.exists():
             return "", 404
         
-        # Read and serve image
-        with open(image_path, 'rb') as f:
-            image_data = f.read()
-        
-        # Determine mimetype based on file extension (preserves original format)
-        ext = image_path.suffix.lower()
-        mime = 'image/jpeg'  # Default
-        if ext == '.png': mime = 'image/png'
-        elif ext == '.bmp': mime = 'image/bmp'
-        elif ext == '.gif': mime = 'image/gif'
-        elif ext == '.webp': mime = 'image/webp'
+        variant_response = await _image_variant_redirect(image_path)
+        if variant_response is not None:
+            return variant_response
         
-        # Build cache headers with ETag/Last-Modified for efficient revalidation
-        # After max-age expires (24h), browser validates with ETag → 304 if unchanged
-        headers = {'Cache-Control': 'public, max-age=86400, must-revalidate'}
-        
-        try:
-            # Last-Modified: file modification timestamp
-            mtime = os.path.getmtime(str(image_path))
-            from email.utils import formatdate
-            headers['Last-Modified'] = formatdate(mtime, usegmt=True)
-            
-            # ETag: hash of path + mtime (fast, avoids hashing large image files)
-            import hashlib
-            etag_source = f"{image_path}:{mtime}".encode('utf-8')
-            etag = hashlib.md5(etag_source).hexdigest()
-            headers['ETag'] = f'"{etag}"'
-        except Exception:
-            # If mtime fails, just use max-age without ETag (still works)
-            pass
-        
-        return Response(
-            image_data,
-            mimetype=mime,
-            headers=headers
-        )
+        # Stream with revalidation: after max-age expires (24h), browser revalidates
+        # with If-None-Match (content hash ETag) -> 304 if unchanged
+        return await _send_image_file(image_path, 'public, max-age=86400, must-revalidate')
     except Exception as e:
         logger.error(f"Error serving album art image: {e}")
         return "", 500
@@ -1801,10 +2048,12 @@ async def serve_album_art_image(folder_name: str, filename: str):
 
 @app.route("/cover-art")
 async def get_cover_art():
-    """Serves the album art or background image directly from the source (DB or Thumbnail) without race conditions."""
+    """
+    Serves the album art or background image directly from the source (DB or Thumbnail) without race conditions.
+    
+    ?w=&fmt=&q= redirects to a resized variant (see _image_variant_redirect).
+    """
     from system_utils import get_current_song_meta_data, get_cached_art_path
-    from quart import send_file
-    from pathlib import Path
 
     global _cover_art_log_throttle  # <--- CRITICAL FIX NEEDED HERE
 
@@ -1833,6 +2082,9 @@ async def get_cover_art():
         # If thumbnail was deleted during cleanup while metadata cache still references it,
         # we fall through to legacy path instead of returning 404
         if art_path.exists():
+            variant_response = await _image_variant_redirect(art_path)
+            if variant_response is not None:
+                return variant_response
             try:
                 # DEBUG: Log size to verify quality
                 file_size = art_path.stat().st_size
@@ -1854,21 +2106,8 @@ async def get_cover_art():
                             if v > cutoff_time
                         }
                 
-                # Determine mimetype based on extension (preserves original format)
-                ext = art_path.suffix.lower()
-                mime = 'image/jpeg'  # Default
-                if ext == '.png': mime = 'image/png'
-                elif ext == '.bmp': mime = 'image/bmp'
-                elif ext == '.gif': mime = 'image/gif'
-                elif ext == '.webp': mime = 'image/webp'
-                
-                # Serve the file directly with explicit no-cache headers
-                # CRITICAL FIX: Explicit headers prevent browser caching issues
-                response = await send_file(art_path, mimetype=mime)
-                response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-                response.headers['Pragma'] = 'no-cache'
-                response.headers['Expires'] = '0'
-                return response
+                # no-cache (not no-store): polls revalidate and get 304 while the art is unchanged
+                return await _send_image_file(art_path, 'no-cache')
             except Exception as e:
                 logger.error(f"Failed to serve art from path {art_path}: {e}")
         else:
@@ -1880,20 +2119,7 @@ async def get_cover_art():
     art_path = get_cached_art_path()
     if art_path and art_path.exists():
         try:
-            # Determine mimetype based on extension (preserves original format)
-            ext = art_path.suffix.lower()
-            mime = 'image/jpeg'  # Default
-            if ext == '.png': mime = 'image/png'
-            elif ext == '.bmp': mime = 'image/bmp'
-            elif ext == '.gif': mime = 'image/gif'
-            elif ext == '.webp': mime = 'image/webp'
-            
-            # CRITICAL FIX: Explicit headers prevent browser caching issues
-            response = await send_file(art_path, mimetype=mime)
-            response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-            response.headers['Pragma'] = 'no-cache'
-            response.headers['Expires'] = '0'
-            return response
+            return await _send_image_file(art_path, 'no-cache')
         except (OSError, IOError) as e:
             logger.warning(f"Failed to read album art: {e}")
     
@@ -2274,6 +2500,7 @@ async def save_artist_slideshow_preferences_endpoint():
 
 
 @app.route("/api/playback/queue", methods=['GET'])
+@json_fields
 async def get_playback_queue():
     """
     Get playback queue.
@@ -2293,11 +2520,11 @@ async def get_playback_queue():
             spicetify_queue = await get_spicetify_queue()
             if spicetify_queue and spicetify_queue.get('success'):
                 # Return in same format as Spotify API response
-                return jsonify({
+                return {
                     "current": spicetify_queue.get('current'),
                     "queue": spicetify_queue.get('queue', [])[:20],  # Limit to 20 for consistency
                     "source": "spicetify"  # Let frontend know this is more accurate data
-                })
+                }
             else:
                 logger.debug("Spicetify queue request failed, falling back to Spotify API")
     
@@ -2310,11 +2537,11 @@ async def get_playback_queue():
             if plugin and plugin.capabilities() & SourceCapability.QUEUE:
                 queue_data = await plugin.get_queue()
                 if queue_data:
-                    return jsonify({
+                    return {
                         "current": queue_data.get('current'),
                         "queue": queue_data.get('queue', [])[:20],
                         "source": source
-                    })
+                    }
                 logger.debug(f"Plugin {source} queue failed, falling back to Spotify API")
         except Exception as e:
             logger.debug(f"Plugin queue routing failed: {e}")
@@ -2332,11 +2559,11 @@ async def get_playback_queue():
     currently_playing = queue_data.get('currently_playing')
     queue = queue_data.get('queue', [])
     
-    return jsonify({
+    return {
         "current": currently_playing,
         "queue": queue[:20],  # Limit to next 20 songs
         "source": "spotify_api"  # Indicate this may not include autoplay
-    })
+    }
 
 @app.route("/api/playback/liked", methods=['GET'])
 async def check_liked_status():
@@ -3094,6 +3321,7 @@ async def audio_stream_websocket():
         keeping the state machine consistent for both backend and frontend modes.
     """
     frontend_queue = None
+    counted = False  # Gauge incremented (handshake completed)
     
     try:
         from system_utils.reaper import get_reaper_source
@@ -3129,6 +3357,8 @@ async def audio_stream_websocket():
         })
         
         logger.info("Frontend audio WebSocket connected")
+        gauge("websocket_connections", "Open WebSocket connections", endpoint="audio_stream").inc()
+        counted = True
         
         # Main receive loop
         while True:
@@ -3138,7 +3368,8 @@ async def audio_stream_websocket():
                 
                 if isinstance(data, bytes):
                     # Push to frontend queue (async method)
-                    await frontend_queue.push(data)
+                    with timed("websocket_message_seconds", endpoint="audio_stream", type="audio"):
+                        await frontend_queue.push(data)
                 else:
                     # Text message - check for commands
                     if isinstance(data, str):
@@ -3168,6 +3399,8 @@ async def audio_stream_websocket():
         # and allows the frontend to reconnect without losing the recognition session
         GRACE_PERIOD_SECONDS = 10
         
+        if counted:
+            gauge("websocket_connections", endpoint="audio_stream").dec()
         if frontend_queue:
             try:
                 from system_utils.reaper import get_reaper_source
@@ -3245,38 +3478,39 @@ async def settings_page():
         state = set_attribute_js_notation(state, 'representationMethods.terminal', terminal)
         set_state(state)
 
-        # New settings support
-        for key, value in form_data.items():
-            if key in ['theme', 'terminal-method']: continue
-            try:
-                # FIX: Use settings definitions for proper type conversion
-                definition = settings._definitions.get(key)
-                if definition:
-                    if definition.type == bool:
-                        val = value.lower() in ['true', 'on', '1', 'yes']
-                    elif definition.type == int:
-                        val = int(value) if value else definition.default
-                    elif definition.type == float:
-                        val = float(value) if value else definition.default
-                    elif definition.type == list:
-                        # Let validate_and_convert handle JSON/comma parsing
-                        val = value  # Pass raw, settings.set will convert
+        # New settings support (one batch: a single snapshot rebuild for the whole form)
+        with settings.batch():
+            for key, value in form_data.items():
+                if key in ['theme', 'terminal-method']: continue
+                try:
+                    # FIX: Use settings definitions for proper type conversion
+                    definition = settings._definitions.get(key)
+                    if definition:
+                        if definition.type == bool:
+                            val = value.lower() in ['true', 'on', '1', 'yes']
+                        elif definition.type == int:
+                            val = int(value) if value else definition.default
+                        elif definition.type == float:
+                            val = float(value) if value else definition.default
+                        elif definition.type == list:
+                            # Let validate_and_convert handle JSON/comma parsing
+                            val = value  # Pass raw, settings.set will convert
+                        else:
+                            val = value
                     else:
-                        val = value
-                else:
-                    # Fallback for unknown keys
-                    if value.lower() in ['true', 'on']: val = True
-                    elif value.lower() in ['false', 'off']: val = False
-                    elif value.isdigit(): val = int(value)
-                    else: val = value
+                        # Fallback for unknown keys
+                        if value.lower() in ['true', 'on']: val = True
+                        elif value.lower() in ['false', 'off']: val = False
+                        elif value.isdigit(): val = int(value)
+                        else: val = value
                 
-                setting_requires_restart = settings.set(key, val)
-                if setting_requires_restart:
-                    requires_restart = True
-                changes_made += 1
-            except Exception as e:
-                logger.warning(f"Failed to set setting {key}: {e}")
-                errors.append(f"{key}: {str(e)}")
+                    setting_requires_restart = settings.set(key, val)
+                    if setting_requires_restart:
+                        requires_restart = True
+                    changes_made += 1
+                except Exception as e:
+                    logger.warning(f"Failed to set setting {key}: {e}")
+                    errors.append(f"{key}: {str(e)}")
         
         settings.save_to_config()
         
@@ -3564,63 +3798,44 @@ async def get_random_slideshow_images():
     """
     Get a random selection of images from the global album art database.
     Used for the idle screen dashboard.
+
+    Sampled from the image index (kept current on save/delete and by its
+    background scanner), so picking images is O(limit) rather than a walk of the DB.
+    Right after a restart the persisted index is used as-is rather than waiting
+    for the scanner's first pass.
+
+    Query params:
+        limit: Number of images (default 20)
+        artist: Only images from this artist's folders
+        min_resolution: Only images whose larger side is at least this many pixels
+        weight: "resolution" (favor larger images) or "recent" (favor recently added)
     """
+    from system_utils.image_index import load_image_index
+    from urllib.parse import quote
     try:
-        limit = int(request.args.get('limit', 20))
-        current_time = time.time()
-        
-        # Check cache validity
-        if not _slideshow_cache['images'] or (current_time - _slideshow_cache['last_update'] > _SLIDESHOW_CACHE_TTL):
-            logger.info("Refeshing slideshow image cache...")
-            
-            # Helper to recursively find images
-            def find_all_images():
-                images = []
-                if not ALBUM_ART_DB_DIR.exists():
-                    return []
-                    
-                # Walk through the database
-                for root, _, files in os.walk(ALBUM_ART_DB_DIR):
-                    for file in files:
-                        if file.lower().endswith(('.jpg', '.jpeg', '.png', '.webp', '.bmp')):
-                            # Get relative path from DB root for the API URL
-                            full_path = Path(root) / file
-                            try:
-                                rel_path = full_path.relative_to(ALBUM_ART_DB_DIR)
-                                # Convert Windows path separators to forward slashes for URL
-                                url_path = str(rel_path).replace('\\', '/')
-                                images.append(f"/api/album-art/image/{url_path}")
-                            except ValueError:
-                                pass
-                return images
-
-            # Run file scan in thread to avoid blocking
-            loop = asyncio.get_running_loop()
-            all_images = await loop.run_in_executor(None, find_all_images)
-            
-            # Update cache
-            if all_images:
-                _slideshow_cache['images'] = all_images
-                _slideshow_cache['last_update'] = current_time
-                logger.info(f"Slideshow cache updated with {len(all_images)} images")
-        
-        # Use cached images
-        all_images = _slideshow_cache['images']
-        
-        if not all_images:
-            return jsonify({'images': []})
-            
-        # Shuffle and pick random subset (from cache)
-        # We copy the list to avoid modifying the cache with shuffle
-        shuffled = all_images.copy()
-        random.shuffle(shuffled)
-        selected_images = shuffled[:limit]
-        
+        limit = max(0, int(request.args.get('limit', 20)))
+        min_resolution = int(request.args.get('min_resolution', 0) or 0)
+        artist = request.args.get('artist') or None
+        weighting = request.args.get('weight') or None
+        if weighting not in (None, 'resolution', 'recent'):
+            return jsonify({'error': f"Invalid weight '{weighting}' (use 'resolution' or 'recent')"}), 400
+
+        index = await load_image_index()
+        entries = index.sample(
+            limit, artist=artist, min_resolution=min_resolution, weighting=weighting, allow_stale=True
+        ) or []
+        selected_images = [
+            f"/api/album-art/image/{quote(entry.path, safe='/')}" for entry in entries
+            if entry.path.lower().endswith(_SLIDESHOW_EXTENSIONS)
+        ]
+
         return jsonify({
             'images': selected_images,
-            'total_available': len(all_images)
+            'total_available': index.image_count
         })
-        
+
+    except ValueError as e:
+        return jsonify({'error': f"Invalid parameter: {e}"}), 400
     except Exception as e:
         logger.error(f"Error generating random slideshow: {e}")
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
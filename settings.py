@@ -1,6 +1,13 @@
 """
 SyncLyrics Settings Manager
 Handles dynamic configuration management using settings.json
+
+Hot paths should read settings.snapshot (an immutable, attribute-access view
+rebuilt only when a setting changes) or values derived in a
+settings.subscribe() callback, instead of calling settings.get() per request:
+
+    display = settings.snapshot.lyrics.display
+    offset = display.latency_compensation
 """
 
 import json
@@ -11,7 +18,8 @@ import uuid
 import ast  # FIX: For safe list parsing
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Union
 from dataclasses import dataclass, asdict
 from logging_config import get_logger
 
@@ -94,9 +102,68 @@ class Setting:
         except (ValueError, TypeError):
             return self.default
 
+class _Namespace:
+    """Read-only settings namespace; one __slots__ subclass per schema level (see _namespace_class)."""
+    __slots__ = ()
+    _children: Dict[str, type] = {}
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Settings snapshots are read-only (use settings.set() for '{name}')")
+
+    def __delattr__(self, name):
+        raise AttributeError("Settings snapshots are read-only")
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Nested plain-dict copy (for logging/debugging)."""
+        return {
+            name: value.as_dict() if isinstance(value, _Namespace) else value
+            for name, value in ((name, getattr(self, name)) for name in self.__slots__)
+        }
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.as_dict()}>"
+
+
+class SettingsSnapshot(_Namespace):
+    """
+    Immutable view of every schema setting at one point in time.
+
+    Dotted keys become attributes ("lyrics.display.latency_compensation" ->
+    snapshot.lyrics.display.latency_compensation); lists are frozen to tuples.
+    version increases with every published change, so callers can cache
+    derived values per version.
+    """
+    __slots__ = ("version",)
+
+
+def _namespace_class(name: str, tree: Dict[str, Any], base: type = _Namespace) -> type:
+    """Generate a __slots__ class for one level of the key tree ({attr: subtree or None})."""
+    children = {attr: _namespace_class(f"{name}_{attr}", sub) for attr, sub in tree.items() if sub is not None}
+    return type(name, (base,), {"__slots__": tuple(tree), "_children": children})
+
+
+def _fill_namespace(cls: type, tree: Dict[str, Any], values: Dict[str, Any], prefix: str = "") -> _Namespace:
+    namespace = cls.__new__(cls)
+    for attr, sub in tree.items():
+        key = prefix + attr
+        if sub is None:
+            value = values.get(key)
+            if isinstance(value, list):
+                value = tuple(value)
+        else:
+            value = _fill_namespace(cls._children[attr], sub, values, key + ".")
+        object.__setattr__(namespace, attr, value)
+    return namespace
+
+
 class SettingsManager:
     def __init__(self):
         self._settings: Dict[str, Any] = {}
+        self._snapshot: Optional[SettingsSnapshot] = None
+        self._version = 0
+        self._listeners: List[Callable[[SettingsSnapshot], None]] = []
+        self._batch_depth = 0
+        self._batch_changed = False
         
         # Define all available settings
         self._definitions = {
@@ -109,6 +176,11 @@ class SettingsManager:
             "debug.log_to_console": Setting("Log to Console", bool, True, False, "Debug", "Print logs to terminal", "switch"),
             "debug.log_detailed": Setting("Detailed Logging", bool, False, False, "Debug", "Include detailed info", "switch"),
             "debug.performance_logging": Setting("Performance Logging", bool, False, False, "Debug", "Log timing stats", "switch"),
+            "debug.log_queue_size": Setting("Log Queue Size", int, 10000, True, "Debug", "Max log records waiting to be written (DEBUG/INFO dropped when full)", "number"),
+            "debug.log_rate_limit": Setting("Debug Log Rate Limit", float, 5.0, True, "Debug", "DEBUG logs per second per call site in polling modules (0 = unlimited)", "number"),
+            "loop_monitor.enabled": Setting("Event Loop Monitor", bool, True, True, "Debug", "Measure event loop lag and capture the stack of blocking calls", "switch"),
+            "loop_monitor.threshold": Setting("Loop Lag Threshold", float, 0.1, True, "Debug", "Lag (seconds) recorded as an event", "number"),
+            "loop_monitor.slow_callbacks": Setting("Slow Callback Detection", bool, False, True, "Debug", "asyncio debug mode slow-callback reports (adds overhead)", "switch"),
             "debug.log_rotation.max_bytes": Setting("Max Log Size", int, 10485760, False, "Debug", "Max log file size (bytes)", "number"),
             "debug.log_rotation.backup_count": Setting("Log Backups", int, 10, False, "Debug", "Number of backups to keep", "number"),
 
@@ -116,6 +188,13 @@ class SettingsManager:
             "server.port": Setting("Port", int, 9012, True, "Server", "Server port (9012 is default)", "number"),
             "server.host": Setting("Host", str, "0.0.0.0", True, "Server", "Bind address (0.0.0.0 is default)"),
             "server.debug": Setting("Server Debug", bool, False, True, "Server", "Quart debug mode", "switch"),
+            "server.compression.enabled": Setting("Response Compression", bool, True, True, "Server", "gzip/brotli for JSON API responses", "switch"),
+            "server.compression.min_size": Setting("Compression Min Size", int, 1024, True, "Server", "Only compress responses larger than this (bytes)", "number"),
+            "server.compression.level": Setting("Compression Level", int, 5, True, "Server", "gzip level (1 = fastest, 9 = smallest)", "number"),
+            "server.edge.workers": Setting("Edge Workers", int, 0, True, "Server", "Extra worker processes serving displays on the edge port (0 = single process)", "number", advanced=True),
+            "server.edge.port": Setting("Edge Port", int, 9014, True, "Server", "Port the edge workers listen on (point kiosk displays here)", "number", advanced=True),
+            "server.edge.publish_interval": Setting("Edge Snapshot Interval", float, 0.1, True, "Server", "Seconds between track/lyrics snapshots for edge workers", "number", advanced=True),
+            "server.edge.snapshot_size_kb": Setting("Edge Snapshot Size", int, 4096, True, "Server", "Shared memory per snapshot slot (KB); larger responses are proxied", "number", advanced=True),
 
             # UI - Active settings
             "ui.blur_strength": Setting("Blur Strength", int, 10, False, "UI", "Background blur (px)", "slider", min_val=0, max_val=50),
@@ -289,6 +368,7 @@ class SettingsManager:
             "artist_image.timeout": Setting("Timeout", int, 5, False, "Artist Image", "Request timeout (s)", "number"),
             "artist_image.enable_wikipedia": Setting("Wikipedia", bool, False, False, "Artist Image", "Enable Wikipedia/Wikimedia", "switch"),
             "artist_image.enable_fanart_albumcover": Setting("FanArt Album Covers", bool, True, False, "Artist Image", "Fetch FanArt.tv album covers", "switch"),
+            "artist_image.lookup_cache": Setting("Lookup Cache", bool, True, False, "Artist Image", "Remember source lookups across restarts", "switch"),
 
             # Visual Mode
             "visual_mode.enabled": Setting("Visual Mode", bool, True, False, "Visual Mode", "Enable visual mode for instrumentals", "switch"),
@@ -327,6 +407,16 @@ class SettingsManager:
             "server.https.key_file": Setting("Key File", str, "certs/server.key", True, "HTTPS", "SSL private key file path"),
         }
         
+        # Snapshot layout follows the schema (unknown keys from settings.json stay reachable via get())
+        self._key_tree: Dict[str, Any] = {}
+        for key in self._definitions:
+            *parents, leaf = key.split(".")
+            node = self._key_tree
+            for part in parents:
+                node = node.setdefault(part, {})
+            node[leaf] = None
+        self._snapshot_class = _namespace_class("SettingsSnapshot", self._key_tree, SettingsSnapshot)
+        
         self.load_settings()
 
     def load_settings(self) -> None:
@@ -366,6 +456,8 @@ class SettingsManager:
             # FIX: Create default settings file on first run
             logger.info(f"Creating default settings file at {SETTINGS_FILE}")
             self.save_to_config()
+        
+        self._publish()
 
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -389,9 +481,63 @@ class SettingsManager:
         
         setting = self._definitions[key]
         converted = setting.validate_and_convert(value)
+        if key in self._settings and self._settings[key] == converted:
+            return setting.requires_restart
         self._settings[key] = converted
+        if self._batch_depth:
+            self._batch_changed = True
+        else:
+            self._publish()
         return setting.requires_restart
 
+    @contextmanager
+    def batch(self):
+        """Apply several set() calls as one change (one snapshot rebuild, one notification)."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_changed:
+                self._batch_changed = False
+                self._publish()
+
+    @property
+    def snapshot(self) -> SettingsSnapshot:
+        """Current immutable snapshot (replaced, never mutated, on change)."""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Increases every time a new snapshot is published."""
+        return self._version
+
+    def subscribe(self, callback: Callable[[SettingsSnapshot], None]) -> None:
+        """
+        Call callback(snapshot) after every settings change (set, batch, load_settings).
+        
+        Use it to recompute derived values once per change instead of per request.
+        Callbacks run synchronously in the caller of set()/load_settings().
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[SettingsSnapshot], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _publish(self) -> None:
+        """Rebuild the snapshot from the current values and notify subscribers."""
+        snapshot = _fill_namespace(self._snapshot_class, self._key_tree, self._settings)
+        self._version += 1
+        object.__setattr__(snapshot, "version", self._version)
+        self._snapshot = snapshot
+        for callback in list(self._listeners):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"Settings listener {getattr(callback, '__name__', callback)} failed: {e}", exc_info=True)
+
     def save_to_config(self) -> None:
         """Save current memory settings to JSON file"""
         try:
@@ -1,7 +1,21 @@
+"""
+Application state (state.json): theme, display methods, last song.
+
+The state lives in memory; state.json is only its persistence:
+- get_state() returns a copy of the in-memory state (no disk reads on the hot
+  path; the theme context processor calls it on every template render)
+- set_state()/update_state() update memory, notify subscribers and schedule a
+  debounced atomic write on a background thread (bursts coalesce into one write)
+- edits made by another process (or by hand) are picked up by comparing the
+  file's mtime/size every STATE_WATCH_INTERVAL seconds
+- flush_state() writes pending changes immediately (called on shutdown)
+"""
+
 from os import path
-from typing import Any
+from typing import Any, Callable, List, Optional, Set
 import sys  # Added sys
 from pathlib import Path  # Added Path
+import copy
 import json 
 import time
 import threading
@@ -9,8 +23,6 @@ import os
 import uuid
 import logging
 
-from benedict import benedict
-
 # Get logger for this module (will be configured by logging_config.py)
 logger = logging.getLogger(__name__)
 
@@ -46,135 +58,247 @@ DEFAULT_STATE = {
     },
 }
 
-# In-memory cache with TTL to avoid reading from disk constantly
-state = None # memory cache for state to avoid reading from disk
-state_cache_time = 0
-STATE_CACHE_TTL = 2.0  # Cache for 2 seconds to reduce disk I/O
+STATE_WATCH_INTERVAL = 2.0  # Seconds between state.json mtime/size checks (external edits)
+STATE_WRITE_DELAY = 0.5     # Debounce: changes within this window share one write
 
-# Thread lock to prevent concurrent writes (cross-platform)
-# CRITICAL FIX: Use RLock (re-entrant lock) instead of Lock to prevent deadlock
-# When get_state() calls reset_state() which calls set_state(), the same thread
-# needs to acquire the lock multiple times. RLock allows this, Lock does not.
+_state: Optional[dict] = None     # Authoritative state (loaded on first access)
+_file_signature = None            # (mtime_ns, size) of state.json as last read/written by us
+_last_watch_check = 0.0
+_dirty = False                    # In-memory changes not yet written
+_listeners: List[Callable[[dict, Set[str]], None]] = []
+
+# Re-entrant: set_state() may run inside a listener triggered by another change
 _state_lock = threading.RLock()
+_write_event = threading.Event()
+_writer_thread: Optional[threading.Thread] = None
+
+
+def _signature() -> Optional[tuple]:
+    try:
+        stat = os.stat(STATE_FILE)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+def _read_file() -> Optional[dict]:
+    """Parse state.json; None if it is missing, unreadable or not a JSON object."""
+    try:
+        with open(STATE_FILE, "r") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Failed to read state file {STATE_FILE}: {e}")
+        return None
+    if not isinstance(data, dict):
+        logger.warning(f"State file {STATE_FILE} does not contain an object, ignoring it")
+        return None
+    return data
+
+
+def _changed_keys(old: dict, new: dict) -> Set[str]:
+    missing = object()
+    return {key for key in old.keys() | new.keys() if old.get(key, missing) != new.get(key, missing)}
+
+
+def _load() -> None:
+    """Initial load; a missing or corrupt file is replaced with the default state."""
+    global _state, _file_signature, _last_watch_check
+    data = _read_file()
+    _file_signature = _signature()
+    _last_watch_check = time.monotonic()
+    if data is None:
+        _state = copy.deepcopy(DEFAULT_STATE)
+        _schedule_write()
+    else:
+        _state = data
+
+
+def _check_external_edit() -> Set[str]:
+    """
+    Reload state.json if another process changed it since our last read/write.
+
+    Returns:
+        Top-level keys changed by the reload (empty if nothing changed)
+    """
+    global _state, _file_signature, _last_watch_check
+    now = time.monotonic()
+    if now - _last_watch_check < STATE_WATCH_INTERVAL:
+        return set()
+    _last_watch_check = now
+    if _dirty:
+        return set()  # Our pending write wins; it will overwrite the file anyway
+
+    signature = _signature()
+    if signature == _file_signature:
+        return set()
+    _file_signature = signature
+    if signature is None:
+        _schedule_write()  # File was deleted: write it back from memory
+        return set()
+
+    data = _read_file()
+    if data is None:
+        return set()  # Keep the in-memory state; the file is rewritten on the next change
+    changed = _changed_keys(_state, data)
+    _state = data
+    if changed:
+        logger.info(f"State file changed on disk, reloaded ({', '.join(sorted(changed))})")
+    return changed
+
+
+def _notify(changed: Set[str]) -> None:
+    if not changed or not _listeners:
+        return
+    snapshot = get_state()
+    for callback in list(_listeners):
+        try:
+            callback(snapshot, changed)
+        except Exception as e:
+            logger.error(f"State listener {getattr(callback, '__name__', callback)} failed: {e}", exc_info=True)
+
+
+def _schedule_write() -> None:
+    """Mark state dirty and wake the writer thread (started on first use)."""
+    global _dirty, _writer_thread
+    _dirty = True
+    if _writer_thread is None or not _writer_thread.is_alive():
+        _writer_thread = threading.Thread(target=_writer_loop, daemon=True, name="StateWriter")
+        _writer_thread.start()
+    _write_event.set()
+
+
+def _writer_loop() -> None:
+    while True:
+        _write_event.wait()
+        time.sleep(STATE_WRITE_DELAY)  # Let a burst of changes settle
+        _write_event.clear()
+        flush_state()
+
+
+def _write_file(data: str) -> None:
+    """Atomic write: temp file in the same directory, then os.replace()."""
+    state_dir = os.path.dirname(STATE_FILE)
+    if state_dir:
+        os.makedirs(state_dir, exist_ok=True)
+    # Unique temp name so another process writing at the same time cannot clobber ours
+    temp_path = os.path.join(state_dir, f"state_{uuid.uuid4().hex}.json.tmp")
+    try:
+        with open(temp_path, "w") as f:
+            f.write(data)
+        os.replace(temp_path, STATE_FILE)  # Atomic on Windows and Unix
+    except Exception:
+        try:
+            if path.exists(temp_path):
+                os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def flush_state() -> bool:
+    """
+    Write pending changes to state.json now.
+
+    Returns:
+        bool: True if the file is up to date, False if the write failed
+              (the change stays pending and is retried on the next change)
+    """
+    global _dirty, _file_signature
+    with _state_lock:
+        if not _dirty or _state is None:
+            return True
+        try:
+            _write_file(json.dumps(_state, indent=4))
+        except Exception as e:
+            logger.error(f"Failed to write state file {STATE_FILE}: {e}")
+            return False
+        _dirty = False
+        _file_signature = _signature()
+        return True
+
+
+def subscribe_state(callback: Callable[[dict, Set[str]], None]) -> None:
+    """
+    Register a callback for state changes (set_state or an external edit of state.json).
+
+    Args:
+        callback: Called as callback(state, changed_keys) with a copy of the new
+                  state and the changed top-level keys. Runs on the thread that made
+                  the change, so it should be quick.
+    """
+    if callback not in _listeners:
+        _listeners.append(callback)
+
+
+def unsubscribe_state(callback: Callable[[dict, Set[str]], None]) -> None:
+    """Remove a callback registered with subscribe_state()."""
+    if callback in _listeners:
+        _listeners.remove(callback)
 
 
 def reset_state(): 
     """
     This function resets the state to the default state.
     """
-    try:
-        set_state(DEFAULT_STATE)
-    except Exception as e:
-        # Log error but don't re-raise - let get_state() handle it
-        logger.error(f"Failed to reset state to default: {e}", exc_info=True)
-        # Update in-memory cache even if file write fails
-        global state, state_cache_time
-        state = DEFAULT_STATE.copy()
-        state_cache_time = time.time()
-        raise  # Re-raise so caller knows it failed
+    set_state(DEFAULT_STATE)
 
 
 def set_state(new_state: dict):
     """
     This function sets the state to the given state.
-    Uses file locking and atomic writes to prevent race conditions.
+    Memory is updated immediately; state.json is written by the background writer.
 
     Args:
         new_state (dict): The new state.
     """
 
-    global state, state_cache_time
+    global _state
     
-    # Use lock to prevent concurrent writes
     with _state_lock:
-        # FIX: Use unique temp filename to prevent concurrent writes from overwriting each other
-        # This provides extra safety even though we have a lock (defense in depth)
-        # Temp file must be in the same directory as STATE_FILE for atomic replace to work
-        state_dir = os.path.dirname(STATE_FILE) if os.path.dirname(STATE_FILE) else "."
-        temp_filename = f"state_{uuid.uuid4().hex}.json.tmp"
-        temp_path = os.path.join(state_dir, temp_filename) if state_dir != "." else temp_filename
-        
-        try:
-            # CRITICAL FIX: Create directory FIRST, before trying to write
-            # This prevents FileNotFoundError if the directory doesn't exist
-            # Moved inside try block to handle permission errors gracefully
-            if os.path.dirname(STATE_FILE):
-                os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
-            
-            with open(temp_path, "w") as f:
-                json.dump(new_state, f, indent=4)
-            
-            # Atomic replace (works on both Windows and Unix)
-            
-            if path.exists(STATE_FILE):
-                os.remove(STATE_FILE)
-            os.replace(temp_path, STATE_FILE)
-            
-            # Update cache immediately
-            state = new_state
-            state_cache_time = time.time()
-        except Exception as e:
-            # If write fails, try to clean up temp file
-            try:
-                if path.exists(temp_path):
-                    os.remove(temp_path)
-            except:
-                pass
-            # Re-raise the exception so caller knows it failed
-            raise
+        if _state is None:
+            _load()
+        changed = _changed_keys(_state, new_state)
+        if not changed:
+            return
+        _state = copy.deepcopy(new_state)
+        _schedule_write()
+    _notify(changed)
+
+
+def update_state(changes: dict):
+    """
+    Set top-level keys of the state, leaving the others untouched.
+
+    Args:
+        changes (dict): Keys and values to set.
+    """
+
+    with _state_lock:
+        new_state = get_state()
+        new_state.update(changes)
+        set_state(new_state)
 
 
 def get_state() -> dict:
     """
     This function returns the current state.
-    Uses caching with TTL to avoid reading from disk constantly.
+    Served from memory; state.json is only re-read when another process changed it.
 
     Returns:
-        dict: The current state.
+        dict: A copy of the current state (mutate it and pass it to set_state()).
     """
 
-    global state, state_cache_time
-    
-    # Check cache first (with TTL)
-    current_time = time.time()
-    if state is not None and (current_time - state_cache_time) < STATE_CACHE_TTL:
-        return state  # Return cached version (still valid)
-    
-    # Cache expired or doesn't exist, read from disk
-    # Use lock to prevent concurrent reads during write
     with _state_lock:
-        if not path.exists(STATE_FILE):
-            # File doesn't exist, try to create default state
-            # Wrap in try-except to handle permission/directory errors gracefully
-            try:
-                reset_state()
-                return state
-            except Exception as e:
-                # If reset_state() fails (e.g., permission error), log and return default in-memory
-                logger.error(f"Failed to create state file at {STATE_FILE}: {e}", exc_info=True)
-                # Return default state in memory (won't persist, but app won't crash)
-                state = DEFAULT_STATE.copy()
-                state_cache_time = current_time
-                return state
-        
-        # Read from disk
-        try:
-            with open(STATE_FILE, "r") as f:
-                state = json.load(f)
-                state_cache_time = current_time
-                return state
-        except Exception as e:
-            # If read fails (corrupted file), try to reset to default
-            logger.warning(f"Failed to read state file {STATE_FILE}: {e}, attempting reset")
-            try:
-                reset_state()
-                return state
-            except Exception as reset_error:
-                # If reset also fails, return default in-memory
-                logger.error(f"Failed to reset state file: {reset_error}", exc_info=True)
-                state = DEFAULT_STATE.copy()
-                state_cache_time = current_time
-                return state
+        if _state is None:
+            _load()
+            changed = set()
+        else:
+            changed = _check_external_edit()
+        snapshot = copy.deepcopy(_state)
+    _notify(changed)
+    return snapshot
 
 
 def set_attribute_js_notation(state: dict, attribute: str, value: Any) -> dict:
@@ -190,9 +314,14 @@ def set_attribute_js_notation(state: dict, attribute: str, value: Any) -> dict:
         dict: The state with the attribute set to the value.
     """
 
-    state = benedict(state, keypath_separator=".")
-    state[attribute] = value
-    return state.dict()
+    *parents, name = attribute.split(".")
+    target = state
+    for key in parents:
+        if not isinstance(target.get(key), dict):
+            target[key] = {}
+        target = target[key]
+    target[name] = value
+    return state
 
 
 def get_attribute_js_notation(state: dict, attribute: str) -> Any:
@@ -205,7 +334,14 @@ def get_attribute_js_notation(state: dict, attribute: str) -> Any:
 
     Returns:
         Any: The value of the attribute.
+
+    Raises:
+        KeyError: If the attribute does not exist.
     """
 
-    state = benedict(state, keypath_separator=".")
-    return state[attribute]
+    value = state
+    for key in attribute.split("."):
+        if not isinstance(value, dict):
+            raise KeyError(attribute)
+        value = value[key]
+    return value
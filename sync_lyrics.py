@@ -38,12 +38,10 @@ try:
     HAS_TRAY = True
 except ImportError:
     HAS_TRAY = False
-from PIL import Image
 from config import DEBUG, RESOURCES_DIR
-from lyrics import get_timed_lyrics
-from state_manager import get_state, reset_state
-from server import app
-from logging_config import setup_logging, get_logger, LOGS_DIR
+# NOTE: server/lyrics/state_manager are imported by _load_app() after Hypercorn binds (see boot.py)
+from boot import BootApp, register_stages, stage
+from logging_config import setup_logging, shutdown_logging, get_logger, LOGS_DIR
 # NOTE: SpotifyAPI is accessed via get_shared_spotify_client() singleton throughout the app
 from hypercorn.config import Config
 from hypercorn.asyncio import serve
@@ -62,7 +60,6 @@ except ImportError:
 logger = get_logger(__name__)
 
 # Constants
-from network_utils import MDNSService
 from config import SERVER
 
 # Constants
@@ -74,6 +71,9 @@ _shutdown_event = th.Event()  # Thread-safe for signal handlers (runs in differe
 _server_task = None  # Global to track server task
 _mdns_service = None # Global mDNS service
 _hypercorn_shutdown = None  # asyncio.Event - triggers Hypercorn graceful shutdown
+_boot_app = BootApp(RESOURCES_DIR)  # Served by Hypercorn; forwards to server.app once it is imported
+_reaper_mode = False  # --reaper flag, applied by _load_app()
+_edge_pool = None  # edge.EdgePool when server.edge.workers > 0
 
 # Watchdog for emergency exit - prevents zombie processes when PortAudio hangs
 import threading
@@ -123,6 +123,13 @@ def _dump_thread_stacks():
         # Generate new crash dump
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         new_dump = f"\n{'='*60}\n=== WATCHDOG TRIGGERED - {timestamp} ===\n=== Cleanup hung for {WATCHDOG_TIMEOUT}s ===\n{'='*60}\n\n"
+        # Event loop lag history (what was blocking the loop before the hang)
+        if 'system_utils.loop_monitor' in sys.modules:
+            try:
+                from system_utils.loop_monitor import get_loop_monitor
+                new_dump += get_loop_monitor().format_summary() + "\n"
+            except Exception:
+                pass
         new_dump += "Thread stack traces at time of hang:\n\n"
         
         # Capture stack traces to string
@@ -206,21 +213,14 @@ def restart():
             logger.error(f"Error joining tray thread: {e}")
 
     import subprocess
-    import logging as logging_module  # Avoid shadowing module-level logger
     
     logger.info("Closing log handlers and spawning new instance...")
     
     # FIX: Close all log file handlers BEFORE spawning new process
     # This prevents race condition where new process can't access log files
     # because old process still holds file locks
-    root_logger = logging_module.getLogger()
-    for handler in root_logger.handlers[:]:  # Iterate over copy of list
-        if isinstance(handler, logging_module.FileHandler):
-            try:
-                handler.close()
-                root_logger.removeHandler(handler)
-            except Exception:
-                pass  # Best effort - we're exiting anyway
+    # (flushes the logging queue first so no records are lost)
+    shutdown_logging()
     
     # FIX: Use conditional creation flags based on whether we're running windowless
     # - pythonw.exe: No console, stdout is None
@@ -328,6 +328,47 @@ async def cleanup() -> None:
         except Exception as e:
             logger.debug(f"Failed to stop MA background connection: {e}")
     
+    # Persist image content hashes computed since the last sidecar write
+    if 'system_utils.image_hashes' in sys.modules:
+        try:
+            from system_utils.image_hashes import flush as flush_image_hashes
+            flush_image_hashes()
+        except Exception as e:
+            logger.debug(f"Failed to flush image hash index: {e}")
+    
+    # Stop the event loop monitor (its watcher thread would report shutdown as a stall)
+    if 'system_utils.loop_monitor' in sys.modules:
+        try:
+            from system_utils.loop_monitor import get_loop_monitor
+            get_loop_monitor().stop()
+        except Exception:
+            pass
+
+    # Stop the library backfill job (its checkpoint is saved after every item)
+    if 'system_utils.library_backfill' in sys.modules:
+        try:
+            from system_utils.library_backfill import _job as library_backfill
+            if library_backfill is not None:
+                await library_backfill.cancel()
+        except Exception as e:
+            logger.debug(f"Failed to stop library backfill: {e}")
+
+    # Abort in-flight image downloads (partial files are kept and resumed next run)
+    if 'system_utils.image_downloads' in sys.modules:
+        try:
+            from system_utils.image_downloads import _manager as download_manager
+            if download_manager is not None:
+                download_manager.shutdown()
+        except Exception as e:
+            logger.debug(f"Failed to stop image downloads: {e}")
+    
+    if 'system_utils.image_index' in sys.modules:
+        try:
+            from system_utils.image_index import get_image_index
+            get_image_index().close()
+        except Exception as e:
+            logger.debug(f"Failed to close image index: {e}")
+    
     # Fix C2: REMOVED sd.stop() call
     # Calling sd.stop() while an InputStream is blocked in a C-level call (in the daemon thread)
     # can cause PortAudio deadlock on Windows, hanging the entire cleanup process.
@@ -362,6 +403,14 @@ async def cleanup() -> None:
         except Exception as e:
             logger.error(f"Error joining tray thread: {e}")
 
+    # Stop edge workers (they proxy to this process, so before the server goes away)
+    if _edge_pool:
+        logger.debug("CLEANUP: Stopping edge workers...")
+        try:
+            await asyncio.wait_for(asyncio.to_thread(_edge_pool.stop), timeout=4.0)
+        except Exception as e:
+            logger.error(f"Error stopping edge workers: {e}")
+
     # Fix H3: Cancel only tracked background tasks, not all asyncio tasks
     # Cancelling all_tasks() kills library internals (aiohttp sessions, etc.) and causes issues
     logger.debug("CLEANUP: Cancelling background tasks...")
@@ -384,21 +433,21 @@ async def cleanup() -> None:
     except Exception:
         pass
 
+    # Write pending state changes (the debounced writer thread is a daemon; os._exit skips atexit)
+    if 'state_manager' in sys.modules:
+        try:
+            from state_manager import flush_state
+            flush_state()
+        except Exception as e:
+            logger.error(f"Error flushing state: {e}")
+
     queue.put("exit")
     await asyncio.sleep(0.5)
     
     # Close log file handlers for clean exit
     # This ensures file locks are released before process terminates
-    import logging as logging_module
     logger.info("Cleanup complete, closing log handlers...")
-    root_logger = logging_module.getLogger()
-    for handler in root_logger.handlers[:]:
-        if isinstance(handler, logging_module.FileHandler):
-            try:
-                handler.close()
-                root_logger.removeHandler(handler)
-            except Exception:
-                pass
+    shutdown_logging()
     
     # Signal watchdog that cleanup completed successfully
     _cleanup_complete_event.set()
@@ -437,6 +486,7 @@ def run_tray() -> NoReturn:
         MenuItem("Exit", on_exit)
     )
     
+    from PIL import Image
     _tray_icon = Icon("SyncLyrics", Image.open(ICON_URL), menu=menu)
     _tray_icon.run()
 
@@ -517,7 +567,7 @@ async def run_server() -> NoReturn:
                 http_config.graceful_timeout = 2
                 http_config.shutdown_timeout = 2
                 http_config.debug = False
-                tasks.append(serve(app, http_config, shutdown_trigger=_hypercorn_shutdown.wait))
+                tasks.append(serve(_boot_app, http_config, shutdown_trigger=_hypercorn_shutdown.wait))
                 logger.info(f"HTTP server starting on {host}:{http_port}")
                 
                 # Task B: HTTPS server (with SSL) - for tablet/mobile mic access
@@ -530,14 +580,14 @@ async def run_server() -> NoReturn:
                 https_server_config.graceful_timeout = 2
                 https_server_config.shutdown_timeout = 2
                 https_server_config.debug = False
-                tasks.append(serve(app, https_server_config, shutdown_trigger=_hypercorn_shutdown.wait))
+                tasks.append(serve(_boot_app, https_server_config, shutdown_trigger=_hypercorn_shutdown.wait))
                 logger.info(f"HTTPS server starting on {host}:{https_port}")
             else:
                 # HTTPS-ONLY MODE: Same port, HTTPS replaces HTTP
                 base_config.bind = [f"{host}:{http_port}"]
                 base_config.certfile = str(cert_file)
                 base_config.keyfile = str(key_file)
-                tasks.append(serve(app, base_config, shutdown_trigger=_hypercorn_shutdown.wait))
+                tasks.append(serve(_boot_app, base_config, shutdown_trigger=_hypercorn_shutdown.wait))
                 logger.info(f"HTTPS-only server starting on {host}:{http_port}")
         else:
             # Certificates not found, fall back to HTTP only
@@ -546,12 +596,12 @@ async def run_server() -> NoReturn:
                 f"Falling back to HTTP only. Install 'cryptography' package: pip install cryptography"
             )
             base_config.bind = [f"{host}:{http_port}"]
-            tasks.append(serve(app, base_config, shutdown_trigger=_hypercorn_shutdown.wait))
+            tasks.append(serve(_boot_app, base_config, shutdown_trigger=_hypercorn_shutdown.wait))
             logger.info(f"HTTP server starting on {host}:{http_port}")
     else:
         # HTTP-only mode (default)
         base_config.bind = [f"{host}:{http_port}"]
-        tasks.append(serve(app, base_config, shutdown_trigger=_hypercorn_shutdown.wait))
+        tasks.append(serve(_boot_app, base_config, shutdown_trigger=_hypercorn_shutdown.wait))
         logger.info(f"HTTP server starting on {host}:{http_port}")
     
     try:
@@ -567,13 +617,82 @@ async def run_server() -> NoReturn:
             logger.error(f"Server error: {e}")
         raise  # Re-raise to trigger cleanup
 
+def _apply_audio_rec_flags() -> None:
+    """Set audio recognition runtime flags from --reaper or settings (before any request reads them)."""
+    from config import AUDIO_RECOGNITION
+    from system_utils.metadata import set_audio_rec_runtime_enabled
+    if _reaper_mode:
+        set_audio_rec_runtime_enabled(True, False)
+        return
+    # Initialize runtime flags from config (if --reaper wasn't used)
+    # This ensures settings.json values are respected for audio recognition
+    enabled = AUDIO_RECOGNITION.get("enabled", False)
+    auto_detect = AUDIO_RECOGNITION.get("reaper_auto_detect", False)
+    if enabled or auto_detect:
+        set_audio_rec_runtime_enabled(enabled, auto_detect)
+        logger.debug(f"Audio rec runtime flags from config: enabled={enabled}, auto_detect={auto_detect}")
+
+def _load_app():
+    """
+    Import the Quart app and everything behind it (runs in a worker thread).
+    
+    Returns:
+        The Quart app from server.py
+    """
+    from server import app
+    _apply_audio_rec_flags()
+    # Create the Spotify singleton here, before concurrent requests can race to create it
+    from providers.spotify_api import get_shared_spotify_client
+    get_shared_spotify_client()
+    return app
+
+async def _init_background() -> None:
+    """Start audio sources and cache scanners once the app is serving (startup stages on /health)."""
+    with stage("sources"):
+        # Start audio recognition if --reaper flag was used
+        # Check runtime flag (set by --reaper or config) to avoid importing audio_recognition unnecessarily
+        from system_utils.metadata import _audio_rec_runtime_enabled
+        if _audio_rec_runtime_enabled:
+            try:
+                from system_utils.reaper import get_reaper_source
+                source = get_reaper_source()
+                await source.start(manual=True)
+                logger.info("Audio recognition started (--reaper mode)")
+            except Exception as e:
+                logger.error(f"Failed to start audio recognition: {e}")
+                # Disable audio rec for this session to prevent further attempts
+                from system_utils.metadata import set_audio_rec_runtime_enabled
+                set_audio_rec_runtime_enabled(False, False)
+                logger.info("Audio recognition disabled for this session")
+        
+        # Start Reaper auto-detect background task if enabled in settings
+        # This is SEPARATE from --reaper flag - runs a lightweight check every 30s
+        from config import AUDIO_RECOGNITION
+        if AUDIO_RECOGNITION.get("reaper_auto_detect", False):
+            try:
+                from system_utils.reaper import start_reaper_auto_detect
+                await start_reaper_auto_detect()
+                logger.info("Reaper auto-detect enabled")
+            except Exception as e:
+                logger.error(f"Failed to start Reaper auto-detect: {e}")
+
+    with stage("caches"):
+        # Start the album art DB image index scanner (reconciles with the disk in the background)
+        from config import FEATURES
+        if FEATURES.get("album_art_db", True):
+            try:
+                from system_utils.image_index import start_image_index_scanner
+                start_image_index_scanner()
+            except Exception as e:
+                logger.error(f"Failed to start image index scanner: {e}")
+
 async def main() -> NoReturn:
     """
     Main application loop that coordinates the server, tray icon and lyrics sync
     Returns:
         NoReturn: This function never returns
     """
-    global _tray_thread, _server_task, _mdns_service
+    global _tray_thread, _server_task, _mdns_service, _edge_pool
     
     # Register asyncio-native signal handlers on Unix
     # This is the recommended approach for asyncio apps - properly interrupts async operations
@@ -603,11 +722,17 @@ async def main() -> NoReturn:
     _hypercorn_shutdown = asyncio.Event()
     
     # Start the server and store task globally
+    # Hypercorn binds right away with the boot app in front (/health + static files);
+    # the real app is imported below without holding up the bind
+    register_stages("app", "sources", "caches")
     logger.info(f"Starting server on port {PORT}...")
     _server_task = asyncio.create_task(run_server())
+    # Import the Quart app (providers, lyrics, state) off the loop while mDNS/tray start up
+    app_task = asyncio.create_task(_boot_app.load(_load_app))
     
     # Register mDNS service
     try:
+        from network_utils import MDNSService
         _mdns_service = MDNSService(PORT)
         await asyncio.to_thread(_mdns_service.register)
     except Exception as e:
@@ -621,32 +746,35 @@ async def main() -> NoReturn:
     else:
         logger.info("System tray disabled (headless mode or missing dependency).")
     
-    # Start audio recognition if --reaper flag was used
-    # Check runtime flag (set by --reaper or config) to avoid importing audio_recognition unnecessarily
-    from system_utils.metadata import _audio_rec_runtime_enabled
-    if _audio_rec_runtime_enabled:
-        try:
-            from system_utils.reaper import get_reaper_source
-            source = get_reaper_source()
-            await source.start(manual=True)
-            logger.info("Audio recognition started (--reaper mode)")
-        except Exception as e:
-            logger.error(f"Failed to start audio recognition: {e}")
-            # Disable audio rec for this session to prevent further attempts
-            from system_utils.metadata import set_audio_rec_runtime_enabled
-            set_audio_rec_runtime_enabled(False, False)
-            logger.info("Audio recognition disabled for this session")
-    
-    # Start Reaper auto-detect background task if enabled in settings
-    # This is SEPARATE from --reaper flag - runs a lightweight check every 30s
-    from config import AUDIO_RECOGNITION
-    if AUDIO_RECOGNITION.get("reaper_auto_detect", False):
-        try:
-            from system_utils.reaper import start_reaper_auto_detect
-            await start_reaper_auto_detect()
-            logger.info("Reaper auto-detect enabled")
-        except Exception as e:
-            logger.error(f"Failed to start Reaper auto-detect: {e}")
+    # Hand traffic over to the real app once it is imported
+    await app_task
+
+    # Start the event-loop lag monitor (GET /api/debug/loop-lag, summarized in watchdog dumps)
+    try:
+        from system_utils.loop_monitor import start_loop_monitor
+        start_loop_monitor()
+    except Exception as e:
+        logger.error(f"Failed to start event loop monitor: {e}")
+
+    # Audio sources and caches are not needed to serve the first request
+    from system_utils.helpers import create_tracked_task
+    create_tracked_task(_init_background())
+
+    # Edge worker processes for many displays (server.edge.workers > 0, see edge.py)
+    try:
+        from edge import create_edge_pool
+        _edge_pool = create_edge_pool()
+        if _edge_pool:
+            _edge_pool.start(DEBUG.get("log_level", "INFO"))
+            create_tracked_task(_edge_pool.publish_loop(_boot_app.app))
+    except Exception as e:
+        logger.error(f"Failed to start edge workers: {e}")
+        if _edge_pool:
+            _edge_pool.stop()  # Release the snapshot segment and any workers already started
+        _edge_pool = None
+
+    from lyrics import get_timed_lyrics
+    from state_manager import get_state, reset_state
 
     # Get active display methods
     # CRITICAL FIX: Use .get() with default to prevent crash if state file is missing representationMethods key
@@ -737,6 +865,10 @@ async def main() -> NoReturn:
         await cleanup()
 
 if __name__ == "__main__":
+    # Edge workers are spawned processes; frozen builds must hand them off here
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
     # Parse command line arguments
     import argparse
     parser = argparse.ArgumentParser(description='SyncLyrics - Real-time lyrics display')
@@ -750,9 +882,8 @@ if __name__ == "__main__":
         from config import AUDIO_RECOGNITION
         AUDIO_RECOGNITION['enabled'] = True
         AUDIO_RECOGNITION['reaper_auto_detect'] = False  # Not needed - we start immediately
-        # Set runtime flags for event-driven approach
-        from system_utils.metadata import set_audio_rec_runtime_enabled
-        set_audio_rec_runtime_enabled(True, False)
+        # Runtime flags are set by _load_app() once system_utils is imported
+        _reaper_mode = True
         print("🎵 Reaper mode: Audio recognition will start after server launch")
     
     # Set up logging
@@ -761,20 +892,11 @@ if __name__ == "__main__":
         file_level="DEBUG" if DEBUG.get("log_detailed", False) else "INFO",
         console=DEBUG.get("log_to_console", True),
         log_file=DEBUG.get("log_file", "synclyrics.log"),
-        log_providers=DEBUG.get("log_providers", True)
+        log_providers=DEBUG.get("log_providers", True),
+        queue_size=DEBUG.get("log_queue_size", 10000),
+        debug_rate_limit=DEBUG.get("log_rate_limit", 5.0)
     )
     
-    # Initialize runtime flags from config (if --reaper wasn't used)
-    # This ensures settings.json values are respected for audio recognition
-    if not args.reaper:
-        from config import AUDIO_RECOGNITION
-        from system_utils.metadata import set_audio_rec_runtime_enabled
-        enabled = AUDIO_RECOGNITION.get("enabled", False)
-        auto_detect = AUDIO_RECOGNITION.get("reaper_auto_detect", False)
-        if enabled or auto_detect:
-            set_audio_rec_runtime_enabled(enabled, auto_detect)
-            logger.debug(f"Audio rec runtime flags from config: enabled={enabled}, auto_detect={auto_detect}")
-    
     def handle_interrupt(signum=None, frame=None):
         """Handle keyboard interrupt (works for both signal.signal and loop.add_signal_handler)"""
         logger.info("Received interrupt signal, initiating shutdown...")
@@ -79,7 +79,6 @@ external_hints = [
     'cryptography.x509',
     
     # Utilities
-    'benedict',
     'desktop_notifier',
     'desktop_notifier.winrt',
     'colorama',
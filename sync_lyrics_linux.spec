@@ -76,7 +76,6 @@ external_hints = [
     'PIL.Image',
     
     # Utilities
-    'benedict',
     'colorama',
     'yaml',
     'urllib3',
@@ -80,7 +80,6 @@ external_hints = [
     'PIL.Image',
     
     # Utilities
-    'benedict',
     'colorama',
     'yaml',
     'urllib3',
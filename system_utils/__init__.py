@@ -12,6 +12,15 @@ The internal structure is:
     state.py      - Shared locks, caches, trackers
     helpers.py    - Pure utility functions
     image.py      - Image I/O and color extraction
+    image_variants.py - Resized/transcoded image variant cache
+    image_hashes.py - Persistent content hash index (ETags, variant names)
+    image_index.py - Persistent album art DB image index (SQLite + memory)
+    image_downloads.py - Pooled, prioritized, resumable image downloads
+    image_dedup.py - Perceptual duplicate removal in the album art DB
+    library_backfill.py - Bulk lyrics/art backfill job for a whole library
+    loop_monitor.py - Event-loop lag sampler and stall capture
+    profiler.py   - On-demand CPU sampling / tracemalloc profiler
+    analysis_compact.py - Compact binary audio analysis for the visualizers
     album_art.py  - Album art database
     artist_image.py - Artist image database
     windows.py    - Windows Media Session
@@ -37,7 +46,6 @@ from .state import (
     _MAX_DB_CHECKED_SIZE,
     _spotify_download_tracker,
     _artist_download_tracker,
-    _artist_image_log_throttle,
     _ARTIST_IMAGE_LOG_THROTTLE_SECONDS,
     _artist_db_check_cache,
     _artist_image_provider,
@@ -62,7 +70,6 @@ from .state import (
 # --- Level 1: Helpers (pure utilities) ---
 from .helpers import (
     create_tracked_task,
-    _cleanup_artist_image_log_throttle,
     _remove_text_inside_parentheses_and_brackets,
     _normalize_track_id,
     sanitize_folder_name,
@@ -136,7 +143,6 @@ __all__ = [
     '_MAX_DB_CHECKED_SIZE',
     '_spotify_download_tracker',
     '_artist_download_tracker',
-    '_artist_image_log_throttle',
     '_ARTIST_IMAGE_LOG_THROTTLE_SECONDS',
     '_artist_db_check_cache',
     '_artist_image_provider',
@@ -159,7 +165,6 @@ __all__ = [
     
     # Helpers
     'create_tracked_task',
-    '_cleanup_artist_image_log_throttle',
     '_remove_text_inside_parentheses_and_brackets',
     '_normalize_track_id',
     'sanitize_folder_name',
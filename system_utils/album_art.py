@@ -21,6 +21,11 @@ from PIL import Image
 from . import state
 from .helpers import sanitize_folder_name
 from .image import save_image_original, determine_image_extension
+from .image_dedup import dedupe_album_providers
+from .image_index import get_image_index
+from .image_downloads import (
+    download_image, normalize_image_url, image_request_headers, PRIORITY_CURRENT
+)
 from config import ALBUM_ART_DB_DIR, FEATURES
 from logging_config import get_logger
 from providers.album_art import get_album_art_provider
@@ -163,6 +168,8 @@ def save_album_db_metadata(folder: Path, metadata: Dict[str, Any]) -> bool:
 def _download_and_save_sync(url: str, path: Path) -> Tuple[bool, str]:
     """
     Helper function to run download and save in thread executor.
+    Standalone one-off download; the album art and artist image DBs use the
+    pooled download manager (image_downloads.download_image) instead.
     This performs blocking I/O operations (network request and file save).
     Preserves the original image format without conversion.
     
@@ -179,33 +186,12 @@ def _download_and_save_sync(url: str, path: Path) -> Tuple[bool, str]:
     """
     import requests
     
-    # FIX: Convert spotify:image:xxx URIs to proper HTTPS URLs
+    # FIX: Convert spotify:image:xxx URIs to proper (1400px) HTTPS URLs
     # Spicetify sometimes sends spotify:image:xxx format instead of HTTPS URLs
-    # Format: spotify:image:ab67616d00001e023cea3f53137fcb2cc86a481c -> https://i.scdn.co/image/ab67616d00001e023cea3f53137fcb2cc86a481c
-    if url and url.startswith('spotify:image:'):
-        image_id = url.replace('spotify:image:', '')
-        url = f'https://i.scdn.co/image/{image_id}'
-        logger.debug(f"Converted spotify:image URI to HTTPS: {url}")
-        
-        # FIX: Also enhance to 1400px after conversion
-        # The URI often contains low-res quality codes (e.g., 00001e02 = 300px)
-        # Enhancement function is idempotent and cached, so safe to call multiple times
-        from providers.spotify_api import enhance_spotify_image_url_sync
-        enhanced_url = enhance_spotify_image_url_sync(url)
-        if enhanced_url != url:
-            logger.debug(f"Enhanced Spotify URL to 1400px: {enhanced_url}")
-            url = enhanced_url
+    url = normalize_image_url(url)
     
-    # Add User-Agent and Referer headers (required by Wikimedia Commons and best practice)
-    # Use same User-Agent as ArtistImageProvider for consistency
-    # Referer header prevents hotlinking protection and reduces 403 errors
-
-    headers = {
-        'User-Agent': 'SyncLyrics/1.0.0 (https://github.com/AnshulJ999/SyncLyrics; contact@example.com)'
-    }
-    # Only add Referer for Wikipedia/Wikimedia to prevent hotlinking protection
-    if 'wikipedia' in url.lower() or 'wikimedia' in url.lower():
-        headers['Referer'] = 'https://en.wikipedia.org/'
+    # User-Agent (required by Wikimedia Commons) and Referer for Wikipedia hotlinking protection
+    headers = image_request_headers(url)
     
     # Retry logic with very small exponential backoff (0.1s, 0.2s, 0.4s)
     max_retries = 3
@@ -261,7 +247,8 @@ def _download_and_save_sync(url: str, path: Path) -> Tuple[bool, str]:
 
 async def ensure_album_art_db(
     artist: str, album: Optional[str], title: str, spotify_url: Optional[str] = None, 
-    retry_count: int = 0, force: bool = False
+    retry_count: int = 0, force: bool = False, priority: int = PRIORITY_CURRENT,
+    album_only: bool = False
 ) -> Optional[Tuple[str, str]]:
     """
     Background task to fetch all album art options and save them to the database.
@@ -275,6 +262,9 @@ async def ensure_album_art_db(
         spotify_url: Spotify album art URL (optional)
         retry_count: Internal retry counter for self-healing
         force: If True, re-download images even if they already exist (for manual refetch)
+        priority: Download priority (image_downloads.PRIORITY_*; backfill passes PRIORITY_BACKFILL)
+        album_only: True when no track is known and title is just the album name,
+            so the entry is never recorded as a single
         
     Returns:
         Tuple of (preferred_url, resolution_str) of the selected art, or None if failed.
@@ -364,6 +354,12 @@ async def ensure_album_art_db(
                 height = option.get("height", 0)
                 resolution = max(width, height) if width > 0 and height > 0 else 0
                 
+                # Skip providers whose image was removed as a perceptual duplicate of another
+                # provider's (kept) image, as long as the kept image is still there
+                duplicate_of = providers_data.get(provider_name, {}).get("duplicate_of")
+                if duplicate_of and not force and providers_data.get(duplicate_of, {}).get("downloaded"):
+                    continue
+                
                 # Check if we already have this image (check metadata for correct filename)
                 image_filename = None
                 if existing_metadata and provider_name in existing_metadata.get("providers", {}):
@@ -399,14 +395,9 @@ async def ensure_album_art_db(
                         temp_filename = f"{provider_name}_{uuid.uuid4().hex}"
                         temp_path = folder / temp_filename
                         
-                        # Run blocking download/save in executor to avoid freezing the event loop
+                        # Pooled, prioritized download (streamed to disk off the event loop)
                         # Returns (success: bool, extension: str)
-                        success, file_extension = await loop.run_in_executor(
-                            None,
-                            _download_and_save_sync,
-                            url,
-                            temp_path
-                        )
+                        success, file_extension = await download_image(url, temp_path, priority)
                         
                         if success:
                             # Update filename with correct extension
@@ -444,6 +435,10 @@ async def ensure_album_art_db(
                                 logger.info(f"Verified resolution for {provider_name}: {resolution_str}") # Add success log
                             except Exception as e:
                                 logger.warning(f"Failed to verify resolution for {image_path}: {e}") # Log error
+                                actual_width = actual_height = None
+
+                            # Keep the image index current (hash + dimensions) without waiting for a rescan
+                            await loop.run_in_executor(None, get_image_index().record, image_path, actual_width, actual_height)
                         else:
                             logger.warning(f"Failed to save {provider_name} art for {artist} - {album or title}")
                             # Clean up temp file if download failed
@@ -513,13 +508,19 @@ async def ensure_album_art_db(
             if existing_metadata and "preferred_provider" in existing_metadata:
                 preferred_provider = existing_metadata["preferred_provider"]
             
+            # Keep one copy of images several providers returned (same cover, different
+            # resolutions); a preference for a removed copy moves to the kept one
+            preferred_provider, _ = await loop.run_in_executor(
+                None, dedupe_album_providers, folder, providers_data, preferred_provider
+            )
+            
             # Create metadata structure
             # FIX: Preserve background_style from existing metadata to prevent it from being wiped
             # when the background task runs (e.g., for self-healing or adding new providers)
             metadata = {
                 "artist": artist,
                 "album": album or title,
-                "is_single": album is None or album.lower() == title.lower(),
+                "is_single": not album_only and (album is None or album.lower() == title.lower()),
                 "preferred_provider": preferred_provider,
                 "created_at": existing_metadata.get("created_at") if existing_metadata else datetime.utcnow().isoformat() + "Z",
                 "last_accessed": datetime.utcnow().isoformat() + "Z",
@@ -567,6 +568,18 @@ async def ensure_album_art_db(
         return None
 
 
+def _image_file_exists(path: Path) -> bool:
+    """
+    Check if an album art DB image exists, answering from the image index when possible.
+
+    Only positive index answers are trusted; a miss is confirmed on disk so files the
+    index hasn't seen yet (copied in since the last reconcile) are never treated as deleted.
+    """
+    if get_image_index().exists(path):
+        return True
+    return path.exists()
+
+
 def discover_custom_images(folder: Path, metadata: Dict[str, Any], is_artist_images: bool = False) -> Dict[str, Any]:
     """
     Auto-discover custom images in folder that aren't in metadata.json.
@@ -597,16 +610,21 @@ def discover_custom_images(folder: Path, metadata: Dict[str, Any], is_artist_ima
             folder_key = str(folder)  # Fallback to string representation
         folder_mtime = 0
         
-        # Get max mtime of all files in folder (indicates if new files were added)
-        try:
-            if folder.exists():
-                folder_mtime = max(
-                    (f.stat().st_mtime for f in folder.iterdir() if f.is_file()),
-                    default=0
-                )
-        except OSError:
-            # Folder might not exist or be inaccessible
-            return metadata
+        # Get max mtime of all images in folder (indicates if new files were added)
+        # The image index answers from memory once it has reconciled with the disk
+        indexed_mtime = get_image_index().folder_mtime(folder)
+        if indexed_mtime is not None:
+            folder_mtime = indexed_mtime
+        else:
+            try:
+                if folder.exists():
+                    folder_mtime = max(
+                        (f.stat().st_mtime for f in folder.iterdir() if f.is_file()),
+                        default=0
+                    )
+            except OSError:
+                # Folder might not exist or be inaccessible
+                return metadata
         
         # Check cache
         should_discover = True
@@ -835,7 +853,7 @@ def load_album_art_from_db(artist: str, album: Optional[str], title: Optional[st
             filename = provider_data.get("filename", f"{provider_name}.jpg")
             file_path = folder / filename
             # If file doesn't exist but metadata says it's downloaded, remove it
-            if provider_data.get("downloaded", False) and not file_path.exists():
+            if provider_data.get("downloaded", False) and not _image_file_exists(file_path):
                 providers_to_remove.append(provider_name)
                 removed_count += 1
                 logger.debug(f"Self-healing: Removing missing file '{filename}' from metadata for provider '{provider_name}'")
@@ -923,13 +941,13 @@ def load_album_art_from_db(artist: str, album: Optional[str], title: Optional[st
         # FIX: If preferred provider's file doesn't exist (e.g., download in progress or failed),
         # try to fall back to another available provider instead of returning None
         # This prevents the album art selector from appearing broken when a download is in progress
-        if not image_path.exists():
+        if not _image_file_exists(image_path):
             logger.debug(f"Preferred provider '{preferred_provider}' file not found, trying fallback providers")
             # Try to find any provider with an existing file
             for fallback_provider, fallback_data in providers.items():
                 fallback_filename = fallback_data.get("filename", f"{fallback_provider}.jpg")
                 fallback_path = folder / fallback_filename
-                if fallback_path.exists():
+                if _image_file_exists(fallback_path):
                     logger.info(f"Using fallback provider '{fallback_provider}' (preferred '{preferred_provider}' file missing)")
                     # Use fallback but keep preferred_provider in metadata so UI shows correct selection
                     provider_data = fallback_data
@@ -0,0 +1,130 @@
+"""
+Compact binary audio analysis for the waveform/spectrum visualizers.
+
+Spotify audio analysis JSON is hundreds of KB (bars, tatums, every segment's
+loudness curve) while the frontend only draws a waveform, pitch bars and beat
+pulses. encode() precomputes exactly that with NumPy, once per track, when
+spicetify_db saves the analysis:
+
+    magic "SLA1" | uint32 header length | header JSON | arrays
+
+The header JSON carries scalars (analysis_track_id, duration, tempo) and the
+array table [[name, dtype, length], ...]. Arrays follow in table order, each
+padded to a 4-byte boundary so the browser can wrap them in typed arrays
+without copying (decodeCompactAnalysis in resources/js/modules/api.js):
+
+    segment_start, segment_duration   float32 seconds
+    waveform                          uint8, normalized amplitude * 255
+    pitches                           uint8, 12 per segment, value * 255
+    timbre                            uint8, 12 per segment, per-coefficient
+                                      min/max scaling (header "timbre_range")
+    beat_start                        float32 seconds
+    beat_confidence                   uint8, confidence * 255
+    section_start, section_duration,
+    section_loudness                  float32
+
+Level 0 - No internal imports (self-contained)
+"""
+
+import json
+import struct
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+MAGIC = b"SLA1"
+EXTENSION = ".analysis.bin"
+FLOOR_DB = -60.0  # Quietest loudness the waveform distinguishes
+
+
+def _column(items: List[Dict[str, Any]], key: str, default: float = 0.0) -> np.ndarray:
+    values = (item.get(key) for item in items)
+    return np.array([default if value is None else value for value in values], dtype=np.float64)
+
+
+def _matrix(items: List[Dict[str, Any]], key: str) -> np.ndarray:
+    """12-wide matrix; segments with missing/short vectors get zeros."""
+    matrix = np.zeros((len(items), 12), dtype=np.float64)
+    for row, item in enumerate(items):
+        values = item.get(key)
+        if values and len(values) == 12:
+            matrix[row] = values
+    return matrix
+
+
+def _to_uint8(values: np.ndarray) -> np.ndarray:
+    return np.clip(np.rint(values * 255), 0, 255).astype(np.uint8)
+
+
+def encode(analysis: Dict[str, Any], analysis_track_id: str) -> bytes:
+    """
+    Build the compact artifact from a Spotify/Spicetify audio analysis dict.
+
+    Args:
+        analysis: Audio analysis with segments/beats/sections (as stored by spicetify_db)
+        analysis_track_id: helpers._normalize_track_id(artist, title)
+
+    Returns:
+        Artifact bytes
+    """
+    segments = analysis.get("segments") or []
+    beats = analysis.get("beats") or []
+    sections = analysis.get("sections") or []
+
+    # Waveform: mean of start/max loudness per segment, dB -> linear, normalized to 0-1
+    # (same formula as the JSON endpoint's "waveform" field)
+    loud_start = np.maximum(_column(segments, "loudness_start", FLOOR_DB), FLOOR_DB)
+    loud_max = np.maximum(_column(segments, "loudness_max", FLOOR_DB), FLOOR_DB)
+    amplitude = np.power(10.0, (loud_start + loud_max) / 40.0)
+    peak = amplitude.max() if amplitude.size else 0.0
+    if peak > 0:
+        amplitude /= peak
+
+    timbre = _matrix(segments, "timbre")
+    timbre_min = timbre.min(axis=0) if len(segments) else np.zeros(12)
+    timbre_span = (timbre.max(axis=0) - timbre_min) if len(segments) else np.zeros(12)
+    scaled_timbre = (timbre - timbre_min) / np.where(timbre_span > 0, timbre_span, 1.0)
+
+    arrays: List[Tuple[str, np.ndarray]] = [
+        ("segment_start", _column(segments, "start").astype(np.float32)),
+        ("segment_duration", _column(segments, "duration").astype(np.float32)),
+        ("waveform", _to_uint8(amplitude)),
+        ("pitches", _to_uint8(_matrix(segments, "pitches")).ravel()),
+        ("timbre", _to_uint8(scaled_timbre).ravel()),
+        ("beat_start", _column(beats, "start").astype(np.float32)),
+        ("beat_confidence", _to_uint8(_column(beats, "confidence"))),
+        ("section_start", _column(sections, "start").astype(np.float32)),
+        ("section_duration", _column(sections, "duration").astype(np.float32)),
+        ("section_loudness", _column(sections, "loudness", FLOOR_DB).astype(np.float32)),
+    ]
+
+    header = json.dumps({
+        "analysis_track_id": analysis_track_id,
+        "duration": analysis.get("duration") or 0,
+        "tempo": analysis.get("tempo"),
+        "timbre_range": [[round(float(lo), 3), round(float(lo + span), 3)] for lo, span in zip(timbre_min, timbre_span)],
+        "arrays": [[name, array.dtype.name, int(array.size)] for name, array in arrays],
+    }, separators=(",", ":")).encode("utf-8")
+
+    parts = [MAGIC, struct.pack("<I", len(header)), header]
+    offset = len(MAGIC) + 4 + len(header)
+    for _, array in arrays:
+        padding = -offset % 4
+        parts.append(b"\0" * padding)
+        data = array.astype(array.dtype.newbyteorder("<"), copy=False).tobytes()
+        parts.append(data)
+        offset += padding + len(data)
+    return b"".join(parts)
+
+
+def decode_header(blob: bytes) -> Dict[str, Any]:
+    """
+    Read the header of an artifact (validation, analysis_track_id lookup).
+
+    Raises:
+        ValueError: If the blob is not an artifact of this format
+    """
+    if blob[:4] != MAGIC or len(blob) < 8:
+        raise ValueError("Not a compact audio analysis artifact")
+    (length,) = struct.unpack_from("<I", blob, 4)
+    return json.loads(blob[8:8 + length])
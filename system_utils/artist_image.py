@@ -19,10 +19,13 @@ from urllib.parse import quote
 from PIL import Image
 
 from . import state
-from .helpers import create_tracked_task, _cleanup_artist_image_log_throttle
-from .album_art import get_album_db_folder, save_album_db_metadata, discover_custom_images, _download_and_save_sync
+from .helpers import create_tracked_task
+from .album_art import get_album_db_folder, save_album_db_metadata, discover_custom_images
+from .image_dedup import dedupe_artist_images
+from .image_downloads import download_image, PRIORITY_PREFETCH
+from .image_index import get_image_index
 from config import FEATURES
-from logging_config import get_logger
+from logging_config import get_logger, should_log
 from providers.artist_image import ArtistImageProvider
 from providers.spotify_api import get_shared_spotify_client
 
@@ -436,13 +439,8 @@ def _get_artist_image_fallback(artist: str) -> Optional[Dict[str, Any]]:
         # Defensive logging: Log if no images found or all images failed to download
         # CRITICAL FIX: Throttle log to prevent spam (30+ logs per second during polling)
         if not artist_images:
-            current_time = time.time()
-            log_key = f"no_fallback_{artist}"
-            last_log_time = state._artist_image_log_throttle.get(log_key, 0)
-            if (current_time - last_log_time) >= state._ARTIST_IMAGE_LOG_THROTTLE_SECONDS:
+            if should_log(f"no_fallback_{artist}", state._ARTIST_IMAGE_LOG_THROTTLE_SECONDS):
                 logger.debug(f"No artist images found in DB for fallback: {artist}")
-                state._artist_image_log_throttle[log_key] = current_time
-                _cleanup_artist_image_log_throttle()
             return None
         
         # Use first available artist image as fallback (no explicit preference needed)
@@ -459,20 +457,15 @@ def _get_artist_image_fallback(artist: str) -> Optional[Dict[str, Any]]:
         
         # Log if images exist but none are downloaded or available
         # CRITICAL FIX: Throttle log to prevent spam (30+ logs per second during polling)
-        current_time = time.time()
-        log_key = f"no_downloaded_{artist}"
-        last_log_time = state._artist_image_log_throttle.get(log_key, 0)
-        if (current_time - last_log_time) >= state._ARTIST_IMAGE_LOG_THROTTLE_SECONDS:
+        if should_log(f"no_downloaded_{artist}", state._ARTIST_IMAGE_LOG_THROTTLE_SECONDS):
             logger.debug(f"Artist images found in DB for {artist} but none are downloaded or available")
-            state._artist_image_log_throttle[log_key] = current_time
-            _cleanup_artist_image_log_throttle()
         return None
     except Exception as e:
         logger.debug(f"Failed to load artist image fallback: {e}")
         return None
 
 
-async def ensure_artist_image_db(artist: str, spotify_artist_id: Optional[str] = None, force: bool = False, artist_visuals: Optional[Dict[str, Any]] = None, spicetify_only: bool = False) -> List[str]:
+async def ensure_artist_image_db(artist: str, spotify_artist_id: Optional[str] = None, force: bool = False, artist_visuals: Optional[Dict[str, Any]] = None, spicetify_only: bool = False, validate_current_song: bool = True) -> List[str]:
     """
     Background task to fetch artist images and save them to the database.
     Fetches from multiple sources: Deezer, TheAudioDB, FanArt.tv, Spicetify GraphQL, Spotify, and Last.fm.
@@ -493,6 +486,8 @@ async def ensure_artist_image_db(artist: str, spotify_artist_id: Optional[str] =
         force: If True, bypass cache and tracker checks (for manual refetch)
         artist_visuals: Spicetify GraphQL visuals dict with header_image and gallery (optional)
         spicetify_only: If True, skip API calls and only add Spicetify images to existing collection
+        validate_current_song: If False, skip the check that discards images when playback
+            moved to a different artist (for callers not tied to the current song, e.g. backfill)
     """
     # force=True overrides spicetify_only (user explicitly wants full refetch)
     if force:
@@ -625,7 +620,7 @@ async def ensure_artist_image_db(artist: str, spotify_artist_id: Optional[str] =
                 else:
                     # Normal mode: fetch from all sources (Deezer, TheAudioDB, FanArt.tv)
                     # This returns: [{'url':..., 'source':..., 'type':..., 'width':..., 'height':...}]
-                    all_images = await artist_provider.get_artist_images(artist)
+                    all_images = await artist_provider.get_artist_images(artist, refresh=force)
                 
                 # Spicetify GraphQL visuals (header + gallery from internal API)
                 # These are high-res images directly from Spotify's internal GraphQL
@@ -697,21 +692,11 @@ async def ensure_artist_image_db(artist: str, spotify_artist_id: Optional[str] =
                 
                 # Log summary with throttle (prevents spam when function runs multiple times)
                 # Only log if enough time has passed since last log for this artist
-                current_time = time.time()
-                last_log_time = state._artist_image_log_throttle.get(artist, 0)
-                should_log = (current_time - last_log_time) >= state._ARTIST_IMAGE_LOG_THROTTLE_SECONDS
-                
-                if should_log:
+                if should_log(f"fetched_{artist}", state._ARTIST_IMAGE_LOG_THROTTLE_SECONDS):
                     if all_images:
                         logger.info(f"Artist images fetched for '{artist}': {len(all_images)} total from all sources")
                     else:
                         logger.info(f"Artist images fetched for '{artist}': No images found from any source")
-                    
-                    # Update throttle timestamp
-                    state._artist_image_log_throttle[artist] = current_time
-                    
-                    # Clean up old entries to prevent memory leak
-                    _cleanup_artist_image_log_throttle()
 
                 # Download and Save
                 saved_images = existing_metadata.get("images", [])
@@ -735,45 +720,46 @@ async def ensure_artist_image_db(artist: str, spotify_artist_id: Optional[str] =
                 # Without this, SMTC returning stale data causes false "artist changed" aborts
                 validation_passed = False
                 current_metadata = None  # Initialize to prevent NameError on exception
-                for validation_retry in range(4):
-                    try:
-                        # REMOVED: get_current_song_meta_data._last_check_time = 0
-                        # Don't bust global cache - causes feedback loops and system churn
-                        current_metadata = await get_current_song_meta_data()
-                        if current_metadata:
-                            current_artist = current_metadata.get("artist", "")
-                            current_artist_id = current_metadata.get("artist_id")
+                if validate_current_song:
+                    for validation_retry in range(4):
+                        try:
+                            # REMOVED: get_current_song_meta_data._last_check_time = 0
+                            # Don't bust global cache - causes feedback loops and system churn
+                            current_metadata = await get_current_song_meta_data()
+                            if current_metadata:
+                                current_artist = current_metadata.get("artist", "")
+                                current_artist_id = current_metadata.get("artist_id")
                             
-                            # CRITICAL FIX: Only abort if artist NAME changed OR if we HAD an ID and it changed to a DIFFERENT ID
-                            name_changed = current_artist != original_artist
+                                # CRITICAL FIX: Only abort if artist NAME changed OR if we HAD an ID and it changed to a DIFFERENT ID
+                                name_changed = current_artist != original_artist
                             
-                            # Only consider ID change a failure if we HAD an ID originally and it changed to a DIFFERENT NON-NULL ID
-                            id_mismatch_is_critical = (
-                                original_spotify_id is not None and 
-                                current_artist_id is not None and 
-                                current_artist_id != original_spotify_id
-                            )
+                                # Only consider ID change a failure if we HAD an ID originally and it changed to a DIFFERENT NON-NULL ID
+                                id_mismatch_is_critical = (
+                                    original_spotify_id is not None and 
+                                    current_artist_id is not None and 
+                                    current_artist_id != original_spotify_id
+                                )
                             
-                            if name_changed or id_mismatch_is_critical:
-                                if validation_retry < 3:
-                                    # SMTC may be lagging - wait and retry
-                                    await asyncio.sleep(0.5)
-                                    continue
-                                else:
-                                    # Genuinely different song after 4 attempts (4 seconds wait)
-                                    logger.info(f"Artist changed from '{original_artist}' to '{current_artist}' (ID: {original_spotify_id} -> {current_artist_id}) before download, discarding images")
-                                    return []  # Abort entire operation
+                                if name_changed or id_mismatch_is_critical:
+                                    if validation_retry < 3:
+                                        # SMTC may be lagging - wait and retry
+                                        await asyncio.sleep(0.5)
+                                        continue
+                                    else:
+                                        # Genuinely different song after 4 attempts (4 seconds wait)
+                                        logger.info(f"Artist changed from '{original_artist}' to '{current_artist}' (ID: {original_spotify_id} -> {current_artist_id}) before download, discarding images")
+                                        return []  # Abort entire operation
                             
-                            # Validation passed - artist matches
-                            validation_passed = True
-                            break
-                    except Exception as e:
-                        logger.debug(f"Failed to check current artist before download (retry {validation_retry}): {e}")
-                        break  # Continue with download if check fails (defensive)
+                                # Validation passed - artist matches
+                                validation_passed = True
+                                break
+                        except Exception as e:
+                            logger.debug(f"Failed to check current artist before download (retry {validation_retry}): {e}")
+                            break  # Continue with download if check fails (defensive)
                 
-                if not validation_passed and not current_metadata:
-                    # No metadata available - proceed cautiously (better to save than lose work)
-                    pass
+                    if not validation_passed and not current_metadata:
+                        # No metadata available - proceed cautiously (better to save than lose work)
+                        pass
                 
                 # OPTIMIZATION: Process images in parallel batches to significantly speed up downloads
                 # Process 12 images at a time to balance speed with resource usage
@@ -819,8 +805,8 @@ async def ensure_artist_image_db(artist: str, spotify_artist_id: Optional[str] =
                     temp_filename = f"temp_{url_hash}"
                     temp_file_path = folder / temp_filename
                     
-                    # Download the image
-                    success, ext = await loop.run_in_executor(None, _download_and_save_sync, url, temp_file_path)
+                    # Download the image (pooled; behind the current track's album art)
+                    success, ext = await download_image(url, temp_file_path, PRIORITY_PREFETCH)
                     if success:
                         # Update temp_file_path to reflect actual file extension
                         temp_file_path = temp_file_path.with_suffix(ext)
@@ -964,6 +950,11 @@ async def ensure_artist_image_db(artist: str, spotify_artist_id: Optional[str] =
                                     logger.debug(f"Failed to copy temp file: {e2}")
                                     continue  # Skip this image if we can't move/copy it
                         
+                        # Keep the image index current without waiting for a rescan
+                        await loop.run_in_executor(
+                            None, get_image_index().record, final_file_path, result.get("width"), result.get("height")
+                        )
+                        
                         if should_upgrade and existing_image_index is not None:
                             # Upgrading existing image
                             saved_images[existing_image_index].update({
@@ -991,16 +982,17 @@ async def ensure_artist_image_db(artist: str, spotify_artist_id: Optional[str] =
                 # INFORMATIONAL: Check if song changed during download (for logging only)
                 # Images are saved for original_artist regardless of current playback,
                 # since all API calls used original parameters and folder was created for original artist
-                try:
-                    current_metadata = await get_current_song_meta_data()
-                    if current_metadata:
-                        current_artist = current_metadata.get("artist", "")
-                        if current_artist != original_artist:
-                            # Log that we saved images for a different artist than currently playing
-                            # This is EXPECTED behavior - images are correct for original_artist
-                            logger.info(f"Song changed during download: saved artist images for '{original_artist}' (now playing: '{current_artist}'). Images are correct.")
-                except Exception as e:
-                    logger.debug(f"Could not check current song after download: {e}")
+                if validate_current_song:
+                    try:
+                        current_metadata = await get_current_song_meta_data()
+                        if current_metadata:
+                            current_artist = current_metadata.get("artist", "")
+                            if current_artist != original_artist:
+                                # Log that we saved images for a different artist than currently playing
+                                # This is EXPECTED behavior - images are correct for original_artist
+                                logger.info(f"Song changed during download: saved artist images for '{original_artist}' (now playing: '{current_artist}'). Images are correct.")
+                    except Exception as e:
+                        logger.debug(f"Could not check current song after download: {e}")
                 
                 # OPTIMIZATION: Only save metadata if it actually changed OR if file doesn't exist
                 # This prevents unnecessary disk writes when ensure_artist_image_db runs but finds no new images
@@ -1014,6 +1006,16 @@ async def ensure_artist_image_db(artist: str, spotify_artist_id: Optional[str] =
                         "images": saved_images
                     }
                     
+                    # Keep one copy of photos several sources returned (URL dedup can't see these).
+                    # Preferred/favorite images are looked up in the existing metadata and moved
+                    # to the kept copy; other existing keys are preserved by save_album_db_metadata.
+                    if metadata_changed:
+                        dedup_view = {**existing_metadata, **metadata}
+                        if await loop.run_in_executor(None, dedupe_artist_images, folder, dedup_view):
+                            for key in ("preferred_image_filename", "slideshow_preferences"):
+                                if dedup_view.get(key) != existing_metadata.get(key):
+                                    metadata[key] = dedup_view[key]
+                    
                     await loop.run_in_executor(None, save_album_db_metadata, folder, metadata)
                 else:
                     # Commented out to reduce log spam - this is internal optimization feedback, not actionable debugging info
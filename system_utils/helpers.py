@@ -101,24 +101,6 @@ def create_tracked_task(coro):
     return task
 
 
-def _cleanup_artist_image_log_throttle():
-    """
-    Helper function to clean up old entries from _artist_image_log_throttle.
-    Prevents memory leaks by removing entries older than 5 minutes when cache exceeds 100 entries.
-    This should be called periodically when the throttle is accessed.
-    """
-    if len(state._artist_image_log_throttle) > 100:
-        current_time = time.time()
-        cutoff_time = current_time - 300  # 5 minutes
-        # Rebuild the throttle dict with only recent entries
-        new_throttle = {
-            k: v for k, v in state._artist_image_log_throttle.items()
-            if v > cutoff_time
-        }
-        state._artist_image_log_throttle.clear()
-        state._artist_image_log_throttle.update(new_throttle)
-
-
 def _remove_text_inside_parentheses_and_brackets(text: str) -> str:
     """Remove text inside parentheses () and brackets []."""
     return re.sub(r"\([^)]*\)|\[[^\]]*\]", '', text)
@@ -187,7 +169,7 @@ def sanitize_folder_name(name: str) -> str:
 def _log_app_state() -> None:
     """Log key application state periodically."""
     import logging
-    from state_manager import get_state, set_state
+    from state_manager import update_state
     from providers.spotify_api import get_shared_spotify_client
     
     current_time = time.time()
@@ -205,11 +187,8 @@ def _log_app_state() -> None:
     last_song = getattr(get_current_song_meta_data, '_last_song', 'None')
     last_source = getattr(get_current_song_meta_data, '_last_source', 'None')
 
-    # Update state file
-    app_state = get_state()
-    app_state['current_song'] = last_song
-    app_state['active_source'] = last_source
-    set_state(app_state)
+    # Update state (written to state.json only if the song/source changed)
+    update_state({'current_song': last_song, 'active_source': last_source})
 
     # --- LOGGING LOGIC ---
     # We log if the level is INFO or lower, regardless of "Debug Mode" toggle.
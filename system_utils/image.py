@@ -2,123 +2,258 @@
 Image utilities for system_utils package.
 Handles image I/O, color extraction, and format detection.
 
-Dependencies: state (for caches)
+Dependencies: state (for caches), image_hashes, image_index (persisted colors)
 """
 from __future__ import annotations
 import asyncio
 import os
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple
 
+import numpy as np
 from PIL import Image
 
 from . import state
+from .image_hashes import get_content_hash
+from .image_index import get_image_index
 from config import CACHE_DIR
 from logging_config import get_logger
+from metrics import timed
 
 logger = get_logger(__name__)
 
 
+DEFAULT_COLORS = ["#24273a", "#363b54"]  # Returned when extraction fails
+
+# Bump when the extractor changes so persisted colors are recomputed
+COLOR_VERSION = 2
+COLOR_SAMPLE_SIZE = 64        # Image is reduced to this square before clustering (4096 pixels)
+COLOR_CLUSTERS = 10
+COLOR_KMEANS_ITERATIONS = 8
+COLOR_WORKERS = 2
+
+_color_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_color_executor() -> ThreadPoolExecutor:
+    """Get or create the color extraction pool."""
+    global _color_executor
+    if _color_executor is None:
+        _color_executor = ThreadPoolExecutor(
+            max_workers=COLOR_WORKERS,
+            thread_name_prefix="SyncLyrics_Colors"
+        )
+    return _color_executor
+
+
+def _cluster_palette(pixels: np.ndarray, k: int) -> list:
+    """
+    K-means over RGB pixels.
+
+    Deterministic: centers start at luminance quantiles, so the same image
+    always gives the same palette.
+
+    Returns:
+        List of (r, g, b) tuples, most populated cluster first
+    """
+    luminance = pixels @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    order = np.argsort(luminance, kind="stable")
+    k = min(k, len(pixels))
+    centers = pixels[order[((np.arange(k) + 0.5) * len(pixels) / k).astype(np.int64)]]
+
+    for _ in range(COLOR_KMEANS_ITERATIONS):
+        distances = ((pixels[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        labels = distances.argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, pixels)
+        filled = counts > 0
+        new_centers = centers.copy()
+        new_centers[filled] = sums[filled] / counts[filled, None]
+        if np.allclose(new_centers, centers, atol=0.5):
+            centers = new_centers
+            break
+        centers = new_centers
+
+    labels = ((pixels[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+    counts = np.bincount(labels, minlength=k)
+    return [
+        tuple(int(round(c)) for c in centers[i])
+        for i in np.argsort(-counts, kind="stable") if counts[i] > 0
+    ]
+
+
 def extract_dominant_colors_sync(image_path: Path) -> list:
     """
     Synchronous helper function for color extraction.
     This runs in a separate thread to avoid blocking the event loop.
+
+    JPEGs are decoded at reduced scale (draft), then the image is shrunk to a
+    small sample and clustered with NumPy k-means.
     """
     try:
         if not image_path.exists():
-            return ["#24273a", "#363b54"]
+            return list(DEFAULT_COLORS)
 
-        # Open image and resize for faster processing
         with Image.open(image_path) as img:
-            img = img.convert("RGB")
-            img = img.resize((100, 100))  # Small size is enough for dominant colors
-            
-            # Quantize to more colors to get a better palette
-            result = img.quantize(colors=10)
-            palette = result.getpalette()[:30]  # Get first 10 RGB triplets
-            
-            colors = []
-            for i in range(0, len(palette), 3):
-                r, g, b = palette[i], palette[i+1], palette[i+2]
-                # Skip very dark or very light colors unless we have no choice
-                brightness = (r * 299 + g * 587 + b * 114) / 1000
-                if 10 < brightness < 245:
-                    colors.append(f"#{r:02x}{g:02x}{b:02x}")
-            
-            # Fallback if we filtered everything out
-            if not colors:
-                for i in range(0, len(palette), 3):
-                    r, g, b = palette[i], palette[i+1], palette[i+2]
-                    colors.append(f"#{r:02x}{g:02x}{b:02x}")
-
-            # FINAL FALLBACK: If palette was empty or failed completely
-            if not colors:
-                return ["#24273a", "#363b54"]
-
-            # Ensure we have 2 unique colors
-            final_colors = []
-            seen = set()
-            for c in colors:
-                if c not in seen:
-                    final_colors.append(c)
-                    seen.add(c)
-                if len(final_colors) >= 2:
-                    break
-            
-            while len(final_colors) < 2:
-                final_colors.append(final_colors[0] if final_colors else "#363b54")
-                
-            return final_colors
-            
+            # DCT scaling for JPEGs: decode at 1/2..1/8 size instead of full resolution
+            img.draft("RGB", (COLOR_SAMPLE_SIZE * 2, COLOR_SAMPLE_SIZE * 2))
+            img = img.convert("RGB").resize(
+                (COLOR_SAMPLE_SIZE, COLOR_SAMPLE_SIZE), Image.Resampling.BILINEAR, reducing_gap=2.0
+            )
+            pixels = np.asarray(img, dtype=np.float32).reshape(-1, 3)
+
+        palette = _cluster_palette(pixels, COLOR_CLUSTERS)
+
+        colors = []
+        for r, g, b in palette:
+            # Skip very dark or very light colors unless we have no choice
+            brightness = (r * 299 + g * 587 + b * 114) / 1000
+            if 10 < brightness < 245:
+                colors.append(f"#{r:02x}{g:02x}{b:02x}")
+
+        # Fallback if we filtered everything out
+        if not colors:
+            colors = [f"#{r:02x}{g:02x}{b:02x}" for r, g, b in palette]
+
+        # FINAL FALLBACK: If palette was empty or failed completely
+        if not colors:
+            return list(DEFAULT_COLORS)
+
+        # Ensure we have 2 unique colors
+        final_colors = []
+        seen = set()
+        for c in colors:
+            if c not in seen:
+                final_colors.append(c)
+                seen.add(c)
+            if len(final_colors) >= 2:
+                break
+
+        while len(final_colors) < 2:
+            final_colors.append(final_colors[0] if final_colors else "#363b54")
+
+        return final_colors
+
     except Exception as e:
         logger.error(f"Color extraction failed: {e}")
-        return ["#24273a", "#363b54"]
+        return list(DEFAULT_COLORS)
+
+
+def _extract_and_store(image_path: Path, content_hash: Optional[str]) -> list:
+    """Extract colors and persist them under the image's content hash (runs in the color pool)."""
+    with timed("color_extraction_seconds"):
+        colors = extract_dominant_colors_sync(image_path)
+    if content_hash and colors != DEFAULT_COLORS:
+        get_image_index().set_colors(content_hash, colors, COLOR_VERSION)
+    return colors
 
 
 async def extract_dominant_colors(image_path: Path) -> list:
     """
-    Extracts two dominant colors from an image using a simple quantization method.
-    Results are cached in memory to prevent high CPU usage on repeated polls.
-    
-    This async version runs CPU-bound Pillow operations in a thread executor
-    to prevent blocking the event loop, ensuring smooth lyrics animation.
+    Extracts two dominant colors from an image.
+
+    Lookup order, cheapest first:
+    1. Image index (album art DB images, memory only - no stat)
+    2. In-memory cache validated by mtime
+    3. Persistent color store keyed by content hash (survives restarts and
+       is shared by copies of the same image, e.g. cache/current_art.*)
+    4. Extraction in the color thread pool, stored for next time
     """
     path_str = str(image_path)
-    
+    index = get_image_index()
+    if not index.is_loaded:
+        await asyncio.to_thread(index.load)
+
+    indexed_colors = index.get_colors_for_path(image_path, COLOR_VERSION)
+    if indexed_colors:
+        return indexed_colors
+
     # Check cache first with mtime validation (Fix: Optimize Color Extraction)
     try:
-        current_mtime = image_path.stat().st_mtime
+        st = image_path.stat()
         if path_str in state._color_cache:
             cached_mtime, cached_colors = state._color_cache[path_str]
-            if cached_mtime == current_mtime:
+            if cached_mtime == st.st_mtime:
                 return cached_colors
     except FileNotFoundError:
-        return ["#24273a", "#363b54"]
+        return list(DEFAULT_COLORS)
     except Exception as e:
         logger.debug(f"Error checking mtime for color cache: {e}")
-    
+        return list(DEFAULT_COLORS)
+
     # Prevent cache from growing indefinitely - remove oldest entry if too large
     if len(state._color_cache) > state._MAX_CACHE_SIZE:
         oldest_key = next(iter(state._color_cache))
         state._color_cache.pop(oldest_key)
         logger.debug(f"Color cache: removed oldest entry (size was {state._MAX_CACHE_SIZE + 1})")
-    
-    # Run CPU-bound task in thread executor to avoid blocking event loop
-    loop = asyncio.get_running_loop()
-    final_colors = await loop.run_in_executor(None, extract_dominant_colors_sync, image_path)
-    
-    # Cache the result with current mtime
+
     try:
-        current_mtime = image_path.stat().st_mtime
-        state._color_cache[path_str] = (current_mtime, final_colors)
-    except:
-        pass
-        
+        content_hash = await get_content_hash(image_path, st)
+    except OSError:
+        content_hash = None
+
+    final_colors = index.get_colors(content_hash, COLOR_VERSION) if content_hash else None
+    if not final_colors:
+        # Run CPU-bound task in the color pool to avoid blocking event loop
+        loop = asyncio.get_running_loop()
+        final_colors = await loop.run_in_executor(
+            _get_color_executor(), _extract_and_store, image_path, content_hash
+        )
+
+    state._color_cache[path_str] = (st.st_mtime, final_colors)
     return final_colors
 
 
+async def precompute_dominant_colors(paths: Optional[Iterable[Path]] = None) -> int:
+    """
+    Batch-extract and persist colors so later lookups never decode an image.
+
+    Images are processed one at a time through the color pool, so on-demand
+    extractions for the current song are never queued behind a whole batch.
+
+    Args:
+        paths: Images to process (default: every album art DB image without colors)
+
+    Returns:
+        Number of images whose colors were extracted
+    """
+    index = get_image_index()
+    if not index.is_loaded:
+        await asyncio.to_thread(index.load)
+
+    if paths is None:
+        pending = index.missing_colors(COLOR_VERSION)
+    else:
+        pending = []
+        for path in paths:
+            try:
+                content_hash = await get_content_hash(path)
+            except OSError:
+                continue
+            if not index.get_colors(content_hash, COLOR_VERSION):
+                pending.append((path, content_hash))
+
+    if not pending:
+        return 0
+
+    start = time.time()
+    loop = asyncio.get_running_loop()
+    executor = _get_color_executor()
+    done = 0
+    for path, content_hash in pending:
+        if index.get_colors(content_hash, COLOR_VERSION):
+            continue  # Extracted on demand meanwhile
+        await loop.run_in_executor(executor, _extract_and_store, path, content_hash)
+        done += 1
+
+    logger.info(f"Precomputed dominant colors for {done} image(s) in {time.time() - start:.1f}s")
+    return done
+
+
 def get_image_extension(data: bytes) -> str:
     """Detect image format from file header bytes."""
     if data.startswith(b'\xff\xd8'):
@@ -0,0 +1,305 @@
+"""
+Perceptual duplicate detection for the album art DB.
+
+Providers often return the same cover/photo at different resolutions (iTunes,
+Last.fm and Spotify for one album; Deezer, FanArt.tv and Wikipedia for one
+artist), and URL dedup can't see that. Each image gets a 64-bit dHash
+(horizontal gradient of a 9x8 grayscale thumbnail) plus a 4x4 RGB thumbnail;
+two images are duplicates when the hashes are within IMAGE_DEDUP["max_distance"]
+bits AND the thumbnails agree in color and aspect ratio (the dHash alone can't
+tell flat/dark covers apart). Hash distances for a whole folder are computed
+at once with NumPy. Signatures are cached in the image index by content hash,
+so a folder refresh only decodes images it has not seen before.
+
+Per cluster only the highest-resolution image (actual pixel size, not the
+provider's metadata) is kept. The removed copies stay
+in metadata.json as {"downloaded": false, "duplicate_of": <kept>} so they are
+not downloaded again on the next refresh, and user choices (preferred provider,
+preferred/favorite artist image) move to the kept copy. User-added images
+(file://local/ placeholders) are never removed.
+
+Used at save time by ensure_album_art_db / ensure_artist_image_db, and by
+scripts/compact_album_art_db.py for folders saved before dedup existed.
+
+Dependencies: image_index, image_hashes
+"""
+from __future__ import annotations
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from . import image_hashes
+from .image_index import get_image_index
+from config import ALBUM_ART_DB_DIR, IMAGE_DEDUP
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+HASH_SIZE = 8              # dHash grid (64 bits)
+THUMB_SIZE = 4             # RGB thumbnail used as the color check
+MAX_ASPECT_DIFF = 0.1      # Relative aspect ratio difference still considered the same image
+
+# Cached signature: dhash, width, height, then the RGB thumbnail as bytes
+SIGNATURE_VERSION = 1
+_SIGNATURE_HEADER = struct.Struct("<QII")
+
+Signature = Tuple[int, np.ndarray, float, int]  # dhash, float32 thumbnail, aspect ratio, pixel count
+
+
+def _make_signature(dhash: int, thumb: np.ndarray, width: int, height: int) -> Signature:
+    aspect = width / height if height else 0.0
+    return dhash, thumb.astype(np.float32), aspect, width * height
+
+
+def compute_signature(path: Path) -> Optional[Tuple[int, np.ndarray, int, int]]:
+    """
+    Compute the dedup signature of an image (decodes it at reduced scale).
+
+    Args:
+        path: Image file
+
+    Returns:
+        (dhash, 4x4 RGB thumbnail as uint8 array, width, height), or None if unreadable
+    """
+    try:
+        with Image.open(path) as img:
+            width, height = img.size
+            img.draft("RGB", (64, 64))  # JPEG: decode at reduced scale
+            rgb = img.convert("RGB")
+        gray = np.asarray(rgb.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.BILINEAR), dtype=np.int16)
+        bits = (gray[:, 1:] > gray[:, :-1]).ravel()
+        dhash = int.from_bytes(np.packbits(bits).tobytes(), "big")
+        thumb = np.asarray(rgb.resize((THUMB_SIZE, THUMB_SIZE), Image.BILINEAR), dtype=np.uint8)
+        return dhash, thumb, width, height
+    except Exception as e:
+        logger.debug(f"Could not compute image signature for {path}: {e}")
+        return None
+
+
+def _cached_signature(path: Path) -> Optional[Signature]:
+    """Signature from the image index by content hash, computed and stored on a miss."""
+    try:
+        content_hash = image_hashes.compute(path)
+    except OSError:
+        return None
+    index = get_image_index()
+    blob = index.get_signature(content_hash, SIGNATURE_VERSION)
+    if blob is not None and len(blob) == _SIGNATURE_HEADER.size + THUMB_SIZE * THUMB_SIZE * 3:
+        dhash, width, height = _SIGNATURE_HEADER.unpack_from(blob)
+        thumb = np.frombuffer(blob, dtype=np.uint8, offset=_SIGNATURE_HEADER.size).reshape(THUMB_SIZE, THUMB_SIZE, 3)
+        return _make_signature(dhash, thumb, width, height)
+
+    raw = compute_signature(path)
+    if raw is None:
+        return None
+    dhash, thumb, width, height = raw
+    index.set_signature(content_hash, _SIGNATURE_HEADER.pack(dhash, width, height) + thumb.tobytes(),
+                        SIGNATURE_VERSION)
+    return _make_signature(*raw)
+
+
+def find_duplicates(candidates: List[Tuple[str, Path]]) -> Dict[str, str]:
+    """
+    Cluster perceptually identical images.
+
+    Args:
+        candidates: (key, path) per image
+
+    Returns:
+        {duplicate key: kept key}; the kept image is the largest (in pixels) of its cluster
+    """
+    signed = []
+    for key, path in candidates:
+        signature = _cached_signature(path)
+        if signature:
+            signed.append((key, signature))
+    if len(signed) < 2:
+        return {}
+
+    # Largest first, so each cluster is represented by its highest resolution
+    signed.sort(key=lambda item: item[1][3], reverse=True)
+    hashes = np.array([s[1][0] for s in signed], dtype=np.uint64)
+    thumbs = np.stack([s[1][1] for s in signed])
+    aspects = np.array([s[1][2] for s in signed], dtype=np.float32)
+
+    # Pairwise Hamming distances (popcount of XOR) and thumbnail/aspect differences
+    xor = hashes[:, None] ^ hashes[None, :]
+    distances = np.unpackbits(xor.view(np.uint8).reshape(len(signed), len(signed), 8), axis=2).sum(axis=2)
+    color_diff = np.abs(thumbs[:, None] - thumbs[None, :]).mean(axis=(2, 3, 4))
+    aspect_diff = np.abs(aspects[:, None] - aspects[None, :]) / np.maximum(aspects[:, None], 1e-6)
+    same = (
+        (distances <= IMAGE_DEDUP["max_distance"])
+        & (color_diff <= IMAGE_DEDUP["max_color_diff"])
+        & (aspect_diff <= MAX_ASPECT_DIFF)
+    )
+
+    duplicates: Dict[str, str] = {}
+    assigned = np.zeros(len(signed), dtype=bool)
+    for i in range(len(signed)):
+        if assigned[i]:
+            continue
+        members = np.flatnonzero(same[i] & ~assigned)
+        assigned[members] = True
+        for j in members:
+            if j != i:
+                duplicates[signed[j][0]] = signed[i][0]
+    return duplicates
+
+
+def _delete_duplicate(path: Path) -> None:
+    try:
+        path.unlink(missing_ok=True)
+        get_image_index().remove(path)
+    except OSError as e:
+        logger.debug(f"Could not delete duplicate image {path}: {e}")
+
+
+def _is_user_image(entry: Dict[str, Any]) -> bool:
+    return str(entry.get("url", "")).startswith("file://")
+
+
+def _candidates(folder: Path, entries) -> List[Tuple[str, Path]]:
+    """(key, path) of the entries dedup may remove: downloaded, not already a duplicate, not user-added."""
+    return [
+        (key, folder / data.get("filename", f"{key}.jpg"))
+        for key, data in entries
+        if key and data.get("downloaded") and not data.get("duplicate_of") and not _is_user_image(data)
+    ]
+
+
+def _artist_entries(metadata: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    return [(img.get("filename"), img) for img in metadata.get("images", []) if img.get("filename")]
+
+
+def dedupe_album_providers(folder: Path, providers: Dict[str, Dict[str, Any]],
+                           preferred_provider: Optional[str]) -> Tuple[Optional[str], int]:
+    """
+    Remove perceptual duplicates among an album folder's provider images (blocking).
+
+    Args:
+        folder: Album folder
+        providers: metadata["providers"], updated in place
+        preferred_provider: Current preferred provider
+
+    Returns:
+        (preferred provider, moved to the kept copy if it was a duplicate; number removed)
+    """
+    if not IMAGE_DEDUP["enabled"]:
+        return preferred_provider, 0
+
+    duplicates = find_duplicates(_candidates(folder, providers.items()))
+    for name, kept in duplicates.items():
+        data = providers[name]
+        _delete_duplicate(folder / data.get("filename", f"{name}.jpg"))
+        data["downloaded"] = False
+        data["duplicate_of"] = kept
+        if preferred_provider == name:
+            preferred_provider = kept
+    if duplicates:
+        logger.info(f"Removed {len(duplicates)} duplicate album art image(s) in {folder.name}: {duplicates}")
+    return preferred_provider, len(duplicates)
+
+
+def dedupe_artist_images(folder: Path, metadata: Dict[str, Any]) -> int:
+    """
+    Remove perceptual duplicates among an artist folder's images (blocking).
+
+    Args:
+        folder: Artist folder
+        metadata: Artist metadata.json dict; images are updated in place,
+                  preferred_image_filename and slideshow_preferences replaced if affected
+
+    Returns:
+        Number of images removed
+    """
+    if not IMAGE_DEDUP["enabled"]:
+        return 0
+
+    entries = _artist_entries(metadata)
+    by_filename = dict(entries)
+    duplicates = find_duplicates(_candidates(folder, entries))
+    if not duplicates:
+        return 0
+
+    for filename, kept in duplicates.items():
+        _delete_duplicate(folder / filename)
+        by_filename[filename]["downloaded"] = False
+        by_filename[filename]["duplicate_of"] = kept
+
+    if metadata.get("preferred_image_filename") in duplicates:
+        metadata["preferred_image_filename"] = duplicates[metadata["preferred_image_filename"]]
+    prefs = metadata.get("slideshow_preferences")
+    if isinstance(prefs, dict) and prefs.get("favorites"):
+        favorites = list(dict.fromkeys(duplicates.get(f, f) for f in prefs["favorites"]))
+        metadata["slideshow_preferences"] = {**prefs, "favorites": favorites}
+    logger.info(f"Removed {len(duplicates)} duplicate artist image(s) in {folder.name}: {duplicates}")
+    return len(duplicates)
+
+
+def compact_folder(folder: Path, dry_run: bool = False) -> int:
+    """
+    Dedupe one existing album art DB folder in place (blocking).
+
+    Args:
+        folder: Album or artist folder containing metadata.json
+        dry_run: Only count duplicates, don't delete or rewrite anything
+
+    Returns:
+        Number of duplicates found (removed unless dry_run)
+    """
+    from .album_art import save_album_db_metadata
+
+    metadata_path = folder / "metadata.json"
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+    except (FileNotFoundError, NotADirectoryError):
+        return 0
+    except Exception as e:
+        logger.warning(f"Skipping {folder.name}: unreadable metadata.json ({e})")
+        return 0
+
+    if dry_run:
+        if metadata.get("type") == "artist_images":
+            entries = _artist_entries(metadata)
+        else:
+            entries = metadata.get("providers", {}).items()
+        return len(find_duplicates(_candidates(folder, entries)))
+
+    if metadata.get("type") == "artist_images":
+        removed = dedupe_artist_images(folder, metadata)
+    else:
+        metadata["preferred_provider"], removed = dedupe_album_providers(
+            folder, metadata.get("providers", {}), metadata.get("preferred_provider")
+        )
+    if removed:
+        save_album_db_metadata(folder, metadata)
+    return removed
+
+
+def compact_album_art_db(dry_run: bool = False) -> Dict[str, int]:
+    """
+    One-shot dedup of every folder in the album art DB (blocking).
+
+    Args:
+        dry_run: Only report duplicates
+
+    Returns:
+        {"folders": scanned, "affected": folders with duplicates, "duplicates": total}
+    """
+    stats = {"folders": 0, "affected": 0, "duplicates": 0}
+    if not ALBUM_ART_DB_DIR.exists():
+        return stats
+    for folder in sorted(ALBUM_ART_DB_DIR.iterdir()):
+        if not folder.is_dir():
+            continue
+        stats["folders"] += 1
+        count = compact_folder(folder, dry_run=dry_run)
+        if count:
+            stats["affected"] += 1
+            stats["duplicates"] += count
+    return stats
@@ -0,0 +1,558 @@
+"""
+Image download manager for album art and artist images.
+
+Every provider image download goes through one manager instead of a fresh
+requests.get per image in the default executor:
+
+- Per-host pooled connections (one requests.Session per host)
+- Priority scheduling: the current track's album art first, then artist images
+  (prefetch), then library backfill; both the global and per-host slots admit
+  waiters in priority order
+- Per-host politeness: concurrency limit, minimum spacing between requests,
+  and Retry-After on 429/503
+- Identical URLs in flight are downloaded once and delivered to every caller
+- Bodies are streamed to a .part file in the cache dir; interrupted downloads
+  resume with a Range request (If-Range guarded) on the next attempt, even
+  after a restart
+- Progress (active, queued, recent, per-host) via get_download_status()
+
+Dependencies: helpers, image (extension detection)
+"""
+from __future__ import annotations
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from config import CACHE_DIR, IMAGE_DOWNLOADS
+from logging_config import get_logger
+from metrics import histogram
+from .helpers import create_tracked_task
+from .image import determine_image_extension
+
+logger = get_logger(__name__)
+
+PRIORITY_CURRENT = 0    # Art for the track that is playing now
+PRIORITY_PREFETCH = 1   # Artist images and other art not on screen yet
+PRIORITY_BACKFILL = 2   # Library backfill
+PRIORITY_NAMES = {PRIORITY_CURRENT: "current", PRIORITY_PREFETCH: "prefetch", PRIORITY_BACKFILL: "backfill"}
+
+DOWNLOADS_DIR = CACHE_DIR / "downloads"
+USER_AGENT = 'SyncLyrics/1.0.0 (https://github.com/AnshulJ999/SyncLyrics; contact@example.com)'
+CHUNK_SIZE = 64 * 1024
+REQUEST_TIMEOUT = (5, 15)      # (connect, read) seconds
+MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5         # 0.5s, 1s between attempts
+MAX_RETRY_AFTER = 60.0         # Cap on a server's Retry-After
+MIN_IMAGE_BYTES = 100          # Smaller bodies are error pages, not images
+PARTIAL_MAX_AGE = 86400        # Unfinished .part files older than this are discarded
+STAGED_MAX_AGE = 600           # Finished files waiting to be delivered older than this are leftovers
+RETRYABLE_STATUS = (403, 429, 500, 502, 503, 504)
+HISTORY_SIZE = 50
+
+_seq = itertools.count()
+
+
+class _RetryableError(Exception):
+    """Attempt failed but may succeed later (network error, 5xx, rate limit)."""
+
+
+class _PermanentError(Exception):
+    """Attempt failed for good (404, not an image)."""
+
+
+class _PriorityLimiter:
+    """
+    Concurrency limit whose waiters are admitted lowest priority value first
+    (FIFO within a priority). A released slot passes directly to the next waiter.
+    """
+
+    def __init__(self, limit: int):
+        self._limit = max(1, limit)
+        self._active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    async def acquire(self, priority: int) -> None:
+        if self._active < self._limit and not self.waiting:
+            self._active += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(_seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # The slot was handed to us just before cancellation
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self._active -= 1
+
+
+@dataclass
+class _Host:
+    """Per-host connection pool and politeness state."""
+    name: str
+    session: requests.Session
+    limiter: _PriorityLimiter
+    next_start: float = 0.0    # time.monotonic() before which no new request may start
+
+
+@dataclass
+class DownloadJob:
+    """One URL being downloaded (shared by all callers requesting it)."""
+    url: str
+    host: str
+    priority: int
+    key: str                                   # Stable file key derived from the URL
+    state: str = "queued"                      # queued | downloading | done | failed
+    bytes_done: int = 0
+    bytes_total: Optional[int] = None
+    resumed_from: int = 0
+    attempts: int = 0
+    waiters: int = 1                           # Callers that still need the file delivered
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+    future: Optional[asyncio.Future] = None    # -> (staging path, extension) or None on failure
+
+    @property
+    def part_path(self) -> Path:
+        return DOWNLOADS_DIR / f"{self.key}.part"
+
+    @property
+    def part_meta_path(self) -> Path:
+        return DOWNLOADS_DIR / f"{self.key}.part.json"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "host": self.host,
+            "priority": PRIORITY_NAMES.get(self.priority, str(self.priority)),
+            "state": self.state,
+            "bytes_done": self.bytes_done,
+            "bytes_total": self.bytes_total,
+            "resumed_from": self.resumed_from,
+            "attempts": self.attempts,
+            "waiters": self.waiters,
+            "error": self.error,
+            "age": round((self.finished or time.time()) - self.created, 2),
+        }
+
+
+def normalize_image_url(url: str) -> str:
+    """
+    Convert spotify:image:xxx URIs (sent by Spicetify) to 1400px HTTPS URLs.
+
+    May do network I/O (Spotify URL enhancement) - call from a worker thread.
+    """
+    if url and url.startswith('spotify:image:'):
+        image_id = url.replace('spotify:image:', '')
+        url = f'https://i.scdn.co/image/{image_id}'
+        logger.debug(f"Converted spotify:image URI to HTTPS: {url}")
+
+        # The URI often contains low-res quality codes (e.g., 00001e02 = 300px)
+        from providers.spotify_api import enhance_spotify_image_url_sync
+        enhanced_url = enhance_spotify_image_url_sync(url)
+        if enhanced_url != url:
+            logger.debug(f"Enhanced Spotify URL to 1400px: {enhanced_url}")
+            url = enhanced_url
+    return url
+
+
+def image_request_headers(url: str) -> Dict[str, str]:
+    """Request headers for an image download (Wikimedia requires a User-Agent and rejects hotlinks)."""
+    headers = {'User-Agent': USER_AGENT}
+    if 'wikipedia' in url.lower() or 'wikimedia' in url.lower():
+        headers['Referer'] = 'https://en.wikipedia.org/'
+    return headers
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP dates are ignored)."""
+    value = response.headers.get('Retry-After')
+    try:
+        return min(MAX_RETRY_AFTER, max(0.0, float(value))) if value else None
+    except ValueError:
+        return None
+
+
+def _deliver(staging: Path, target: Path, move: bool) -> bool:
+    """Place a finished download at a caller's destination (runs in a thread)."""
+    try:
+        if move:
+            shutil.move(str(staging), str(target))
+        else:
+            shutil.copyfile(staging, target)
+        return True
+    except OSError as e:
+        logger.warning(f"Failed to deliver download to {target}: {e}")
+        return False
+
+
+class DownloadManager:
+    """Schedules, deduplicates and performs image downloads."""
+
+    def __init__(self):
+        self._workers = max(1, IMAGE_DOWNLOADS["workers"])
+        self._per_host = max(1, IMAGE_DOWNLOADS["per_host"])
+        self._host_interval = max(0.0, IMAGE_DOWNLOADS["host_interval"])
+        self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="SyncLyrics_Download")
+        self._limiter = _PriorityLimiter(self._workers)
+        self._hosts: Dict[str, _Host] = {}
+        self._hosts_lock = threading.Lock()
+        self._inflight: Dict[str, DownloadJob] = {}
+        self._recent: Deque[DownloadJob] = deque(maxlen=HISTORY_SIZE)
+        self._stats = {"completed": 0, "failed": 0, "deduplicated": 0, "resumed": 0, "bytes": 0}
+        self._closing = False
+        self._pruned = False
+
+    # ---------- Hosts ----------
+
+    def _host(self, name: str) -> _Host:
+        host = self._hosts.get(name)
+        if host is None:
+            with self._hosts_lock:
+                host = self._hosts.get(name)
+                if host is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._per_host)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    host = _Host(name, session, _PriorityLimiter(self._per_host))
+                    self._hosts[name] = host
+        return host
+
+    async def _polite_wait(self, host: _Host) -> None:
+        """Space out request starts to the same host (reserves the next start time)."""
+        now = time.monotonic()
+        start = max(now, host.next_start)
+        host.next_start = start + self._host_interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    # ---------- Public API ----------
+
+    async def download(self, url: str, dest: Path, priority: int = PRIORITY_CURRENT) -> Tuple[bool, str]:
+        """
+        Download an image to dest (extension chosen from the response).
+
+        Args:
+            url: Image URL (spotify:image: URIs are converted)
+            dest: Destination path; the file is written to dest.with_suffix(extension)
+            priority: PRIORITY_CURRENT, PRIORITY_PREFETCH or PRIORITY_BACKFILL
+
+        Returns:
+            Tuple of (success, extension) - same contract as _download_and_save_sync
+        """
+        if url.startswith('spotify:image:'):
+            url = await asyncio.to_thread(normalize_image_url, url)
+
+        job = self._inflight.get(url)
+        if job is not None:
+            job.waiters += 1
+            self._stats["deduplicated"] += 1
+            logger.debug(f"Download already in flight, sharing: {url}")
+        else:
+            job = DownloadJob(
+                url=url,
+                host=(urlsplit(url).hostname or "unknown").lower(),
+                priority=priority,
+                key=hashlib.sha1(url.encode('utf-8')).hexdigest()[:20],
+            )
+            job.future = asyncio.get_running_loop().create_future()
+            self._inflight[url] = job
+            create_tracked_task(self._run(job))
+
+        try:
+            result = await asyncio.shield(job.future)
+        except asyncio.CancelledError:
+            self._drop_waiter(job)
+            raise
+
+        if result is None:
+            job.waiters -= 1
+            return (False, '.jpg')
+
+        staging, ext = result
+        # Last caller takes the staged file; earlier ones get a copy
+        move = job.waiters == 1
+        try:
+            ok = await asyncio.to_thread(_deliver, staging, dest.with_suffix(ext), move)
+        finally:
+            if not move:
+                self._drop_waiter(job)
+            else:
+                job.waiters -= 1
+        return (ok, ext)
+
+    def _drop_waiter(self, job: DownloadJob) -> None:
+        """A caller no longer needs the file; remove the staged copy once nobody does."""
+        job.waiters -= 1
+        if job.waiters <= 0 and job.future.done() and job.future.result() is not None:
+            staging, _ = job.future.result()
+            try:
+                os.remove(staging)
+            except OSError:
+                pass
+
+    def status(self) -> Dict[str, Any]:
+        """Snapshot of download progress for the API."""
+        jobs = list(self._inflight.values())
+        return {
+            "active": [j.to_dict() for j in jobs if j.state == "downloading"],
+            "queued": [j.to_dict() for j in sorted(jobs, key=lambda j: (j.priority, j.created)) if j.state == "queued"],
+            "recent": [j.to_dict() for j in reversed(self._recent)],
+            "hosts": {
+                name: {"active": h.limiter.active, "waiting": h.limiter.waiting}
+                for name, h in self._hosts.items() if h.limiter.active or h.limiter.waiting
+            },
+            "workers": {"limit": self._workers, "active": self._limiter.active, "waiting": self._limiter.waiting},
+            "totals": dict(self._stats),
+        }
+
+    def shutdown(self) -> None:
+        """Abort running transfers (partial files are kept for resume) and stop the pool."""
+        self._closing = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for host in self._hosts.values():
+            host.session.close()
+
+    # ---------- Scheduling ----------
+
+    async def _run(self, job: DownloadJob) -> None:
+        """Download a job with retries, then resolve its future."""
+        loop = asyncio.get_running_loop()
+        host = self._host(job.host)
+        result = None
+        try:
+            if not self._pruned:
+                self._pruned = True
+                await asyncio.to_thread(_prune_partials)
+
+            for attempt in range(MAX_ATTEMPTS):
+                job.attempts = attempt + 1
+                job.state = "queued"
+                await host.limiter.acquire(job.priority)
+                try:
+                    await self._limiter.acquire(job.priority)
+                    try:
+                        await self._polite_wait(host)
+                        job.state = "downloading"
+                        result = await loop.run_in_executor(self._executor, self._fetch, job, host)
+                        break
+                    finally:
+                        self._limiter.release()
+                except _RetryableError as e:
+                    job.error = str(e)
+                    if attempt == MAX_ATTEMPTS - 1 or self._closing:
+                        logger.warning(f"Download failed for {job.url}: {e}")
+                        break
+                    logger.debug(f"Download attempt {attempt + 1} failed for {job.url}: {e}")
+                finally:
+                    host.limiter.release()
+                await asyncio.sleep(RETRY_BASE_DELAY * (2 ** attempt))
+        except _PermanentError as e:
+            job.error = str(e)
+            logger.warning(f"Download failed for {job.url}: {e}")
+        except Exception as e:
+            job.error = str(e)
+            logger.warning(f"Download failed for {job.url}: {e}")
+        finally:
+            job.state = "done" if result is not None else "failed"
+            job.finished = time.time()
+            if result is not None:
+                job.error = None
+                self._stats["completed"] += 1
+                self._stats["bytes"] += job.bytes_done - job.resumed_from
+                if job.resumed_from:
+                    self._stats["resumed"] += 1
+            else:
+                self._stats["failed"] += 1
+            # Queue wait + transfer + retries, per priority
+            histogram("image_download_seconds", "Album art / artist image download latency",
+                      priority=PRIORITY_NAMES.get(job.priority, str(job.priority)),
+                      outcome=job.state).observe(job.finished - job.created)
+            self._inflight.pop(job.url, None)
+            self._recent.append(job)
+            job.future.set_result(result)
+            if result is not None and job.waiters <= 0:
+                try:
+                    os.remove(result[0])  # Every caller went away
+                except OSError:
+                    pass
+
+    # ---------- Transfer (worker thread) ----------
+
+    def _fetch(self, job: DownloadJob, host: _Host) -> Tuple[Path, str]:
+        """
+        One download attempt: stream to the .part file, resuming it if possible.
+
+        Returns:
+            (staging path, extension) of the completed file
+
+        Raises:
+            _RetryableError: Worth another attempt (partial data kept)
+            _PermanentError: Not worth retrying (partial data discarded)
+        """
+        DOWNLOADS_DIR.mkdir(parents=True, exist_ok=True)
+        part, meta_path = job.part_path, job.part_meta_path
+        headers = image_request_headers(job.url)
+
+        # Resume a previous partial download of the same URL
+        offset, meta = 0, {}
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get("url") == job.url and part.exists():
+                offset = part.stat().st_size
+        except (OSError, ValueError):
+            meta = {}
+        if offset:
+            headers['Range'] = f'bytes={offset}-'
+            if meta.get("validator"):
+                headers['If-Range'] = meta["validator"]
+
+        try:
+            with host.session.get(job.url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                if response.status_code == 416:
+                    # Our partial is not a prefix of the current resource - start over next attempt
+                    _discard(part, meta_path)
+                    raise _RetryableError("range not satisfiable, restarting")
+                if response.status_code in RETRYABLE_STATUS:
+                    retry_after = _retry_after_seconds(response)
+                    if retry_after:
+                        host.next_start = max(host.next_start, time.monotonic() + retry_after)
+                    raise _RetryableError(f"HTTP {response.status_code}")
+                if response.status_code >= 400:
+                    _discard(part, meta_path)
+                    raise _PermanentError(f"HTTP {response.status_code}")
+
+                resumed = response.status_code == 206 and offset > 0
+                if not resumed:
+                    offset = 0
+                content_type = response.headers.get('Content-Type') or meta.get("content_type", "")
+                length = response.headers.get('Content-Length')
+                job.resumed_from = offset
+                job.bytes_done = offset
+                job.bytes_total = offset + int(length) if length and length.isdigit() else None
+
+                # Remember how to resume (strong validators only - weak ETags can't be used with If-Range)
+                etag = response.headers.get('ETag')
+                validator = etag if etag and not etag.startswith('W/') else response.headers.get('Last-Modified')
+                with open(meta_path, 'w', encoding='utf-8') as f:
+                    json.dump({"url": job.url, "validator": validator, "content_type": content_type}, f)
+
+                if resumed:
+                    logger.debug(f"Resuming download at {offset} bytes: {job.url}")
+                # read1 hands over whatever arrived before a dropped connection (iter_content
+                # discards a partially filled chunk), so the .part file keeps every received byte
+                raw = response.raw
+                if hasattr(raw, "read1"):
+                    chunks = iter(lambda: raw.read1(CHUNK_SIZE, decode_content=True), b'')
+                else:
+                    chunks = response.iter_content(CHUNK_SIZE)
+                with open(part, 'ab' if resumed else 'wb') as f:
+                    for chunk in chunks:
+                        if self._closing:
+                            raise _RetryableError("shutting down")
+                        f.write(chunk)
+                        job.bytes_done += len(chunk)
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+            raise _RetryableError(str(e)) from e
+
+        size = part.stat().st_size
+        if job.bytes_total is not None and size < job.bytes_total:
+            raise _RetryableError(f"incomplete body ({size}/{job.bytes_total} bytes)")
+        if size < MIN_IMAGE_BYTES:
+            _discard(part, meta_path)
+            raise _PermanentError(f"empty/tiny response ({size} bytes)")
+
+        ext = determine_image_extension(job.url, content_type)
+        staging = DOWNLOADS_DIR / f"{job.key}_{next(_seq)}{ext}"
+        os.replace(part, staging)
+        try:
+            os.remove(meta_path)
+        except OSError:
+            pass
+        return staging, ext
+
+
+def _discard(*paths: Path) -> None:
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _prune_partials() -> None:
+    """Remove abandoned partial and staged downloads (runs once per session)."""
+    if not DOWNLOADS_DIR.exists():
+        return
+    now = time.time()
+    removed = 0
+    with os.scandir(DOWNLOADS_DIR) as entries:
+        for entry in entries:
+            try:
+                # Staged files are only kept while their callers copy them; any left over are stale
+                partial = entry.name.endswith(('.part', '.part.json'))
+                max_age = PARTIAL_MAX_AGE if partial else STAGED_MAX_AGE
+                if entry.stat().st_mtime < now - max_age:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                pass
+    if removed:
+        logger.debug(f"Removed {removed} stale download file(s)")
+
+
+_manager: Optional[DownloadManager] = None
+
+
+def get_download_manager() -> DownloadManager:
+    """Get the shared download manager."""
+    global _manager
+    if _manager is None:
+        _manager = DownloadManager()
+    return _manager
+
+
+async def download_image(url: str, dest: Path, priority: int = PRIORITY_CURRENT) -> Tuple[bool, str]:
+    """Download an image through the shared manager (see DownloadManager.download)."""
+    return await get_download_manager().download(url, dest, priority)
+
+
+def get_download_status() -> Dict[str, Any]:
+    """Download progress for the API (empty if nothing was downloaded yet)."""
+    if _manager is None:
+        return {"active": [], "queued": [], "recent": [], "hosts": {}, "workers": {}, "totals": {}}
+    return _manager.status()
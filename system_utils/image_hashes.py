@@ -0,0 +1,147 @@
+"""
+Content hash index for served images.
+
+Maps image path -> (size, mtime_ns, content hash) and persists it to a sidecar
+JSON file in the cache dir, so ETags and variant names are content hashes
+without re-reading (or re-hashing) the file on every request or after restarts.
+An entry is trusted only while the file's size and mtime still match.
+
+Dependencies: none (config only)
+"""
+from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from config import CACHE_DIR
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_PATH = CACHE_DIR / "image_hashes.json"
+HASH_LENGTH = 20              # Hex chars of SHA-256 kept
+SAVE_INTERVAL = 5.0           # Min seconds between sidecar writes
+MAX_ENTRIES = 50000           # Oldest entries dropped beyond this
+
+_index: Optional[Dict[str, Tuple[int, int, str]]] = None  # path -> (size, mtime_ns, hash)
+_lock = threading.Lock()
+_dirty = False
+_last_save = 0.0
+
+
+def _load() -> Dict[str, Tuple[int, int, str]]:
+    """Load the sidecar index (once)."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                index = {}
+                try:
+                    with open(INDEX_PATH, 'r', encoding='utf-8') as f:
+                        for path, entry in json.load(f).items():
+                            index[path] = (int(entry[0]), int(entry[1]), str(entry[2]))
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    logger.warning(f"Image hash index unreadable, rebuilding: {e}")
+                _index = index
+    return _index
+
+
+def _save_if_due(force: bool = False) -> None:
+    """Write the sidecar index if it changed and SAVE_INTERVAL has passed."""
+    global _dirty, _last_save
+    now = time.time()
+    if not _dirty or (not force and now - _last_save < SAVE_INTERVAL):
+        return
+    with _lock:
+        snapshot = {path: list(entry) for path, entry in _index.items()}
+        _dirty = False
+        _last_save = now
+    tmp = INDEX_PATH.with_suffix(".json.tmp")
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+        os.replace(tmp, INDEX_PATH)
+    except Exception as e:
+        logger.debug(f"Failed to save image hash index: {e}")
+
+
+def lookup(path: Path, st: os.stat_result) -> Optional[str]:
+    """
+    Return the indexed hash if it is still valid for the file's current stat.
+
+    Args:
+        path: Image path
+        st: Current os.stat() of the file
+
+    Returns:
+        Content hash, or None if unknown/outdated
+    """
+    entry = _load().get(str(path))
+    if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+        return entry[2]
+    return None
+
+
+def compute(path: Path, st: Optional[os.stat_result] = None) -> str:
+    """
+    Get a file's content hash, hashing it (and recording it) only if the index is outdated.
+
+    Blocking - call from a worker thread for files that may not be indexed.
+
+    Args:
+        path: Image path
+        st: os.stat() of the file (taken here if omitted)
+
+    Returns:
+        HASH_LENGTH hex chars of SHA-256 over the file contents
+    """
+    global _dirty
+    st = st or path.stat()
+    cached = lookup(path, st)
+    if cached:
+        return cached
+
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(block)
+    digest = hasher.hexdigest()[:HASH_LENGTH]
+
+    with _lock:
+        if len(_index) >= MAX_ENTRIES:
+            _index.pop(next(iter(_index)), None)
+        _index[str(path)] = (st.st_size, st.st_mtime_ns, digest)
+        _dirty = True
+    _save_if_due()
+    return digest
+
+
+async def get_content_hash(path: Path, st: Optional[os.stat_result] = None) -> str:
+    """
+    Async content hash lookup: index hit on the event loop, hashing in a thread.
+
+    Args:
+        path: Image path
+        st: os.stat() of the file (taken here if omitted)
+
+    Returns:
+        Content hash (see compute)
+    """
+    st = st or path.stat()
+    cached = lookup(path, st)
+    if cached:
+        return cached
+    return await asyncio.to_thread(compute, path, st)
+
+
+def flush() -> None:
+    """Write pending index changes now (e.g. on shutdown)."""
+    if _index is not None:
+        _save_if_due(force=True)
@@ -0,0 +1,591 @@
+"""
+Persistent index of every image in the album art database.
+
+SQLite tables for images (path, size, mtime, dimensions, content hash),
+dominant colors and dedup signatures (both keyed by content hash, so copies of
+an image share them). Images and colors are mirrored in memory so steady-state lookups (does this image exist, what's in this
+folder, list every image for the slideshow, cached colors) never touch the disk.
+
+- Maintained incrementally by the download/save paths (record/remove)
+- Reconciled by a background scanner (startup + every RECONCILE_INTERVAL) that
+  picks up files added, replaced or deleted outside the app
+- Until the first reconcile has completed the index is not authoritative and
+  lookups return None, so callers fall back to the filesystem (the slideshow
+  samples the persisted entries meanwhile; a stale pick is harmless there)
+- Random sampling (slideshow) is O(k) over a dense path list kept alongside the
+  dicts, with optional artist/resolution filters and weighting
+
+Dependencies: image_hashes (content hashes)
+"""
+from __future__ import annotations
+import asyncio
+import heapq
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from config import ALBUM_ART_DB_DIR, CACHE_DIR
+from logging_config import get_logger
+from . import image_hashes
+from .helpers import sanitize_folder_name
+
+logger = get_logger(__name__)
+
+INDEX_DB_PATH = CACHE_DIR / "image_index.sqlite3"
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp')
+RECONCILE_INTERVAL = 600      # Seconds between background scans
+RECONCILE_START_DELAY = 10    # Let startup settle before the first scan
+RECENT_HALF_LIFE_DAYS = 90    # "recent" sampling weight halves every 90 days of image age
+MAX_UNINDEXED_COLORS = 2000   # Colors kept for images outside the DB (cache copies, Spotify art)
+
+SCHEMA_VERSION = 2            # Bump to rebuild (the index is derived data)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    path TEXT PRIMARY KEY,      -- Relative to ALBUM_ART_DB_DIR, forward slashes
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    content_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS colors (
+    content_hash TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,   -- Extractor version the colors came from
+    colors TEXT NOT NULL        -- JSON list of hex colors
+);
+CREATE TABLE IF NOT EXISTS signatures (
+    content_hash TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,   -- image_dedup signature format
+    signature BLOB NOT NULL
+);
+"""
+
+
+@dataclass
+class ImageEntry:
+    """One indexed image."""
+    path: str                   # Relative path ("Artist - Album/iTunes.jpg")
+    size: int
+    mtime_ns: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    content_hash: Optional[str] = None
+
+    @property
+    def folder(self) -> str:
+        return self.path.rpartition('/')[0]
+
+    @property
+    def filename(self) -> str:
+        return self.path.rpartition('/')[2]
+
+    @property
+    def mtime(self) -> float:
+        return self.mtime_ns / 1e9
+
+
+def is_image_file(name: str) -> bool:
+    """Whether a filename is an indexable image (excludes temp/metadata files)."""
+    lower = name.lower()
+    return (lower.endswith(IMAGE_EXTENSIONS) and not lower.endswith('.tmp')
+            and 'metadata_' not in lower)
+
+
+def _read_dimensions(path: Path) -> Tuple[Optional[int], Optional[int]]:
+    """Image size from the file header (no full decode)."""
+    try:
+        with Image.open(path) as img:
+            return img.size
+    except Exception:
+        return None, None
+
+
+class ImageIndex:
+    """
+    SQLite-backed image index with an in-memory mirror.
+
+    Thread-safe: record/remove/reconcile may run in executor threads while the
+    event loop reads.
+    """
+
+    def __init__(self, root: Path = ALBUM_ART_DB_DIR, db_path: Path = INDEX_DB_PATH):
+        self._root = root
+        self._db_path = db_path
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._entries: Dict[str, ImageEntry] = {}
+        self._folders: Dict[str, Dict[str, ImageEntry]] = {}
+        self._order: List[str] = []       # Dense list of paths for O(k) random sampling
+        self._positions: Dict[str, int] = {}
+        self._colors: Dict[str, Tuple[int, List[str]]] = {}  # content hash -> (version, colors)
+        self._loaded = False
+        self._reconciled = False  # True once a full scan has confirmed the index
+
+    # ---------- Storage ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                self._conn.executescript(
+                    f"DROP TABLE IF EXISTS images; DROP TABLE IF EXISTS colors; DROP TABLE IF EXISTS signatures; "
+                    f"PRAGMA user_version = {SCHEMA_VERSION};"
+                )
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def load(self) -> None:
+        """Load the persisted index into memory (once)."""
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                conn = self._connect()
+                rows = conn.execute(
+                    "SELECT path, size, mtime_ns, width, height, content_hash FROM images"
+                ).fetchall()
+                color_rows = conn.execute("SELECT content_hash, version, colors FROM colors ORDER BY rowid").fetchall()
+            except sqlite3.DatabaseError as e:
+                logger.warning(f"Image index unreadable, rebuilding: {e}")
+                self._reset_db()
+                rows, color_rows = [], []
+            for row in rows:
+                self._put(ImageEntry(*row))
+            for content_hash, version, colors in color_rows:
+                self._colors[content_hash] = (version, json.loads(colors))
+            self._loaded = True
+            logger.debug(f"Image index loaded: {len(self._entries)} images")
+
+    def _reset_db(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        try:
+            os.remove(self._db_path)
+        except OSError:
+            pass
+
+    def _put(self, entry: ImageEntry) -> None:
+        old = self._entries.get(entry.path)
+        if old is not None:
+            self._folders.get(old.folder, {}).pop(old.filename, None)
+        else:
+            self._positions[entry.path] = len(self._order)
+            self._order.append(entry.path)
+        self._entries[entry.path] = entry
+        self._folders.setdefault(entry.folder, {})[entry.filename] = entry
+
+    def _drop(self, rel: str) -> bool:
+        entry = self._entries.pop(rel, None)
+        if entry is None:
+            return False
+        folder = self._folders.get(entry.folder)
+        if folder is not None:
+            folder.pop(entry.filename, None)
+            if not folder:
+                del self._folders[entry.folder]
+        # Swap-remove from the dense list
+        pos = self._positions.pop(rel)
+        last = self._order.pop()
+        if last != rel:
+            self._order[pos] = last
+            self._positions[last] = pos
+        return True
+
+    def _write(self, entries: List[ImageEntry], removed: List[str]) -> None:
+        conn = self._connect()
+        with conn:
+            if entries:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?, ?)",
+                    [(e.path, e.size, e.mtime_ns, e.width, e.height, e.content_hash) for e in entries]
+                )
+            if removed:
+                conn.executemany("DELETE FROM images WHERE path = ?", [(p,) for p in removed])
+
+    def close(self) -> None:
+        """Close the database connection (writes are already committed)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ---------- Paths ----------
+
+    def _rel(self, path: Path) -> Optional[str]:
+        """Relative index key for a path, or None if outside the album art DB."""
+        try:
+            return Path(os.path.relpath(path, self._root)).as_posix() if Path(path).is_absolute() \
+                else Path(path).as_posix()
+        except ValueError:
+            return None
+
+    def _in_root(self, rel: Optional[str]) -> bool:
+        return bool(rel) and not rel.startswith('../') and rel != '..'
+
+    # ---------- Incremental maintenance ----------
+
+    def _build_entry(self, path: Path, rel: str, st: os.stat_result,
+                     width: Optional[int] = None, height: Optional[int] = None) -> ImageEntry:
+        """Build an entry for a file (hash reused from image_hashes if unchanged)."""
+        if not width or not height:
+            width, height = _read_dimensions(path)
+        content_hash = image_hashes.compute(path, st)
+        return ImageEntry(rel, st.st_size, st.st_mtime_ns, width, height, content_hash)
+
+    def record(self, path: Path, width: Optional[int] = None, height: Optional[int] = None) -> None:
+        """
+        Index (or re-index) an image just written to the album art DB.
+
+        Blocking (stat + header read + hash) - call from an executor thread.
+
+        Args:
+            path: Absolute image path
+            width: Known width (skips reading the header)
+            height: Known height
+        """
+        rel = self._rel(path)
+        if not self._in_root(rel) or not is_image_file(rel):
+            return
+        try:
+            self.load()
+            entry = self._build_entry(path, rel, path.stat(), width, height)
+            with self._lock:
+                self._put(entry)
+                self._write([entry], [])
+        except Exception as e:
+            logger.debug(f"Image index: failed to record {path}: {e}")
+
+    def remove(self, path: Path) -> None:
+        """Drop an image deleted from the album art DB."""
+        rel = self._rel(path)
+        if not self._in_root(rel):
+            return
+        try:
+            with self._lock:
+                if self._drop(rel):
+                    self._write([], [rel])
+        except Exception as e:
+            logger.debug(f"Image index: failed to remove {path}: {e}")
+
+    def set_colors(self, content_hash: str, colors: List[str], version: int) -> None:
+        """
+        Store extracted dominant colors for an image's content.
+
+        Args:
+            content_hash: Content hash of the image (see image_hashes)
+            colors: Hex colors
+            version: Extractor version (stale versions are ignored by get_colors)
+        """
+        with self._lock:
+            if self._colors.get(content_hash) == (version, colors):
+                return
+            self._colors.pop(content_hash, None)  # Re-insert so dict order tracks recency
+            self._colors[content_hash] = (version, list(colors))
+            try:
+                with self._connect() as conn:
+                    conn.execute("INSERT OR REPLACE INTO colors VALUES (?, ?, ?)",
+                                 (content_hash, version, json.dumps(colors)))
+            except Exception as e:
+                logger.debug(f"Image index: failed to store colors for {content_hash}: {e}")
+
+    def get_signature(self, content_hash: str, version: int) -> Optional[bytes]:
+        """
+        Stored dedup signature for an image's content (see image_dedup).
+
+        Blocking (SQLite read, not mirrored in memory) - call from an executor thread.
+
+        Returns:
+            Signature bytes, or None if unknown or from another version
+        """
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT signature FROM signatures WHERE content_hash = ? AND version = ?",
+                    (content_hash, version)
+                ).fetchone()
+        except Exception as e:
+            logger.debug(f"Image index: failed to read signature for {content_hash}: {e}")
+            return None
+        return row[0] if row else None
+
+    def set_signature(self, content_hash: str, signature: bytes, version: int) -> None:
+        """Store the dedup signature for an image's content (blocking)."""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO signatures VALUES (?, ?, ?)",
+                             (content_hash, version, signature))
+        except Exception as e:
+            logger.debug(f"Image index: failed to store signature for {content_hash}: {e}")
+
+    # ---------- Lookups (memory only; None = not authoritative, use the filesystem) ----------
+
+    @property
+    def image_count(self) -> int:
+        return len(self._entries)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def is_authoritative(self) -> bool:
+        return self._reconciled
+
+    def get(self, path: Path) -> Optional[ImageEntry]:
+        """Entry for an image path (None if not indexed)."""
+        rel = self._rel(path)
+        return self._entries.get(rel) if rel else None
+
+    def exists(self, path: Path) -> Optional[bool]:
+        """Whether an image exists, or None if the index can't answer yet."""
+        if not self._reconciled:
+            return None
+        return self.get(path) is not None
+
+    def folder_entries(self, folder: Path) -> Optional[Dict[str, ImageEntry]]:
+        """Images in a folder (filename -> entry), or None if the index can't answer yet."""
+        if not self._reconciled:
+            return None
+        rel = self._rel(folder)
+        with self._lock:
+            return dict(self._folders.get(rel, {})) if rel is not None else {}
+
+    def folder_mtime(self, folder: Path) -> Optional[float]:
+        """Newest image mtime in a folder (0 if empty), or None if the index can't answer yet."""
+        entries = self.folder_entries(folder)
+        if entries is None:
+            return None
+        return max((e.mtime for e in entries.values()), default=0)
+
+    def list_paths(self) -> Optional[List[str]]:
+        """All indexed relative image paths, or None if the index can't answer yet."""
+        if not self._reconciled:
+            return None
+        with self._lock:
+            return list(self._entries)
+
+    def sample(self, k: int, artist: Optional[str] = None, min_resolution: int = 0,
+               weighting: Optional[str] = None, allow_stale: bool = False) -> Optional[List[ImageEntry]]:
+        """
+        Pick up to k distinct random images.
+
+        Unfiltered uniform sampling is O(k); filters and weighting scan the index once.
+
+        Args:
+            k: Number of images
+            artist: Only images from this artist's folders ("Artist" and "Artist - *")
+            min_resolution: Only images whose larger side is at least this many pixels
+            weighting: None (uniform), "resolution" (favor larger images) or
+                       "recent" (favor recently added images)
+            allow_stale: Answer from the persisted entries before the first reconcile
+                         (they may briefly list files changed outside the app)
+
+        Returns:
+            List of entries, or None if the index can't answer yet
+        """
+        if not (self._reconciled or (allow_stale and self._loaded)):
+            return None
+        with self._lock:
+            if artist is None and not min_resolution and weighting is None:
+                picks = random.sample(range(len(self._order)), min(k, len(self._order)))
+                return [self._entries[self._order[i]] for i in picks]
+
+            candidates = list(self._entries.values())
+
+        if artist:
+            safe_artist = sanitize_folder_name(artist)
+            prefix = f"{safe_artist} - "
+            candidates = [e for e in candidates if e.folder == safe_artist or e.folder.startswith(prefix)]
+        if min_resolution:
+            candidates = [e for e in candidates if max(e.width or 0, e.height or 0) >= min_resolution]
+
+        if weighting == "resolution":
+            weight = lambda e: max(e.width or 0, e.height or 0) or 1
+        elif weighting == "recent":
+            now = time.time()
+            weight = lambda e: 0.5 ** (max(0.0, now - e.mtime) / 86400 / RECENT_HALF_LIFE_DAYS)
+        else:
+            return random.sample(candidates, min(k, len(candidates)))
+
+        # Weighted sampling without replacement (Efraimidis-Spirakis): the k largest u^(1/w)
+        keyed = []
+        for entry in candidates:
+            w = weight(entry)
+            if w > 0:
+                keyed.append((random.random() ** (1.0 / w), entry))
+        return [entry for _, entry in heapq.nlargest(k, keyed, key=lambda item: item[0])]
+
+    def get_colors(self, content_hash: str, version: int) -> Optional[List[str]]:
+        """Stored dominant colors for an image's content (None if unknown or from another version)."""
+        stored = self._colors.get(content_hash)
+        return list(stored[1]) if stored is not None and stored[0] == version else None
+
+    def get_colors_for_path(self, path: Path, version: int) -> Optional[List[str]]:
+        """Stored dominant colors for an indexed image, from memory (None if unknown)."""
+        entry = self.get(path)
+        if entry is None or not entry.content_hash:
+            return None
+        return self.get_colors(entry.content_hash, version)
+
+    def missing_colors(self, version: int) -> List[Tuple[Path, str]]:
+        """Indexed images with no colors for this extractor version, as (path, content hash)."""
+        with self._lock:
+            pending = {}
+            for entry in self._entries.values():
+                if entry.content_hash and entry.content_hash not in pending:
+                    stored = self._colors.get(entry.content_hash)
+                    if stored is None or stored[0] != version:
+                        pending[entry.content_hash] = self._root / entry.path
+        return [(path, content_hash) for content_hash, path in pending.items()]
+
+    def _prune_colors(self) -> None:
+        """Drop colors of images no longer in the DB once too many have accumulated (lock held)."""
+        referenced = {e.content_hash for e in self._entries.values()}
+        unreferenced = [h for h in self._colors if h not in referenced]
+        if len(unreferenced) <= MAX_UNINDEXED_COLORS:
+            return
+        stale = unreferenced[:len(unreferenced) - MAX_UNINDEXED_COLORS // 2]  # Oldest first (insertion order)
+        for content_hash in stale:
+            del self._colors[content_hash]
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM colors WHERE content_hash = ?", [(h,) for h in stale])
+
+    def _prune_signatures(self) -> None:
+        """Drop dedup signatures of images no longer in the DB (lock held)."""
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM signatures WHERE content_hash NOT IN "
+                "(SELECT content_hash FROM images WHERE content_hash IS NOT NULL)"
+            )
+
+    # ---------- Reconcile ----------
+
+    def reconcile(self) -> Tuple[int, int, int]:
+        """
+        Bring the index in line with the album art DB on disk.
+
+        Blocking - run in an executor thread.
+
+        Returns:
+            Tuple of (added, updated, removed) counts
+        """
+        self.load()
+        start = time.time()
+        seen = set()
+        changed: List[ImageEntry] = []
+        added = 0
+
+        for dirpath, _, files in os.walk(self._root):
+            for name in files:
+                if not is_image_file(name):
+                    continue
+                path = Path(dirpath) / name
+                rel = self._rel(path)
+                if not self._in_root(rel):
+                    continue
+                seen.add(rel)
+                try:
+                    st = path.stat()
+                    old = self._entries.get(rel)
+                    if old is not None and old.size == st.st_size and old.mtime_ns == st.st_mtime_ns:
+                        continue
+                    entry = self._build_entry(path, rel, st)
+                except OSError:
+                    seen.discard(rel)
+                    continue
+                if old is None:
+                    added += 1
+                changed.append(entry)
+
+        with self._lock:
+            removed = [rel for rel in self._entries if rel not in seen]
+            for entry in changed:
+                self._put(entry)
+            for rel in removed:
+                self._drop(rel)
+            if changed or removed:
+                self._write(changed, removed)
+            self._prune_colors()
+            self._prune_signatures()
+            self._reconciled = True
+
+        updated = len(changed) - added
+        if changed or removed:
+            logger.info(
+                f"Image index reconciled in {time.time() - start:.1f}s: "
+                f"+{added} new, {updated} updated, -{len(removed)} removed ({len(self._entries)} total)"
+            )
+        else:
+            logger.debug(f"Image index up to date ({len(self._entries)} images, {time.time() - start:.1f}s)")
+        return added, updated, len(removed)
+
+
+_index: Optional[ImageIndex] = None
+_index_lock = threading.Lock()
+_scanner_task: Optional[asyncio.Task] = None
+_reconcile_lock = asyncio.Lock()
+
+
+def get_image_index() -> ImageIndex:
+    """Get the shared album art DB image index."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ImageIndex()
+    return _index
+
+
+async def reconcile_image_index() -> None:
+    """Run a reconcile in a worker thread (one at a time)."""
+    async with _reconcile_lock:
+        await asyncio.to_thread(get_image_index().reconcile)
+
+
+async def load_image_index() -> ImageIndex:
+    """
+    Get the image index with its persisted entries loaded, without waiting for a
+    reconcile. If nothing was persisted yet (first run), a reconcile is started
+    in the background instead of waiting for the scanner's delayed first pass.
+    """
+    index = get_image_index()
+    if not index.is_loaded:
+        await asyncio.to_thread(index.load)
+    if not index.is_authoritative and not index.image_count and not _reconcile_lock.locked():
+        from .helpers import create_tracked_task
+        create_tracked_task(reconcile_image_index())
+    return index
+
+
+async def _scanner_loop() -> None:
+    """Reconcile the index at startup and then periodically, then fill in missing colors."""
+    from .image import precompute_dominant_colors
+
+    await asyncio.sleep(RECONCILE_START_DELAY)
+    while True:
+        try:
+            await reconcile_image_index()
+            await precompute_dominant_colors()
+        except Exception as e:
+            logger.warning(f"Image index reconcile failed: {e}")
+        await asyncio.sleep(RECONCILE_INTERVAL)
+
+
+def start_image_index_scanner() -> None:
+    """Start the background reconcile loop (idempotent)."""
+    global _scanner_task
+    if _scanner_task is not None and not _scanner_task.done():
+        return
+    from .helpers import create_tracked_task
+    _scanner_task = create_tracked_task(_scanner_loop())
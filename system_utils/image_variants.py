@@ -0,0 +1,378 @@
+"""
+Image variant cache for album art and artist images.
+
+The album art database keeps full-size originals (iTunes art up to 3000x3000,
+Wikipedia images up to 5000px). Thumbnails, tablets and slideshow frames ask
+for a resized/transcoded copy instead via ?w=&fmt=&q= on the image URL.
+
+- Widths snap up to a small set of buckets so the number of variants stays bounded
+- Variants are named after the original's content hash plus the parameters, so a
+  variant URL never changes meaning and is served as immutable
+- Each variant is rendered once, in a small dedicated thread pool (Pillow releases
+  the GIL while decoding, resampling and encoding); concurrent requests share one render
+- Least recently used variants are evicted when the cache exceeds its disk budget
+
+Dependencies: image_hashes (content hashes of originals)
+"""
+from __future__ import annotations
+import asyncio
+import base64
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+from PIL import Image, ImageOps, features
+
+from config import CACHE_DIR, IMAGE_VARIANTS
+from logging_config import get_logger
+from .image_hashes import get_content_hash
+
+logger = get_logger(__name__)
+
+VARIANTS_DIR = CACHE_DIR / "image_variants"
+VARIANT_URL_PREFIX = "/api/image-variants/"
+
+# Requested widths snap up to the nearest bucket (capped at IMAGE_VARIANTS["max_width"])
+WIDTH_BUCKETS = (64, 128, 192, 256, 384, 512, 640, 800, 1024, 1280, 1600, 2048, 2560, 3000)
+
+# fmt query value -> (Pillow format, mimetype, extension)
+FORMATS = {
+    "webp": ("WEBP", "image/webp", ".webp"),
+    "avif": ("AVIF", "image/avif", ".avif"),
+    "jpeg": ("JPEG", "image/jpeg", ".jpg"),
+}
+FORMAT_ALIASES = {"jpg": "jpeg"}
+MIN_QUALITY = 30
+MAX_QUALITY = 95
+
+# <content hash>_w<width>_q<quality>.<ext>
+VARIANT_NAME_RE = re.compile(r"^[0-9a-f]{20}_w\d+_q\d+\.(?:webp|avif|jpg)$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+EVICT_TARGET_RATIO = 0.9      # Evict down to 90% of the budget so we don't evict on every render
+TOUCH_INTERVAL = 3600         # Refresh a variant's mtime (LRU clock) at most once an hour
+
+# Inline previews (data URIs) embedded in picker responses
+THUMBNAIL_WIDTH = 256
+THUMBNAIL_QUALITY = 60
+MAX_INLINE_CACHE = 256
+
+_executor: Optional[ThreadPoolExecutor] = None
+_inflight: Dict[str, asyncio.Future] = {}
+_cache_bytes: Optional[int] = None  # Running total of VARIANTS_DIR size (None = not scanned yet)
+_evict_lock = threading.Lock()
+_inline_cache: Dict[str, str] = {}  # Variant name -> data URI
+
+
+@dataclass(frozen=True)
+class VariantSpec:
+    """Normalized variant parameters."""
+    width: int
+    fmt: str      # Key of FORMATS
+    quality: int
+
+
+@lru_cache(maxsize=None)
+def _format_supported(fmt: str) -> bool:
+    """Check if the installed Pillow can encode a variant format."""
+    if fmt == "jpeg":
+        return True
+    try:
+        return bool(features.check(fmt))
+    except Exception:
+        return False
+
+
+def _snap_width(width: int, max_width: int) -> int:
+    """Round a requested width up to the nearest bucket, capped at max_width."""
+    for bucket in WIDTH_BUCKETS:
+        if bucket >= width:
+            return min(bucket, max_width)
+    return max_width
+
+
+def parse_variant_args(args: Mapping[str, str]) -> Optional[VariantSpec]:
+    """
+    Build a VariantSpec from request query parameters.
+
+    Invalid values fall back to defaults rather than failing the request.
+
+    Args:
+        args: Query parameters (w, fmt, q)
+
+    Returns:
+        VariantSpec, or None if no variant was requested (or variants are disabled)
+    """
+    if not IMAGE_VARIANTS["enabled"] or not any(k in args for k in ("w", "fmt", "q")):
+        return None
+
+    max_width = max(WIDTH_BUCKETS[0], IMAGE_VARIANTS["max_width"])
+    try:
+        width = int(args.get("w") or max_width)
+    except (TypeError, ValueError):
+        width = max_width
+    width = _snap_width(max(1, min(width, max_width)), max_width)
+
+    fmt = str(args.get("fmt") or IMAGE_VARIANTS["default_format"]).lower()
+    fmt = FORMAT_ALIASES.get(fmt, fmt)
+    if fmt not in FORMATS or not _format_supported(fmt):
+        fmt = "webp" if _format_supported("webp") else "jpeg"
+
+    try:
+        quality = int(args.get("q") or IMAGE_VARIANTS["default_quality"])
+    except (TypeError, ValueError):
+        quality = IMAGE_VARIANTS["default_quality"]
+    quality = max(MIN_QUALITY, min(quality, MAX_QUALITY))
+
+    return VariantSpec(width=width, fmt=fmt, quality=quality)
+
+
+def variant_mimetype(name: str) -> str:
+    """Mimetype for a variant filename."""
+    ext = Path(name).suffix.lower()
+    for _, mime, fmt_ext in FORMATS.values():
+        if fmt_ext == ext:
+            return mime
+    return "application/octet-stream"
+
+
+def resolve_variant(name: str) -> Optional[Path]:
+    """
+    Map a variant filename from a URL to its path.
+
+    Returns:
+        Path if the name is well-formed and the variant exists, else None
+    """
+    if not VARIANT_NAME_RE.match(name):
+        return None
+    path = VARIANTS_DIR / name
+    return path if path.is_file() else None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get or create the variant render pool."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, IMAGE_VARIANTS["workers"]),
+            thread_name_prefix="SyncLyrics_ImageVariant"
+        )
+    return _executor
+
+
+def _render_variant(src: Path, dst: Path, spec: VariantSpec) -> int:
+    """
+    Render one variant to disk (runs in the variant pool).
+
+    Never upscales. JPEG sources are decoded at a reduced scale when possible.
+
+    Returns:
+        Size of the written variant in bytes
+    """
+    pil_format = FORMATS[spec.fmt][0]
+
+    with Image.open(src) as original:
+        if original.format == "JPEG" and original.width > spec.width:
+            # DCT scaling: decode at 1/2, 1/4 or 1/8 size while staying >= target
+            target_height = max(1, round(original.height * spec.width / original.width))
+            original.draft("RGB", (spec.width, target_height))
+        img = ImageOps.exif_transpose(original)
+
+        if img.width > spec.width:
+            height = max(1, round(img.height * spec.width / img.width))
+            img = img.resize((spec.width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha and pil_format != "JPEG" else "RGB")
+
+        save_kwargs = {"quality": spec.quality}
+        if pil_format == "JPEG":
+            save_kwargs.update(optimize=True, progressive=True)
+        elif pil_format == "WEBP":
+            save_kwargs["method"] = 4
+
+        # Write to temp file, then atomic rename (readers never see partial files)
+        tmp = dst.with_name(f"{dst.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            img.save(tmp, pil_format, **save_kwargs)
+            os.replace(tmp, dst)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    return dst.stat().st_size
+
+
+def _scan_cache_size() -> int:
+    """Total size of all files in VARIANTS_DIR."""
+    total = 0
+    with os.scandir(VARIANTS_DIR) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    total += entry.stat().st_size
+            except OSError:
+                pass
+    return total
+
+
+def _enforce_disk_budget(added: Path, added_bytes: int) -> None:
+    """
+    Account for a new variant and evict least recently used ones if over budget.
+
+    Args:
+        added: Variant just written (never evicted here - it is about to be served)
+        added_bytes: Its size in bytes
+    """
+    global _cache_bytes
+    budget = IMAGE_VARIANTS["disk_budget_mb"] * 1024 * 1024
+
+    with _evict_lock:
+        if _cache_bytes is None:
+            _cache_bytes = _scan_cache_size()  # Includes the new variant
+        else:
+            _cache_bytes += added_bytes
+
+        if _cache_bytes <= budget:
+            return
+
+        files = []
+        with os.scandir(VARIANTS_DIR) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        st = entry.stat()
+                        files.append((st.st_mtime, st.st_size, entry.path))
+                except OSError:
+                    pass
+        files.sort()
+
+        total = sum(size for _, size, _ in files)
+        target = budget * EVICT_TARGET_RATIO
+        removed = 0
+        for _, size, path in files:
+            if total <= target:
+                break
+            if path == str(added):
+                continue
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+
+        _cache_bytes = total
+        logger.info(f"Image variants: evicted {removed} file(s), cache now {total / 1048576:.1f} MB")
+
+
+def _build_variant(src: Path, dst: Path, spec: VariantSpec) -> Path:
+    """Render a variant and keep the cache within budget (runs in the variant pool)."""
+    VARIANTS_DIR.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    size = _render_variant(src, dst, spec)
+    logger.debug(
+        f"Image variant {dst.name} from {src.name}: {size} bytes "
+        f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+    )
+    _enforce_disk_budget(dst, size)
+    return dst
+
+
+def _touch(path: Path) -> None:
+    """Bump a variant's mtime (eviction uses it as last-used time), at most once per TOUCH_INTERVAL."""
+    try:
+        now = time.time()
+        if now - path.stat().st_mtime > TOUCH_INTERVAL:
+            os.utime(path, (now, now))
+    except OSError:
+        pass
+
+
+async def get_variant(src: Path, spec: VariantSpec) -> Optional[Path]:
+    """
+    Get the variant of an original image, rendering it on first use.
+
+    Args:
+        src: Original image path (must exist)
+        spec: Variant parameters (see parse_variant_args)
+
+    Returns:
+        Path of the variant file, or None if it couldn't be produced (serve the original)
+    """
+    try:
+        digest = await get_content_hash(src)
+    except OSError as e:
+        logger.debug(f"Image variant: cannot read {src}: {e}")
+        return None
+
+    name = f"{digest}_w{spec.width}_q{spec.quality}{FORMATS[spec.fmt][2]}"
+    dst = VARIANTS_DIR / name
+    if dst.exists():
+        _touch(dst)
+        return dst
+
+    future = _inflight.get(name)
+    if future is None:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(_get_executor(), _build_variant, src, dst, spec)
+        _inflight[name] = future
+        future.add_done_callback(lambda _: _inflight.pop(name, None))
+
+    try:
+        # Shield: a client disconnect must not cancel a render other requests are waiting on
+        return await asyncio.shield(future)
+    except Exception as e:
+        logger.warning(f"Image variant render failed for {src.name} ({spec}): {e}")
+        return None
+
+
+def variant_url(path: Path) -> str:
+    """Public URL of a variant file."""
+    return f"{VARIANT_URL_PREFIX}{path.name}"
+
+
+async def get_inline_thumbnail(src: Path, width: int = THUMBNAIL_WIDTH) -> Optional[str]:
+    """
+    Small preview of an image as a data URI, for embedding in JSON responses.
+
+    Rendered through the variant cache (once per image content), so a picker
+    can show every option without fetching each original.
+
+    Args:
+        src: Original image path
+        width: Preview width (snapped to a bucket)
+
+    Returns:
+        "data:<mime>;base64,..." or None if variants are disabled or rendering failed
+    """
+    if not IMAGE_VARIANTS["enabled"]:
+        return None
+    fmt = "webp" if _format_supported("webp") else "jpeg"
+    spec = VariantSpec(width=_snap_width(width, max(WIDTH_BUCKETS[0], IMAGE_VARIANTS["max_width"])),
+                       fmt=fmt, quality=THUMBNAIL_QUALITY)
+
+    path = await get_variant(src, spec)
+    if path is None:
+        return None
+    cached = _inline_cache.get(path.name)
+    if cached:
+        return cached
+
+    try:
+        data = await asyncio.to_thread(path.read_bytes)
+    except OSError:
+        return None
+    uri = f"data:{FORMATS[fmt][1]};base64,{base64.b64encode(data).decode('ascii')}"
+
+    if len(_inline_cache) >= MAX_INLINE_CACHE:
+        _inline_cache.pop(next(iter(_inline_cache)), None)
+    _inline_cache[path.name] = uri
+    return uri
@@ -0,0 +1,451 @@
+"""
+Bulk library backfill job.
+
+Walks a whole library and fills in what the per-song backfill endpoints only
+do for the current track: lyrics (lyrics._get_lyrics), album art
+(ensure_album_art_db) and artist images (ensure_artist_image_db).
+
+Library sources:
+    lyrics_db - songs in the local lyrics database (DATABASE_DIR/*.json)
+    art_db    - albums/artists in the album art database (metadata.json)
+    folder    - audio files in a folder, tags read with mutagen
+
+Items are processed one at a time in sorted key order, LIBRARY_BACKFILL
+["interval"] seconds apart, with image downloads at PRIORITY_BACKFILL. Items
+that already have lyrics/art are skipped without network calls unless the
+job is forced. Progress is checkpointed to CACHE_DIR after every item (the key
+of the last finished item), so a restarted or paused job resumes where it
+stopped even if the library changed in between. The job pauses itself as soon
+as playback starts, leaving bandwidth and provider rate limits to the
+current song.
+
+Dependencies: metadata, album_art, artist_image, lyrics (imported lazily)
+"""
+from __future__ import annotations
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import ALBUM_ART_DB_DIR, CACHE_DIR, DATABASE_DIR, FEATURES, LIBRARY_BACKFILL
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CHECKPOINT_PATH = CACHE_DIR / "library_backfill.json"
+SOURCES = ("lyrics_db", "art_db", "folder")
+TASKS = ("lyrics", "album_art", "artist_images")
+
+
+def _item_key(artist: str, title: str, album: Optional[str]) -> str:
+    """Stable, case-insensitive sort/resume key for a library item."""
+    return "\x1f".join(part.strip().lower() for part in (artist or "", album or "", title or ""))
+
+
+def _load_checkpoint() -> Dict[str, Any]:
+    """Load the checkpoint, or return an empty dict if missing/corrupt."""
+    try:
+        with open(CHECKPOINT_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+            return data if isinstance(data, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Library backfill checkpoint unreadable, starting over: {e}")
+        return {}
+
+
+def _save_checkpoint(data: Dict[str, Any]) -> None:
+    """Write the checkpoint via temp file + rename."""
+    try:
+        CHECKPOINT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CHECKPOINT_PATH.with_suffix(".json.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, CHECKPOINT_PATH)
+    except Exception as e:
+        logger.debug(f"Failed to save library backfill checkpoint: {e}")
+
+
+# ============================================================================
+# LIBRARY SOURCES (blocking, run in a thread)
+# ============================================================================
+
+def _items_from_lyrics_db() -> List[Dict[str, Any]]:
+    """Songs saved in the local lyrics database."""
+    items = []
+    if not DATABASE_DIR.exists():
+        return items
+    for path in DATABASE_DIR.glob("*.json"):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.debug(f"Skipping unreadable lyrics DB entry {path.name}: {e}")
+            continue
+        artist, title = data.get("artist"), data.get("title")
+        if artist and title:
+            items.append({"artist": artist, "title": title, "album": None, "duration": None})
+    return items
+
+
+def _items_from_art_db() -> List[Dict[str, Any]]:
+    """Albums and artists in the album art database."""
+    items = []
+    if not ALBUM_ART_DB_DIR.exists():
+        return items
+    for folder in ALBUM_ART_DB_DIR.iterdir():
+        try:
+            with open(folder / "metadata.json", 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        except Exception as e:
+            logger.debug(f"Skipping unreadable album art metadata in {folder.name}: {e}")
+            continue
+        artist = data.get("artist")
+        if not artist:
+            continue
+        if data.get("type") == "artist_images":
+            # Artist-only folder: nothing to fetch but the artist images
+            items.append({"artist": artist, "title": None, "album": None, "duration": None})
+        elif data.get("album"):
+            # Album folders don't know their tracks; singles are named after the track
+            album = data["album"]
+            items.append({
+                "artist": artist,
+                "title": album if data.get("is_single") else None,
+                "album": None if data.get("is_single") else album,
+                "duration": None,
+            })
+    return items
+
+
+def _items_from_folder(folder: Path) -> List[Dict[str, Any]]:
+    """Audio files under a folder, tagged with mutagen (filename fallback)."""
+    from audio_recognition.indexer import read_track_metadata, scan_library
+
+    items = []
+    for path, _size, _mtime in scan_library(folder):
+        metadata = read_track_metadata(Path(path), filename_fallback=True)
+        artist = metadata.get("albumArtist") or metadata.get("artist")
+        if metadata.get("artist") and metadata.get("title"):
+            duration = metadata.get("duration")
+            items.append({
+                "artist": metadata["artist"],
+                "title": metadata["title"],
+                "album": metadata.get("album"),
+                "duration": int(duration) if duration else None,
+            })
+        elif artist:
+            items.append({"artist": artist, "title": None, "album": metadata.get("album"), "duration": None})
+    return items
+
+
+def collect_library(source: str, folder: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Build the de-duplicated, key-sorted item list for a library source.
+
+    Args:
+        source: One of SOURCES
+        folder: Audio folder (required for the "folder" source)
+
+    Returns:
+        List of {key, artist, title, album, duration} dicts sorted by key
+    """
+    if source == "lyrics_db":
+        raw = _items_from_lyrics_db()
+    elif source == "art_db":
+        raw = _items_from_art_db()
+    elif source == "folder":
+        raw = _items_from_folder(Path(folder))
+    else:
+        raise ValueError(f"Unknown library source: {source}")
+
+    items: Dict[str, Dict[str, Any]] = {}
+    for item in raw:
+        key = _item_key(item["artist"], item["title"], item["album"])
+        # Keep the first occurrence, but prefer one that knows the duration
+        if key not in items or (item["duration"] and not items[key]["duration"]):
+            items[key] = {"key": key, **item}
+    return [items[key] for key in sorted(items)]
+
+
+# ============================================================================
+# PER-ITEM WORK
+# ============================================================================
+
+def _has_lyrics_saved(artist: str, title: str) -> bool:
+    """True if the lyrics DB already has lyrics (or an instrumental flag) for a song."""
+    from lyrics import _get_db_path
+
+    db_path = _get_db_path(artist, title)
+    if not db_path or not os.path.exists(db_path):
+        return False
+    try:
+        with open(db_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception:
+        return False
+    if data.get("lyrics") or any(data.get("saved_lyrics", {}).values()):
+        return True
+    metadata = data.get("metadata", {})
+    return isinstance(metadata, dict) and any(
+        isinstance(m, dict) and m.get("is_instrumental") for m in metadata.values()
+    )
+
+
+def _has_album_art(artist: str, album: Optional[str], title: Optional[str]) -> bool:
+    """True if the album art DB already has downloaded art for an album/single."""
+    from .album_art import get_album_db_folder
+
+    metadata_path = get_album_db_folder(artist, album or title) / "metadata.json"
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            providers = json.load(f).get("providers", {})
+    except Exception:
+        return False
+    return any(isinstance(p, dict) and p.get("downloaded") for p in providers.values())
+
+
+async def _fetch_lyrics(artist: str, title: str, album: Optional[str], duration: Optional[int]) -> bool:
+    """Fetch and save lyrics without touching the current song's provider state."""
+    import lyrics
+
+    return bool(await lyrics._get_lyrics(artist, title, album, duration, set_current_provider=False))
+
+
+# ============================================================================
+# JOB
+# ============================================================================
+
+class LibraryBackfillJob:
+    """
+    Single background backfill run (one per process, see get_library_backfill).
+
+    States: idle -> scanning -> running -> completed | paused | error.
+    A paused job (manual or playback) keeps its checkpoint; start() resumes it.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._pause_requested = False
+        self._checkpoint: Dict[str, Any] = {}
+        self.state = "idle"
+        self.reason: Optional[str] = None
+        self.current: Optional[str] = None
+        self.total = 0
+        self.position = 0
+        self.started_at: Optional[float] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, source: str, folder: Optional[str] = None, tasks: Optional[List[str]] = None,
+              force: bool = False, restart: bool = False) -> Dict[str, Any]:
+        """
+        Start (or resume) a backfill run.
+
+        A checkpoint for the same source/folder is resumed unless restart=True;
+        a checkpoint for a different library is discarded.
+
+        Args:
+            source: One of SOURCES
+            folder: Audio folder (required for the "folder" source)
+            tasks: Subset of TASKS to run (default: all)
+            force: Refetch even if lyrics/art already exist
+            restart: Ignore any checkpoint and start from the beginning
+
+        Returns:
+            Status dict
+
+        Raises:
+            ValueError: Invalid source/folder/tasks
+            RuntimeError: A run is already in progress
+        """
+        if self.is_running:
+            raise RuntimeError("Library backfill is already running")
+        if source not in SOURCES:
+            raise ValueError(f"source must be one of: {', '.join(SOURCES)}")
+        if source == "folder":
+            if not folder or not Path(folder).is_dir():
+                raise ValueError("folder must be an existing directory for the folder source")
+            folder = str(Path(folder).absolute())
+        else:
+            folder = None
+        tasks = list(tasks) if tasks else list(TASKS)
+        invalid = [t for t in tasks if t not in TASKS]
+        if invalid:
+            raise ValueError(f"Unknown tasks: {', '.join(invalid)} (valid: {', '.join(TASKS)})")
+
+        checkpoint = {} if restart else _load_checkpoint()
+        if checkpoint.get("source") != source or checkpoint.get("folder") != folder:
+            checkpoint = {}
+        self._checkpoint = {
+            "source": source,
+            "folder": folder,
+            "tasks": tasks,
+            "force": force,
+            "last_key": checkpoint.get("last_key"),
+            "counts": checkpoint.get("counts") or {},
+            "created_at": checkpoint.get("created_at") or time.time(),
+        }
+        if checkpoint:
+            logger.info(f"Resuming library backfill ({source}) after {checkpoint.get('last_key')!r}")
+
+        from .helpers import create_tracked_task
+        self._pause_requested = False
+        self.reason = None
+        self.started_at = time.time()
+        self.state = "scanning"
+        self._task = create_tracked_task(self._run())
+        return self.status()
+
+    def pause(self, reason: str = "manual") -> Dict[str, Any]:
+        """Stop after the current item; the checkpoint is kept for resuming."""
+        if self.is_running:
+            self._pause_requested = True
+            self.reason = reason
+        return self.status()
+
+    async def cancel(self) -> None:
+        """Cancel immediately (shutdown). The checkpoint is already up to date."""
+        if self.is_running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> Dict[str, Any]:
+        """Current progress, for the status endpoint."""
+        checkpoint = self._checkpoint or _load_checkpoint()
+        return {
+            "state": self.state,
+            "reason": self.reason,
+            "source": checkpoint.get("source"),
+            "folder": checkpoint.get("folder"),
+            "tasks": checkpoint.get("tasks"),
+            "force": checkpoint.get("force", False),
+            "total": self.total,
+            "position": self.position,
+            "current": self.current,
+            "counts": checkpoint.get("counts", {}),
+            "resumable": bool(checkpoint.get("last_key")) and self.state != "completed",
+            "started_at": self.started_at,
+        }
+
+    def _count(self, name: str) -> None:
+        counts = self._checkpoint["counts"]
+        counts[name] = counts.get(name, 0) + 1
+
+    async def _is_playing(self) -> bool:
+        from .metadata import get_current_song_meta_data
+        try:
+            metadata = await get_current_song_meta_data()
+        except Exception as e:
+            logger.debug(f"Library backfill could not check playback: {e}")
+            return False
+        return bool(metadata and metadata.get("is_playing"))
+
+    async def _process(self, item: Dict[str, Any], artists_done: set) -> None:
+        """Run the configured tasks for one library item."""
+        from .album_art import ensure_album_art_db
+        from .artist_image import ensure_artist_image_db
+        from .image_downloads import PRIORITY_BACKFILL
+
+        artist, title, album = item["artist"], item["title"], item["album"]
+        tasks, force = self._checkpoint["tasks"], self._checkpoint["force"]
+
+        if "lyrics" in tasks and title and FEATURES.get("save_lyrics_locally", False):
+            if not force and await asyncio.to_thread(_has_lyrics_saved, artist, title):
+                self._count("lyrics_skipped")
+            elif await _fetch_lyrics(artist, title, album, item["duration"]):
+                self._count("lyrics_fetched")
+            else:
+                self._count("lyrics_missing")
+
+        if "album_art" in tasks and (album or title):
+            if not force and await asyncio.to_thread(_has_album_art, artist, album, title):
+                self._count("album_art_skipped")
+            # Album-only items (art DB folders, untagged tracks) search by the album name
+            elif await ensure_album_art_db(
+                artist, album, title or album, force=force, priority=PRIORITY_BACKFILL, album_only=not title
+            ):
+                self._count("album_art_fetched")
+            else:
+                self._count("album_art_missing")
+
+        if "artist_images" in tasks and artist.lower() not in artists_done:
+            artists_done.add(artist.lower())
+            if await ensure_artist_image_db(artist, force=force, validate_current_song=False):
+                self._count("artist_images")
+            else:
+                self._count("artist_images_missing")
+
+    async def _run(self) -> None:
+        checkpoint = self._checkpoint
+        try:
+            if "lyrics" in checkpoint["tasks"] and not FEATURES.get("save_lyrics_locally", False):
+                logger.info("Library backfill: save_lyrics_locally is disabled, skipping lyrics")
+            items = await asyncio.to_thread(collect_library, checkpoint["source"], checkpoint["folder"])
+            self.total = len(items)
+            last_key = checkpoint.get("last_key")
+            start = 0
+            if last_key:
+                start = next((i for i, item in enumerate(items) if item["key"] > last_key), len(items))
+            self.position = start
+            self.state = "running"
+            logger.info(f"Library backfill ({checkpoint['source']}): {self.total} items, starting at {start}")
+
+            interval = max(0.0, LIBRARY_BACKFILL["interval"])
+            artists_done: set = set()
+            for item in items[start:]:
+                if self._pause_requested:
+                    break
+                if LIBRARY_BACKFILL["pause_on_playback"] and await self._is_playing():
+                    self.reason = "playback"
+                    break
+                self.current = f"{item['artist']} - {item['title'] or item['album'] or ''}".rstrip(" -")
+                try:
+                    await self._process(item, artists_done)
+                except Exception as e:
+                    logger.warning(f"Library backfill failed for {self.current}: {e}")
+                    self._count("errors")
+                self.position += 1
+                checkpoint["last_key"] = item["key"]
+                checkpoint["updated_at"] = time.time()
+                await asyncio.to_thread(_save_checkpoint, checkpoint)
+                await asyncio.sleep(interval)
+            else:
+                self.state = "completed"
+                self.current = None
+                checkpoint["last_key"] = None
+                await asyncio.to_thread(_save_checkpoint, checkpoint)
+                logger.info(f"Library backfill ({checkpoint['source']}) completed: {checkpoint['counts']}")
+                return
+
+            self.state = "paused"
+            logger.info(f"Library backfill paused ({self.reason}) at {self.position}/{self.total}")
+        except asyncio.CancelledError:
+            self.state = "paused"
+            self.reason = "shutdown"
+            raise
+        except Exception as e:
+            self.state = "error"
+            self.reason = str(e)
+            logger.error(f"Library backfill failed: {e}", exc_info=True)
+
+
+_job: Optional[LibraryBackfillJob] = None
+
+
+def get_library_backfill() -> LibraryBackfillJob:
+    """Return the process-wide backfill job."""
+    global _job
+    if _job is None:
+        _job = LibraryBackfillJob()
+    return _job
@@ -0,0 +1,263 @@
+"""
+Event-loop lag monitor.
+
+Anything that blocks the asyncio thread (sync file I/O, json.load of a big DB
+file, Pillow work) shows up as janky karaoke long before it shows up in logs.
+Three probes measure it:
+
+- Sampler task: sleeps LOOP_MONITOR["interval"] and records how late it woke
+  up (event_loop_lag_seconds in /metrics).
+- Stall watcher thread: notices the sampler's heartbeat going stale while the
+  loop is still blocked and captures the loop thread's stack and current
+  task, i.e. the code that is blocking right now.
+- Slow callbacks (optional, LOOP_MONITOR["slow_callbacks"]): asyncio debug
+  mode reports every callback/task step slower than the threshold. Debug mode
+  has overhead, so it is off by default.
+
+Lag events go to a ring buffer (GET /api/debug/loop-lag) and are summarized in
+the watchdog's crash_stacks.txt dumps.
+
+Dependencies: helpers (create_tracked_task)
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import re
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from config import LOOP_MONITOR
+from logging_config import get_logger
+from metrics import histogram
+
+logger = get_logger(__name__)
+
+MAX_EVENTS = 100          # Ring buffer size
+MAX_STACK_FRAMES = 25     # Innermost frames kept per captured stack
+_TOOK_RE = re.compile(r"took ([\d.]+) seconds")
+
+
+def _format_stack(frame, limit: int = MAX_STACK_FRAMES) -> List[str]:
+    frames = traceback.extract_stack(frame)[-limit:]
+    return [f"{f.filename}:{f.lineno} in {f.name}" + (f" | {f.line}" if f.line else "") for f in frames]
+
+
+def _task_name(loop: asyncio.AbstractEventLoop) -> Optional[str]:
+    try:
+        task = asyncio.current_task(loop)
+    except RuntimeError:
+        return None
+    if task is None:
+        return None
+    coro = task.get_coro()
+    return f"{task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """Captures asyncio debug-mode 'Executing <Handle ...> took X seconds' warnings."""
+
+    def __init__(self, monitor: "LoopMonitor"):
+        super().__init__(level=logging.WARNING)
+        self._monitor = monitor
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = record.getMessage()
+        except Exception:
+            return
+        if message.startswith("Executing "):
+            took = _TOOK_RE.search(message)
+            self._monitor._record("slow_callback", float(took.group(1)) if took else None, detail=message)
+
+
+class LoopMonitor:
+    """Loop-lag sampler + stall watcher for the running event loop."""
+
+    def __init__(self):
+        self.interval = max(0.05, LOOP_MONITOR["interval"])
+        self.threshold = max(0.01, LOOP_MONITOR["threshold"])
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=MAX_EVENTS)
+        self._events_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._heartbeat = time.monotonic()
+        self._stall_captured = False
+        self._slow_handler: Optional[_SlowCallbackHandler] = None
+        self._recent_lag: Deque[tuple] = deque(maxlen=int(60 / self.interval) + 1)  # (time, lag)
+        self._max_lag = 0.0
+        self._samples = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling the current event loop (idempotent, call from the loop)."""
+        if self.running:
+            return
+        from .helpers import create_tracked_task
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._heartbeat = time.monotonic()
+        self._task = create_tracked_task(self._sample_loop())
+        self._watcher = threading.Thread(target=self._watch, daemon=True, name="LoopLagWatcher")
+        self._watcher.start()
+
+        if LOOP_MONITOR["slow_callbacks"]:
+            self._loop.set_debug(True)
+            self._loop.slow_callback_duration = self.threshold
+            self._slow_handler = _SlowCallbackHandler(self)
+            logging.getLogger("asyncio").addHandler(self._slow_handler)
+        logger.info(
+            f"Event loop monitor started (interval {self.interval * 1000:.0f}ms, "
+            f"threshold {self.threshold * 1000:.0f}ms, slow callbacks: {bool(LOOP_MONITOR['slow_callbacks'])})"
+        )
+
+    def stop(self) -> None:
+        """Stop sampling (safe to call from any state)."""
+        self._stop.set()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        if self._slow_handler is not None:
+            logging.getLogger("asyncio").removeHandler(self._slow_handler)
+            self._slow_handler = None
+
+    async def _sample_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        lag_histogram = histogram("event_loop_lag_seconds", "Event loop scheduling delay of a periodic timer")
+        while not self._stop.is_set():
+            self._heartbeat = time.monotonic()
+            self._stall_captured = False
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            lag_histogram.observe(lag)
+            self._samples += 1
+            self._recent_lag.append((time.time(), lag))
+            if lag > self._max_lag:
+                self._max_lag = lag
+            if lag >= self.threshold:
+                if self._stall_captured:
+                    self._complete_stall(lag)
+                else:
+                    self._record("lag", lag)
+
+    def _watch(self) -> None:
+        """Runs in its own thread: grabs the loop thread's stack while a stall is in progress."""
+        while not self._stop.wait(self.interval):
+            overdue = time.monotonic() - self._heartbeat - self.interval
+            if overdue < self.threshold or self._stall_captured:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._stall_captured = True  # One capture per stall; reset by the next heartbeat
+            self._record("stall", overdue, stack=_format_stack(frame), task=_task_name(self._loop))
+
+    def _record(self, kind: str, lag: Optional[float], stack: Optional[List[str]] = None,
+                task: Optional[str] = None, detail: Optional[str] = None) -> None:
+        event = {
+            "time": time.time(),
+            "kind": kind,
+            "lag_ms": round(lag * 1000, 1) if lag is not None else None,
+        }
+        if task:
+            event["task"] = task
+        if stack:
+            event["stack"] = stack
+        if detail:
+            event["detail"] = detail
+        with self._events_lock:
+            self._events.append(event)
+        if kind == "stall":
+            logger.warning(f"Event loop blocked for {event['lag_ms']:.0f}ms+ in {task or 'a callback'}: {stack[-1] if stack else '?'}")
+
+    def _complete_stall(self, lag: float) -> None:
+        """Replace the captured stall's 'blocked so far' with the final lag."""
+        with self._events_lock:
+            for event in reversed(self._events):
+                if event["kind"] == "stall":
+                    event["lag_ms"] = round(lag * 1000, 1)
+                    break
+
+    def get_events(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Recorded lag events, newest first."""
+        with self._events_lock:
+            events = list(self._events)
+        events.reverse()
+        return events[:limit] if limit else events
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Monitor state and lag statistics.
+
+        Returns:
+            {"running", "interval_ms", "threshold_ms", "slow_callbacks", "samples",
+             "lag": {p50_ms, p99_ms, max_ms, last_minute_max_ms}, "event_count"}
+        """
+        quantiles = histogram("event_loop_lag_seconds").quantiles((0.5, 0.99))
+        cutoff = time.time() - 60
+        last_minute = [lag for t, lag in list(self._recent_lag) if t >= cutoff]
+        with self._events_lock:
+            event_count = len(self._events)
+        return {
+            "running": self.running,
+            "interval_ms": round(self.interval * 1000),
+            "threshold_ms": round(self.threshold * 1000),
+            "slow_callbacks": self._slow_handler is not None,
+            "samples": self._samples,
+            "lag": {
+                "p50_ms": round(quantiles[0.5] * 1000, 2) if quantiles[0.5] is not None else None,
+                "p99_ms": round(quantiles[0.99] * 1000, 2) if quantiles[0.99] is not None else None,
+                "max_ms": round(self._max_lag * 1000, 1),
+                "last_minute_max_ms": round(max(last_minute) * 1000, 1) if last_minute else None,
+            },
+            "event_count": event_count,
+        }
+
+    def format_summary(self, max_events: int = 5) -> str:
+        """Plain-text summary for the watchdog's crash dump."""
+        status = self.get_status()
+        lag = status["lag"]
+        lines = [
+            f"Event loop lag: p50 {lag['p50_ms']}ms, p99 {lag['p99_ms']}ms, "
+            f"max {lag['max_ms']}ms, last minute max {lag['last_minute_max_ms']}ms "
+            f"({status['samples']} samples, {status['event_count']} events >= {status['threshold_ms']}ms)"
+        ]
+        overdue = time.monotonic() - self._heartbeat - self.interval
+        if self.running and overdue >= self.threshold:
+            lines.append(f"Loop currently blocked for {overdue * 1000:.0f}ms")
+        for event in self.get_events(max_events):
+            stamp = time.strftime("%H:%M:%S", time.localtime(event["time"]))
+            where = event.get("task") or event.get("detail") or ""
+            lines.append(f"  {stamp} {event['kind']} {event['lag_ms']}ms {where}".rstrip())
+            for frame_line in event.get("stack", [])[-5:]:
+                lines.append(f"      {frame_line}")
+        return "\n".join(lines) + "\n"
+
+
+_monitor: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """Get the loop monitor singleton."""
+    global _monitor
+    if _monitor is None:
+        _monitor = LoopMonitor()
+    return _monitor
+
+
+def start_loop_monitor() -> None:
+    """Start the monitor on the running loop if enabled in config."""
+    if LOOP_MONITOR["enabled"]:
+        get_loop_monitor().start()
@@ -23,6 +23,7 @@ from .image import extract_dominant_colors, get_cached_art_path
 from .album_art import get_album_db_folder, ensure_album_art_db
 from config import CACHE_DIR
 from logging_config import get_logger
+from metrics import timed_async
 from providers.album_art import get_album_art_provider
 from providers.spotify_api import get_shared_spotify_client
 
@@ -166,6 +167,7 @@ async def _update_debug_art(result: Dict[str, Any]):
         logger.debug(f"Failed to schedule debug art update: {e}")
 
 
+@timed_async("metadata_fetch_seconds")
 async def get_current_song_meta_data() -> Optional[dict]:
     """
     Main orchestrator to get song data from configured sources with hybrid enrichment.
@@ -340,7 +342,7 @@ async def get_current_song_meta_data() -> Optional[dict]:
                         change_reason.append(f"name ({last_song} -> {cached_song_name})")
                     if not track_id_matches:
                         change_reason.append(f"track_id ({last_track_id} -> {cached_track_id})")
-                    logger.debug(f"Song changed in cache ({', '.join(change_reason)}), invalidating cache to fetch fresh data")
+                    logger.debug("Song changed in cache (%s), invalidating cache to fetch fresh data", ", ".join(change_reason))
                     get_current_song_meta_data._last_check_time = 0  # Force refresh by resetting check time
             else:
                 # If last result was None (Idle/Paused) and we are within interval,
@@ -465,7 +467,7 @@ async def get_current_song_meta_data() -> Optional[dict]:
                             # Continue checking other sources for active playback
                             continue
                 except Exception as e:
-                    logger.debug(f"Source {source_info['name']} failed: {e}")
+                    logger.debug("Source %s failed: %s", source_info['name'], e)
                     continue
             
             # If no active source found, use paused fallback
@@ -711,7 +713,7 @@ async def get_current_song_meta_data() -> Optional[dict]:
                         mtime = int(artist_image_path.stat().st_mtime)
                         result["background_image_url"] = f"/cover-art?id={audio_rec_track_id}&t={mtime}&type=background"
                         result["background_image_path"] = str(artist_image_path)
-                        logger.debug(f"Audio rec: Using preferred artist image for background: {artist}")
+                        logger.debug("Audio rec: Using preferred artist image for background: %s", artist)
                 
                 # C. Background fetch (like Windows/Spotify pattern) - only if not already in DB
                 # FIX: Check negative cache first (prevents retry spam for non-music files)
@@ -901,7 +903,7 @@ async def get_current_song_meta_data() -> Optional[dict]:
                             result["background_image_path"] = str(artist_image_path)
                             enriched["background_image_url"] = result["background_image_url"]
                             enriched["background_image_path"] = result["background_image_path"]
-                            logger.debug(f"Spicetify: Using preferred artist image for background: {artist}")
+                            logger.debug("Spicetify: Using preferred artist image for background: %s", artist)
                     
                     # C. Background fetch (like Windows/Spotify pattern) - only if not already in DB
                     # FIX: Check negative cache first (prevents retry spam for non-music files)
@@ -987,7 +989,7 @@ async def get_current_song_meta_data() -> Optional[dict]:
                     if artist_visuals:
                         header = artist_visuals.get('header_image')
                         gallery = artist_visuals.get('gallery', [])
-                        logger.debug(f"Spicetify: Got artist_visuals for {artist} (header: {bool(header)}, gallery: {len(gallery)})")
+                        logger.debug("Spicetify: Got artist_visuals for %s (header: %s, gallery: %d)", artist, bool(header), len(gallery))
                     
                     if artist and artist not in state._artist_download_tracker:
                         # CLOSURE FIX: Capture values via default arguments (evaluated at definition time)
@@ -1030,7 +1032,7 @@ async def get_current_song_meta_data() -> Optional[dict]:
                                 except Exception as e:
                                     logger.debug(f"Spicetify: Background Spicetify-only backfill failed for {_artist}: {e}")
                             
-                            logger.debug(f"Spicetify: Adding Spicetify images for existing artist: {artist}")
+                            logger.debug("Spicetify: Adding Spicetify images for existing artist: %s", artist)
                             create_tracked_task(background_spicetify_only_backfill())
                     
                     # Cache the enrichment result for this track
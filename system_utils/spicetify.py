@@ -15,6 +15,7 @@ from quart import websocket
 from . import state
 from .helpers import _normalize_track_id
 from logging_config import get_logger
+from metrics import gauge, histogram
 from providers.spotify_api import enhance_spotify_image_url_async, get_shared_spotify_client
 
 logger = get_logger(__name__)
@@ -52,6 +53,9 @@ _spicetify_state: Dict[str, Any] = {
     'colors': None,             # May be null (Spotify blocks API)
 }
 
+# Message types sent by the bridge (metrics label; anything else counts as "other")
+_MESSAGE_TYPES = ('position', 'track_data', 'queue_data', 'ping')
+
 # Queue cache (separate from main state for cleaner management)
 _spicetify_queue_cache: Dict[str, Any] = {
     'data': None,               # Queue response from bridge
@@ -135,7 +139,7 @@ async def get_queue() -> Optional[Dict[str, Any]]:
             if not hasattr(get_queue, '_last_success_log'):
                 get_queue._last_success_log = 0
             if time.time() - get_queue._last_success_log > 60:
-                logger.debug(f"Got Spicetify queue: {_queue_response_data.get('count', 0)} tracks")
+                logger.debug("Got Spicetify queue: %s tracks", _queue_response_data.get('count', 0))
                 get_queue._last_success_log = time.time()
             return _queue_response_data
         else:
@@ -182,7 +186,7 @@ async def get_current_song_meta_data_spicetify() -> Optional[dict]:
                 get_current_song_meta_data_spicetify._last_stale_log = 0
             now = time.time()
             if now - get_current_song_meta_data_spicetify._last_stale_log > 120:
-                logger.debug(f"Spicetify data stale ({age_ms:.0f}ms > {METADATA_STALE_MS}ms), returning cached paused state")
+                logger.debug("Spicetify data stale (%.0fms > %sms), returning cached paused state", age_ms, METADATA_STALE_MS)
                 get_current_song_meta_data_spicetify._last_stale_log = now
             # Continue to build result - is_playing will be forced to False below
         
@@ -303,6 +307,7 @@ async def handle_spicetify_connection():
     
     _spicetify_state['connected'] = True
     _active_websocket = websocket._get_current_object()  # Store actual object, not proxy
+    gauge("websocket_connections", "Open WebSocket connections", endpoint="spicetify").inc()
     logger.info("Spicetify bridge connected")
     
     try:
@@ -311,6 +316,8 @@ async def handle_spicetify_connection():
             data = await websocket.receive()
             
             if isinstance(data, str):
+                received = time.perf_counter()
+                msg_type = None
                 try:
                     msg = json.loads(data)
                     msg_type = msg.get('type')
@@ -335,6 +342,12 @@ async def handle_spicetify_connection():
                         
                 except json.JSONDecodeError:
                     logger.debug("Spicetify: Invalid JSON received")
+                finally:
+                    # Handling time on the receive loop (position updates are only scheduled here)
+                    histogram("websocket_message_seconds", "Time a WebSocket message holds the receive loop",
+                              endpoint="spicetify",
+                              type=msg_type if msg_type in _MESSAGE_TYPES else "other"
+                              ).observe(time.perf_counter() - received)
                     
     except asyncio.CancelledError:
         logger.debug("Spicetify WebSocket cancelled")
@@ -360,6 +373,7 @@ async def handle_spicetify_connection():
         _spicetify_queue_cache['data'] = None
         _spicetify_queue_cache['last_update'] = 0
         _active_websocket = None
+        gauge("websocket_connections", endpoint="spicetify").dec()
         logger.info("Spicetify bridge disconnected")
 
 
@@ -403,7 +417,7 @@ async def _handle_position_update(data: dict):
         _handle_position_update._last_pos_log = 0
     now = time.time()
     if now - _handle_position_update._last_pos_log > 60:
-        logger.debug(f"Spicetify position: {data.get('position_ms', 0)}ms, playing={data.get('is_playing')}")
+        logger.debug("Spicetify position: %sms, playing=%s", data.get('position_ms', 0), data.get('is_playing'))
         _handle_position_update._last_pos_log = now
 
 
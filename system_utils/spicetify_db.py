@@ -11,7 +11,11 @@ Pattern follows lyrics.py for consistency:
 - Safe filenames (strip illegal chars)
 - Feature flag control
 
-Level 0 - No internal imports (self-contained)
+Each song with audio analysis also gets a compact binary artifact next to its
+JSON ("<artist> - <title>.analysis.bin", see analysis_compact.py) that the
+visualizers load instead of the full analysis.
+
+Level 0 - Only imports analysis_compact (Level 0); helpers is imported lazily
 """
 
 import asyncio
@@ -23,6 +27,7 @@ from typing import Optional, Dict, Any
 from datetime import datetime
 from config import SPICETIFY_DB_DIR, FEATURES
 from logging_config import get_logger
+from .analysis_compact import EXTENSION as COMPACT_EXTENSION, encode as encode_compact_analysis
 
 logger = get_logger(__name__)
 
@@ -121,6 +126,85 @@ def _get_db_path(artist: str, title: str) -> Optional[str]:
         return None
 
 
+def _get_compact_path(db_path: str) -> str:
+    """Compact analysis artifact path for a song's JSON path."""
+    return db_path[:-len(".json")] + COMPACT_EXTENSION
+
+
+def _atomic_write_bytes(path: str, data: bytes) -> None:
+    """Write via temp file + os.replace (same pattern as the JSON files)."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+        raise
+
+
+def build_compact_analysis(artist: str, title: str, audio_analysis: Dict[str, Any]) -> bytes:
+    """
+    Encode an audio analysis as the compact artifact (CPU-bound, run in a thread).
+
+    Args:
+        artist: Artist name (for the analysis_track_id)
+        title: Track title
+        audio_analysis: Analysis dict with segments/beats/sections
+
+    Returns:
+        Artifact bytes
+    """
+    from .helpers import _normalize_track_id
+    return encode_compact_analysis(audio_analysis, _normalize_track_id(artist, title))
+
+
+def load_compact_analysis(artist: str, title: str) -> Optional[bytes]:
+    """
+    Load a song's compact analysis artifact (blocking, run in a thread).
+
+    Songs cached before artifacts existed get theirs built from the JSON on
+    first request and written next to it.
+
+    Args:
+        artist: Artist name
+        title: Track title
+
+    Returns:
+        Artifact bytes, or None if no audio analysis is cached
+    """
+    if not FEATURES.get("spicetify_database", True):
+        return None
+
+    db_path = _get_db_path(artist, title)
+    if not db_path:
+        return None
+    compact_path = _get_compact_path(db_path)
+    try:
+        with open(compact_path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug(f"Failed to read compact analysis: {e}")
+
+    data = load_from_db(artist, title)
+    analysis = data.get('audio_analysis') if data else None
+    if not analysis or not analysis.get('segments'):
+        return None
+    blob = build_compact_analysis(artist, title, analysis)
+    try:
+        _atomic_write_bytes(compact_path, blob)
+        logger.debug(f"Built compact analysis for cached song: {artist} - {title} ({len(blob)} bytes)")
+    except Exception as e:
+        logger.debug(f"Failed to save compact analysis: {e}")
+    return blob
+
+
 def load_from_db(artist: str, title: str) -> Optional[Dict[str, Any]]:
     """
     Load cached Spicetify data (audio analysis, colors) for a song.
@@ -382,6 +466,16 @@ async def save_to_db(
                     pass
             raise write_err
         
+        # Compact artifact for the visualizers: rebuilt when new analysis arrives,
+        # backfilled when missing (songs cached before artifacts existed)
+        saved_analysis = data.get("audio_analysis") or {}
+        compact_path = _get_compact_path(db_path)
+        if saved_analysis.get('segments') and (new_has_data or not os.path.exists(compact_path)):
+            try:
+                _atomic_write_bytes(compact_path, build_compact_analysis(artist, title, saved_analysis))
+            except Exception as e:
+                logger.warning(f"Failed to save compact analysis for {artist} - {title}: {e}")
+        
         return True
     
     async with _db_lock:
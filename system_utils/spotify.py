@@ -16,12 +16,12 @@ from typing import Optional, Dict, Any
 from PIL import Image
 
 from . import state
-from .helpers import create_tracked_task, _normalize_track_id, _cleanup_artist_image_log_throttle
+from .helpers import create_tracked_task, _normalize_track_id
 from .image import extract_dominant_colors
 from .album_art import get_album_db_folder, load_album_art_from_db, ensure_album_art_db
 from .artist_image import load_artist_image_from_db, _get_artist_image_fallback, ensure_artist_image_db
 from config import CACHE_DIR
-from logging_config import get_logger
+from logging_config import get_logger, should_log
 from providers.album_art import get_album_art_provider
 from providers.spotify_api import get_shared_spotify_client
 
@@ -277,13 +277,8 @@ async def _get_current_song_meta_data_spotify(target_title: str = None, target_a
                 background_image_url = f"/cover-art?id={captured_track_id}&t={mtime}&type=background"
                 background_image_path = str(artist_image_path)
                 # CRITICAL FIX: Throttle log to prevent spam (30+ logs per second)
-                current_time = time.time()
-                log_key = f"preferred_bg_{captured_artist}"
-                last_log_time = state._artist_image_log_throttle.get(log_key, 0)
-                if (current_time - last_log_time) >= state._ARTIST_IMAGE_LOG_THROTTLE_SECONDS:
+                if should_log(f"preferred_bg_{captured_artist}", state._ARTIST_IMAGE_LOG_THROTTLE_SECONDS):
                     logger.debug(f"Using preferred artist image for background: {captured_artist}")
-                    state._artist_image_log_throttle[log_key] = current_time
-                    _cleanup_artist_image_log_throttle()
         
         # If no album art found but artist image is selected, still set background
         # CRITICAL FIX: Don't set found_in_db here - we want to keep album_art_found_in_db = False
@@ -467,13 +462,8 @@ async def _get_current_song_meta_data_spotify(target_title: str = None, target_a
                 found_in_db = True  # For display purposes only - album_art_found_in_db stays False
                 # CRITICAL FIX: Throttle log to prevent spam (30+ logs per second)
                 # Use same throttle mechanism as artist image fetching
-                current_time = time.time()
-                log_key = f"fallback_{captured_artist}"
-                last_log_time = state._artist_image_log_throttle.get(log_key, 0)
-                if (current_time - last_log_time) >= state._ARTIST_IMAGE_LOG_THROTTLE_SECONDS:
+                if should_log(f"fallback_{captured_artist}", state._ARTIST_IMAGE_LOG_THROTTLE_SECONDS):
                     logger.debug(f"Using artist image '{fallback_result.get('source')}' as fallback for {captured_artist}")
-                    state._artist_image_log_throttle[log_key] = current_time
-                    _cleanup_artist_image_log_throttle()
         
         # Progressive Enhancement: Return Spotify 640px immediately, upgrade in background
         if album_art_url:
@@ -133,10 +133,7 @@ _no_art_found_cache: Dict[str, float] = {}
 # ==========================================
 # THROTTLES
 # ==========================================
-
-# Throttle for artist image fetch logs (prevents spam)
-# Key: artist name, Value: last log timestamp
-_artist_image_log_throttle: Dict[str, float] = {}
+# Log intervals for logging_config.should_log(key, interval)
 
 # Throttle for Windows SMTC empty artist skip log (prevents spam)
 # Only logs once per 60 seconds when skipping tracks with no artist
@@ -145,7 +142,6 @@ _smtc_empty_artist_last_log_time: float = 0
 
 # Throttle for lyrics skip log (when artist or title is empty)
 _LYRICS_SKIP_LOG_INTERVAL = 60  # seconds
-_lyrics_skip_last_log_time: float = 0
 
 # ==========================================
 # COUNTERS & TRACKING STATE
@@ -12,11 +12,11 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 
 from . import state
-from .helpers import create_tracked_task, _remove_text_inside_parentheses_and_brackets, _normalize_track_id, _cleanup_artist_image_log_throttle
+from .helpers import create_tracked_task, _remove_text_inside_parentheses_and_brackets, _normalize_track_id
 from .album_art import get_album_db_folder, load_album_art_from_db, ensure_album_art_db
 from .artist_image import load_artist_image_from_db, _get_artist_image_fallback, ensure_artist_image_db
 from config import CACHE_DIR
-from logging_config import get_logger
+from logging_config import get_logger, should_log
 
 logger = get_logger(__name__)
 
@@ -437,13 +437,8 @@ async def _get_current_song_meta_data_windows() -> Optional[dict]:
                 background_image_url = f"/cover-art?id={current_track_id}&t={mtime}&type=background"
                 background_image_path = str(artist_image_path)
                 # CRITICAL FIX: Throttle log to prevent spam (30+ logs per second)
-                current_time = time.time()
-                log_key = f"preferred_bg_{artist}"
-                last_log_time = state._artist_image_log_throttle.get(log_key, 0)
-                if (current_time - last_log_time) >= state._ARTIST_IMAGE_LOG_THROTTLE_SECONDS:
+                if should_log(f"preferred_bg_{artist}", state._ARTIST_IMAGE_LOG_THROTTLE_SECONDS):
                     logger.debug(f"Using preferred artist image for background: {artist}")
-                    state._artist_image_log_throttle[log_key] = current_time
-                    _cleanup_artist_image_log_throttle()
         
         # CRITICAL FIX: Check if artist images DB is populated with ALL expected sources
         # This ensures all provider options are available in the selection menu (similar to album art backfill)
@@ -524,13 +519,8 @@ async def _get_current_song_meta_data_windows() -> Optional[dict]:
                 found_in_db = True  # For display purposes only - album_art_found_in_db stays False
                 # CRITICAL FIX: Throttle log to prevent spam (30+ logs per second)
                 # Use same throttle mechanism as artist image fetching
-                current_time = time.time()
-                log_key = f"fallback_{artist}"
-                last_log_time = state._artist_image_log_throttle.get(log_key, 0)
-                if (current_time - last_log_time) >= state._ARTIST_IMAGE_LOG_THROTTLE_SECONDS:
+                if should_log(f"fallback_{artist}", state._ARTIST_IMAGE_LOG_THROTTLE_SECONDS):
                     logger.debug(f"Using artist image '{fallback_result.get('source')}' as fallback for {artist}")
-                    state._artist_image_log_throttle[log_key] = current_time
-                    _cleanup_artist_image_log_throttle()
 
         # 2. Windows Thumbnail Extraction (Fallback)
         # Only if not found in DB